@@ -0,0 +1,163 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Shared HTTP client for AWS Documentation MCP Server.
+
+All tools send their requests through one pooled client that lives as long as
+the server, so connections to the documentation site and the search and
+recommendation APIs are kept alive and reused instead of paying for TCP and
+TLS setup on every tool call.
+"""
+
+import httpx
+import importlib.util
+import os
+from contextlib import asynccontextmanager
+from loguru import logger
+from typing import Any, AsyncIterator, Dict, Optional
+
+
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 10
+DEFAULT_KEEPALIVE_EXPIRY_SECONDS = 60.0
+DEFAULT_CONNECT_TIMEOUT_SECONDS = 10.0
+DEFAULT_TIMEOUT_SECONDS = 30.0
+
+# Read timeout of requests to each host, in seconds
+HOST_TIMEOUT_SECONDS = {
+    'docs.aws.amazon.com': 30.0,
+    'proxy.search.docs.aws.amazon.com': 30.0,
+    'contentrecs-api.docs.aws.amazon.com': 30.0,
+}
+
+_client: Optional[httpx.AsyncClient] = None
+_client_users = 0
+
+
+def get_host_timeouts() -> Dict[str, float]:
+    """Get the request timeout of each host.
+
+    The defaults can be overridden with the AWS_DOCUMENTATION_HTTP_TIMEOUTS
+    environment variable, a comma-separated list of host=seconds pairs.
+
+    Returns:
+        Dictionary mapping host names to timeouts in seconds
+    """
+    timeouts = dict(HOST_TIMEOUT_SECONDS)
+    for pair in os.environ.get('AWS_DOCUMENTATION_HTTP_TIMEOUTS', '').split(','):
+        if not pair.strip():
+            continue
+        try:
+            host, seconds = pair.split('=', 1)
+            timeouts[host.strip()] = float(seconds)
+        except ValueError:
+            logger.warning(f'Ignoring invalid HTTP timeout setting: {pair}')
+    return timeouts
+
+
+def get_timeout(url: str) -> httpx.Timeout:
+    """Get the timeout of a request to a URL.
+
+    Args:
+        url: URL of the request
+
+    Returns:
+        Timeout for the host of the URL
+    """
+    seconds = get_host_timeouts().get(httpx.URL(url).host, DEFAULT_TIMEOUT_SECONDS)
+    return httpx.Timeout(seconds, connect=min(seconds, DEFAULT_CONNECT_TIMEOUT_SECONDS))
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create the pooled HTTP client.
+
+    The pool size can be configured with the AWS_DOCUMENTATION_MAX_CONNECTIONS
+    and AWS_DOCUMENTATION_MAX_KEEPALIVE_CONNECTIONS environment variables.
+    HTTP/2 is used when the h2 package is installed, unless
+    AWS_DOCUMENTATION_HTTP2 is set to false.
+
+    Returns:
+        New httpx.AsyncClient
+    """
+    max_connections = DEFAULT_MAX_CONNECTIONS
+    max_keepalive_connections = DEFAULT_MAX_KEEPALIVE_CONNECTIONS
+    try:
+        max_connections = int(os.environ.get('AWS_DOCUMENTATION_MAX_CONNECTIONS', max_connections))
+        max_keepalive_connections = int(
+            os.environ.get(
+                'AWS_DOCUMENTATION_MAX_KEEPALIVE_CONNECTIONS', max_keepalive_connections
+            )
+        )
+    except ValueError:
+        logger.warning('Invalid HTTP connection limits, using defaults')
+
+    http2 = os.environ.get('AWS_DOCUMENTATION_HTTP2', 'true').lower() != 'false'
+    if http2 and importlib.util.find_spec('h2') is None:
+        logger.warning('The h2 package is not installed, using HTTP/1.1')
+        http2 = False
+
+    logger.debug(
+        f'Creating HTTP client (http2={http2}, max_connections={max_connections}, '
+        f'max_keepalive_connections={max_keepalive_connections})'
+    )
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        timeout=httpx.Timeout(DEFAULT_TIMEOUT_SECONDS, connect=DEFAULT_CONNECT_TIMEOUT_SECONDS),
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it if the server has not started it.
+
+    Returns:
+        The shared httpx.AsyncClient
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_http_client()
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and its pooled connections."""
+    global _client
+    if _client is not None:
+        client, _client = _client, None
+        await client.aclose()
+        logger.debug('Closed HTTP client')
+
+
+@asynccontextmanager
+async def http_client_lifespan(server: Any) -> AsyncIterator[None]:
+    """Create the shared HTTP client when the server starts and close it on shutdown.
+
+    With the SSE transport the lifespan is entered for every session, so the
+    client is closed when the last session ends.
+
+    Args:
+        server: The MCP server
+
+    Yields:
+        None
+    """
+    global _client_users
+    _client_users += 1
+    get_http_client()
+    try:
+        yield
+    finally:
+        _client_users -= 1
+        if _client_users == 0:
+            await close_http_client()
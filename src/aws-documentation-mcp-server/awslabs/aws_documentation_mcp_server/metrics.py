@@ -0,0 +1,162 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Tool latency metrics for AWS Documentation MCP Server."""
+
+import bisect
+import functools
+import threading
+import time
+from awslabs.aws_documentation_mcp_server.models import ToolLatency
+from typing import Any, Awaitable, Callable, Dict, List, TypeVar
+
+
+# Upper bounds of the latency histogram buckets, in milliseconds
+LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000]
+
+F = TypeVar('F', bound=Callable[..., Awaitable[Any]])
+
+
+class LatencyHistogram:
+    """Histogram of the latencies of a tool with fixed buckets."""
+
+    def __init__(self, tool: str):
+        """Initialize the histogram.
+
+        Args:
+            tool: Name of the tool
+        """
+        self.tool = tool
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        # The last bucket counts latencies above the largest bound
+        self.bucket_counts: List[int] = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self._lock = threading.Lock()
+
+    def record(self, latency_ms: float, error: bool = False) -> None:
+        """Record the latency of a call.
+
+        Args:
+            latency_ms: Latency of the call in milliseconds
+            error: True if the call raised an exception
+        """
+        with self._lock:
+            self.count += 1
+            self.errors += int(error)
+            self.total_ms += latency_ms
+            self.max_ms = max(self.max_ms, latency_ms)
+            self.bucket_counts[bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+
+    def percentile(self, percent: float) -> float:
+        """Estimate a latency percentile from the histogram.
+
+        Args:
+            percent: Percentile between 0 and 100
+
+        Returns:
+            Upper bound of the bucket holding the percentile, capped at the maximum latency
+        """
+        with self._lock:
+            if self.count == 0:
+                return 0.0
+            rank = percent / 100 * self.count
+            seen = 0
+            for bound, bucket_count in zip(LATENCY_BUCKETS_MS, self.bucket_counts):
+                seen += bucket_count
+                if seen >= rank:
+                    return min(float(bound), self.max_ms)
+            return self.max_ms
+
+    def snapshot(self) -> ToolLatency:
+        """Get the statistics of the histogram.
+
+        Returns:
+            ToolLatency with the call counts, percentiles and bucket counts
+        """
+        p50, p90, p99 = (self.percentile(p) for p in (50, 90, 99))
+        with self._lock:
+            labels = [f'le_{bound}' for bound in LATENCY_BUCKETS_MS] + ['inf']
+            return ToolLatency(
+                tool=self.tool,
+                count=self.count,
+                errors=self.errors,
+                mean_ms=round(self.total_ms / self.count, 3) if self.count else 0.0,
+                p50_ms=p50,
+                p90_ms=p90,
+                p99_ms=p99,
+                max_ms=round(self.max_ms, 3),
+                buckets=dict(zip(labels, self.bucket_counts)),
+            )
+
+
+_histograms: Dict[str, LatencyHistogram] = {}
+_histograms_lock = threading.Lock()
+
+
+def get_latency_histogram(tool: str) -> LatencyHistogram:
+    """Get the latency histogram of a tool.
+
+    Args:
+        tool: Name of the tool
+
+    Returns:
+        LatencyHistogram of the tool, created on first use
+    """
+    with _histograms_lock:
+        if tool not in _histograms:
+            _histograms[tool] = LatencyHistogram(tool)
+        return _histograms[tool]
+
+
+def get_latency_stats() -> List[ToolLatency]:
+    """Get the latency statistics of all tools that have been called.
+
+    Returns:
+        List of ToolLatency sorted by tool name
+    """
+    with _histograms_lock:
+        histograms = sorted(_histograms.values(), key=lambda h: h.tool)
+    return [histogram.snapshot() for histogram in histograms]
+
+
+def reset_latency_stats() -> None:
+    """Drop the latency histograms of all tools."""
+    with _histograms_lock:
+        _histograms.clear()
+
+
+def timed(tool: str) -> Callable[[F], F]:
+    """Record the latency of every call of an async tool.
+
+    Args:
+        tool: Name of the tool
+
+    Returns:
+        Decorator that records the latency in the histogram of the tool
+    """
+
+    def decorator(func: F) -> F:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            start_time = time.perf_counter()
+            error = True
+            try:
+                result = await func(*args, **kwargs)
+                error = False
+                return result
+            finally:
+                latency_ms = (time.perf_counter() - start_time) * 1000
+                get_latency_histogram(tool).record(latency_ms, error=error)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
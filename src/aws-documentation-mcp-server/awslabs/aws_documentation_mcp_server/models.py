@@ -11,7 +11,7 @@
 """Data models for AWS Documentation MCP Server."""
 
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, List, Optional
 
 
 class SearchResult(BaseModel):
@@ -29,3 +29,38 @@ class RecommendationResult(BaseModel):
     url: str
     title: str
     context: Optional[str] = None
+
+
+class CachedPage(BaseModel):
+    """Documentation page converted to markdown and kept in the page cache."""
+
+    url: str
+    content: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: float
+    boundaries: List[int] = []
+
+
+class ToolLatency(BaseModel):
+    """Latency statistics of a tool, in milliseconds."""
+
+    tool: str
+    count: int
+    errors: int
+    mean_ms: float
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    max_ms: float
+    buckets: Dict[str, int]
+
+
+class BatchReadResult(BaseModel):
+    """Result of reading one page of a documentation batch read."""
+
+    url: str
+    content: Optional[str] = None
+    error: Optional[str] = None
+    cached: bool = False
+    elapsed_ms: float
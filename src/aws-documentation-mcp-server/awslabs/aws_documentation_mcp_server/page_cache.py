@@ -0,0 +1,269 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Cache of converted documentation pages for AWS Documentation MCP Server.
+
+Pages are cached as markdown after conversion, so paginated reads of a long
+page with increasing start_index values download and convert it once. Cached
+pages are served as is while they are fresh and revalidated with their ETag or
+Last-Modified date afterwards.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from awslabs.aws_documentation_mcp_server.models import CachedPage
+from awslabs.aws_documentation_mcp_server.util import get_chunk_boundaries
+from collections import OrderedDict
+from loguru import logger
+from typing import Dict, Optional
+
+
+DEFAULT_CACHE_MAX_PAGES = 50
+DEFAULT_CACHE_TTL_SECONDS = 900.0
+DEFAULT_CACHE_DISK_MAX_PAGES = 1000
+
+
+class PageCache:
+    """LRU cache of converted documentation pages, optionally persisted to disk.
+
+    The in-memory cache holds the most recently read pages. When a cache
+    directory is configured, pages are also written there as JSON files and
+    loaded back on a memory miss, so they survive server restarts.
+    """
+
+    def __init__(
+        self,
+        max_pages: int = DEFAULT_CACHE_MAX_PAGES,
+        ttl_seconds: float = DEFAULT_CACHE_TTL_SECONDS,
+        cache_dir: Optional[str] = None,
+        disk_max_pages: int = DEFAULT_CACHE_DISK_MAX_PAGES,
+    ):
+        """Initialize the page cache.
+
+        Args:
+            max_pages: Maximum number of pages kept in memory
+            ttl_seconds: Time after which a page is revalidated, in seconds
+            cache_dir: Directory to persist pages in, or None to keep them in memory only
+            disk_max_pages: Maximum number of pages kept in the cache directory
+        """
+        self.max_pages = max_pages
+        self.ttl_seconds = ttl_seconds
+        self.cache_dir = cache_dir
+        self.disk_max_pages = disk_max_pages
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._pages: OrderedDict[str, CachedPage] = OrderedDict()
+        self._lock = threading.Lock()
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """Look up a cached page, fresh or not.
+
+        Args:
+            url: URL of the page
+
+        Returns:
+            The cached page, or None if the page is not cached
+        """
+        with self._lock:
+            page = self._pages.get(url)
+            if page is not None:
+                self._pages.move_to_end(url)
+                return page
+
+        page = self._load(url)
+        if page is not None:
+            self._remember(page)
+        return page
+
+    def put(
+        self,
+        url: str,
+        content: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> CachedPage:
+        """Cache a converted page.
+
+        Args:
+            url: URL of the page
+            content: Markdown content of the page
+            etag: ETag header of the response
+            last_modified: Last-Modified header of the response
+
+        Returns:
+            The cached page
+        """
+        page = CachedPage(
+            url=url,
+            content=content,
+            etag=etag,
+            last_modified=last_modified,
+            fetched_at=time.time(),
+            boundaries=get_chunk_boundaries(content),
+        )
+        self._remember(page)
+        self._save(page)
+        return page
+
+    def touch(self, page: CachedPage) -> CachedPage:
+        """Mark a page as fresh again after the server confirmed it is unchanged.
+
+        Args:
+            page: The cached page
+
+        Returns:
+            The revalidated page
+        """
+        page = page.model_copy(update={'fetched_at': time.time()})
+        with self._lock:
+            self.revalidations += 1
+        self._remember(page)
+        self._save(page)
+        return page
+
+    def is_fresh(self, page: CachedPage) -> bool:
+        """Check whether a page can be served without revalidating it.
+
+        Args:
+            page: The cached page
+
+        Returns:
+            True if the page is younger than the time to live
+        """
+        return time.time() - page.fetched_at < self.ttl_seconds
+
+    def record(self, hit: bool) -> None:
+        """Record whether a read was served from the cache.
+
+        Args:
+            hit: True if the read was served without downloading the page
+        """
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def clear(self) -> None:
+        """Drop the pages kept in memory and reset the statistics."""
+        with self._lock:
+            self._pages.clear()
+            self.hits = 0
+            self.misses = 0
+            self.revalidations = 0
+
+    def _remember(self, page: CachedPage) -> None:
+        """Keep a page in memory, evicting the least recently used pages."""
+        with self._lock:
+            self._pages[page.url] = page
+            self._pages.move_to_end(page.url)
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+
+    def _path(self, url: str) -> str:
+        """Get the path of the file a page is persisted in."""
+        digest = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir or '', f'{digest}.json')
+
+    def _load(self, url: str) -> Optional[CachedPage]:
+        """Load a page from the cache directory."""
+        if not self.cache_dir:
+            return None
+        path = self._path(url)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                page = CachedPage.model_validate_json(f.read())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f'Ignoring unreadable cached page {path}: {e}')
+            return None
+        return page if page.url == url else None
+
+    def _save(self, page: CachedPage) -> None:
+        """Persist a page to the cache directory and drop the oldest files over the limit."""
+        if not self.cache_dir:
+            return
+        path = self._path(page.url)
+        temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(page.model_dump_json())
+            os.replace(temp_path, path)
+
+            files = [
+                os.path.join(self.cache_dir, name)
+                for name in os.listdir(self.cache_dir)
+                if name.endswith('.json')
+            ]
+            if len(files) > self.disk_max_pages:
+                files.sort(key=os.path.getmtime)
+                for old_path in files[: len(files) - self.disk_max_pages]:
+                    os.remove(old_path)
+        except OSError as e:
+            logger.warning(f'Cannot persist cached page {page.url}: {e}')
+
+
+def get_revalidation_headers(page: CachedPage) -> Dict[str, str]:
+    """Get the headers of a conditional request that revalidates a cached page.
+
+    Args:
+        page: The cached page
+
+    Returns:
+        If-None-Match and If-Modified-Since headers for the validators of the page
+    """
+    headers = {}
+    if page.etag:
+        headers['If-None-Match'] = page.etag
+    if page.last_modified:
+        headers['If-Modified-Since'] = page.last_modified
+    return headers
+
+
+_page_cache: Optional[PageCache] = None
+_page_cache_lock = threading.Lock()
+
+
+def get_page_cache() -> PageCache:
+    """Get the process-wide page cache.
+
+    The cache can be configured with the AWS_DOCUMENTATION_CACHE_MAX_PAGES,
+    AWS_DOCUMENTATION_CACHE_TTL_SECONDS and AWS_DOCUMENTATION_CACHE_DIR
+    environment variables. Pages are only persisted to disk when
+    AWS_DOCUMENTATION_CACHE_DIR is set.
+
+    Returns:
+        PageCache shared by all tool calls
+    """
+    global _page_cache
+    with _page_cache_lock:
+        if _page_cache is None:
+            max_pages = DEFAULT_CACHE_MAX_PAGES
+            ttl_seconds = DEFAULT_CACHE_TTL_SECONDS
+            try:
+                max_pages = int(os.environ.get('AWS_DOCUMENTATION_CACHE_MAX_PAGES', max_pages))
+                ttl_seconds = float(
+                    os.environ.get('AWS_DOCUMENTATION_CACHE_TTL_SECONDS', ttl_seconds)
+                )
+            except ValueError:
+                logger.warning('Invalid documentation page cache settings, using defaults')
+            _page_cache = PageCache(
+                max_pages=max_pages,
+                ttl_seconds=ttl_seconds,
+                cache_dir=os.environ.get('AWS_DOCUMENTATION_CACHE_DIR') or None,
+            )
+        return _page_cache
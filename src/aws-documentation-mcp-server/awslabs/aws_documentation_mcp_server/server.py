@@ -11,17 +11,31 @@
 """awslabs AWS Documentation MCP Server implementation."""
 
 import argparse
+import asyncio
 import httpx
 import json
 import os
 import re
 import sys
+import time
+from awslabs.aws_documentation_mcp_server.http_client import (
+    get_http_client,
+    get_timeout,
+    http_client_lifespan,
+)
+from awslabs.aws_documentation_mcp_server.metrics import get_latency_stats, timed
 
 # Import models
 from awslabs.aws_documentation_mcp_server.models import (
+    BatchReadResult,
+    CachedPage,
     RecommendationResult,
     SearchResult,
 )
+from awslabs.aws_documentation_mcp_server.page_cache import (
+    get_page_cache,
+    get_revalidation_headers,
+)
 
 # Import utility functions
 from awslabs.aws_documentation_mcp_server.util import (
@@ -33,7 +47,7 @@ from awslabs.aws_documentation_mcp_server.util import (
 from loguru import logger
 from mcp.server.fastmcp import Context, FastMCP
 from pydantic import AnyUrl, Field
-from typing import List, Union
+from typing import List, Tuple, Union
 
 
 # Set up logging
@@ -43,6 +57,8 @@ logger.add(sys.stderr, level=os.getenv('FASTMCP_LOG_LEVEL', 'WARNING'))
 DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36 ModelContextProtocol/1.0 (AWS Documentation Server)'
 SEARCH_API_URL = 'https://proxy.search.docs.aws.amazon.com/search'
 RECOMMENDATIONS_API_URL = 'https://contentrecs-api.docs.aws.amazon.com/v1/recommendations'
+MAX_BATCH_URLS = 20
+DEFAULT_BATCH_MAX_CONCURRENCY = 5
 
 
 mcp = FastMCP(
@@ -66,6 +82,7 @@ mcp = FastMCP(
 
     - Use `search_documentation` when: You need to find documentation about a specific AWS service or feature
     - Use `read_documentation` when: You have a specific documentation URL and need its content
+    - Use `read_documentation_batch` when: You need the content of several documentation URLs, such as the top search results
     - Use `recommend` when: You want to find related content to a documentation page you're already viewing or need to find newly released information
     - Use `recommend` as a fallback when: Multiple searches have not yielded the specific information needed
     """,
@@ -74,10 +91,98 @@ mcp = FastMCP(
         'httpx',
         'beautifulsoup4',
     ],
+    lifespan=http_client_lifespan,
 )
 
 
+class DocumentationFetchError(Exception):
+    """Raised when an AWS documentation page cannot be fetched."""
+
+
+def validate_documentation_url(url_str: str) -> None:
+    """Check that a URL is an AWS documentation page.
+
+    Args:
+        url_str: URL of the page
+
+    Raises:
+        ValueError: If the URL is not from docs.aws.amazon.com or does not end with .html
+    """
+    if not re.match(r'^https?://docs\.aws\.amazon\.com/', url_str):
+        raise ValueError('URL must be from the docs.aws.amazon.com domain')
+    if not url_str.endswith('.html'):
+        raise ValueError('URL must end with .html')
+
+
+async def fetch_documentation_page(url_str: str) -> Tuple[CachedPage, bool]:
+    """Get an AWS documentation page as markdown, from the page cache if possible.
+
+    Fresh cached pages are served as is, stale ones are revalidated and other
+    pages are downloaded with the shared HTTP client and converted to markdown.
+
+    Args:
+        url_str: URL of the page
+
+    Returns:
+        Tuple of the page and whether it was served without downloading it
+
+    Raises:
+        DocumentationFetchError: If the page cannot be downloaded
+    """
+    cache = get_page_cache()
+    page = cache.get(url_str)
+
+    if page is not None and cache.is_fresh(page):
+        # Continuation calls of a paginated read are served from the cached page
+        logger.debug(f'Serving documentation for {url_str} from cache')
+        cache.record(hit=True)
+        return page, True
+
+    logger.debug(f'Fetching documentation from {url_str}')
+    headers = {'User-Agent': DEFAULT_USER_AGENT}
+    if page is not None:
+        headers.update(get_revalidation_headers(page))
+
+    client = get_http_client()
+    try:
+        response = await client.get(
+            url_str,
+            follow_redirects=True,
+            headers=headers,
+            timeout=get_timeout(url_str),
+        )
+    except httpx.HTTPError as e:
+        raise DocumentationFetchError(f'Failed to fetch {url_str}: {str(e)}') from e
+
+    if response.status_code == 304 and page is not None:
+        logger.debug(f'Cached documentation for {url_str} is still current')
+        page = await asyncio.to_thread(cache.touch, page)
+    elif response.status_code >= 400:
+        raise DocumentationFetchError(
+            f'Failed to fetch {url_str} - status code {response.status_code}'
+        )
+    else:
+        page_raw = response.text
+        content_type = response.headers.get('content-type', '')
+        # Converting and chunking a page is CPU bound, so run it off the event loop and let
+        # the pages of a batch be converted concurrently
+        if is_html_content(page_raw, content_type):
+            content = await asyncio.to_thread(extract_content_from_html, page_raw)
+        else:
+            content = page_raw
+        page = await asyncio.to_thread(
+            cache.put,
+            url_str,
+            content,
+            etag=response.headers.get('etag'),
+            last_modified=response.headers.get('last-modified'),
+        )
+    cache.record(hit=False)
+    return page, False
+
+
 @mcp.tool()
+@timed('read_documentation')
 async def read_documentation(
     ctx: Context,
     url: Union[AnyUrl, str] = Field(description='URL of the AWS documentation page to read'),
@@ -122,9 +227,12 @@ async def read_documentation(
 
     If the response indicates the document was truncated, you have several options:
 
-    1. **Continue Reading**: Make another call with start_index set to the end of the previous response
+    1. **Continue Reading**: Make another call with the start_index given at the end of the previous response
     2. **Stop Early**: For very long documents (>30,000 characters), if you've already found the specific information needed, you can stop reading
 
+    Truncated responses end before a heading or paragraph where possible, so code blocks are
+    not split between calls. Pages are cached, so continuation calls do not download the page again.
+
     Args:
         ctx: MCP context for logging and error handling
         url: URL of the AWS documentation page to read
@@ -134,46 +242,25 @@ async def read_documentation(
     Returns:
         Markdown content of the AWS documentation
     """
-    # Validate that URL is from docs.aws.amazon.com and ends with .html
     url_str = str(url)
-    if not re.match(r'^https?://docs\.aws\.amazon\.com/', url_str):
-        await ctx.error(f'Invalid URL: {url_str}. URL must be from the docs.aws.amazon.com domain')
-        raise ValueError('URL must be from the docs.aws.amazon.com domain')
-    if not url_str.endswith('.html'):
-        await ctx.error(f'Invalid URL: {url_str}. URL must end with .html')
-        raise ValueError('URL must end with .html')
-
-    logger.debug(f'Fetching documentation from {url_str}')
-
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(
-                url_str,
-                follow_redirects=True,
-                headers={'User-Agent': DEFAULT_USER_AGENT},
-                timeout=30,
-            )
-        except httpx.HTTPError as e:
-            error_msg = f'Failed to fetch {url_str}: {str(e)}'
-            logger.error(error_msg)
-            await ctx.error(error_msg)
-            return error_msg
-
-        if response.status_code >= 400:
-            error_msg = f'Failed to fetch {url_str} - status code {response.status_code}'
-            logger.error(error_msg)
-            await ctx.error(error_msg)
-            return error_msg
-
-        page_raw = response.text
-        content_type = response.headers.get('content-type', '')
-
-    if is_html_content(page_raw, content_type):
-        content = extract_content_from_html(page_raw)
-    else:
-        content = page_raw
-
-    result = format_documentation_result(url_str, content, start_index, max_length)
+    try:
+        validate_documentation_url(url_str)
+    except ValueError as e:
+        await ctx.error(f'Invalid URL: {url_str}. {e}')
+        raise
+
+    try:
+        page, _ = await fetch_documentation_page(url_str)
+    except DocumentationFetchError as e:
+        error_msg = str(e)
+        logger.error(error_msg)
+        await ctx.error(error_msg)
+        return error_msg
+
+    content = page.content
+    result = format_documentation_result(
+        url_str, content, start_index, max_length, page.boundaries
+    )
 
     # Log if content was truncated
     if len(content) > start_index + max_length:
@@ -185,6 +272,103 @@ async def read_documentation(
 
 
 @mcp.tool()
+@timed('read_documentation_batch')
+async def read_documentation_batch(
+    ctx: Context,
+    urls: List[str] = Field(
+        description='URLs of the AWS documentation pages to read',
+        min_length=1,
+        max_length=MAX_BATCH_URLS,
+    ),
+    max_length: int = Field(
+        default=5000,
+        description='Maximum number of characters to return for each page.',
+        gt=0,
+        lt=1000000,
+    ),
+    start_index: int = Field(
+        default=0,
+        description='On return output of each page starting at this character index.',
+        ge=0,
+    ),
+) -> List[BatchReadResult]:
+    """Fetch and convert several AWS documentation pages to markdown format at once.
+
+    ## Usage
+
+    This tool reads up to 20 AWS documentation pages in one call, for example the top results
+    of `search_documentation`. Pages are downloaded concurrently and share the page cache with
+    `read_documentation`, so a page read here can be continued with `read_documentation` and
+    the start_index given at the end of its content.
+
+    ## URL Requirements
+
+    - Must be from the docs.aws.amazon.com domain
+    - Must end with .html
+
+    ## Result Interpretation
+
+    Each result includes:
+    - url: The documentation page URL
+    - content: Markdown content of the page, truncated like `read_documentation` output
+    - error: Why the page could not be read, if it could not
+    - cached: Whether the page was served from the cache
+    - elapsed_ms: Time taken to read the page in milliseconds
+
+    Args:
+        ctx: MCP context for logging and error handling
+        urls: URLs of the AWS documentation pages to read
+        max_length: Maximum number of characters to return for each page
+        start_index: On return output of each page starting at this character index
+
+    Returns:
+        List of results in the order of the URLs
+    """
+    try:
+        max_concurrency = int(
+            os.environ.get(
+                'AWS_DOCUMENTATION_BATCH_MAX_CONCURRENCY', DEFAULT_BATCH_MAX_CONCURRENCY
+            )
+        )
+    except ValueError:
+        max_concurrency = DEFAULT_BATCH_MAX_CONCURRENCY
+    semaphore = asyncio.Semaphore(max(max_concurrency, 1))
+
+    async def read(url_str: str) -> BatchReadResult:
+        start_time = time.perf_counter()
+        async with semaphore:
+            try:
+                validate_documentation_url(url_str)
+                page, cached = await fetch_documentation_page(url_str)
+            except (ValueError, DocumentationFetchError) as e:
+                logger.error(f'Failed to read {url_str}: {e}')
+                return BatchReadResult(
+                    url=url_str,
+                    error=str(e),
+                    elapsed_ms=(time.perf_counter() - start_time) * 1000,
+                )
+        return BatchReadResult(
+            url=url_str,
+            content=format_documentation_result(
+                url_str, page.content, start_index, max_length, page.boundaries
+            ),
+            cached=cached,
+            elapsed_ms=(time.perf_counter() - start_time) * 1000,
+        )
+
+    # Pages listed more than once are only read once
+    unique_urls = list(dict.fromkeys(urls))
+    logger.debug(f'Reading {len(unique_urls)} documentation pages')
+    results = dict(zip(unique_urls, await asyncio.gather(*(read(u) for u in unique_urls))))
+
+    errors = [result for result in results.values() if result.error]
+    if errors:
+        await ctx.error(f'Failed to read {len(errors)} of {len(unique_urls)} pages')
+    return [results[url_str] for url_str in urls]
+
+
+@mcp.tool()
+@timed('search_documentation')
 async def search_documentation(
     ctx: Context,
     search_phrase: str = Field(description='Search phrase to use'),
@@ -236,47 +420,47 @@ async def search_documentation(
         'locales': ['en_us'],
     }
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(
-                SEARCH_API_URL,
-                json=request_body,
-                headers={'Content-Type': 'application/json', 'User-Agent': DEFAULT_USER_AGENT},
-                timeout=30,
+    client = get_http_client()
+    try:
+        response = await client.post(
+            SEARCH_API_URL,
+            json=request_body,
+            headers={'Content-Type': 'application/json', 'User-Agent': DEFAULT_USER_AGENT},
+            timeout=get_timeout(SEARCH_API_URL),
+        )
+    except httpx.HTTPError as e:
+        error_msg = f'Error searching AWS docs: {str(e)}'
+        logger.error(error_msg)
+        await ctx.error(error_msg)
+        return [SearchResult(rank_order=1, url='', title=error_msg, context=None)]
+
+    if response.status_code >= 400:
+        error_msg = f'Error searching AWS docs - status code {response.status_code}'
+        logger.error(error_msg)
+        await ctx.error(error_msg)
+        return [
+            SearchResult(
+                rank_order=1,
+                url='',
+                title=error_msg,
+                context=None,
             )
-        except httpx.HTTPError as e:
-            error_msg = f'Error searching AWS docs: {str(e)}'
-            logger.error(error_msg)
-            await ctx.error(error_msg)
-            return [SearchResult(rank_order=1, url='', title=error_msg, context=None)]
-
-        if response.status_code >= 400:
-            error_msg = f'Error searching AWS docs - status code {response.status_code}'
-            logger.error(error_msg)
-            await ctx.error(error_msg)
-            return [
-                SearchResult(
-                    rank_order=1,
-                    url='',
-                    title=error_msg,
-                    context=None,
-                )
-            ]
-
-        try:
-            data = response.json()
-        except json.JSONDecodeError as e:
-            error_msg = f'Error parsing search results: {str(e)}'
-            logger.error(error_msg)
-            await ctx.error(error_msg)
-            return [
-                SearchResult(
-                    rank_order=1,
-                    url='',
-                    title=error_msg,
-                    context=None,
-                )
-            ]
+        ]
+
+    try:
+        data = response.json()
+    except json.JSONDecodeError as e:
+        error_msg = f'Error parsing search results: {str(e)}'
+        logger.error(error_msg)
+        await ctx.error(error_msg)
+        return [
+            SearchResult(
+                rank_order=1,
+                url='',
+                title=error_msg,
+                context=None,
+            )
+        ]
 
     results = []
     if 'suggestions' in data:
@@ -305,6 +489,7 @@ async def search_documentation(
 
 
 @mcp.tool()
+@timed('recommend')
 async def recommend(
     ctx: Context,
     url: Union[AnyUrl, str] = Field(
@@ -361,44 +546,55 @@ async def recommend(
 
     recommendation_url = f'{RECOMMENDATIONS_API_URL}?path={url_str}'
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(
-                recommendation_url,
-                headers={'User-Agent': DEFAULT_USER_AGENT},
-                timeout=30,
+    client = get_http_client()
+    try:
+        response = await client.get(
+            recommendation_url,
+            headers={'User-Agent': DEFAULT_USER_AGENT},
+            timeout=get_timeout(RECOMMENDATIONS_API_URL),
+        )
+    except httpx.HTTPError as e:
+        error_msg = f'Error getting recommendations: {str(e)}'
+        logger.error(error_msg)
+        await ctx.error(error_msg)
+        return [RecommendationResult(url='', title=error_msg, context=None)]
+
+    if response.status_code >= 400:
+        error_msg = f'Error getting recommendations - status code {response.status_code}'
+        logger.error(error_msg)
+        await ctx.error(error_msg)
+        return [
+            RecommendationResult(
+                url='',
+                title=error_msg,
+                context=None,
             )
-        except httpx.HTTPError as e:
-            error_msg = f'Error getting recommendations: {str(e)}'
-            logger.error(error_msg)
-            await ctx.error(error_msg)
-            return [RecommendationResult(url='', title=error_msg, context=None)]
-
-        if response.status_code >= 400:
-            error_msg = f'Error getting recommendations - status code {response.status_code}'
-            logger.error(error_msg)
-            await ctx.error(error_msg)
-            return [
-                RecommendationResult(
-                    url='',
-                    title=error_msg,
-                    context=None,
-                )
-            ]
+        ]
 
-        try:
-            data = response.json()
-        except json.JSONDecodeError as e:
-            error_msg = f'Error parsing recommendations: {str(e)}'
-            logger.error(error_msg)
-            await ctx.error(error_msg)
-            return [RecommendationResult(url='', title=error_msg, context=None)]
+    try:
+        data = response.json()
+    except json.JSONDecodeError as e:
+        error_msg = f'Error parsing recommendations: {str(e)}'
+        logger.error(error_msg)
+        await ctx.error(error_msg)
+        return [RecommendationResult(url='', title=error_msg, context=None)]
 
     results = parse_recommendation_results(data)
     logger.debug(f'Found {len(results)} recommendations for: {url_str}')
     return results
 
 
+@mcp.resource('metrics://latency', mime_type='application/json')
+async def latency_metrics() -> str:
+    """Latency histograms of the tools of the server.
+
+    Returns:
+        JSON list with the call count, latency percentiles in milliseconds and
+        histogram bucket counts of each tool
+    """
+    return json.dumps([stats.model_dump() for stats in get_latency_stats()])
+
+
 def main():
     """Run the MCP server with CLI argument support."""
     parser = argparse.ArgumentParser(
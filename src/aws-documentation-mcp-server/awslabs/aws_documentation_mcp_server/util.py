@@ -10,14 +10,150 @@
 # and limitations under the License.
 """Utility functions for AWS Documentation MCP Server."""
 
+import bisect
 import markdownify
+import re
 from awslabs.aws_documentation_mcp_server.models import RecommendationResult
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional
+
+
+# Common content container selectors for AWS documentation, in order of preference
+CONTENT_SELECTORS = [
+    'main',
+    'article',
+    '#main-content',
+    '.main-content',
+    '#content',
+    '.content',
+    "div[role='main']",
+    '#awsdocs-content',
+    '.awsui-article',
+]
+
+# Navigation elements that might be in the main content
+NAV_SELECTORS = [
+    'noscript',
+    '.prev-next',
+    '#main-col-footer',
+    '.awsdocs-page-utilities',
+    '#quick-feedback-yes',
+    '#quick-feedback-no',
+    '.page-loading-indicator',
+    '#tools-panel',
+    '.doc-cookie-banner',
+    'awsdocs-copyright',
+    'awsdocs-thumb-feedback',
+]
+
+# Tags to strip - these are elements we don't want in the output
+TAGS_TO_STRIP = [
+    'script',
+    'style',
+    'noscript',
+    'meta',
+    'link',
+    'footer',
+    'nav',
+    'aside',
+    'header',
+    # AWS documentation specific elements
+    'awsdocs-cookie-consent-container',
+    'awsdocs-feedback-container',
+    'awsdocs-page-header',
+    'awsdocs-page-header-container',
+    'awsdocs-filter-selector',
+    'awsdocs-breadcrumb-container',
+    'awsdocs-page-footer',
+    'awsdocs-page-footer-container',
+    'awsdocs-footer',
+    'awsdocs-cookie-banner',
+    # Common unnecessary elements
+    'js-show-more-buttons',
+    'js-show-more-text',
+    'feedback-container',
+    'feedback-section',
+    'doc-feedback-container',
+    'doc-feedback-section',
+    'warning-container',
+    'warning-section',
+    'cookie-banner',
+    'cookie-notice',
+    'copyright-section',
+    'legal-section',
+    'terms-section',
+]
+
+
+def compile_selector(selector: str) -> Callable[[Any], bool]:
+    """Compile a simple CSS selector into a predicate on BeautifulSoup tags.
+
+    Only the selector forms used for AWS documentation pages are supported:
+    tag, #id, .class and tag[attribute='value']. Matching them in Python is
+    much cheaper than running the full CSS selector engine over the page.
+
+    Args:
+        selector: CSS selector
+
+    Returns:
+        Function that checks whether a tag matches the selector
+    """
+    if selector.startswith('#'):
+        element_id = selector[1:]
+        return lambda tag: tag.get('id') == element_id
+    if selector.startswith('.'):
+        class_name = selector[1:]
+        return lambda tag: class_name in tag.get_attribute_list('class')
+    match = re.fullmatch(r"([\w-]+)\[([\w-]+)='([^']*)'\]", selector)
+    if match:
+        name, attribute, value = match.groups()
+        return lambda tag: tag.name == name and tag.get(attribute) == value
+    return lambda tag: tag.name == selector
+
+
+CONTENT_MATCHERS = [compile_selector(selector) for selector in CONTENT_SELECTORS]
+NAV_MATCHERS = [compile_selector(selector) for selector in NAV_SELECTORS]
+
+MARKDOWN_CONVERTER = markdownify.MarkdownConverter(
+    heading_style=markdownify.ATX,
+    autolinks=True,
+    default_title=True,
+    escape_asterisks=True,
+    escape_underscores=True,
+    newline_style='SPACES',
+    strip=TAGS_TO_STRIP,
+)
+
+
+def find_main_content(soup: Any) -> Any:
+    """Find the main content area of a parsed page in one pass over its tags.
+
+    Args:
+        soup: Parsed page
+
+    Returns:
+        First tag matching the most preferred content selector, else the body or the page
+    """
+    best_rank = len(CONTENT_MATCHERS)
+    main_content = None
+    for tag in soup.find_all(True):
+        for rank in range(best_rank):
+            if CONTENT_MATCHERS[rank](tag):
+                best_rank = rank
+                main_content = tag
+                break
+        if best_rank == 0:
+            break
+    if main_content is None:
+        main_content = soup.body if soup.body else soup
+    return main_content
 
 
 def extract_content_from_html(html: str) -> str:
     """Extract and convert HTML content to Markdown format.
 
+    The page is parsed once: the main content is found and pruned in place and
+    the pruned tree is converted to markdown directly.
+
     Args:
         html: Raw HTML content to process
 
@@ -34,101 +170,25 @@ def extract_content_from_html(html: str) -> str:
         # Parse HTML with BeautifulSoup
         soup = BeautifulSoup(html, 'html.parser')
 
-        # Try to find the main content area
-        main_content = None
-
-        # Common content container selectors for AWS documentation
-        content_selectors = [
-            'main',
-            'article',
-            '#main-content',
-            '.main-content',
-            '#content',
-            '.content',
-            "div[role='main']",
-            '#awsdocs-content',
-            '.awsui-article',
-        ]
-
-        # Try to find the main content using common selectors
-        for selector in content_selectors:
-            content = soup.select_one(selector)
-            if content:
-                main_content = content
-                break
-
-        # If no main content found, use the body
-        if not main_content:
-            main_content = soup.body if soup.body else soup
+        # Try to find the main content area, or use the body
+        main_content = find_main_content(soup)
 
         # Remove navigation elements that might be in the main content
-        nav_selectors = [
-            'noscript',
-            '.prev-next',
-            '#main-col-footer',
-            '.awsdocs-page-utilities',
-            '#quick-feedback-yes',
-            '#quick-feedback-no',
-            '.page-loading-indicator',
-            '#tools-panel',
-            '.doc-cookie-banner',
-            'awsdocs-copyright',
-            'awsdocs-thumb-feedback',
+        navigation = [
+            tag
+            for tag in main_content.find_all(True)
+            if any(matcher(tag) for matcher in NAV_MATCHERS)
         ]
-
-        for selector in nav_selectors:
-            for element in main_content.select(selector):
+        for element in navigation:
+            if not element.decomposed:
                 element.decompose()
 
-        # Define tags to strip - these are elements we don't want in the output
-        tags_to_strip = [
-            'script',
-            'style',
-            'noscript',
-            'meta',
-            'link',
-            'footer',
-            'nav',
-            'aside',
-            'header',
-            # AWS documentation specific elements
-            'awsdocs-cookie-consent-container',
-            'awsdocs-feedback-container',
-            'awsdocs-page-header',
-            'awsdocs-page-header-container',
-            'awsdocs-filter-selector',
-            'awsdocs-breadcrumb-container',
-            'awsdocs-page-footer',
-            'awsdocs-page-footer-container',
-            'awsdocs-footer',
-            'awsdocs-cookie-banner',
-            # Common unnecessary elements
-            'js-show-more-buttons',
-            'js-show-more-text',
-            'feedback-container',
-            'feedback-section',
-            'doc-feedback-container',
-            'doc-feedback-section',
-            'warning-container',
-            'warning-section',
-            'cookie-banner',
-            'cookie-notice',
-            'copyright-section',
-            'legal-section',
-            'terms-section',
-        ]
-
-        # Use markdownify on the cleaned HTML content
-        content = markdownify.markdownify(
-            str(main_content),
-            heading_style=markdownify.ATX,
-            autolinks=True,
-            default_title=True,
-            escape_asterisks=True,
-            escape_underscores=True,
-            newline_style='SPACES',
-            strip=tags_to_strip,
-        )
+        # Leave only the main content in the document and convert it without serializing it
+        if main_content is not soup:
+            main_content.extract()
+            soup.clear()
+            soup.append(main_content)
+        content = MARKDOWN_CONVERTER.convert_soup(soup)
 
         if not content:
             return '<e>Page failed to be simplified from HTML</e>'
@@ -151,7 +211,75 @@ def is_html_content(page_raw: str, content_type: str) -> bool:
     return '<html' in page_raw[:100] or 'text/html' in content_type or not content_type
 
 
-def format_documentation_result(url: str, content: str, start_index: int, max_length: int) -> str:
+def get_chunk_boundaries(content: str) -> List[int]:
+    """Find the offsets at which markdown content can be split into chunks.
+
+    Chunks may start at a heading or at a paragraph that follows a blank line,
+    but never inside a fenced code block.
+
+    Args:
+        content: Markdown content
+
+    Returns:
+        Sorted character offsets of the lines chunks may start at
+    """
+    boundaries = []
+    in_code_block = False
+    previous_blank = False
+    offset = 0
+    for line in content.splitlines(keepends=True):
+        stripped = line.strip()
+        if not in_code_block and stripped and (stripped.startswith('#') or previous_blank):
+            boundaries.append(offset)
+        # Fences may follow the colon of a definition list item
+        if stripped.lstrip(':').lstrip().startswith('```'):
+            in_code_block = not in_code_block
+        previous_blank = not stripped
+        offset += len(line)
+    return boundaries
+
+
+def find_chunk_end(content: str, start_index: int, max_length: int, boundaries: List[int]) -> int:
+    """Find where a chunk of markdown content should end.
+
+    The chunk ends before the last heading that fits in its second half, and
+    otherwise before the last paragraph that does. Only when no boundary falls
+    in the second half is the content cut at max_length, so that a long code
+    block after a short paragraph does not produce a tiny chunk.
+
+    Args:
+        content: Markdown content
+        start_index: Start index of the chunk
+        max_length: Maximum chunk length
+        boundaries: Chunk boundaries from get_chunk_boundaries
+
+    Returns:
+        End index of the chunk
+    """
+    limit = min(start_index + max_length, len(content))
+    if limit == len(content):
+        return limit
+
+    # Only boundaries in the second half of the chunk are considered
+    first = bisect.bisect_left(boundaries, start_index + max(max_length // 2, 1))
+    last = bisect.bisect_right(boundaries, limit)
+    candidates = boundaries[first:last]
+    if not candidates:
+        return limit
+
+    for boundary in reversed(candidates):
+        if content[boundary] == '#':
+            return boundary
+    return candidates[-1]
+
+
+def format_documentation_result(
+    url: str,
+    content: str,
+    start_index: int,
+    max_length: int,
+    boundaries: Optional[List[int]] = None,
+) -> str:
     """Format documentation result with pagination information.
 
     Args:
@@ -159,6 +287,8 @@ def format_documentation_result(url: str, content: str, start_index: int, max_le
         content: Content to format
         start_index: Start index for pagination
         max_length: Maximum content length
+        boundaries: Optional chunk boundaries from get_chunk_boundaries, to end the result
+            at a heading or paragraph instead of after exactly max_length characters
 
     Returns:
         Formatted documentation result
@@ -169,7 +299,10 @@ def format_documentation_result(url: str, content: str, start_index: int, max_le
         return f'AWS Documentation from {url}:\n\n<e>No more content available.</e>'
 
     # Calculate the end index, ensuring we don't go beyond the content length
-    end_index = min(start_index + max_length, original_length)
+    if boundaries:
+        end_index = find_chunk_end(content, start_index, max_length, boundaries)
+    else:
+        end_index = min(start_index + max_length, original_length)
     truncated_content = content[start_index:end_index]
 
     if not truncated_content:
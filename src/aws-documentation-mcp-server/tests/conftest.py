@@ -11,6 +11,9 @@
 """Configuration for pytest."""
 
 import pytest
+from awslabs.aws_documentation_mcp_server import http_client
+from awslabs.aws_documentation_mcp_server.metrics import reset_latency_stats
+from awslabs.aws_documentation_mcp_server.page_cache import get_page_cache
 
 
 def pytest_addoption(parser):
@@ -21,17 +24,51 @@ def pytest_addoption(parser):
         default=False,
         help='Run tests that make live API calls',
     )
+    parser.addoption(
+        '--run-benchmark',
+        action='store_true',
+        default=False,
+        help='Run benchmarks',
+    )
 
 
 def pytest_configure(config):
     """Configure pytest."""
     config.addinivalue_line('markers', 'live: mark test as making live API calls')
+    config.addinivalue_line('markers', 'benchmark: mark test as a benchmark')
 
 
 def pytest_collection_modifyitems(config, items):
-    """Skip live tests unless --run-live is specified."""
+    """Skip live tests and benchmarks unless --run-live or --run-benchmark is specified."""
     if not config.getoption('--run-live'):
         skip_live = pytest.mark.skip(reason='need --run-live option to run')
         for item in items:
             if 'live' in item.keywords:
                 item.add_marker(skip_live)
+    if not config.getoption('--run-benchmark'):
+        skip_benchmark = pytest.mark.skip(reason='need --run-benchmark option to run')
+        for item in items:
+            if 'benchmark' in item.keywords:
+                item.add_marker(skip_benchmark)
+
+
+@pytest.fixture(autouse=True)
+def clear_page_cache():
+    """Start every test with an empty documentation page cache."""
+    get_page_cache().clear()
+    yield
+    get_page_cache().clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_http_client():
+    """Give every test its own shared HTTP client and empty latency histograms.
+
+    Each test runs in a new event loop, so the client of a previous test cannot be reused.
+    """
+    http_client._client = None
+    http_client._client_users = 0
+    reset_latency_stats()
+    yield
+    http_client._client = None
+    reset_latency_stats()
@@ -0,0 +1,128 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Golden output tests and benchmark of the HTML to markdown conversion."""
+
+import glob
+import markdownify
+import os
+import pytest
+import time
+from awslabs.aws_documentation_mcp_server.util import (
+    CONTENT_SELECTORS,
+    NAV_SELECTORS,
+    TAGS_TO_STRIP,
+    compile_selector,
+    extract_content_from_html,
+)
+from bs4 import BeautifulSoup
+
+
+RESOURCES_DIR = os.path.join(os.path.dirname(__file__), 'resources')
+PAGES = sorted(glob.glob(os.path.join(RESOURCES_DIR, '*_raw.html')))
+
+
+def read(path):
+    """Read a test resource."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def extract_content_reparsing(html):
+    """Convert HTML the way the server did before, selecting with CSS and parsing twice."""
+    soup = BeautifulSoup(html, 'html.parser')
+    main_content = None
+    for selector in CONTENT_SELECTORS:
+        main_content = soup.select_one(selector)
+        if main_content:
+            break
+    if not main_content:
+        main_content = soup.body if soup.body else soup
+    for selector in NAV_SELECTORS:
+        for element in main_content.select(selector):
+            element.decompose()
+    return markdownify.markdownify(
+        str(main_content),
+        heading_style=markdownify.ATX,
+        autolinks=True,
+        default_title=True,
+        escape_asterisks=True,
+        escape_underscores=True,
+        newline_style='SPACES',
+        strip=TAGS_TO_STRIP,
+    )
+
+
+def pages_per_second(convert, pages, seconds=2.0):
+    """Measure how many pages a conversion function converts per second."""
+    converted = 0
+    start_time = time.perf_counter()
+    while time.perf_counter() - start_time < seconds:
+        for page in pages:
+            convert(page)
+        converted += len(pages)
+    return converted / (time.perf_counter() - start_time)
+
+
+class TestGoldenOutput:
+    """Tests that saved AWS documentation pages convert to their golden markdown."""
+
+    @pytest.mark.parametrize('page', PAGES, ids=os.path.basename)
+    def test_golden_output(self, page):
+        """Test that a saved page converts to exactly its golden markdown."""
+        golden = read(page.replace('_raw.html', '_golden.md'))
+
+        assert extract_content_from_html(read(page)) == golden
+
+    @pytest.mark.parametrize('page', PAGES, ids=os.path.basename)
+    def test_matches_reparsing_conversion(self, page):
+        """Test that the single-pass conversion matches selecting with CSS and parsing twice."""
+        html = read(page)
+
+        assert extract_content_from_html(html) == extract_content_reparsing(html)
+
+
+class TestSelectors:
+    """Tests for the compiled content and navigation selectors."""
+
+    def test_compiled_selectors_match_css(self):
+        """Test that compiled selectors match the same elements as the CSS engine."""
+        for page in PAGES:
+            soup = BeautifulSoup(read(page), 'html.parser')
+            for selector in CONTENT_SELECTORS + NAV_SELECTORS:
+                matcher = compile_selector(selector)
+                matches = [tag for tag in soup.find_all(True) if matcher(tag)]
+                assert matches == soup.select(selector)
+
+    def test_preferred_content_selector_wins(self):
+        """Test that the most preferred content container is used wherever it appears."""
+        html = (
+            '<html><body><div role="main"><p>Role main</p></div>'
+            '<div class="content"><p>Content</p></div>'
+            '<article><p>Article</p><div class="prev-next"><p>Next</p></div></article>'
+            '</body></html>'
+        )
+
+        assert extract_content_from_html(html) == 'Article'
+
+
+class TestConversionBenchmark:
+    """Throughput benchmark of the HTML to markdown conversion."""
+
+    @pytest.mark.benchmark
+    def test_conversion_throughput(self):
+        """Compare the pages/sec of the single-pass and the reparsing conversion."""
+        pages = [read(page) for page in PAGES]
+
+        single_pass = pages_per_second(extract_content_from_html, pages)
+        reparsing = pages_per_second(extract_content_reparsing, pages)
+
+        print(f'\nsingle pass: {single_pass:.1f} pages/sec, reparsing: {reparsing:.1f} pages/sec')
+        assert single_pass > reparsing
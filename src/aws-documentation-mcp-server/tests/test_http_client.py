@@ -0,0 +1,136 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Tests for the shared HTTP client and tool latency metrics."""
+
+import json
+import pytest
+from awslabs.aws_documentation_mcp_server.http_client import (
+    get_http_client,
+    get_timeout,
+    http_client_lifespan,
+)
+from awslabs.aws_documentation_mcp_server.metrics import LatencyHistogram, get_latency_stats
+from awslabs.aws_documentation_mcp_server.server import (
+    latency_metrics,
+    read_documentation,
+    recommend,
+    search_documentation,
+)
+from unittest.mock import AsyncMock, MagicMock, patch
+
+
+class MockContext:
+    """Mock context for testing."""
+
+    async def error(self, message):
+        """Mock error method."""
+        print(f'Error: {message}')
+
+
+def make_response(text='', json_data=None):
+    """Create a mock HTTP response."""
+    response = MagicMock()
+    response.status_code = 200
+    response.text = text
+    response.headers = {'content-type': 'text/html'}
+    response.json.return_value = json_data or {}
+    return response
+
+
+class TestSharedClient:
+    """Tests for the process-lifetime HTTP client."""
+
+    @pytest.mark.asyncio
+    async def test_tools_share_one_client(self):
+        """Test that all tools send their requests through the same client."""
+        clients = []
+
+        async def record_client(self, *args, **kwargs):
+            clients.append(self)
+            return make_response(text='<html><body><h1>Title</h1></body></html>')
+
+        with (
+            patch('httpx.AsyncClient.get', new=record_client),
+            patch('httpx.AsyncClient.post', new=record_client),
+        ):
+            await read_documentation(
+                MockContext(),
+                url='https://docs.aws.amazon.com/test.html',
+                max_length=5000,
+                start_index=0,
+            )
+            await search_documentation(MockContext(), search_phrase='lambda', limit=10)
+            await recommend(MockContext(), url='https://docs.aws.amazon.com/test.html')
+
+        assert len(clients) == 3
+        assert clients[0] is clients[1] is clients[2] is get_http_client()
+
+    @pytest.mark.asyncio
+    async def test_lifespan_closes_client_after_last_session(self):
+        """Test that the client is closed when the last server session ends."""
+        async with http_client_lifespan(None):
+            client = get_http_client()
+            async with http_client_lifespan(None):
+                assert get_http_client() is client
+            assert not client.is_closed
+
+        assert client.is_closed
+        assert get_http_client() is not client
+
+    def test_per_host_timeouts(self, monkeypatch):
+        """Test that timeouts can be overridden for each host."""
+        monkeypatch.setenv(
+            'AWS_DOCUMENTATION_HTTP_TIMEOUTS', 'proxy.search.docs.aws.amazon.com=5,invalid'
+        )
+
+        assert get_timeout('https://proxy.search.docs.aws.amazon.com/search').read == 5
+        assert get_timeout('https://proxy.search.docs.aws.amazon.com/search').connect == 5
+        assert get_timeout('https://docs.aws.amazon.com/test.html').read == 30
+        assert get_timeout('https://docs.aws.amazon.com/test.html').connect == 10
+
+
+class TestLatencyMetrics:
+    """Tests for the tool latency histograms."""
+
+    def test_histogram_percentiles(self):
+        """Test that percentiles are estimated from the histogram buckets."""
+        histogram = LatencyHistogram('tool')
+        for latency_ms in [3, 4, 20, 20, 20, 80, 80, 80, 80, 700]:
+            histogram.record(latency_ms)
+        histogram.record(40000, error=True)
+
+        stats = histogram.snapshot()
+        assert (stats.count, stats.errors, stats.max_ms) == (11, 1, 40000)
+        assert (stats.p50_ms, stats.p90_ms, stats.p99_ms) == (100, 1000, 40000)
+        assert stats.buckets['le_5'] == 2
+        assert stats.buckets['inf'] == 1
+
+    @pytest.mark.asyncio
+    async def test_tool_calls_are_timed(self):
+        """Test that tool calls and failures are recorded in the latency resource."""
+        with patch('httpx.AsyncClient.post', new_callable=AsyncMock) as mock_post:
+            mock_post.return_value = make_response(json_data={'suggestions': []})
+            await search_documentation(MockContext(), search_phrase='lambda', limit=10)
+            await search_documentation(MockContext(), search_phrase='s3', limit=10)
+        with pytest.raises(ValueError):
+            await read_documentation(
+                MockContext(), url='https://example.com/test.html', max_length=10, start_index=0
+            )
+
+        stats = {s.tool: s for s in get_latency_stats()}
+        assert (stats['search_documentation'].count, stats['search_documentation'].errors) == (
+            2,
+            0,
+        )
+        assert (stats['read_documentation'].count, stats['read_documentation'].errors) == (1, 1)
+
+        resource = json.loads(await latency_metrics())
+        assert [s['tool'] for s in resource] == ['read_documentation', 'search_documentation']
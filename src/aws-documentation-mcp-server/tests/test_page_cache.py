@@ -0,0 +1,209 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Tests for the documentation page cache and chunk boundaries."""
+
+import os
+import pytest
+import re
+from awslabs.aws_documentation_mcp_server.page_cache import (
+    PageCache,
+    get_page_cache,
+    get_revalidation_headers,
+)
+from awslabs.aws_documentation_mcp_server.server import read_documentation
+from awslabs.aws_documentation_mcp_server.util import (
+    extract_content_from_html,
+    format_documentation_result,
+    get_chunk_boundaries,
+)
+from unittest.mock import AsyncMock, MagicMock, patch
+
+
+MARKDOWN = """# Title
+
+Intro paragraph.
+
+## Example
+
+```
+line one
+
+# not a heading
+```
+
+Closing paragraph.
+"""
+
+URL = 'https://docs.aws.amazon.com/lambda/latest/dg/with-sns.html'
+
+
+class MockContext:
+    """Mock context for testing."""
+
+    async def error(self, message):
+        """Mock error method."""
+        print(f'Error: {message}')
+
+
+def make_response(status_code=200, text='', headers=None):
+    """Create a mock HTTP response."""
+    response = MagicMock()
+    response.status_code = status_code
+    response.text = text
+    response.headers = {'content-type': 'text/html', **(headers or {})}
+    return response
+
+
+def is_inside_code_block(content, index):
+    """Check whether an index of markdown content is inside a fenced code block."""
+    return content[:index].count('```') % 2 == 1
+
+
+class TestChunkBoundaries:
+    """Tests for heading-aware chunk boundaries."""
+
+    def test_boundaries_skip_code_blocks(self):
+        """Test that headings and paragraphs inside code blocks are not boundaries."""
+        boundaries = get_chunk_boundaries(MARKDOWN)
+
+        starts = [MARKDOWN[b:].split('\n', 1)[0] for b in boundaries]
+        assert starts == ['# Title', 'Intro paragraph.', '## Example', '```', 'Closing paragraph.']
+
+    def test_chunks_end_before_headings(self):
+        """Test that a chunk ends before the last heading in its second half."""
+        boundaries = get_chunk_boundaries(MARKDOWN)
+        example_index = MARKDOWN.index('## Example')
+
+        result = format_documentation_result(URL, MARKDOWN, 0, example_index + 10, boundaries)
+
+        assert result.endswith(f'start_index={example_index} to get more content.</e>')
+
+    def test_short_paragraph_before_long_code_block(self):
+        """Test that a paragraph boundary in the first half does not end a chunk."""
+        content = '# Title\n\nShort intro.\n\n```\n' + 'x = 1\n' * 2000 + '```\n'
+        boundaries = get_chunk_boundaries(content)
+
+        result = format_documentation_result(URL, content, 0, 5000, boundaries)
+
+        assert result.endswith('start_index=5000 to get more content.</e>')
+
+    def test_chunks_never_split_code_blocks(self):
+        """Test that no chunk of a real page ends inside a code block."""
+        with open(
+            os.path.join(os.path.dirname(__file__), 'resources', 'lambda_sns_raw.html')
+        ) as f:
+            content = extract_content_from_html(f.read())
+        boundaries = get_chunk_boundaries(content)
+
+        start_index = 0
+        chunks = []
+        while start_index < len(content):
+            result = format_documentation_result(URL, content, start_index, 1500, boundaries)
+            match = re.search(r'start_index=(\d+)', result)
+            end_index = int(match.group(1)) if match else len(content)
+            assert not is_inside_code_block(content, end_index)
+            chunks.append(content[start_index:end_index])
+            start_index = end_index
+
+        assert len(chunks) > 1
+        assert ''.join(chunks) == content
+
+
+class TestPageCache:
+    """Tests for the PageCache class."""
+
+    def test_lru_eviction(self):
+        """Test that the least recently used page is evicted."""
+        cache = PageCache(max_pages=2)
+        cache.put('a', 'A')
+        cache.put('b', 'B')
+        cache.get('a')
+        cache.put('c', 'C')
+
+        assert cache.get('b') is None
+        assert cache.get('a').content == 'A'
+        assert cache.get('c').content == 'C'
+
+    def test_disk_persistence(self, tmp_path):
+        """Test that pages survive in the cache directory, bounded by the disk limit."""
+        cache = PageCache(cache_dir=str(tmp_path), disk_max_pages=2)
+        cache.put('a', MARKDOWN, etag='"a"')
+        cache.put('b', 'B')
+        cache.put('c', 'C')
+
+        reloaded = PageCache(cache_dir=str(tmp_path))
+        assert len(os.listdir(tmp_path)) == 2
+        assert reloaded.get('c').content == 'C'
+        assert reloaded.get('b').content == 'B'
+        assert reloaded.get('a') is None
+
+    def test_revalidation_headers(self):
+        """Test that conditional request headers use the validators of a page."""
+        cache = PageCache()
+        page = cache.put('a', 'A', etag='"abc"', last_modified='Wed, 21 Oct 2015 07:28:00 GMT')
+
+        assert get_revalidation_headers(page) == {
+            'If-None-Match': '"abc"',
+            'If-Modified-Since': 'Wed, 21 Oct 2015 07:28:00 GMT',
+        }
+        assert get_revalidation_headers(cache.put('b', 'B')) == {}
+
+
+class TestReadDocumentationCache:
+    """Tests for reading documentation through the page cache."""
+
+    @pytest.mark.asyncio
+    async def test_continuation_reads_are_served_from_cache(self):
+        """Test that paginated reads download and convert a page once."""
+        html = '<html><body><h1>Title</h1>' + '<p>Paragraph.</p>' * 200 + '</body></html>'
+        with (
+            patch('httpx.AsyncClient.get', new_callable=AsyncMock) as mock_get,
+            patch(
+                'awslabs.aws_documentation_mcp_server.server.extract_content_from_html',
+                wraps=extract_content_from_html,
+            ) as mock_extract,
+        ):
+            mock_get.return_value = make_response(text=html)
+
+            first = await read_documentation(MockContext(), url=URL, max_length=500, start_index=0)
+            next_start = int(re.search(r'start_index=(\d+)', first).group(1))
+            second = await read_documentation(
+                MockContext(), url=URL, max_length=500, start_index=next_start
+            )
+
+        assert 'Paragraph.' in second
+        mock_get.assert_called_once()
+        mock_extract.assert_called_once()
+        assert (get_page_cache().hits, get_page_cache().misses) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_stale_pages_are_revalidated(self):
+        """Test that a stale page is revalidated and reused when not modified."""
+        get_page_cache().ttl_seconds = 0
+        try:
+            with patch('httpx.AsyncClient.get', new_callable=AsyncMock) as mock_get:
+                mock_get.return_value = make_response(
+                    text='<html><body><h1>Title</h1></body></html>', headers={'etag': '"v1"'}
+                )
+                first = await read_documentation(
+                    MockContext(), url=URL, max_length=5000, start_index=0
+                )
+
+                mock_get.return_value = make_response(status_code=304)
+                second = await read_documentation(
+                    MockContext(), url=URL, max_length=5000, start_index=0
+                )
+
+            assert second == first
+            assert mock_get.call_args.kwargs['headers']['If-None-Match'] == '"v1"'
+            assert get_page_cache().revalidations == 1
+        finally:
+            get_page_cache().ttl_seconds = 900.0
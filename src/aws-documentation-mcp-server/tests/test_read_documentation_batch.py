@@ -0,0 +1,173 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Tests for the read_documentation_batch tool."""
+
+import asyncio
+import httpx
+import pytest
+import threading
+from awslabs.aws_documentation_mcp_server.page_cache import get_page_cache
+from awslabs.aws_documentation_mcp_server.server import (
+    read_documentation,
+    read_documentation_batch,
+)
+from unittest.mock import MagicMock, patch
+
+
+BASE_URL = 'https://docs.aws.amazon.com/lambda/latest/dg'
+
+
+class MockContext:
+    """Mock context for testing."""
+
+    def __init__(self):
+        """Initialize the mock context."""
+        self.errors = []
+
+    async def error(self, message):
+        """Mock error method."""
+        self.errors.append(message)
+
+
+def make_response(status_code=200, text=''):
+    """Create a mock HTTP response."""
+    response = MagicMock()
+    response.status_code = status_code
+    response.text = text
+    response.headers = {'content-type': 'text/html'}
+    return response
+
+
+def page_html(title):
+    """Create the HTML of a documentation page."""
+    return f'<html><body><main><h1>{title}</h1><p>{title} details.</p></main></body></html>'
+
+
+class TestReadDocumentationBatch:
+    """Tests for reading several documentation pages at once."""
+
+    @pytest.mark.asyncio
+    async def test_pages_are_read_concurrently_within_limit(self, monkeypatch):
+        """Test that pages are fetched concurrently, at most the configured number at a time."""
+        monkeypatch.setenv('AWS_DOCUMENTATION_BATCH_MAX_CONCURRENCY', '2')
+        running = 0
+        peak = 0
+
+        async def get(self, url, **kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.05)
+            running -= 1
+            return make_response(text=page_html(url.rsplit('/', 1)[1]))
+
+        urls = [f'{BASE_URL}/page-{i}.html' for i in range(5)]
+        with patch('httpx.AsyncClient.get', new=get):
+            results = await read_documentation_batch(
+                MockContext(), urls=urls, max_length=5000, start_index=0
+            )
+
+        assert peak == 2
+        assert [result.url for result in results] == urls
+        for i, result in enumerate(results):
+            assert f'# page-{i}.html' in result.content
+            assert result.error is None
+            assert result.elapsed_ms > 0
+
+    @pytest.mark.asyncio
+    async def test_pages_are_converted_concurrently(self, monkeypatch):
+        """Test that page conversions run in worker threads and overlap."""
+        monkeypatch.setenv('AWS_DOCUMENTATION_BATCH_MAX_CONCURRENCY', '3')
+        # Every conversion waits until all three are running, which only works off the loop
+        barrier = threading.Barrier(3, timeout=5)
+
+        def convert(html):
+            barrier.wait()
+            return html
+
+        async def get(self, url, **kwargs):
+            return make_response(text=page_html(url.rsplit('/', 1)[1]))
+
+        urls = [f'{BASE_URL}/page-{i}.html' for i in range(3)]
+        with (
+            patch('httpx.AsyncClient.get', new=get),
+            patch(
+                'awslabs.aws_documentation_mcp_server.server.extract_content_from_html',
+                side_effect=convert,
+            ),
+        ):
+            results = await read_documentation_batch(
+                MockContext(), urls=urls, max_length=5000, start_index=0
+            )
+
+        assert [result.error for result in results] == [None, None, None]
+        assert not barrier.broken
+
+    @pytest.mark.asyncio
+    async def test_errors_are_reported_per_url(self):
+        """Test that invalid and failing pages do not fail the other pages."""
+
+        async def get(self, url, **kwargs):
+            if 'missing' in url:
+                return make_response(status_code=404)
+            if 'timeout' in url:
+                raise httpx.ReadTimeout('timed out')
+            return make_response(text=page_html('Found'))
+
+        ctx = MockContext()
+        urls = [
+            f'{BASE_URL}/found.html',
+            f'{BASE_URL}/missing.html',
+            f'{BASE_URL}/timeout.html',
+            'https://example.com/page.html',
+            f'{BASE_URL}/not-a-page',
+        ]
+        with patch('httpx.AsyncClient.get', new=get):
+            results = await read_documentation_batch(
+                ctx, urls=urls, max_length=5000, start_index=0
+            )
+
+        assert '# Found' in results[0].content
+        assert [result.error for result in results] == [
+            None,
+            f'Failed to fetch {BASE_URL}/missing.html - status code 404',
+            f'Failed to fetch {BASE_URL}/timeout.html: timed out',
+            'URL must be from the docs.aws.amazon.com domain',
+            'URL must end with .html',
+        ]
+        assert all(result.content is None for result in results[1:])
+        assert ctx.errors == ['Failed to read 4 of 5 pages']
+
+    @pytest.mark.asyncio
+    async def test_page_cache_is_shared(self):
+        """Test that batch reads and single reads share cached pages and duplicate URLs."""
+        calls = []
+
+        async def get(self, url, **kwargs):
+            calls.append(url)
+            return make_response(text=page_html('Cached' + ' paragraph' * 200))
+
+        first_url = f'{BASE_URL}/first.html'
+        second_url = f'{BASE_URL}/second.html'
+        with patch('httpx.AsyncClient.get', new=get):
+            await read_documentation(MockContext(), url=first_url, max_length=100, start_index=0)
+            results = await read_documentation_batch(
+                MockContext(),
+                urls=[first_url, second_url, second_url],
+                max_length=100,
+                start_index=0,
+            )
+
+        assert calls == [first_url, second_url]
+        assert [result.cached for result in results] == [True, False, False]
+        assert results[1] == results[2]
+        assert 'start_index=' in results[0].content
+        assert get_page_cache().hits == 1
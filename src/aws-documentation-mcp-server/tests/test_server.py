@@ -38,7 +38,7 @@ class TestExtractContentFromHTML:
         with patch('bs4.BeautifulSoup') as mock_bs:
             mock_soup = MagicMock()
             mock_bs.return_value = mock_soup
-            with patch('markdownify.markdownify') as mock_markdownify:
+            with patch('markdownify.MarkdownConverter.convert_soup') as mock_markdownify:
                 mock_markdownify.return_value = '# Test\n\nThis is a test.'
                 result = extract_content_from_html(html)
                 assert result == '# Test\n\nThis is a test.'
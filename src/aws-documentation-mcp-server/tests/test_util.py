@@ -121,13 +121,13 @@ class TestExtractContentFromHtml:
     """Tests for extract_content_from_html function."""
 
     @patch('bs4.BeautifulSoup')
-    @patch('markdownify.markdownify')
+    @patch('markdownify.MarkdownConverter.convert_soup')
     def test_successful_extraction(self, mock_markdownify, mock_soup):
         """Test successful HTML content extraction."""
         # Setup mocks
         mock_soup_instance = mock_soup.return_value
         mock_soup_instance.body = mock_soup_instance
-        mock_soup_instance.select_one.return_value = None  # No main content found
+        mock_soup_instance.find_all.return_value = []  # No main content found
         mock_markdownify.return_value = 'Test content'
 
         # Call function
@@ -0,0 +1,353 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from loguru import logger
+from typing import Any
+
+
+DEFAULT_RETRIEVAL_CACHE_MAX_ENTRIES = 256
+DEFAULT_RETRIEVAL_CACHE_TTL_SECONDS = 300.0
+
+_cache: 'RetrievalCache | None' = None
+_cache_lock = threading.Lock()
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a query so that trivially different spellings share a cache entry.
+
+    The query is Unicode normalized and case folded, runs of whitespace are collapsed, and
+    surrounding whitespace and trailing punctuation are removed.
+
+    Args:
+        query (str): The query
+
+    Returns:
+        str: The normalized query
+    """
+    query = unicodedata.normalize('NFKC', query).casefold()
+    return re.sub(r'\s+', ' ', query).strip().rstrip('?!.').rstrip()
+
+
+def get_retrieval_cache_key(
+    knowledge_base_id: str,
+    query: str,
+    number_of_results: int,
+    data_source_ids: list[str] | None = None,
+    reranking_model_name: str | None = None,
+) -> str:
+    """Get the cache key of a retrieval.
+
+    Args:
+        knowledge_base_id (str): The knowledge base ID
+        query (str): The query
+        number_of_results (int): The number of results
+        data_source_ids (list[str] | None): The data source IDs the knowledge base is filtered by
+        reranking_model_name (str | None): The reranking model, or None without reranking
+
+    Returns:
+        str: The cache key
+    """
+    return json.dumps(
+        [
+            knowledge_base_id,
+            normalize_query(query),
+            number_of_results,
+            sorted(set(data_source_ids or [])),
+            reranking_model_name,
+        ]
+    )
+
+
+class RetrievalCache:
+    """LRU cache of retrieval results, optionally persisted in a SQLite database.
+
+    Entries expire after the TTL. The in-memory cache holds the most recently used entries. When
+    a database path is configured, entries are also written there and loaded back on a memory
+    miss, so they are shared by server processes and survive restarts. The async methods access
+    the database in a worker thread, so they do not block the event loop.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_RETRIEVAL_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = DEFAULT_RETRIEVAL_CACHE_TTL_SECONDS,
+        path: str | None = None,
+    ):
+        """Initialize the cache.
+
+        Args:
+            max_entries (int): The maximum number of entries kept in memory, 0 disables the cache
+            ttl_seconds (float): The time after which an entry expires, in seconds
+            path (str | None): The SQLite database to persist entries in, or None for memory only
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[str, float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+
+        if path and self.enabled:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS retrieval_cache ('
+                'key TEXT PRIMARY KEY, knowledge_base_id TEXT, stored_at REAL, documents TEXT)'
+            )
+            self._db.execute(
+                'CREATE INDEX IF NOT EXISTS retrieval_cache_knowledge_base_id '
+                'ON retrieval_cache (knowledge_base_id)'
+            )
+            self._db.execute(
+                'CREATE INDEX IF NOT EXISTS retrieval_cache_stored_at ON retrieval_cache (stored_at)'
+            )
+            self._db.commit()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether results are cached at all."""
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def get(self, key: str) -> list[dict] | None:
+        """Look up the documents of a retrieval.
+
+        Args:
+            key (str): The cache key of the retrieval
+
+        Returns:
+            list[dict] | None: A copy of the cached documents, or None if they are not cached
+        """
+        if not self.enabled:
+            return None
+        entry = self._get_entry(key)
+        if entry is None:
+            entry = self._load(key)
+        return self._finish_get(key, entry)
+
+    async def get_async(self, key: str) -> list[dict] | None:
+        """Look up the documents of a retrieval, reading the database in a worker thread.
+
+        Args:
+            key (str): The cache key of the retrieval
+
+        Returns:
+            list[dict] | None: A copy of the cached documents, or None if they are not cached
+        """
+        if not self.enabled:
+            return None
+        entry = self._get_entry(key)
+        if entry is None and self._db is not None:
+            entry = await asyncio.to_thread(self._load, key)
+        return self._finish_get(key, entry)
+
+    def put(self, key: str, knowledge_base_id: str, documents: list[dict]) -> None:
+        """Cache the documents of a retrieval.
+
+        Args:
+            key (str): The cache key of the retrieval
+            knowledge_base_id (str): The knowledge base the documents were retrieved from
+            documents (list[dict]): The retrieved documents
+        """
+        entry = self._put_entry(key, knowledge_base_id, documents)
+        if entry is not None:
+            self._persist(key, entry)
+
+    async def put_async(self, key: str, knowledge_base_id: str, documents: list[dict]) -> None:
+        """Cache the documents of a retrieval, writing the database in a worker thread.
+
+        Args:
+            key (str): The cache key of the retrieval
+            knowledge_base_id (str): The knowledge base the documents were retrieved from
+            documents (list[dict]): The retrieved documents
+        """
+        entry = self._put_entry(key, knowledge_base_id, documents)
+        if entry is not None and self._db is not None:
+            await asyncio.to_thread(self._persist, key, entry)
+
+    def invalidate(self, knowledge_base_id: str | None = None) -> int:
+        """Drop the cached results of a knowledge base, for example after an ingestion job.
+
+        Args:
+            knowledge_base_id (str | None): The knowledge base ID, or None for all knowledge bases
+
+        Returns:
+            int: The number of entries dropped from memory
+        """
+        with self._lock:
+            keys = [
+                key
+                for key, entry in self._entries.items()
+                if knowledge_base_id is None or entry[0] == knowledge_base_id
+            ]
+            for key in keys:
+                del self._entries[key]
+        with self._db_lock:
+            if self._db is not None:
+                try:
+                    if knowledge_base_id is None:
+                        self._db.execute('DELETE FROM retrieval_cache')
+                    else:
+                        self._db.execute(
+                            'DELETE FROM retrieval_cache WHERE knowledge_base_id = ?',
+                            (knowledge_base_id,),
+                        )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logger.warning(f'Error invalidating persisted retrieval cache: {e}')
+        logger.info(f'Invalidated {len(keys)} cached retrievals of {knowledge_base_id or "all"}')
+        return len(keys)
+
+    def stats(self) -> dict[str, Any]:
+        """Get the statistics of the cache.
+
+        Returns:
+            dict[str, Any]: The hits, misses, hit rate and size of the cache
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'persistent': self._db is not None,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+            }
+
+    def close(self) -> None:
+        """Close the SQLite database of the persistent tier."""
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _get_entry(self, key: str) -> tuple[str, float, str] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not self._is_fresh(entry[1]):
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _finish_get(self, key: str, entry: tuple[str, float, str] | None) -> list[dict] | None:
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self._remember(key, entry)
+            self.hits += 1
+        return json.loads(entry[2])
+
+    def _put_entry(
+        self, key: str, knowledge_base_id: str, documents: list[dict]
+    ) -> tuple[str, float, str] | None:
+        if not self.enabled:
+            return None
+        entry = (knowledge_base_id, time.time(), json.dumps(documents, default=str))
+        with self._lock:
+            self._remember(key, entry)
+        return entry
+
+    def _persist(self, key: str, entry: tuple[str, float, str]) -> None:
+        with self._db_lock:
+            if self._db is None:
+                return
+            try:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO retrieval_cache VALUES (?, ?, ?, ?)',
+                    (key, *entry),
+                )
+                self._db.execute(
+                    'DELETE FROM retrieval_cache WHERE stored_at < ?',
+                    (time.time() - self.ttl_seconds,),
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f'Error persisting retrieval cache entry: {e}')
+
+    def _is_fresh(self, stored_at: float) -> bool:
+        return time.time() - stored_at < self.ttl_seconds
+
+    def _remember(self, key: str, entry: tuple[str, float, str]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self, key: str) -> tuple[str, float, str] | None:
+        with self._db_lock:
+            if self._db is None:
+                return None
+            try:
+                row = self._db.execute(
+                    'SELECT knowledge_base_id, stored_at, documents FROM retrieval_cache '
+                    'WHERE key = ?',
+                    (key,),
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f'Error reading persisted retrieval cache: {e}')
+                return None
+        if row is None or not self._is_fresh(row[1]):
+            return None
+        return row[0], row[1], row[2]
+
+
+def get_retrieval_cache() -> RetrievalCache:
+    """Get the retrieval cache of the server.
+
+    The cache is configured by the BEDROCK_KB_RETRIEVAL_CACHE_MAX_ENTRIES,
+    BEDROCK_KB_RETRIEVAL_CACHE_TTL_SECONDS and BEDROCK_KB_RETRIEVAL_CACHE_PATH environment
+    variables.
+
+    Returns:
+        RetrievalCache: The process-wide retrieval cache
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            max_entries = DEFAULT_RETRIEVAL_CACHE_MAX_ENTRIES
+            ttl_seconds = DEFAULT_RETRIEVAL_CACHE_TTL_SECONDS
+            try:
+                max_entries = int(os.getenv('BEDROCK_KB_RETRIEVAL_CACHE_MAX_ENTRIES', max_entries))
+                ttl_seconds = float(
+                    os.getenv('BEDROCK_KB_RETRIEVAL_CACHE_TTL_SECONDS', ttl_seconds)
+                )
+            except ValueError:
+                logger.warning('Invalid retrieval cache configuration, using the defaults')
+            _cache = RetrievalCache(
+                max_entries=max_entries,
+                ttl_seconds=ttl_seconds,
+                path=os.getenv('BEDROCK_KB_RETRIEVAL_CACHE_PATH') or None,
+            )
+        return _cache
+
+
+def reset_retrieval_cache() -> None:
+    """Drop the retrieval cache, so that it is configured again on next use."""
+    global _cache
+    with _cache_lock:
+        cache, _cache = _cache, None
+    if cache is not None:
+        cache.close()
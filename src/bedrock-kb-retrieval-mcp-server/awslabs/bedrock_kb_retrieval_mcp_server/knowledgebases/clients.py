@@ -8,8 +8,14 @@
 # or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
 # OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
 # and limitations under the License.
+import asyncio
 import boto3
-from typing import TYPE_CHECKING
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from loguru import logger
+from typing import TYPE_CHECKING, Any, Callable, TypeVar
 
 
 if TYPE_CHECKING:
@@ -20,6 +26,97 @@ else:
     AgentsforBedrockRuntimeClient = object
 
 
+# botocore keeps 10 connections per client by default, so more workers would only queue there
+DEFAULT_BEDROCK_MAX_WORKERS = 10
+DEFAULT_BEDROCK_CALL_TIMEOUT_SECONDS = 60.0
+
+T = TypeVar('T')
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+class BedrockCallTimeoutError(TimeoutError):
+    """A Bedrock API call did not complete within its timeout."""
+
+
+def get_bedrock_executor() -> ThreadPoolExecutor:
+    """Get the executor that runs the blocking boto3 calls of the server.
+
+    The number of worker threads, and so the number of Bedrock calls in flight, is set by the
+    BEDROCK_KB_MAX_WORKERS environment variable.
+
+    Returns:
+        ThreadPoolExecutor: The process-wide executor
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            max_workers = DEFAULT_BEDROCK_MAX_WORKERS
+            try:
+                max_workers = int(os.getenv('BEDROCK_KB_MAX_WORKERS', max_workers))
+            except ValueError:
+                logger.warning('Invalid BEDROCK_KB_MAX_WORKERS, using the default')
+            _executor = ThreadPoolExecutor(
+                max_workers=max(max_workers, 1), thread_name_prefix='bedrock-kb'
+            )
+        return _executor
+
+
+def shutdown_bedrock_executor() -> None:
+    """Shut down the executor without waiting for calls in flight."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_call_timeout() -> float:
+    """Get the timeout of Bedrock API calls from the BEDROCK_KB_CALL_TIMEOUT_SECONDS environment variable.
+
+    Returns:
+        float: The timeout in seconds
+    """
+    try:
+        return float(
+            os.getenv('BEDROCK_KB_CALL_TIMEOUT_SECONDS', DEFAULT_BEDROCK_CALL_TIMEOUT_SECONDS)
+        )
+    except ValueError:
+        logger.warning('Invalid BEDROCK_KB_CALL_TIMEOUT_SECONDS, using the default')
+        return DEFAULT_BEDROCK_CALL_TIMEOUT_SECONDS
+
+
+async def call_bedrock(
+    func: Callable[..., T], *args: Any, timeout: float | None = None, **kwargs: Any
+) -> T:
+    """Run a blocking boto3 call in the Bedrock executor without blocking the event loop.
+
+    Args:
+        func (Callable[..., T]): The boto3 client method or function making the calls
+        *args (Any): Positional arguments of the call
+        timeout (float | None): The timeout in seconds, or None for the configured timeout
+        **kwargs (Any): Keyword arguments of the call
+
+    Returns:
+        T: The result of the call
+
+    Raises:
+        BedrockCallTimeoutError: If the call does not complete within the timeout. The worker
+            thread finishes the call in the background, bounded by the botocore read timeout.
+    """
+    timeout = get_call_timeout() if timeout is None else timeout
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(get_bedrock_executor(), functools.partial(func, *args, **kwargs))
+    try:
+        return await asyncio.wait_for(future, timeout)
+    except asyncio.TimeoutError as e:
+        name = getattr(func, '__name__', repr(func))
+        raise BedrockCallTimeoutError(
+            f'Bedrock call {name} did not complete within {timeout} seconds'
+        ) from e
+
+
 def get_bedrock_agent_runtime_client(
     region_name: str | None = 'us-west-2', profile_name: str | None = None
 ) -> AgentsforBedrockRuntimeClient:
@@ -8,9 +8,13 @@
 # or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
 # OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
 # and limitations under the License.
+import asyncio
+import os
+import time
 from ..models import KnowledgeBaseMapping
+from .clients import call_bedrock
 from loguru import logger
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
 
 
 if TYPE_CHECKING:
@@ -20,60 +24,275 @@ else:
 
 
 DEFAULT_KNOWLEDGE_BASE_TAG_INCLUSION_KEY = 'mcp-multirag-kb'
+DEFAULT_DISCOVERY_MAX_CONCURRENCY = 10
+DEFAULT_DISCOVERY_TTL_SECONDS = 300.0
+
+
+def get_discovery_max_concurrency() -> int:
+    """Get the number of knowledge bases inspected at once during discovery.
+
+    The number is read from the BEDROCK_KB_DISCOVERY_MAX_CONCURRENCY environment variable.
+
+    Returns:
+        int: The maximum number of knowledge bases inspected concurrently
+    """
+    try:
+        max_concurrency = int(
+            os.getenv('BEDROCK_KB_DISCOVERY_MAX_CONCURRENCY', DEFAULT_DISCOVERY_MAX_CONCURRENCY)
+        )
+    except ValueError:
+        logger.warning('Invalid BEDROCK_KB_DISCOVERY_MAX_CONCURRENCY, using the default')
+        max_concurrency = DEFAULT_DISCOVERY_MAX_CONCURRENCY
+    return max(max_concurrency, 1)
+
+
+def get_discovery_ttl() -> float:
+    """Get how long discovered knowledge bases are served from the cache.
+
+    The TTL is read from the BEDROCK_KB_DISCOVERY_TTL_SECONDS environment variable.
+
+    Returns:
+        float: The TTL in seconds
+    """
+    try:
+        return float(os.getenv('BEDROCK_KB_DISCOVERY_TTL_SECONDS', DEFAULT_DISCOVERY_TTL_SECONDS))
+    except ValueError:
+        logger.warning('Invalid BEDROCK_KB_DISCOVERY_TTL_SECONDS, using the default')
+        return DEFAULT_DISCOVERY_TTL_SECONDS
+
+
+def collect_pages(
+    agent_client: AgentsforBedrockClient, operation_name: str, **kwargs: Any
+) -> list[dict]:
+    """Collect all pages of a paginated Bedrock agent operation.
+
+    Args:
+        agent_client (AgentsforBedrockClient): The Bedrock agent client
+        operation_name (str): The name of the paginated operation
+        **kwargs (Any): The parameters of the operation
+
+    Returns:
+        list[dict]: The response pages
+    """
+    return list(agent_client.get_paginator(operation_name).paginate(**kwargs))  # type: ignore
+
+
+def get_arn_prefix(kb_arn: str | None, kb_id: str) -> str | None:
+    """Get the part of a knowledge base ARN that all knowledge bases of the account share.
+
+    Knowledge base ARNs have the form arn:<partition>:bedrock:<region>:<account>:knowledge-base/<id>,
+    and the knowledge bases listed by one client are all in the same account and region.
+
+    Args:
+        kb_arn (str | None): The ARN of a knowledge base
+        kb_id (str): The ID of the same knowledge base
+
+    Returns:
+        str | None: The ARN without the knowledge base ID, or None if the ARN does not end with it
+    """
+    if kb_arn and kb_arn.endswith(f':knowledge-base/{kb_id}'):
+        return kb_arn[: -len(kb_id)]
+    return None
+
+
+async def get_knowledge_base_arn(agent_client: AgentsforBedrockClient, kb_id: str) -> str | None:
+    """Look up the ARN of a knowledge base.
+
+    Args:
+        agent_client (AgentsforBedrockClient): The Bedrock agent client
+        kb_id (str): The knowledge base ID
+
+    Returns:
+        str | None: The knowledge base ARN
+    """
+    response = await call_bedrock(agent_client.get_knowledge_base, knowledgeBaseId=kb_id)
+    return response.get('knowledgeBase', {}).get('knowledgeBaseArn')
 
 
 async def discover_knowledge_bases(
     agent_client: AgentsforBedrockClient,
     tag_key: str = DEFAULT_KNOWLEDGE_BASE_TAG_INCLUSION_KEY,
+    max_concurrency: int | None = None,
 ) -> KnowledgeBaseMapping:
     """Discover knowledge bases.
 
+    The tags and data sources of the knowledge bases are fetched concurrently. The ARN needed to
+    read the tags is taken from the list response when it is there, and otherwise derived from
+    the ARN of the first knowledge base, so that get_knowledge_base is called at most once.
+
     Args:
         agent_client (AgentsforBedrockClient): The Bedrock agent client
         tag_key (str): The tag key to filter knowledge bases by
+        max_concurrency (int | None): The maximum number of knowledge bases inspected at once,
+            or None for the configured number
 
     Returns:
         KnowledgeBaseMapping: A mapping of knowledge base IDs to knowledge base details
     """
-    result: KnowledgeBaseMapping = {}
+    kb_pages = await call_bedrock(collect_pages, agent_client, 'list_knowledge_bases')
+    summaries = [kb for page in kb_pages for kb in page.get('knowledgeBaseSummaries', [])]
+    if not summaries:
+        return {}
 
-    # Collect all knowledge bases with their ARNs in one pass
-    kb_data = []
-    kb_paginator = agent_client.get_paginator('list_knowledge_bases')
-
-    # First, collect all knowledge bases that match our tag criteria
-    for page in kb_paginator.paginate():
-        for kb in page.get('knowledgeBaseSummaries', []):
-            logger.debug(f'KB: {kb}')
-            kb_id = kb.get('knowledgeBaseId')
-            kb_name = kb.get('name')
-
-            kb_arn = (
-                agent_client.get_knowledge_base(knowledgeBaseId=kb_id)
-                .get('knowledgeBase', {})
-                .get('knowledgeBaseArn')
-            )
+    arn_prefix = None
+    for kb in summaries:
+        arn_prefix = get_arn_prefix(kb.get('knowledgeBaseArn'), kb.get('knowledgeBaseId'))
+        if arn_prefix:
+            break
+    if arn_prefix is None:
+        kb_id = summaries[0].get('knowledgeBaseId')
+        arn_prefix = get_arn_prefix(await get_knowledge_base_arn(agent_client, kb_id), kb_id)
 
-            tags = agent_client.list_tags_for_resource(resourceArn=kb_arn).get('tags', {})
-            if tag_key in tags and tags[tag_key] == 'true':
-                logger.debug(f'KB Name: {kb_name}')
-                kb_data.append((kb_id, kb_name))
+    semaphore = asyncio.Semaphore(max_concurrency or get_discovery_max_concurrency())
 
-    # Then, for each matching knowledge base, collect its data sources
-    for kb_id, kb_name in kb_data:
-        result[kb_id] = {'name': kb_name, 'data_sources': []}
+    async def inspect(kb: dict) -> tuple[str, str, list] | None:
+        logger.debug(f'KB: {kb}')
+        kb_id = kb.get('knowledgeBaseId')
+        kb_name = kb.get('name')
+        async with semaphore:
+            kb_arn = kb.get('knowledgeBaseArn')
+            if not kb_arn:
+                kb_arn = (
+                    arn_prefix + kb_id
+                    if arn_prefix
+                    else await get_knowledge_base_arn(agent_client, kb_id)
+                )
 
-        # Collect data sources for this knowledge base
-        data_sources = []
-        data_sources_paginator = agent_client.get_paginator('list_data_sources')
+            tags = (
+                await call_bedrock(agent_client.list_tags_for_resource, resourceArn=kb_arn)
+            ).get('tags', {})
+            if tag_key not in tags or tags[tag_key] != 'true':
+                return None
+            logger.debug(f'KB Name: {kb_name}')
 
-        for page in data_sources_paginator.paginate(knowledgeBaseId=kb_id):
+            data_source_pages = await call_bedrock(
+                collect_pages, agent_client, 'list_data_sources', knowledgeBaseId=kb_id
+            )
+
+        data_sources = []
+        for page in data_source_pages:
             for ds in page.get('dataSourceSummaries', []):
-                ds_id = ds.get('dataSourceId')
-                ds_name = ds.get('name')
                 logger.debug(f'DS: {ds}')
-                data_sources.append({'id': ds_id, 'name': ds_name})
-
-        result[kb_id]['data_sources'] = data_sources
+                data_sources.append({'id': ds.get('dataSourceId'), 'name': ds.get('name')})
+        return kb_id, kb_name, data_sources
 
+    result: KnowledgeBaseMapping = {}
+    for match in await asyncio.gather(*(inspect(kb) for kb in summaries)):
+        if match is not None:
+            kb_id, kb_name, data_sources = match
+            result[kb_id] = {'name': kb_name, 'data_sources': data_sources}
     return result
+
+
+class KnowledgeBaseRegistry:
+    """Cache of discovered knowledge bases that is refreshed in the background.
+
+    Discovery results are served from the cache for the TTL. After that the stale result is still
+    served while a single background refresh replaces it, so only the very first request waits
+    for a full discovery.
+    """
+
+    def __init__(
+        self,
+        discover: Callable[[], Awaitable[KnowledgeBaseMapping]],
+        ttl_seconds: float | None = None,
+    ):
+        """Initialize the registry.
+
+        Args:
+            discover (Callable[[], Awaitable[KnowledgeBaseMapping]]): Runs a discovery
+            ttl_seconds (float | None): How long a discovery result is fresh, or None for the
+                configured TTL
+        """
+        self.discover = discover
+        self.ttl_seconds = get_discovery_ttl() if ttl_seconds is None else ttl_seconds
+        self.knowledge_bases: KnowledgeBaseMapping | None = None
+        self.refreshed_at = 0.0
+        self._refresh_task: asyncio.Task | None = None
+        self._background_task: asyncio.Task | None = None
+
+    def is_fresh(self) -> bool:
+        """Check whether the cached knowledge bases are within their TTL.
+
+        Returns:
+            bool: True if there is a cached result younger than the TTL
+        """
+        return (
+            self.knowledge_bases is not None
+            and time.monotonic() - self.refreshed_at < self.ttl_seconds
+        )
+
+    def invalidate(self) -> None:
+        """Mark the cached knowledge bases as stale, so the next request refreshes them."""
+        self.refreshed_at = 0.0
+
+    async def _refresh(self) -> KnowledgeBaseMapping:
+        knowledge_bases = await self.discover()
+        self.knowledge_bases = knowledge_bases
+        self.refreshed_at = time.monotonic()
+        logger.info(f'Discovered {len(knowledge_bases)} knowledge bases')
+        return knowledge_bases
+
+    def refresh(self) -> asyncio.Task:
+        """Start a discovery, or join the one already running.
+
+        Returns:
+            asyncio.Task: The task running the discovery
+        """
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh())
+        return self._refresh_task
+
+    async def get(self) -> KnowledgeBaseMapping:
+        """Get the discovered knowledge bases.
+
+        Returns:
+            KnowledgeBaseMapping: A mapping of knowledge base IDs to knowledge base details
+        """
+        if self.knowledge_bases is None:
+            return await asyncio.shield(self.refresh())
+        if not self.is_fresh():
+            self.refresh().add_done_callback(log_refresh_error)
+        return self.knowledge_bases
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            try:
+                await asyncio.shield(self.refresh())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f'Error refreshing knowledge bases: {e}')
+            await asyncio.sleep(self.ttl_seconds)
+
+    def start(self) -> None:
+        """Start refreshing the knowledge bases in the background once per TTL.
+
+        Without a positive TTL the registry is only refreshed on request, as the background loop
+        would otherwise call Bedrock without pause.
+        """
+        if self.ttl_seconds <= 0:
+            logger.info(
+                'Discovery TTL is not positive, not refreshing knowledge bases in background'
+            )
+            return
+        if self._background_task is None or self._background_task.done():
+            self._background_task = asyncio.create_task(self._refresh_periodically())
+
+    async def stop(self) -> None:
+        """Stop the background refresh."""
+        tasks = [task for task in (self._background_task, self._refresh_task) if task is not None]
+        self._background_task = self._refresh_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def log_refresh_error(task: asyncio.Task) -> None:
+    """Log the error of a background discovery that failed.
+
+    Args:
+        task (asyncio.Task): The finished discovery task
+    """
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f'Error refreshing knowledge bases: {task.exception()}')
@@ -8,9 +8,13 @@
 # or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
 # OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
 # and limitations under the License.
+import asyncio
 import json
+import time
+from .cache import get_retrieval_cache, get_retrieval_cache_key
+from .clients import call_bedrock
 from loguru import logger
-from typing import TYPE_CHECKING, Literal
+from typing import TYPE_CHECKING, Any, Literal
 
 
 if TYPE_CHECKING:
@@ -23,7 +27,40 @@ else:
     KnowledgeBaseRetrievalConfigurationTypeDef = object
 
 
-async def query_knowledge_base(
+RERANKING_REGIONS = ['us-west-2', 'us-east-1', 'ap-northeast-1', 'ca-central-1']
+RERANKING_MODELS = {
+    'COHERE': 'cohere.rerank-v3-5:0',
+    'AMAZON': 'amazon.rerank-v1:0',
+}
+# The Rerank API accepts at most this many documents per request
+MAX_RERANKING_DOCUMENTS = 1000
+
+
+def get_reranking_model_arn(
+    kb_agent_client: AgentsforBedrockRuntimeClient,
+    reranking_model_name: Literal['COHERE', 'AMAZON'] = 'AMAZON',
+) -> str:
+    """Get the ARN of a reranking model in the region of the client.
+
+    Args:
+        kb_agent_client (AgentsforBedrockRuntimeClient): The Bedrock agent runtime client
+        reranking_model_name (Literal['COHERE', 'AMAZON']): The name of the reranking model
+
+    Returns:
+        str: The ARN of the reranking model
+
+    Raises:
+        ValueError: If reranking is not supported in the region of the client
+    """
+    region_name = kb_agent_client.meta.region_name
+    if region_name not in RERANKING_REGIONS:
+        raise ValueError(f'Reranking is not supported in region {region_name}')
+    return (
+        f'arn:aws:bedrock:{region_name}::foundation-model/{RERANKING_MODELS[reranking_model_name]}'
+    )
+
+
+async def retrieve_documents(
     query: str,
     knowledge_base_id: str,
     kb_agent_client: AgentsforBedrockRuntimeClient,
@@ -31,33 +68,24 @@ async def query_knowledge_base(
     reranking: bool = False,
     reranking_model_name: Literal['COHERE', 'AMAZON'] = 'AMAZON',
     data_source_ids: list[str] | None = None,
-) -> str:
-    """# Amazon Bedrock Knowledge Base query tool.
+) -> list[dict]:
+    """Retrieve the documents of a knowledge base matching a query.
 
-    Args:
-        query (str): The query to search the knowledge base with.
-        knowledge_base_id (str): The knowledge base ID to query.
-        kb_agent_client (AgentsforBedrockRuntimeClient): The Bedrock agent client.
-        number_of_results (int): The number of results to return.
-        reranking (bool): Whether to rerank the results. Can be globally configured using the BEDROCK_KB_RERANKING_ENABLED environment variable.
-        reranking_model_name (Literal['COHERE', 'AMAZON']): The name of the reranking model to use.
-        data_source_ids (list[str] | None): The data source IDs to filter the knowledge base by.
+    Results are served from the retrieval cache when the same knowledge base was queried with the
+    same normalized query and options before.
 
-    ## Warning: You must use the `resource://knowledgebases` tool to get the knowledge base ID and optionally a data source ID first.
+    Args:
+        query (str): The query to search the knowledge base with
+        knowledge_base_id (str): The knowledge base ID to query
+        kb_agent_client (AgentsforBedrockRuntimeClient): The Bedrock agent runtime client
+        number_of_results (int): The number of results to return
+        reranking (bool): Whether to rerank the results
+        reranking_model_name (Literal['COHERE', 'AMAZON']): The name of the reranking model to use
+        data_source_ids (list[str] | None): The data source IDs to filter the knowledge base by
 
-    ## Returns:
-    - A string containing the results of the query.
+    Returns:
+        list[dict]: The content, location and score of the retrieved text documents
     """
-    if reranking and kb_agent_client.meta.region_name not in [
-        'us-west-2',
-        'us-east-1',
-        'ap-northeast-1',
-        'ca-central-1',
-    ]:
-        raise ValueError(
-            f'Reranking is not supported in region {kb_agent_client.meta.region_name}'
-        )
-
     retrieve_request: KnowledgeBaseRetrievalConfigurationTypeDef = {
         'vectorSearchConfiguration': {
             'numberOfResults': number_of_results,
@@ -73,26 +101,35 @@ async def query_knowledge_base(
         }
 
     if reranking:
-        model_name_mapping = {
-            'COHERE': 'cohere.rerank-v3-5:0',
-            'AMAZON': 'amazon.rerank-v1:0',
-        }
         retrieve_request['vectorSearchConfiguration']['rerankingConfiguration'] = {
             'type': 'BEDROCK_RERANKING_MODEL',
             'bedrockRerankingConfiguration': {
                 'modelConfiguration': {
-                    'modelArn': f'arn:aws:bedrock:{kb_agent_client.meta.region_name}::foundation-model/{model_name_mapping[reranking_model_name]}'
+                    'modelArn': get_reranking_model_arn(kb_agent_client, reranking_model_name)
                 },
             },
         }
 
-    response = kb_agent_client.retrieve(
+    cache = get_retrieval_cache()
+    cache_key = get_retrieval_cache_key(
+        knowledge_base_id,
+        query,
+        number_of_results,
+        data_source_ids,
+        reranking_model_name if reranking else None,
+    )
+    documents = await cache.get_async(cache_key)
+    if documents is not None:
+        return documents
+
+    response = await call_bedrock(
+        kb_agent_client.retrieve,
         knowledgeBaseId=knowledge_base_id,
         retrievalQuery={'text': query},
         retrievalConfiguration=retrieve_request,
     )
     results = response['retrievalResults']
-    documents: list[dict] = []
+    documents = []
     for result in results:
         if result['content'].get('type') == 'IMAGE':
             logger.warning('Images are not supported at this time. Skipping...')
@@ -106,4 +143,228 @@ async def query_knowledge_base(
                 }
             )
 
+    await cache.put_async(cache_key, knowledge_base_id, documents)
+    return documents
+
+
+async def query_knowledge_base(
+    query: str,
+    knowledge_base_id: str,
+    kb_agent_client: AgentsforBedrockRuntimeClient,
+    number_of_results: int = 20,
+    reranking: bool = False,
+    reranking_model_name: Literal['COHERE', 'AMAZON'] = 'AMAZON',
+    data_source_ids: list[str] | None = None,
+) -> str:
+    """# Amazon Bedrock Knowledge Base query tool.
+
+    Args:
+        query (str): The query to search the knowledge base with.
+        knowledge_base_id (str): The knowledge base ID to query.
+        kb_agent_client (AgentsforBedrockRuntimeClient): The Bedrock agent client.
+        number_of_results (int): The number of results to return.
+        reranking (bool): Whether to rerank the results. Can be globally configured using the BEDROCK_KB_RERANKING_ENABLED environment variable.
+        reranking_model_name (Literal['COHERE', 'AMAZON']): The name of the reranking model to use.
+        data_source_ids (list[str] | None): The data source IDs to filter the knowledge base by.
+
+    ## Warning: You must use the `resource://knowledgebases` tool to get the knowledge base ID and optionally a data source ID first.
+
+    ## Returns:
+    - A string containing the results of the query.
+    """
+    documents = await retrieve_documents(
+        query=query,
+        knowledge_base_id=knowledge_base_id,
+        kb_agent_client=kb_agent_client,
+        number_of_results=number_of_results,
+        reranking=reranking,
+        reranking_model_name=reranking_model_name,
+        data_source_ids=data_source_ids,
+    )
     return '\n\n'.join([json.dumps(document) for document in documents])
+
+
+def get_document_key(document: dict) -> str:
+    """Get the key identifying a document by its location.
+
+    Args:
+        document (dict): A retrieved document
+
+    Returns:
+        str: The location of the document, or its content if it has no location
+    """
+    return json.dumps(document['location'] or document['content'], sort_keys=True, default=str)
+
+
+def get_document_text(document: dict) -> str:
+    """Get the text of a document to rerank it by.
+
+    Args:
+        document (dict): A retrieved document
+
+    Returns:
+        str: The text content of the document, or its JSON content for structured documents
+    """
+    content = document['content']
+    return content.get('text') or json.dumps(content, default=str)
+
+
+def merge_documents(documents: list[dict], number_of_results: int) -> list[dict]:
+    """Remove duplicate documents and order the rest by score.
+
+    Args:
+        documents (list[dict]): The documents retrieved from all knowledge bases
+        number_of_results (int): The number of documents to keep
+
+    Returns:
+        list[dict]: The highest scoring document of each location, best first
+    """
+    merged: dict[str, dict] = {}
+    for document in documents:
+        key = get_document_key(document)
+        if key not in merged or (document['score'] or 0) > (merged[key]['score'] or 0):
+            merged[key] = document
+    return sorted(merged.values(), key=lambda document: document['score'] or 0, reverse=True)[
+        :number_of_results
+    ]
+
+
+async def rerank_documents(
+    query: str,
+    documents: list[dict],
+    kb_agent_client: AgentsforBedrockRuntimeClient,
+    number_of_results: int,
+    reranking_model_name: Literal['COHERE', 'AMAZON'] = 'AMAZON',
+) -> list[dict]:
+    """Rerank documents against a query with a Bedrock reranking model.
+
+    Args:
+        query (str): The query to rank the documents by
+        documents (list[dict]): The documents to rerank
+        kb_agent_client (AgentsforBedrockRuntimeClient): The Bedrock agent runtime client
+        number_of_results (int): The number of documents to keep
+        reranking_model_name (Literal['COHERE', 'AMAZON']): The name of the reranking model to use
+
+    Returns:
+        list[dict]: The most relevant documents, best first, with the relevance score as their
+            score and the score of the knowledge base as their retrieval_score
+    """
+    if not documents:
+        return []
+    response = await call_bedrock(
+        kb_agent_client.rerank,
+        queries=[{'type': 'TEXT', 'textQuery': {'text': query}}],
+        sources=[
+            {
+                'type': 'INLINE',
+                'inlineDocumentSource': {
+                    'type': 'TEXT',
+                    'textDocument': {'text': get_document_text(document)},
+                },
+            }
+            for document in documents
+        ],
+        rerankingConfiguration={
+            'type': 'BEDROCK_RERANKING_MODEL',
+            'bedrockRerankingConfiguration': {
+                'numberOfResults': min(number_of_results, len(documents)),
+                'modelConfiguration': {
+                    'modelArn': get_reranking_model_arn(kb_agent_client, reranking_model_name)
+                },
+            },
+        },
+    )
+    return [
+        {
+            **documents[result['index']],
+            'score': result['relevanceScore'],
+            'retrieval_score': documents[result['index']]['score'],
+        }
+        for result in response['results']
+    ]
+
+
+async def query_knowledge_bases(
+    query: str,
+    knowledge_base_ids: list[str],
+    kb_agent_client: AgentsforBedrockRuntimeClient,
+    number_of_results: int = 20,
+    reranking: bool = False,
+    reranking_model_name: Literal['COHERE', 'AMAZON'] = 'AMAZON',
+    data_source_ids: dict[str, list[str]] | None = None,
+) -> dict[str, Any]:
+    """Query several knowledge bases at once and merge their results.
+
+    The knowledge bases are queried concurrently. Documents found in more than one knowledge base
+    are kept once, with their highest score. Scores of different knowledge bases are not always
+    comparable, so with reranking the merged documents are ranked again in a single pass.
+
+    Args:
+        query (str): The query to search the knowledge bases with
+        knowledge_base_ids (list[str]): The knowledge base IDs to query
+        kb_agent_client (AgentsforBedrockRuntimeClient): The Bedrock agent runtime client
+        number_of_results (int): The number of results to retrieve from each knowledge base and
+            to return
+        reranking (bool): Whether to rerank the merged results
+        reranking_model_name (Literal['COHERE', 'AMAZON']): The name of the reranking model to use
+        data_source_ids (dict[str, list[str]] | None): The data source IDs to filter each
+            knowledge base by, keyed by knowledge base ID
+
+    Returns:
+        dict[str, Any]: The merged results, each with the ID of its knowledge base, and the
+            latency, result count and error of each knowledge base and of the reranking
+    """
+    if reranking:
+        get_reranking_model_arn(kb_agent_client, reranking_model_name)
+    knowledge_base_ids = list(dict.fromkeys(knowledge_base_ids))
+    data_source_ids = data_source_ids or {}
+
+    async def query_one(knowledge_base_id: str) -> tuple[list[dict], dict[str, Any]]:
+        start_time = time.perf_counter()
+        documents: list[dict] = []
+        error = None
+        try:
+            documents = await retrieve_documents(
+                query=query,
+                knowledge_base_id=knowledge_base_id,
+                kb_agent_client=kb_agent_client,
+                number_of_results=number_of_results,
+                data_source_ids=data_source_ids.get(knowledge_base_id),
+            )
+        except Exception as e:
+            logger.error(f'Error querying knowledge base {knowledge_base_id}: {e}')
+            error = str(e)
+        stats = {
+            'knowledge_base_id': knowledge_base_id,
+            'latency_ms': round((time.perf_counter() - start_time) * 1000, 1),
+            'result_count': len(documents),
+            'error': error,
+        }
+        for document in documents:
+            document['knowledge_base_id'] = knowledge_base_id
+        return documents, stats
+
+    responses = await asyncio.gather(*(query_one(kb_id) for kb_id in knowledge_base_ids))
+    documents = merge_documents(
+        [document for kb_documents, _ in responses for document in kb_documents],
+        min(len(knowledge_base_ids) * number_of_results, MAX_RERANKING_DOCUMENTS)
+        if reranking
+        else number_of_results,
+    )
+
+    reranking_stats = None
+    if reranking:
+        start_time = time.perf_counter()
+        documents = await rerank_documents(
+            query, documents, kb_agent_client, number_of_results, reranking_model_name
+        )
+        reranking_stats = {
+            'model': reranking_model_name,
+            'latency_ms': round((time.perf_counter() - start_time) * 1000, 1),
+        }
+
+    return {
+        'results': documents,
+        'knowledge_bases': [stats for _, stats in responses],
+        'reranking': reranking_stats,
+    }
@@ -9,20 +9,35 @@ from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 import asyncio
 from sse_starlette.sse import EventSourceResponse
-from typing import Dict, List, Optional, Any
+from typing import Awaitable, Callable, Dict, List, Optional, Any
 import uuid
+from contextlib import asynccontextmanager
 
 # Import your existing code
+from awslabs.bedrock_kb_retrieval_mcp_server.knowledgebases.cache import (
+    get_retrieval_cache,
+    reset_retrieval_cache,
+)
 from awslabs.bedrock_kb_retrieval_mcp_server.knowledgebases.clients import (
+    BedrockCallTimeoutError,
     get_bedrock_agent_client,
     get_bedrock_agent_runtime_client,
+    shutdown_bedrock_executor,
 )
 from awslabs.bedrock_kb_retrieval_mcp_server.knowledgebases.discovery import (
     DEFAULT_KNOWLEDGE_BASE_TAG_INCLUSION_KEY,
+    KnowledgeBaseRegistry,
     discover_knowledge_bases,
 )
 from awslabs.bedrock_kb_retrieval_mcp_server.knowledgebases.retrieval import (
     query_knowledge_base,
+    query_knowledge_bases,
+    retrieve_documents,
+)
+from awslabs.bedrock_kb_retrieval_mcp_server.sessions import (
+    Session,
+    SessionClosedError,
+    reap_idle_sessions_periodically,
 )
 from loguru import logger
 
@@ -46,6 +61,11 @@ except Exception as e:
 
 kb_inclusion_tag_key = os.getenv('KB_INCLUSION_TAG_KEY', DEFAULT_KNOWLEDGE_BASE_TAG_INCLUSION_KEY)
 
+# Cache the discovered knowledge bases, refreshing them in the background
+kb_registry = KnowledgeBaseRegistry(
+    lambda: discover_knowledge_bases(kb_agent_mgmt_client, kb_inclusion_tag_key)
+)
+
 # Parse reranking enabled environment variable
 kb_reranking_enabled_raw = os.getenv('BEDROCK_KB_RERANKING_ENABLED')
 kb_reranking_enabled = False  # Default value is now False (off)
@@ -57,8 +77,22 @@ logger.info(
     f'Default reranking enabled: {kb_reranking_enabled} (from BEDROCK_KB_RERANKING_ENABLED)'
 )
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Refresh the knowledge bases and reap idle sessions in the background while the server runs."""
+    kb_registry.start()
+    reaper = asyncio.create_task(reap_idle_sessions_periodically(connections))
+    yield
+    reaper.cancel()
+    for session in list(connections.values()):
+        session.close()
+    connections.clear()
+    await kb_registry.stop()
+    shutdown_bedrock_executor()
+    reset_retrieval_cache()
+
 # Create FastAPI app
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -70,27 +104,23 @@ app.add_middleware(
 )
 
 # Store active connections
-connections: Dict[str, asyncio.Queue] = {}
+connections: Dict[str, Session] = {}
 
 # Handle SSE connections
 @app.get("/sse")
 async def sse(request: Request):
-    session_id = str(uuid.uuid4())
-    queue = asyncio.Queue()
-    connections[session_id] = queue
+    session = Session(str(uuid.uuid4()))
+    connections[session.session_id] = session
     
     async def event_generator():
-        yield {"event": "endpoint", "data": f"/messages/?session_id={session_id}"}
         try:
-            while True:
-                message = await queue.get()
-                if message is None:
-                    break
-                yield {"data": message}
+            async for event in session.events():
+                yield event
         except asyncio.CancelledError:
             pass
         finally:
-            connections.pop(session_id, None)
+            session.close()
+            connections.pop(session.session_id, None)
     
     return EventSourceResponse(event_generator())
 
@@ -103,13 +133,57 @@ async def post_sse():
 @app.post("/messages/")
 async def messages(request: Request):
     session_id = request.query_params.get("session_id")
-    if not session_id or session_id not in connections:
+    session = connections.get(session_id) if session_id else None
+    if session is None:
         return Response(status_code=404)
     
-    data = await request.json()
-    response = await handle_message(data)
+    try:
+        data = await request.json()
+    except ValueError:
+        return Response(status_code=400)
+    if not isinstance(data, dict):
+        # Batches and other non-object bodies are not supported
+        return Response(content="Expected a JSON-RPC request object", status_code=400)
     
-    return response
+    # The response is sent through the SSE stream of the session
+    if not session.start(process_message(session, data)):
+        return Response(content="Too many messages in flight", status_code=429)
+    return Response(content="Accepted", status_code=202)
+
+async def process_message(session: Session, data: Dict[str, Any]):
+    """Handle a JSON-RPC message and send the response through the SSE stream of the session."""
+    try:
+        response = await handle_message(data, session.send)
+    except BedrockCallTimeoutError as e:
+        logger.error(str(e))
+        response = {
+            "jsonrpc": "2.0",
+            "id": data.get("id", 0),
+            "error": {
+                "code": -32000,
+                "message": str(e)
+            }
+        }
+    except SessionClosedError:
+        return
+    except Exception as e:
+        logger.exception(f"Error handling message: {e}")
+        response = {
+            "jsonrpc": "2.0",
+            "id": data.get("id", 0),
+            "error": {
+                "code": -32603,
+                "message": str(e)
+            }
+        }
+
+    # Notifications are not answered
+    if "id" not in data:
+        return
+    try:
+        await session.send(response)
+    except SessionClosedError as e:
+        logger.warning(f"Dropping response to message {data['id']}: {e}")
 
 # Handle root path
 @app.get("/")
@@ -118,7 +192,7 @@ async def root():
     return Response(status_code=200)
 
 # Handle messages
-async def handle_message(data: Dict[str, Any]):
+async def handle_message(data: Dict[str, Any], send: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None):
     method = data.get("method")
     params = data.get("params", {})
     id = data.get("id", 0)
@@ -140,12 +214,34 @@ async def handle_message(data: Dict[str, Any]):
             "result": None
         }
     elif method == "resource://knowledgebases":
-        result = await discover_knowledge_bases(kb_agent_mgmt_client, kb_inclusion_tag_key)
+        result = await kb_registry.get()
         return {
             "jsonrpc": "2.0",
             "id": id,
             "result": result
         }
+    elif method == "QueryKnowledgeBases" and params.get("stream") and send is not None:
+        # Send the documents one message at a time instead of as one large result
+        documents = await retrieve_documents(
+            query=params.get("query", ""),
+            knowledge_base_id=params.get("knowledge_base_id", ""),
+            kb_agent_client=kb_runtime_client,
+            number_of_results=params.get("number_of_results", 10),
+            reranking=params.get("reranking", kb_reranking_enabled),
+            reranking_model_name=params.get("reranking_model_name", "AMAZON"),
+            data_source_ids=params.get("data_source_ids", None),
+        )
+        for index, document in enumerate(documents):
+            await send({
+                "jsonrpc": "2.0",
+                "method": "notifications/retrieval/document",
+                "params": {"requestId": id, "index": index, "document": document}
+            })
+        return {
+            "jsonrpc": "2.0",
+            "id": id,
+            "result": {"document_count": len(documents)}
+        }
     elif method == "QueryKnowledgeBases":
         result = await query_knowledge_base(
             query=params.get("query", ""),
@@ -161,6 +257,41 @@ async def handle_message(data: Dict[str, Any]):
             "id": id,
             "result": result
         }
+    elif method == "QueryMultipleKnowledgeBases":
+        # Query all discovered knowledge bases unless specific ones are requested
+        knowledge_base_ids = params.get("knowledge_base_ids")
+        if not knowledge_base_ids:
+            knowledge_base_ids = list(await kb_registry.get())
+        result = await query_knowledge_bases(
+            query=params.get("query", ""),
+            knowledge_base_ids=knowledge_base_ids,
+            kb_agent_client=kb_runtime_client,
+            number_of_results=params.get("number_of_results", 10),
+            reranking=params.get("reranking", kb_reranking_enabled),
+            reranking_model_name=params.get("reranking_model_name", "AMAZON"),
+            data_source_ids=params.get("data_source_ids", None),
+        )
+        return {
+            "jsonrpc": "2.0",
+            "id": id,
+            "result": result
+        }
+    elif method == "InvalidateRetrievalCache":
+        # Drop cached results after an ingestion job, for one knowledge base or all of them
+        invalidated = await asyncio.to_thread(
+            get_retrieval_cache().invalidate, params.get("knowledge_base_id")
+        )
+        return {
+            "jsonrpc": "2.0",
+            "id": id,
+            "result": {"invalidated": invalidated}
+        }
+    elif method == "GetRetrievalCacheStats":
+        return {
+            "jsonrpc": "2.0",
+            "id": id,
+            "result": get_retrieval_cache().stats()
+        }
     else:
         return {
             "jsonrpc": "2.0",
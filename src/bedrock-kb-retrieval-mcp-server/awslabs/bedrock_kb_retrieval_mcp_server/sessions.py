@@ -0,0 +1,220 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+import asyncio
+import json
+import os
+import time
+from loguru import logger
+from typing import Any, AsyncIterator, Coroutine, TypeVar
+
+
+DEFAULT_SSE_QUEUE_SIZE = 64
+DEFAULT_SSE_MAX_IN_FLIGHT = 8
+DEFAULT_SSE_SEND_TIMEOUT_SECONDS = 30.0
+DEFAULT_SSE_IDLE_TIMEOUT_SECONDS = 300.0
+
+T = TypeVar('T', int, float)
+
+
+def get_setting(name: str, default: T) -> T:
+    """Get a numeric setting of the SSE transport from the environment.
+
+    Args:
+        name (str): The name of the environment variable
+        default (T): The value used when the variable is not set or invalid
+
+    Returns:
+        T: The value of the setting
+    """
+    try:
+        return type(default)(os.getenv(name, default))
+    except ValueError:
+        logger.warning(f'Invalid {name}, using the default')
+        return default
+
+
+class SessionClosedError(Exception):
+    """The SSE session was closed before a message could be sent."""
+
+
+class Session:
+    """An SSE session, through which the responses to a client's messages are sent.
+
+    Memory per session is bounded: at most BEDROCK_KB_SSE_QUEUE_SIZE messages wait to be read by
+    the client, and at most BEDROCK_KB_SSE_MAX_IN_FLIGHT messages are handled at once. When the
+    queue is full, senders wait for the client to catch up, and a client that reads nothing for
+    BEDROCK_KB_SSE_SEND_TIMEOUT_SECONDS is disconnected.
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        queue_size: int | None = None,
+        max_in_flight: int | None = None,
+        send_timeout: float | None = None,
+    ):
+        """Initialize the session.
+
+        Args:
+            session_id (str): The session ID
+            queue_size (int | None): The maximum number of unread messages, or None for the
+                configured number
+            max_in_flight (int | None): The maximum number of messages handled at once, or None
+                for the configured number
+            send_timeout (float | None): The time to wait for room in the queue, in seconds, or
+                None for the configured time
+        """
+        self.session_id = session_id
+        self.queue: asyncio.Queue[str | None] = asyncio.Queue(
+            maxsize=max(
+                queue_size or get_setting('BEDROCK_KB_SSE_QUEUE_SIZE', DEFAULT_SSE_QUEUE_SIZE), 1
+            )
+        )
+        self.max_in_flight = max_in_flight or get_setting(
+            'BEDROCK_KB_SSE_MAX_IN_FLIGHT', DEFAULT_SSE_MAX_IN_FLIGHT
+        )
+        self.send_timeout = send_timeout or get_setting(
+            'BEDROCK_KB_SSE_SEND_TIMEOUT_SECONDS', DEFAULT_SSE_SEND_TIMEOUT_SECONDS
+        )
+        self.tasks: set[asyncio.Task] = set()
+        self.closed = False
+        self.last_activity = time.monotonic()
+
+    @property
+    def endpoint(self) -> str:
+        """The endpoint the client posts its messages to."""
+        return f'/messages/?session_id={self.session_id}'
+
+    def touch(self) -> None:
+        """Record activity on the session."""
+        self.last_activity = time.monotonic()
+
+    def is_idle(self, idle_timeout: float) -> bool:
+        """Check whether the session has had no activity and no work for a while.
+
+        Args:
+            idle_timeout (float): The time without activity after which a session is idle
+
+        Returns:
+            bool: True if no message is being handled and nothing happened within the timeout
+        """
+        return not self.tasks and time.monotonic() - self.last_activity > idle_timeout
+
+    def start(self, coro: Coroutine[Any, Any, None]) -> bool:
+        """Handle a message of the client in the background.
+
+        Args:
+            coro (Coroutine[Any, Any, None]): Handles the message and sends the response
+
+        Returns:
+            bool: False if the session is closed or already handles as many messages as allowed
+        """
+        if self.closed or len(self.tasks) >= self.max_in_flight:
+            coro.close()
+            return False
+        task = asyncio.create_task(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        self.touch()
+        return True
+
+    async def send(self, message: dict[str, Any]) -> None:
+        """Send a JSON-RPC message to the client, waiting while the queue is full.
+
+        Args:
+            message (dict[str, Any]): The JSON-RPC message
+
+        Raises:
+            SessionClosedError: If the session is closed, or the client does not read messages
+                within the send timeout, which closes the session
+        """
+        if self.closed:
+            raise SessionClosedError(f'Session {self.session_id} is closed')
+        try:
+            await asyncio.wait_for(self.queue.put(json.dumps(message)), self.send_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f'Closing session {self.session_id}, the client read no messages '
+                f'for {self.send_timeout} seconds'
+            )
+            self.close()
+            raise SessionClosedError(f'Session {self.session_id} is not reading messages')
+
+    def close(self) -> None:
+        """Close the session, cancel the messages being handled and drop the unread ones."""
+        if self.closed:
+            return
+        self.closed = True
+        for task in list(self.tasks):
+            if task is not asyncio.current_task():
+                task.cancel()
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+    async def events(self) -> AsyncIterator[dict[str, str]]:
+        """Generate the server-sent events of the session until it is closed.
+
+        Yields:
+            dict[str, str]: The endpoint event, followed by a message event per JSON-RPC message
+        """
+        yield {'event': 'endpoint', 'data': self.endpoint}
+        while True:
+            message = await self.queue.get()
+            if message is None:
+                break
+            self.touch()
+            yield {'event': 'message', 'data': message}
+
+
+def reap_idle_sessions(
+    sessions: dict[str, Session], idle_timeout: float | None = None
+) -> list[str]:
+    """Close and forget the sessions that have been idle for too long.
+
+    Args:
+        sessions (dict[str, Session]): The sessions by session ID
+        idle_timeout (float | None): The idle time after which a session is closed, or None for
+            the time configured by BEDROCK_KB_SSE_IDLE_TIMEOUT_SECONDS
+
+    Returns:
+        list[str]: The IDs of the closed sessions
+    """
+    if idle_timeout is None:
+        idle_timeout = get_setting(
+            'BEDROCK_KB_SSE_IDLE_TIMEOUT_SECONDS', DEFAULT_SSE_IDLE_TIMEOUT_SECONDS
+        )
+    idle = [
+        session_id for session_id, session in sessions.items() if session.is_idle(idle_timeout)
+    ]
+    for session_id in idle:
+        logger.info(f'Closing idle session {session_id}')
+        sessions.pop(session_id).close()
+    return idle
+
+
+async def reap_idle_sessions_periodically(
+    sessions: dict[str, Session], idle_timeout: float | None = None
+) -> None:
+    """Reap idle sessions until cancelled, checking several times per idle timeout.
+
+    Args:
+        sessions (dict[str, Session]): The sessions by session ID
+        idle_timeout (float | None): The idle time after which a session is closed, or None for
+            the configured time
+    """
+    if idle_timeout is None:
+        idle_timeout = get_setting(
+            'BEDROCK_KB_SSE_IDLE_TIMEOUT_SECONDS', DEFAULT_SSE_IDLE_TIMEOUT_SECONDS
+        )
+    while True:
+        await asyncio.sleep(max(idle_timeout / 4, 0.01))
+        reap_idle_sessions(sessions, idle_timeout)
@@ -12,9 +12,42 @@
 """Test fixtures for the bedrock-kb-retrieval-mcp-server tests."""
 
 import pytest
+from awslabs.bedrock_kb_retrieval_mcp_server.knowledgebases.cache import reset_retrieval_cache
 from unittest.mock import MagicMock, patch
 
 
+def pytest_addoption(parser):
+    """Add command-line options to pytest."""
+    parser.addoption(
+        '--run-benchmark',
+        action='store_true',
+        default=False,
+        help='Run benchmarks',
+    )
+
+
+def pytest_configure(config):
+    """Configure pytest."""
+    config.addinivalue_line('markers', 'benchmark: mark test as a benchmark')
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip benchmarks unless --run-benchmark is specified."""
+    if not config.getoption('--run-benchmark'):
+        skip_benchmark = pytest.mark.skip(reason='need --run-benchmark option to run')
+        for item in items:
+            if 'benchmark' in item.keywords:
+                item.add_marker(skip_benchmark)
+
+
+@pytest.fixture(autouse=True)
+def fresh_retrieval_cache():
+    """Start every test with an empty retrieval cache configured from the environment."""
+    reset_retrieval_cache()
+    yield
+    reset_retrieval_cache()
+
+
 @pytest.fixture
 def mock_bedrock_agent_runtime_client():
     """Create a mock Bedrock Agent Runtime client."""
@@ -0,0 +1,197 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Tests for the non-blocking Bedrock call layer of the bedrock-kb-retrieval-mcp-server."""
+
+import asyncio
+import httpx
+import json
+import pytest
+import threading
+import time
+from awslabs.bedrock_kb_retrieval_mcp_server.knowledgebases.clients import (
+    BedrockCallTimeoutError,
+    call_bedrock,
+    shutdown_bedrock_executor,
+)
+from awslabs.bedrock_kb_retrieval_mcp_server.server import app, connections, handle_message
+from awslabs.bedrock_kb_retrieval_mcp_server.sessions import Session
+from unittest.mock import MagicMock, patch
+
+
+RETRIEVE_LATENCY_SECONDS = 0.05
+
+
+class StubRuntimeClient:
+    """Local stub of the Bedrock agent runtime client with a blocking retrieve."""
+
+    def __init__(self, latency_seconds=RETRIEVE_LATENCY_SECONDS, barrier=None):
+        """Initialize the stub client."""
+        self.meta = MagicMock(region_name='us-west-2')
+        self.latency_seconds = latency_seconds
+        self.barrier = barrier
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+
+    def retrieve(self, **kwargs):
+        """Block like a boto3 retrieve call and return one result."""
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        if self.barrier is not None:
+            self.barrier.wait(timeout=5)
+        time.sleep(self.latency_seconds)
+        with self._lock:
+            self.in_flight -= 1
+        return {
+            'retrievalResults': [
+                {
+                    'content': {'text': kwargs['retrievalQuery']['text'], 'type': 'TEXT'},
+                    'location': {'s3Location': {'uri': 's3://test-bucket/doc.txt'}},
+                    'score': 0.9,
+                }
+            ]
+        }
+
+
+@pytest.fixture(autouse=True)
+def fresh_executor():
+    """Create the Bedrock executor again for every test, so it picks up the environment."""
+    shutdown_bedrock_executor()
+    yield
+    shutdown_bedrock_executor()
+
+
+async def query(request_id):
+    """Send a QueryKnowledgeBases request to the server."""
+    return await handle_message(
+        {
+            'jsonrpc': '2.0',
+            'id': request_id,
+            'method': 'QueryKnowledgeBases',
+            'params': {'query': f'query {request_id}', 'knowledge_base_id': 'kb-12345'},
+        }
+    )
+
+
+async def measure_throughput(in_flight, requests=16):
+    """Send requests with a fixed number in flight and return the requests per second."""
+    semaphore = asyncio.Semaphore(in_flight)
+
+    async def send(request_id):
+        async with semaphore:
+            return await query(request_id)
+
+    start_time = time.perf_counter()
+    responses = await asyncio.gather(*(send(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start_time
+    assert all(f'query {i}' in response['result'] for i, response in enumerate(responses))
+    return requests / elapsed
+
+
+class TestCallBedrock:
+    """Tests for running boto3 calls in the bounded executor."""
+
+    async def test_event_loop_is_not_blocked(self):
+        """Test that the event loop keeps running while a Bedrock call blocks."""
+        ticks = 0
+
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        heartbeat_task = asyncio.create_task(heartbeat())
+        await call_bedrock(time.sleep, 0.2)
+        heartbeat_task.cancel()
+
+        assert ticks >= 10
+
+    async def test_timeout(self):
+        """Test that a call exceeding its timeout raises an error."""
+        with pytest.raises(BedrockCallTimeoutError, match='sleep did not complete within 0.05'):
+            await call_bedrock(time.sleep, 0.5, timeout=0.05)
+
+    async def test_timeout_from_environment_becomes_json_rpc_error(self, monkeypatch):
+        """Test that a query timing out is answered with a JSON-RPC error."""
+        monkeypatch.setenv('BEDROCK_KB_CALL_TIMEOUT_SECONDS', '0.05')
+
+        session = connections['session'] = Session('session')
+        try:
+            with patch(
+                'awslabs.bedrock_kb_retrieval_mcp_server.server.kb_runtime_client',
+                StubRuntimeClient(latency_seconds=0.5),
+            ):
+                async with httpx.AsyncClient(
+                    transport=httpx.ASGITransport(app=app), base_url='http://test'
+                ) as client:
+                    response = await client.post(
+                        '/messages/',
+                        params={'session_id': 'session'},
+                        json={
+                            'jsonrpc': '2.0',
+                            'id': 7,
+                            'method': 'QueryKnowledgeBases',
+                            'params': {'query': 'slow', 'knowledge_base_id': 'kb-12345'},
+                        },
+                    )
+                message = json.loads(await asyncio.wait_for(session.queue.get(), 1))
+        finally:
+            connections.pop('session', None)
+
+        assert response.status_code == 202
+        assert message['id'] == 7
+        assert message['error']['code'] == -32000
+        assert 'retrieve did not complete' in message['error']['message']
+
+    async def test_in_flight_calls_are_bounded(self, monkeypatch):
+        """Test that no more calls than the executor has workers run at once."""
+        monkeypatch.setenv('BEDROCK_KB_MAX_WORKERS', '2')
+        client = StubRuntimeClient()
+
+        with patch('awslabs.bedrock_kb_retrieval_mcp_server.server.kb_runtime_client', client):
+            await asyncio.gather(*(query(i) for i in range(6)))
+
+        assert client.peak_in_flight == 2
+
+    async def test_concurrent_queries_run_in_parallel(self, monkeypatch):
+        """Test that concurrent queries are served in parallel rather than one at a time."""
+        monkeypatch.setenv('BEDROCK_KB_RETRIEVAL_CACHE_MAX_ENTRIES', '0')
+        # Every call waits until all eight are in flight, so serial calls would time out
+        client = StubRuntimeClient(latency_seconds=0, barrier=threading.Barrier(8))
+
+        with patch('awslabs.bedrock_kb_retrieval_mcp_server.server.kb_runtime_client', client):
+            responses = await asyncio.gather(*(query(i) for i in range(8)))
+
+        assert all(f'query {i}' in response['result'] for i, response in enumerate(responses))
+        assert client.peak_in_flight == 8
+
+
+@pytest.mark.benchmark
+class TestLoadBenchmark:
+    """Load benchmark of QueryKnowledgeBases against a local stub client."""
+
+    async def test_throughput_scales_with_in_flight_requests(self, monkeypatch):
+        """Test that throughput grows with the number of requests in flight."""
+        # Every run sends the same queries, which would otherwise be served from the cache
+        monkeypatch.setenv('BEDROCK_KB_RETRIEVAL_CACHE_MAX_ENTRIES', '0')
+        client = StubRuntimeClient()
+
+        with patch('awslabs.bedrock_kb_retrieval_mcp_server.server.kb_runtime_client', client):
+            throughput = {n: await measure_throughput(n) for n in (1, 4, 8)}
+
+        print(
+            '\nQueryKnowledgeBases requests/sec by requests in flight: '
+            + ', '.join(f'{n}: {rate:.1f}' for n, rate in throughput.items())
+        )
+        assert throughput[4] > 2.5 * throughput[1]
+        assert throughput[8] > 4 * throughput[1]
@@ -0,0 +1,258 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+
+"""Tests for the retrieval cache of the bedrock-kb-retrieval-mcp-server."""
+
+import pytest
+import sqlite3
+import threading
+import time
+from awslabs.bedrock_kb_retrieval_mcp_server import server
+from awslabs.bedrock_kb_retrieval_mcp_server.knowledgebases.cache import (
+    RetrievalCache,
+    get_retrieval_cache,
+    get_retrieval_cache_key,
+    normalize_query,
+)
+from awslabs.bedrock_kb_retrieval_mcp_server.knowledgebases.retrieval import (
+    query_knowledge_base,
+    query_knowledge_bases,
+)
+from unittest.mock import patch
+
+
+DOCUMENTS = [{'content': {'text': 'Text', 'type': 'TEXT'}, 'location': {}, 'score': 0.5}]
+
+
+class TestCacheKey:
+    """Tests for the cache keys of retrievals."""
+
+    def test_normalize_query(self):
+        """Test that case, whitespace and trailing punctuation do not change the query."""
+        assert normalize_query('  What is  Amazon\tS3?  ') == 'what is amazon s3'
+        assert normalize_query('ＷＨＡＴ is amazon s3!') == 'what is amazon s3'
+        assert normalize_query('What is Amazon S3 Glacier?') != 'what is amazon s3'
+
+    def test_key_includes_retrieval_options(self):
+        """Test that the key covers the knowledge base, results, data sources and reranking."""
+        key = get_retrieval_cache_key('kb-1', 'Query', 10, ['ds-2', 'ds-1'], 'AMAZON')
+
+        assert key == get_retrieval_cache_key('kb-1', 'query?', 10, ['ds-1', 'ds-2'], 'AMAZON')
+        assert key != get_retrieval_cache_key('kb-2', 'query', 10, ['ds-1', 'ds-2'], 'AMAZON')
+        assert key != get_retrieval_cache_key('kb-1', 'query', 20, ['ds-1', 'ds-2'], 'AMAZON')
+        assert key != get_retrieval_cache_key('kb-1', 'query', 10, ['ds-1'], 'AMAZON')
+        assert key != get_retrieval_cache_key('kb-1', 'query', 10, ['ds-1', 'ds-2'], 'COHERE')
+        assert key != get_retrieval_cache_key('kb-1', 'query', 10, ['ds-1', 'ds-2'], None)
+
+
+class TestRetrievalCache:
+    """Tests for the RetrievalCache class."""
+
+    def test_entries_are_copies(self):
+        """Test that changing returned documents does not change the cache."""
+        cache = RetrievalCache()
+        cache.put('key', 'kb-1', DOCUMENTS)
+
+        cache.get('key')[0]['score'] = 1.0
+
+        assert cache.get('key') == DOCUMENTS
+        assert (cache.hits, cache.misses) == (2, 0)
+
+    def test_least_recently_used_entries_are_evicted(self):
+        """Test that the least recently used entry is dropped when the cache is full."""
+        cache = RetrievalCache(max_entries=2)
+        cache.put('first', 'kb-1', DOCUMENTS)
+        cache.put('second', 'kb-1', DOCUMENTS)
+        cache.get('first')
+        cache.put('third', 'kb-1', DOCUMENTS)
+
+        assert cache.get('second') is None
+        assert cache.get('first') == DOCUMENTS
+        assert cache.stats()['size'] == 2
+
+    def test_entries_expire(self):
+        """Test that entries are not served after the TTL."""
+        cache = RetrievalCache(ttl_seconds=60)
+        cache.put('key', 'kb-1', DOCUMENTS)
+
+        with patch('time.time', return_value=time.time() + 61):
+            assert cache.get('key') is None
+        assert cache.stats()['size'] == 0
+
+    def test_disabled_cache(self):
+        """Test that no entries are kept when the cache has no room."""
+        cache = RetrievalCache(max_entries=0)
+        cache.put('key', 'kb-1', DOCUMENTS)
+
+        assert cache.get('key') is None
+        assert cache.stats()['enabled'] is False
+
+    def test_invalidate_knowledge_base(self):
+        """Test that only the entries of the invalidated knowledge base are dropped."""
+        cache = RetrievalCache()
+        cache.put('first', 'kb-1', DOCUMENTS)
+        cache.put('second', 'kb-1', DOCUMENTS)
+        cache.put('third', 'kb-2', DOCUMENTS)
+
+        assert cache.invalidate('kb-1') == 2
+        assert cache.get('first') is None
+        assert cache.get('third') == DOCUMENTS
+        assert cache.invalidate() == 1
+
+    def test_persistent_tier(self, tmp_path):
+        """Test that persisted entries survive a restart and are invalidated per knowledge base."""
+        path = str(tmp_path / 'retrieval-cache.db')
+        cache = RetrievalCache(path=path)
+        cache.put('first', 'kb-1', DOCUMENTS)
+        cache.put('second', 'kb-2', DOCUMENTS)
+        cache.close()
+
+        restarted = RetrievalCache(path=path)
+        assert restarted.get('first') == DOCUMENTS
+        restarted.invalidate('kb-2')
+        restarted.close()
+
+        restarted = RetrievalCache(path=path)
+        assert restarted.get('second') is None
+        assert restarted.get('first') == DOCUMENTS
+        assert restarted.stats()['persistent'] is True
+        restarted.close()
+
+    @pytest.mark.asyncio
+    async def test_persistent_tier_off_event_loop(self, tmp_path):
+        """Test that the async methods access the database in a worker thread."""
+        path = str(tmp_path / 'retrieval-cache.db')
+        cache = RetrievalCache(path=path)
+        await cache.put_async('first', 'kb-1', DOCUMENTS)
+        cache.close()
+
+        restarted = RetrievalCache(path=path)
+        load = restarted._load
+        load_threads = []
+
+        def record_load(key):
+            load_threads.append(threading.current_thread())
+            return load(key)
+
+        with patch.object(restarted, '_load', side_effect=record_load):
+            assert await restarted.get_async('first') == DOCUMENTS
+            assert await restarted.get_async('first') == DOCUMENTS
+
+        assert len(load_threads) == 1
+        assert load_threads[0] is not threading.current_thread()
+        restarted.close()
+
+    def test_expired_entries_are_deleted_by_index(self, tmp_path):
+        """Test that deleting expired entries does not scan the whole table."""
+        path = str(tmp_path / 'retrieval-cache.db')
+        RetrievalCache(path=path).close()
+
+        with sqlite3.connect(path) as db:
+            plan = db.execute(
+                'EXPLAIN QUERY PLAN DELETE FROM retrieval_cache WHERE stored_at < ?', (0,)
+            ).fetchall()
+        db.close()
+
+        assert 'retrieval_cache_stored_at' in ' '.join(str(row[-1]) for row in plan)
+
+    def test_configuration_from_environment(self, monkeypatch, tmp_path):
+        """Test that the server cache is configured by environment variables."""
+        monkeypatch.setenv('BEDROCK_KB_RETRIEVAL_CACHE_MAX_ENTRIES', '5')
+        monkeypatch.setenv('BEDROCK_KB_RETRIEVAL_CACHE_TTL_SECONDS', '30')
+        monkeypatch.setenv('BEDROCK_KB_RETRIEVAL_CACHE_PATH', str(tmp_path / 'cache.db'))
+
+        stats = get_retrieval_cache().stats()
+
+        assert (stats['max_entries'], stats['ttl_seconds'], stats['persistent']) == (5, 30, True)
+
+
+class TestCachedRetrieval:
+    """Tests for serving knowledge base queries from the cache."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_query_is_served_from_cache(self, mock_bedrock_agent_runtime_client):
+        """Test that a repeated query with the same options does not call Bedrock again."""
+        first = await query_knowledge_base(
+            query='What is a test?',
+            knowledge_base_id='kb-12345',
+            kb_agent_client=mock_bedrock_agent_runtime_client,
+            reranking=True,
+        )
+        second = await query_knowledge_base(
+            query='what is a test',
+            knowledge_base_id='kb-12345',
+            kb_agent_client=mock_bedrock_agent_runtime_client,
+            reranking=True,
+        )
+        await query_knowledge_base(
+            query='what is a test',
+            knowledge_base_id='kb-12345',
+            kb_agent_client=mock_bedrock_agent_runtime_client,
+        )
+
+        assert first == second
+        assert mock_bedrock_agent_runtime_client.retrieve.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_fan_out_query_shares_cache(self, mock_bedrock_agent_runtime_client):
+        """Test that the fan-out query only retrieves from knowledge bases not yet cached."""
+        await query_knowledge_base(
+            query='test query',
+            knowledge_base_id='kb-12345',
+            kb_agent_client=mock_bedrock_agent_runtime_client,
+            number_of_results=10,
+        )
+
+        await query_knowledge_bases(
+            query='test query',
+            knowledge_base_ids=['kb-12345', 'kb-67890'],
+            kb_agent_client=mock_bedrock_agent_runtime_client,
+            number_of_results=10,
+        )
+
+        assert [
+            call.kwargs['knowledgeBaseId']
+            for call in mock_bedrock_agent_runtime_client.retrieve.call_args_list
+        ] == ['kb-12345', 'kb-67890']
+
+    @pytest.mark.asyncio
+    async def test_server_invalidation_and_stats(self, mock_bedrock_agent_runtime_client):
+        """Test that the server reports cache stats and invalidates the cache per KB."""
+        query = {
+            'jsonrpc': '2.0',
+            'id': 1,
+            'method': 'QueryKnowledgeBases',
+            'params': {'query': 'test query', 'knowledge_base_id': 'kb-12345'},
+        }
+        with patch.object(server, 'kb_runtime_client', mock_bedrock_agent_runtime_client):
+            await server.handle_message(query)
+            await server.handle_message(query)
+            stats = {'jsonrpc': '2.0', 'id': 2, 'method': 'GetRetrievalCacheStats'}
+            response = await server.handle_message(stats)
+            assert 'result' in response and '_meta' not in response
+            assert response['result']['hits'] == 1
+            assert response['result']['hit_rate'] == 0.5
+
+            response = await server.handle_message(
+                {
+                    'jsonrpc': '2.0',
+                    'id': 3,
+                    'method': 'InvalidateRetrievalCache',
+                    'params': {'knowledge_base_id': 'kb-12345'},
+                }
+            )
+            assert response['result'] == {'invalidated': 1}
+            response = await server.handle_message(stats)
+            assert response['result']['size'] == 0
+
+            await server.handle_message(query)
+
+        assert mock_bedrock_agent_runtime_client.retrieve.call_count == 2
@@ -11,11 +11,19 @@
 
 """Tests for the discovery module of the bedrock-kb-retrieval-mcp-server."""
 
+import asyncio
 import pytest
+import threading
+import time
+from awslabs.bedrock_kb_retrieval_mcp_server import server
 from awslabs.bedrock_kb_retrieval_mcp_server.knowledgebases.discovery import (
+    KnowledgeBaseRegistry,
     discover_knowledge_bases,
 )
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
+
+
+ARN_PREFIX = 'arn:aws:bedrock:us-west-2:123456789012:knowledge-base/'
 
 
 class TestDiscoverKnowledgeBases:
@@ -47,8 +55,11 @@ class TestDiscoverKnowledgeBases:
         # Check that the client methods were called correctly
         mock_bedrock_agent_client.get_paginator.assert_any_call('list_knowledge_bases')
 
+        # Only the first ARN is looked up, the others are derived from it
+        mock_bedrock_agent_client.get_knowledge_base.assert_called_once_with(
+            knowledgeBaseId='kb-12345'
+        )
         for kb_id in ['kb-12345', 'kb-67890', 'kb-95008']:
-            mock_bedrock_agent_client.get_knowledge_base.assert_any_call(knowledgeBaseId=kb_id)
             mock_bedrock_agent_client.list_tags_for_resource.assert_any_call(
                 resourceArn=f'arn:aws:bedrock:us-west-2:123456789012:knowledge-base/{kb_id}'
             )
@@ -74,8 +85,11 @@ class TestDiscoverKnowledgeBases:
         # Check that the client methods were called correctly
         mock_bedrock_agent_client.get_paginator.assert_any_call('list_knowledge_bases')
 
+        # Only the first ARN is looked up, the others are derived from it
+        mock_bedrock_agent_client.get_knowledge_base.assert_called_once_with(
+            knowledgeBaseId='kb-12345'
+        )
         for kb_id in ['kb-12345', 'kb-67890', 'kb-95008']:
-            mock_bedrock_agent_client.get_knowledge_base.assert_any_call(knowledgeBaseId=kb_id)
             mock_bedrock_agent_client.list_tags_for_resource.assert_any_call(
                 resourceArn=f'arn:aws:bedrock:us-west-2:123456789012:knowledge-base/{kb_id}'
             )
@@ -98,8 +112,11 @@ class TestDiscoverKnowledgeBases:
 
         # Check that the client methods were called correctly
         mock_bedrock_agent_client.get_paginator.assert_any_call('list_knowledge_bases')
+        # Only the first ARN is looked up, the others are derived from it
+        mock_bedrock_agent_client.get_knowledge_base.assert_called_once_with(
+            knowledgeBaseId='kb-12345'
+        )
         for kb_id in ['kb-12345', 'kb-67890', 'kb-95008']:
-            mock_bedrock_agent_client.get_knowledge_base.assert_any_call(knowledgeBaseId=kb_id)
             mock_bedrock_agent_client.list_tags_for_resource.assert_any_call(
                 resourceArn=f'arn:aws:bedrock:us-west-2:123456789012:knowledge-base/{kb_id}'
             )
@@ -184,9 +201,197 @@ class TestDiscoverKnowledgeBases:
 
         # Check that the client methods were called correctly
         mock_bedrock_agent_client.get_paginator.assert_any_call('list_knowledge_bases')
-        mock_bedrock_agent_client.get_knowledge_base.assert_any_call(knowledgeBaseId='kb-12345')
-        mock_bedrock_agent_client.get_knowledge_base.assert_any_call(knowledgeBaseId='kb-67890')
+        mock_bedrock_agent_client.get_knowledge_base.assert_called_once_with(
+            knowledgeBaseId='kb-12345'
+        )
         mock_bedrock_agent_client.list_tags_for_resource.assert_any_call(
             resourceArn='arn:aws:bedrock:us-west-2:123456789012:knowledge-base/kb-12345'
         )
         mock_bedrock_agent_client.get_paginator.assert_any_call('list_data_sources')
+
+    @pytest.mark.asyncio
+    async def test_discover_knowledge_bases_arn_from_list_response(
+        self, mock_bedrock_agent_client
+    ):
+        """Test that ARNs in the list response are used without looking them up."""
+        kb_paginator = MagicMock()
+        kb_paginator.paginate.return_value = [
+            {
+                'knowledgeBaseSummaries': [
+                    {
+                        'knowledgeBaseId': 'kb-12345',
+                        'knowledgeBaseArn': f'{ARN_PREFIX}kb-12345',
+                        'name': 'Test Knowledge Base',
+                    },
+                    {'knowledgeBaseId': 'kb-67890', 'name': 'Another Knowledge Base'},
+                ]
+            }
+        ]
+        ds_paginator = mock_bedrock_agent_client.get_paginator('list_data_sources')
+        mock_bedrock_agent_client.get_paginator.side_effect = lambda operation_name: {
+            'list_knowledge_bases': kb_paginator,
+            'list_data_sources': ds_paginator,
+        }[operation_name]
+
+        result = await discover_knowledge_bases(mock_bedrock_agent_client)
+
+        assert list(result) == ['kb-12345', 'kb-67890']
+        mock_bedrock_agent_client.get_knowledge_base.assert_not_called()
+        mock_bedrock_agent_client.list_tags_for_resource.assert_any_call(
+            resourceArn=f'{ARN_PREFIX}kb-67890'
+        )
+
+    @pytest.mark.asyncio
+    async def test_discover_knowledge_bases_unexpected_arn(self, mock_bedrock_agent_client):
+        """Test that every ARN is looked up when they cannot be derived from one another."""
+        mock_bedrock_agent_client.get_knowledge_base.side_effect = lambda knowledgeBaseId: {
+            'knowledgeBase': {'knowledgeBaseArn': f'{ARN_PREFIX}{knowledgeBaseId}/unexpected'}
+        }
+        mock_bedrock_agent_client.list_tags_for_resource.side_effect = lambda resourceArn: {
+            'tags': {'mcp-multirag-kb': 'true'}
+        }
+
+        result = await discover_knowledge_bases(mock_bedrock_agent_client)
+
+        assert len(result) == 3
+        for kb_id in ['kb-12345', 'kb-67890', 'kb-95008']:
+            mock_bedrock_agent_client.get_knowledge_base.assert_any_call(knowledgeBaseId=kb_id)
+            mock_bedrock_agent_client.list_tags_for_resource.assert_any_call(
+                resourceArn=f'{ARN_PREFIX}{kb_id}/unexpected'
+            )
+
+    @pytest.mark.asyncio
+    async def test_discover_knowledge_bases_concurrently(self, mock_bedrock_agent_client):
+        """Test that knowledge bases are inspected concurrently, at most the given number at once."""
+        kb_paginator = MagicMock()
+        kb_paginator.paginate.return_value = [
+            {
+                'knowledgeBaseSummaries': [
+                    {'knowledgeBaseId': f'kb-{i}', 'name': f'Knowledge Base {i}'} for i in range(8)
+                ]
+            }
+        ]
+        ds_paginator = mock_bedrock_agent_client.get_paginator('list_data_sources')
+        mock_bedrock_agent_client.get_paginator.side_effect = lambda operation_name: {
+            'list_knowledge_bases': kb_paginator,
+            'list_data_sources': ds_paginator,
+        }[operation_name]
+
+        lock = threading.Lock()
+        in_flight = peak_in_flight = 0
+
+        def list_tags_for_resource(resourceArn):
+            nonlocal in_flight, peak_in_flight
+            with lock:
+                in_flight += 1
+                peak_in_flight = max(peak_in_flight, in_flight)
+            time.sleep(0.05)
+            with lock:
+                in_flight -= 1
+            return {'tags': {'mcp-multirag-kb': 'true'}}
+
+        mock_bedrock_agent_client.list_tags_for_resource.side_effect = list_tags_for_resource
+
+        result = await discover_knowledge_bases(mock_bedrock_agent_client, max_concurrency=3)
+
+        assert list(result) == [f'kb-{i}' for i in range(8)]
+        assert peak_in_flight == 3
+
+
+class TestKnowledgeBaseRegistry:
+    """Tests for the cache of discovered knowledge bases."""
+
+    @pytest.mark.asyncio
+    async def test_result_is_cached_within_ttl(self):
+        """Test that discovery runs once for concurrent and repeated requests within the TTL."""
+        discover = AsyncMock(return_value={'kb-12345': {'name': 'KB', 'data_sources': []}})
+        registry = KnowledgeBaseRegistry(discover, ttl_seconds=60)
+
+        results = await asyncio.gather(*(registry.get() for _ in range(5)))
+        results.append(await registry.get())
+
+        assert all(
+            result == {'kb-12345': {'name': 'KB', 'data_sources': []}} for result in results
+        )
+        discover.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_stale_result_is_served_while_refreshing(self):
+        """Test that a stale result is returned at once and replaced in the background."""
+        discover = AsyncMock(side_effect=[{'kb-1': {}}, {'kb-2': {}}])
+        registry = KnowledgeBaseRegistry(discover, ttl_seconds=60)
+        await registry.get()
+
+        registry.invalidate()
+        assert await registry.get() == {'kb-1': {}}
+        await registry.refresh()
+
+        assert await registry.get() == {'kb-2': {}}
+        assert registry.is_fresh()
+        assert discover.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_stale_result(self):
+        """Test that a failing background refresh keeps serving the last result."""
+        discover = AsyncMock(side_effect=[{'kb-1': {}}, Exception('throttled')])
+        registry = KnowledgeBaseRegistry(discover, ttl_seconds=60)
+        await registry.get()
+
+        registry.invalidate()
+        await registry.get()
+        await asyncio.gather(registry.refresh(), return_exceptions=True)
+
+        assert await registry.get() == {'kb-1': {}}
+        assert not registry.is_fresh()
+
+    @pytest.mark.asyncio
+    async def test_background_refresh(self):
+        """Test that the registry refreshes itself once per TTL until stopped."""
+        discover = AsyncMock(return_value={})
+        registry = KnowledgeBaseRegistry(discover, ttl_seconds=0.02)
+
+        registry.start()
+        await asyncio.sleep(0.07)
+        await registry.stop()
+        refreshes = discover.await_count
+        await asyncio.sleep(0.05)
+
+        assert refreshes >= 3
+        assert discover.await_count == refreshes
+
+    @pytest.mark.asyncio
+    async def test_no_background_refresh_without_ttl(self):
+        """Test that a TTL of zero does not start a background refresh loop."""
+        discover = AsyncMock(return_value={'kb-1': {}})
+        registry = KnowledgeBaseRegistry(discover, ttl_seconds=0)
+
+        registry.start()
+        await asyncio.sleep(0.02)
+
+        assert registry._background_task is None
+        discover.assert_not_awaited()
+        assert await registry.get() == {'kb-1': {}}
+        await registry.stop()
+
+    @pytest.mark.asyncio
+    async def test_server_serves_knowledge_bases_from_registry(self):
+        """Test that the knowledgebases resource does not rediscover within the TTL."""
+        registry = KnowledgeBaseRegistry(
+            lambda: server.discover_knowledge_bases(
+                server.kb_agent_mgmt_client, server.kb_inclusion_tag_key
+            ),
+            ttl_seconds=60,
+        )
+        with (
+            patch.object(server, 'kb_registry', registry),
+            patch.object(
+                server, 'discover_knowledge_bases', AsyncMock(return_value={'kb-1': {}})
+            ) as mock_discover,
+        ):
+            for request_id in range(3):
+                response = await server.handle_message(
+                    {'jsonrpc': '2.0', 'id': request_id, 'method': 'resource://knowledgebases'}
+                )
+                assert response['result'] == {'kb-1': {}}
+
+        mock_discover.assert_awaited_once()
@@ -14,7 +14,7 @@
 import json
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import patch, MagicMock
+from unittest.mock import AsyncMock, patch, MagicMock
 
 from awslabs.bedrock_kb_retrieval_mcp_server.server import app, handle_message
 
@@ -151,6 +151,28 @@ class TestHTTPServer:
             data_source_ids=["ds-12345", "ds-67890"],
         )
 
+    @patch("awslabs.bedrock_kb_retrieval_mcp_server.server.query_knowledge_bases")
+    @patch("awslabs.bedrock_kb_retrieval_mcp_server.server.kb_registry")
+    async def test_handle_message_query_multiple_knowledge_bases(
+        self, mock_kb_registry, mock_query_knowledge_bases
+    ):
+        """Test that QueryMultipleKnowledgeBases queries all discovered knowledge bases by default."""
+        mock_kb_registry.get = AsyncMock(return_value={"kb-12345": {}, "kb-67890": {}})
+        mock_query_knowledge_bases.return_value = {"results": [], "knowledge_bases": [], "reranking": None}
+
+        result = await handle_message({
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "QueryMultipleKnowledgeBases",
+            "params": {"query": "test query", "reranking": True}
+        })
+
+        assert result["id"] == 1
+        assert result["result"] == {"results": [], "knowledge_bases": [], "reranking": None}
+        assert mock_query_knowledge_bases.call_args.kwargs["knowledge_base_ids"] == ["kb-12345", "kb-67890"]
+        assert mock_query_knowledge_bases.call_args.kwargs["number_of_results"] == 10
+        assert mock_query_knowledge_bases.call_args.kwargs["reranking"] is True
+
     async def test_handle_message_unknown_method(self):
         """Test the handle_message function with an unknown method."""
         result = await handle_message({
@@ -13,7 +13,20 @@
 
 import json
 import pytest
-from awslabs.bedrock_kb_retrieval_mcp_server.knowledgebases.retrieval import query_knowledge_base
+import time
+from awslabs.bedrock_kb_retrieval_mcp_server.knowledgebases.retrieval import (
+    query_knowledge_base,
+    query_knowledge_bases,
+)
+
+
+def make_result(uri, score, text=None):
+    """Create a retrieval result of a document in S3."""
+    return {
+        'content': {'text': text or f'Content of {uri}', 'type': 'TEXT'},
+        'location': {'type': 'S3', 's3Location': {'uri': uri}},
+        'score': score,
+    }
 
 
 class TestQueryKnowledgeBase:
@@ -194,3 +207,171 @@ class TestQueryKnowledgeBase:
         assert documents[0]['content']['type'] == 'TEXT'
         assert documents[0]['location']['s3Location']['uri'] == 's3://test-bucket/document.txt'
         assert documents[0]['score'] == 0.85
+
+
+class TestQueryKnowledgeBases:
+    """Tests for the query_knowledge_bases function."""
+
+    @pytest.fixture
+    def client(self, mock_bedrock_agent_runtime_client):
+        """Create a runtime client returning different results for each knowledge base."""
+        results = {
+            'kb-1': [make_result('s3://bucket/a.txt', 0.9), make_result('s3://bucket/b.txt', 0.4)],
+            'kb-2': [make_result('s3://bucket/a.txt', 0.7), make_result('s3://bucket/c.txt', 0.8)],
+        }
+
+        def retrieve(knowledgeBaseId, **kwargs):
+            if knowledgeBaseId.startswith('kb-slow'):
+                time.sleep(0.1)
+            if knowledgeBaseId == 'kb-missing':
+                raise Exception('ResourceNotFoundException')
+            return {'retrievalResults': results.get(knowledgeBaseId, [])}
+
+        mock_bedrock_agent_runtime_client.retrieve.side_effect = retrieve
+        return mock_bedrock_agent_runtime_client
+
+    @pytest.mark.asyncio
+    async def test_results_are_deduplicated_and_merged_by_score(self, client):
+        """Test that documents found in several knowledge bases are kept once, best first."""
+        result = await query_knowledge_bases(
+            query='test query', knowledge_base_ids=['kb-1', 'kb-2', 'kb-1'], kb_agent_client=client
+        )
+
+        assert [
+            (doc['location']['s3Location']['uri'], doc['score'], doc['knowledge_base_id'])
+            for doc in result['results']
+        ] == [
+            ('s3://bucket/a.txt', 0.9, 'kb-1'),
+            ('s3://bucket/c.txt', 0.8, 'kb-2'),
+            ('s3://bucket/b.txt', 0.4, 'kb-1'),
+        ]
+        assert [kb['knowledge_base_id'] for kb in result['knowledge_bases']] == ['kb-1', 'kb-2']
+        assert [kb['result_count'] for kb in result['knowledge_bases']] == [2, 2]
+        assert result['reranking'] is None
+        assert client.retrieve.call_count == 2
+        client.rerank.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_number_of_results_limits_merged_results(self, client):
+        """Test that no more than the requested number of results is returned."""
+        result = await query_knowledge_bases(
+            query='test query',
+            knowledge_base_ids=['kb-1', 'kb-2'],
+            kb_agent_client=client,
+            number_of_results=1,
+            data_source_ids={'kb-2': ['ds-1']},
+        )
+
+        assert len(result['results']) == 1
+        kb_2_call = client.retrieve.call_args_list[1].kwargs
+        assert kb_2_call['retrievalConfiguration']['vectorSearchConfiguration']['filter'] == {
+            'in': {'key': 'x-amz-bedrock-kb-data-source-id', 'value': ['ds-1']}
+        }
+        assert (
+            'filter'
+            not in (
+                client.retrieve.call_args_list[0].kwargs['retrievalConfiguration'][
+                    'vectorSearchConfiguration'
+                ]
+            )
+        )
+
+    @pytest.mark.asyncio
+    async def test_knowledge_bases_are_queried_concurrently(self, client):
+        """Test that slow knowledge bases are queried at the same time and their latency reported."""
+        start_time = time.perf_counter()
+        result = await query_knowledge_bases(
+            query='test query',
+            knowledge_base_ids=['kb-slow-1', 'kb-slow-2', 'kb-slow-3', 'kb-1'],
+            kb_agent_client=client,
+        )
+        elapsed = time.perf_counter() - start_time
+
+        assert elapsed < 0.25
+        latencies = {kb['knowledge_base_id']: kb['latency_ms'] for kb in result['knowledge_bases']}
+        assert all(latencies[f'kb-slow-{i}'] >= 100 for i in range(1, 4))
+        assert latencies['kb-1'] < 100
+        assert len(result['results']) == 2
+
+    @pytest.mark.asyncio
+    async def test_failing_knowledge_base_is_reported(self, client):
+        """Test that one failing knowledge base does not fail the query."""
+        result = await query_knowledge_bases(
+            query='test query', knowledge_base_ids=['kb-missing', 'kb-1'], kb_agent_client=client
+        )
+
+        assert len(result['results']) == 2
+        assert result['knowledge_bases'][0]['error'] == 'ResourceNotFoundException'
+        assert result['knowledge_bases'][0]['result_count'] == 0
+        assert result['knowledge_bases'][1]['error'] is None
+
+    @pytest.mark.asyncio
+    async def test_timeout_is_reported(self, client, monkeypatch):
+        """Test that a knowledge base timing out is reported with its error."""
+        monkeypatch.setenv('BEDROCK_KB_CALL_TIMEOUT_SECONDS', '0.05')
+
+        result = await query_knowledge_bases(
+            query='test query', knowledge_base_ids=['kb-slow-1', 'kb-1'], kb_agent_client=client
+        )
+
+        assert 'did not complete within 0.05 seconds' in result['knowledge_bases'][0]['error']
+        assert len(result['results']) == 2
+
+    @pytest.mark.asyncio
+    async def test_merged_results_are_reranked_once(self, client):
+        """Test that reranking runs once over the merged documents instead of per knowledge base."""
+        client.rerank.return_value = {
+            'results': [{'index': 2, 'relevanceScore': 0.99}, {'index': 0, 'relevanceScore': 0.5}]
+        }
+
+        result = await query_knowledge_bases(
+            query='test query',
+            knowledge_base_ids=['kb-1', 'kb-2'],
+            kb_agent_client=client,
+            number_of_results=2,
+            reranking=True,
+            reranking_model_name='COHERE',
+        )
+
+        for call in client.retrieve.call_args_list:
+            assert (
+                'rerankingConfiguration'
+                not in (call.kwargs['retrievalConfiguration']['vectorSearchConfiguration'])
+            )
+        client.rerank.assert_called_once()
+        rerank_call = client.rerank.call_args.kwargs
+        assert rerank_call['queries'] == [{'type': 'TEXT', 'textQuery': {'text': 'test query'}}]
+        assert [
+            source['inlineDocumentSource']['textDocument']['text']
+            for source in rerank_call['sources']
+        ] == [
+            'Content of s3://bucket/a.txt',
+            'Content of s3://bucket/c.txt',
+            'Content of s3://bucket/b.txt',
+        ]
+        config = rerank_call['rerankingConfiguration']['bedrockRerankingConfiguration']
+        assert config['numberOfResults'] == 2
+        assert config['modelConfiguration']['modelArn'] == (
+            'arn:aws:bedrock:us-west-2::foundation-model/cohere.rerank-v3-5:0'
+        )
+
+        assert [
+            (doc['location']['s3Location']['uri'], doc['score'], doc['retrieval_score'])
+            for doc in result['results']
+        ] == [('s3://bucket/b.txt', 0.99, 0.4), ('s3://bucket/a.txt', 0.5, 0.9)]
+        assert result['reranking']['model'] == 'COHERE'
+
+    @pytest.mark.asyncio
+    async def test_reranking_with_unsupported_region(self, client):
+        """Test that reranking in an unsupported region fails before any query is made."""
+        client.meta.region_name = 'eu-west-1'
+
+        with pytest.raises(ValueError, match='Reranking is not supported in region eu-west-1'):
+            await query_knowledge_bases(
+                query='test query',
+                knowledge_base_ids=['kb-1'],
+                kb_agent_client=client,
+                reranking=True,
+            )
+
+        client.retrieve.assert_not_called()
@@ -0,0 +1,256 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+
+"""Tests for the SSE sessions of the bedrock-kb-retrieval-mcp-server."""
+
+import asyncio
+import httpx
+import json
+import pytest
+from awslabs.bedrock_kb_retrieval_mcp_server import server
+from awslabs.bedrock_kb_retrieval_mcp_server.sessions import (
+    Session,
+    SessionClosedError,
+    reap_idle_sessions,
+    reap_idle_sessions_periodically,
+)
+from unittest.mock import patch
+
+
+async def next_message(session):
+    """Read the next JSON-RPC message sent to a session."""
+    return json.loads(await asyncio.wait_for(session.queue.get(), 1))
+
+
+@pytest.fixture
+async def session():
+    """Register an SSE session with the server."""
+    session = server.connections['session'] = Session('session', queue_size=4)
+    yield session
+    session.close()
+    server.connections.pop('session', None)
+
+
+@pytest.fixture
+async def client():
+    """Create an HTTP client calling the server app on the running event loop."""
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=server.app), base_url='http://test'
+    ) as client:
+        yield client
+
+
+async def post(client, message):
+    """Post a JSON-RPC message to the session."""
+    return await client.post('/messages/', params={'session_id': 'session'}, json=message)
+
+
+class TestSession:
+    """Tests for the Session class."""
+
+    async def test_close_ends_events_and_drops_unread_messages(self):
+        """Test that a closed session only holds the end of its event stream."""
+        session = Session('session-id')
+        await session.send({'jsonrpc': '2.0', 'id': 1, 'result': None})
+        session.close()
+
+        events = [event async for event in session.events()]
+
+        assert events == [
+            {'event': 'endpoint', 'data': '/messages/?session_id=session-id'},
+        ]
+
+    async def test_messages_are_delivered_in_order(self):
+        """Test that sent messages become message events."""
+        session = Session('session-id')
+        events = session.events()
+        await events.__anext__()
+
+        await session.send({'id': 1})
+        await session.send({'id': 2})
+
+        assert await events.__anext__() == {'event': 'message', 'data': '{"id": 1}'}
+        assert await events.__anext__() == {'event': 'message', 'data': '{"id": 2}'}
+
+    async def test_send_waits_for_slow_client(self):
+        """Test that a full queue makes senders wait until the client reads a message."""
+        session = Session('session-id', queue_size=2, send_timeout=1)
+        await session.send({'id': 1})
+        await session.send({'id': 2})
+
+        blocked = asyncio.create_task(session.send({'id': 3}))
+        await asyncio.sleep(0.05)
+        assert not blocked.done()
+
+        await session.queue.get()
+        await asyncio.wait_for(blocked, 1)
+        assert session.queue.qsize() == 2
+
+    async def test_client_not_reading_is_disconnected(self):
+        """Test that a client reading nothing within the send timeout loses its session."""
+        session = Session('session-id', queue_size=1, send_timeout=0.05)
+        await session.send({'id': 1})
+
+        with pytest.raises(SessionClosedError):
+            await session.send({'id': 2})
+
+        assert session.closed
+        assert session.queue.get_nowait() is None
+        with pytest.raises(SessionClosedError):
+            await session.send({'id': 3})
+
+    async def test_messages_in_flight_are_bounded(self):
+        """Test that a session handles at most the configured number of messages at once."""
+        session = Session('session-id', max_in_flight=1)
+        release = asyncio.Event()
+
+        assert session.start(release.wait())
+        assert not session.start(release.wait())
+
+        release.set()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert session.start(release.wait())
+
+    async def test_close_cancels_messages_in_flight(self):
+        """Test that closing a session cancels the messages it is handling."""
+        session = Session('session-id')
+        session.start(asyncio.sleep(10))
+        task = next(iter(session.tasks))
+
+        session.close()
+        await asyncio.gather(task, return_exceptions=True)
+
+        assert task.cancelled()
+        assert not session.start(asyncio.sleep(0))
+
+
+class TestIdleSessions:
+    """Tests for reaping idle sessions."""
+
+    async def test_idle_sessions_are_closed(self):
+        """Test that only sessions without activity or work are reaped."""
+        idle, busy, active = Session('idle'), Session('busy'), Session('active')
+        sessions = {'idle': idle, 'busy': busy, 'active': active}
+        idle.last_activity -= 10
+        busy.last_activity -= 10
+        busy.start(asyncio.sleep(10))
+        await asyncio.sleep(0.01)
+
+        assert reap_idle_sessions(sessions, idle_timeout=5) == ['idle']
+        assert list(sessions) == ['busy', 'active']
+        assert idle.closed
+        busy.close()
+
+    async def test_sessions_are_reaped_periodically(self):
+        """Test that the reaper closes sessions once they become idle."""
+        session = Session('session-id')
+        sessions = {'session-id': session}
+
+        reaper = asyncio.create_task(reap_idle_sessions_periodically(sessions, idle_timeout=0.05))
+        await asyncio.sleep(0.15)
+        reaper.cancel()
+
+        assert sessions == {}
+        assert session.closed
+
+
+class TestMessagesEndpoint:
+    """Tests for sending JSON-RPC responses through the SSE stream."""
+
+    async def test_response_is_sent_through_session(self, session, client):
+        """Test that messages are accepted and answered through the session queue."""
+        response = await post(client, {'jsonrpc': '2.0', 'id': 1, 'method': 'initialize'})
+
+        assert response.status_code == 202
+        message = await next_message(session)
+        assert message['id'] == 1
+        assert message['result']['name'] == 'awslabs.bedrock-kb-retrieval-mcp-server'
+
+    async def test_notifications_are_not_answered(self, session, client):
+        """Test that messages without an ID get no response."""
+        response = await post(client, {'jsonrpc': '2.0', 'method': 'notifications/initialized'})
+        await asyncio.sleep(0.05)
+
+        assert response.status_code == 202
+        assert session.queue.empty()
+
+    async def test_errors_are_sent_as_json_rpc_errors(self, session, client):
+        """Test that a failing message is answered with a JSON-RPC error."""
+        with patch.object(server, 'handle_message', side_effect=ValueError('bad region')):
+            await post(client, {'jsonrpc': '2.0', 'id': 3, 'method': 'QueryKnowledgeBases'})
+
+            message = await next_message(session)
+
+        assert message == {
+            'jsonrpc': '2.0',
+            'id': 3,
+            'error': {'code': -32603, 'message': 'bad region'},
+        }
+
+    async def test_invalid_json(self, session, client):
+        """Test that a body that is not JSON is rejected."""
+        response = await client.post(
+            '/messages/', params={'session_id': 'session'}, content='not json'
+        )
+
+        assert response.status_code == 400
+
+    async def test_batch_is_rejected(self, session, client):
+        """Test that a body that is not a JSON-RPC request object is rejected."""
+        response = await post(client, [{'jsonrpc': '2.0', 'id': 1, 'method': 'initialize'}])
+
+        assert response.status_code == 400
+        assert session.queue.empty()
+
+    async def test_too_many_messages_in_flight(self, session, client):
+        """Test that messages over the in-flight limit of the session are rejected."""
+        session.max_in_flight = 1
+        release = asyncio.Event()
+
+        async def handle_message(data, send=None):
+            await release.wait()
+            return {'jsonrpc': '2.0', 'id': data['id'], 'result': None}
+
+        with patch.object(server, 'handle_message', handle_message):
+            first = await post(client, {'jsonrpc': '2.0', 'id': 1, 'method': 'shutdown'})
+            second = await post(client, {'jsonrpc': '2.0', 'id': 2, 'method': 'shutdown'})
+            release.set()
+            message = await next_message(session)
+
+        assert (first.status_code, second.status_code) == (202, 429)
+        assert message['id'] == 1
+
+    async def test_retrieval_results_are_streamed(
+        self, session, client, mock_bedrock_agent_runtime_client
+    ):
+        """Test that a streaming query sends each document as its own message."""
+        with patch.object(server, 'kb_runtime_client', mock_bedrock_agent_runtime_client):
+            await post(
+                client,
+                {
+                    'jsonrpc': '2.0',
+                    'id': 5,
+                    'method': 'QueryKnowledgeBases',
+                    'params': {'query': 'test', 'knowledge_base_id': 'kb-12345', 'stream': True},
+                },
+            )
+            messages = [await next_message(session) for _ in range(3)]
+
+        assert [message.get('method') for message in messages[:2]] == [
+            'notifications/retrieval/document',
+            'notifications/retrieval/document',
+        ]
+        assert [message['params']['index'] for message in messages[:2]] == [0, 1]
+        assert all(message['params']['requestId'] == 5 for message in messages[:2])
+        assert messages[0]['params']['document']['score'] == 0.95
+        assert messages[2]['id'] == 5
+        assert messages[2]['result'] == {'document_count': 2}
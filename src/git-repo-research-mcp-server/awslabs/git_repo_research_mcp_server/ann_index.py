@@ -0,0 +1,230 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Approximate nearest neighbour indices for Git Repository Research MCP Server.
+
+This module converts the exact (flat) FAISS index built during indexing into an
+HNSW or IVF-PQ index for large repositories, and benchmarks the recall and
+latency of each index type against the flat baseline.
+"""
+
+import argparse
+import faiss
+import math
+import numpy as np
+import os
+import time
+from awslabs.git_repo_research_mcp_server.defaults import Constants
+from awslabs.git_repo_research_mcp_server.models import IndexBenchmarkResult, IndexType
+from loguru import logger
+from typing import List, Optional, Sequence
+
+
+def select_index_type(chunk_count: int, index_type: IndexType = IndexType.AUTO) -> IndexType:
+    """Select the index type to build for a number of chunks.
+
+    Args:
+        chunk_count: Number of chunks in the index
+        index_type: Requested index type; AUTO selects one from the chunk count
+
+    Returns:
+        Index type to build
+    """
+    if index_type != IndexType.AUTO:
+        return IndexType(index_type)
+    if chunk_count >= Constants.ANN_IVF_PQ_MIN_CHUNKS:
+        return IndexType.IVF_PQ
+    if chunk_count >= Constants.ANN_HNSW_MIN_CHUNKS:
+        return IndexType.HNSW
+    return IndexType.FLAT
+
+
+def get_index_type(index: faiss.Index) -> IndexType:
+    """Get the type of a FAISS index.
+
+    Args:
+        index: FAISS index
+
+    Returns:
+        Index type
+    """
+    if isinstance(index, faiss.IndexHNSW):
+        return IndexType.HNSW
+    if isinstance(index, faiss.IndexIVFPQ):
+        return IndexType.IVF_PQ
+    return IndexType.FLAT
+
+
+def _iter_vector_slices(index: faiss.Index, slice_size: int = 65536):
+    """Reconstruct the vectors of an index in contiguous slices."""
+    for start in range(0, index.ntotal, slice_size):
+        yield index.reconstruct_n(start, min(slice_size, index.ntotal - start))
+
+
+def _get_pq_subquantizers(dimensions: int, pq_m: Optional[int]) -> int:
+    """Get the number of PQ sub-quantizers, which must divide the dimensions."""
+    if pq_m:
+        return pq_m
+    # Largest divisor of the dimensions up to 64, for codes of at most 64 bytes
+    return max(m for m in range(1, min(64, dimensions) + 1) if dimensions % m == 0)
+
+
+def build_ann_index(
+    flat_index: faiss.Index,
+    index_type: IndexType,
+    hnsw_m: int = Constants.ANN_HNSW_M,
+    ivf_nlist: Optional[int] = None,
+    pq_m: Optional[int] = None,
+    training_sample_size: int = Constants.ANN_TRAINING_SAMPLE_SIZE,
+) -> faiss.Index:
+    """Build an approximate nearest neighbour index from a flat index.
+
+    Vectors keep their positions, so the index-to-docstore mapping of the flat
+    index remains valid for the new index.
+
+    Args:
+        flat_index: Flat FAISS index with the vectors to index
+        index_type: Type of index to build
+        hnsw_m: Number of neighbours per node in the HNSW graph
+        ivf_nlist: Number of IVF clusters (optional, defaults to 4 * sqrt(vector count))
+        pq_m: Number of PQ sub-quantizers (optional, must divide the vector dimensions)
+        training_sample_size: Maximum number of vectors used to train an IVF-PQ index
+
+    Returns:
+        The new index, or the flat index if the requested type is FLAT or there are
+        too few vectors to train it
+    """
+    index_type = IndexType(index_type)
+    dimensions, count = flat_index.d, flat_index.ntotal
+    if index_type in (IndexType.AUTO, IndexType.FLAT) or count == 0:
+        return flat_index
+
+    start_time = time.time()
+    if index_type == IndexType.HNSW:
+        index = faiss.IndexHNSWFlat(dimensions, hnsw_m)
+        index.hnsw.efConstruction = Constants.ANN_HNSW_EF_CONSTRUCTION
+        index.hnsw.efSearch = Constants.ANN_HNSW_EF_SEARCH
+    else:
+        nlist = ivf_nlist or max(1, int(4 * math.sqrt(count)))
+        # k-means needs at least one training vector per IVF cluster and PQ centroid
+        sample_size = min(count, max(training_sample_size, nlist))
+        if sample_size < max(nlist, 2**Constants.ANN_PQ_BITS):
+            logger.warning(
+                f'Too few vectors ({count}) to train an IVF-PQ index, keeping the flat index'
+            )
+            return flat_index
+
+        pq_m = _get_pq_subquantizers(dimensions, pq_m)
+        quantizer = faiss.IndexFlatL2(dimensions)
+        index = faiss.IndexIVFPQ(quantizer, dimensions, nlist, pq_m, Constants.ANN_PQ_BITS)
+        index.nprobe = min(nlist, Constants.ANN_IVF_NPROBE)
+
+        sample_ids = np.sort(
+            np.random.default_rng(0).choice(count, size=sample_size, replace=False)
+        ).astype('int64')
+        index.train(flat_index.reconstruct_batch(sample_ids))
+
+    for vectors in _iter_vector_slices(flat_index):
+        index.add(vectors)
+
+    logger.info(
+        f'Built {index_type.value} index over {count} vectors in {time.time() - start_time:.1f}s'
+    )
+    return index
+
+
+def benchmark_index_types(
+    vectors: np.ndarray,
+    queries: np.ndarray,
+    k: int = 10,
+    index_types: Sequence[IndexType] = (IndexType.FLAT, IndexType.HNSW, IndexType.IVF_PQ),
+    **build_options,
+) -> List[IndexBenchmarkResult]:
+    """Benchmark the recall and latency of index types against the flat baseline.
+
+    Args:
+        vectors: Vectors to index, one per row
+        queries: Query vectors, one per row
+        k: Number of neighbours retrieved per query
+        index_types: Index types to benchmark
+        **build_options: Additional options passed to build_ann_index
+
+    Returns:
+        List of benchmark results, one per index type
+    """
+    vectors = np.ascontiguousarray(vectors, dtype='float32')
+    queries = np.ascontiguousarray(queries, dtype='float32')
+
+    flat_index = faiss.IndexFlatL2(vectors.shape[1])
+    flat_index.add(vectors)
+    _, expected = flat_index.search(queries, k)
+
+    results = []
+    for index_type in index_types:
+        start_time = time.time()
+        index = build_ann_index(flat_index, index_type, **build_options)
+        build_seconds = time.time() - start_time
+
+        start_time = time.time()
+        for query in queries:
+            index.search(query.reshape(1, -1), k)
+        search_seconds = time.time() - start_time
+        _, found = index.search(queries, k)
+
+        hits = sum(len(set(expected[i]) & set(found[i])) for i in range(len(queries)))
+        results.append(
+            IndexBenchmarkResult(
+                index_type=get_index_type(index),
+                vector_count=len(vectors),
+                recall_at_k=hits / (len(queries) * k),
+                k=k,
+                build_seconds=build_seconds,
+                mean_query_ms=search_seconds * 1000 / max(1, len(queries)),
+            )
+        )
+    return results
+
+
+def main():
+    """Run the index benchmark from the command line."""
+    parser = argparse.ArgumentParser(
+        description='Benchmark approximate nearest neighbour indices against a flat index'
+    )
+    parser.add_argument('--index-path', help='Directory of an existing repository index')
+    parser.add_argument('--vectors', type=int, default=100000, help='Number of random vectors')
+    parser.add_argument('--dimensions', type=int, default=1024, help='Random vector dimensions')
+    parser.add_argument('--queries', type=int, default=200, help='Number of queries')
+    parser.add_argument('--k', type=int, default=10, help='Neighbours retrieved per query')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    if args.index_path:
+        index = faiss.read_index(os.path.join(args.index_path, 'index.faiss'))
+        vectors = np.vstack(list(_iter_vector_slices(index)))
+    else:
+        # Clustered data resembles embeddings more closely than uniform noise
+        centers = rng.standard_normal((256, args.dimensions)).astype('float32')
+        vectors = centers[rng.integers(0, 256, args.vectors)]
+        vectors += 0.3 * rng.standard_normal(vectors.shape).astype('float32')
+        faiss.normalize_L2(vectors)
+
+    queries = vectors[rng.choice(len(vectors), size=min(args.queries, len(vectors)))]
+    queries = queries + 0.05 * rng.standard_normal(queries.shape).astype('float32')
+
+    for result in benchmark_index_types(vectors, queries, args.k):
+        print(
+            f'{result.index_type.value:>6}: recall@{result.k}={result.recall_at_k:.3f} '
+            f'mean query={result.mean_query_ms:.3f}ms build={result.build_seconds:.1f}s '
+            f'({result.vector_count} vectors)'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Registry of long-lived clients for Git Repository Research MCP Server.
+
+This module keeps expensive objects such as Bedrock embedding clients and
+repository searchers alive for the lifetime of the server, so that request
+handlers reuse them instead of creating a new boto3 session per request.
+"""
+
+import threading
+import time
+from awslabs.git_repo_research_mcp_server.models import ClientRegistryEntry, ClientRegistryStats
+from loguru import logger
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class ClientRegistry:
+    """Registry of lazily created, shared clients.
+
+    Each client is created on first use for its key and reused afterwards. The
+    registry records how long each client took to create, which is the latency
+    every later request for the same key saves.
+    """
+
+    def __init__(self):
+        """Initialize the client registry."""
+        self._clients: Dict[Hashable, Any] = {}
+        self._creation_seconds: Dict[Hashable, float] = {}
+        self._reuses: Dict[Hashable, int] = {}
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Return the client for a key, creating it on first use.
+
+        Args:
+            key: Key identifying the client, such as (kind, region, profile, model)
+            factory: Function that creates the client
+
+        Returns:
+            The shared client for the key
+        """
+        with self._lock:
+            if key in self._clients:
+                self._reuses[key] += 1
+                return self._clients[key]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Create each client once even when several requests need it at the same time,
+        # without blocking requests for other keys
+        with key_lock:
+            with self._lock:
+                if key in self._clients:
+                    self._reuses[key] += 1
+                    return self._clients[key]
+
+            start_time = time.perf_counter()
+            client = factory()
+            creation_seconds = time.perf_counter() - start_time
+
+            with self._lock:
+                self._clients[key] = client
+                self._creation_seconds[key] = creation_seconds
+                self._reuses[key] = 0
+            logger.debug(f'Created client {key} in {creation_seconds * 1000:.1f}ms')
+            return client
+
+    def clear(self) -> None:
+        """Drop all clients and reset the statistics."""
+        with self._lock:
+            self._clients.clear()
+            self._creation_seconds.clear()
+            self._reuses.clear()
+            self._key_locks.clear()
+
+    def stats(self) -> ClientRegistryStats:
+        """Get registry statistics.
+
+        Returns:
+            ClientRegistryStats object with the creation time and reuse count of each client
+        """
+        with self._lock:
+            entries = [
+                ClientRegistryEntry(
+                    key=':'.join(str(part) for part in key)
+                    if isinstance(key, tuple)
+                    else str(key),
+                    creation_ms=self._creation_seconds[key] * 1000,
+                    reuses=self._reuses[key],
+                    saved_ms=self._creation_seconds[key] * self._reuses[key] * 1000,
+                )
+                for key in self._clients
+            ]
+        return ClientRegistryStats(
+            clients=len(entries),
+            reuses=sum(entry.reuses for entry in entries),
+            creation_ms=sum(entry.creation_ms for entry in entries),
+            saved_ms=sum(entry.saved_ms for entry in entries),
+            entries=entries,
+        )
+
+
+_client_registry: Optional[ClientRegistry] = None
+_client_registry_lock = threading.Lock()
+
+
+def get_client_registry() -> ClientRegistry:
+    """Get the process-wide client registry.
+
+    Returns:
+        ClientRegistry instance shared by all request handlers
+    """
+    global _client_registry
+    with _client_registry_lock:
+        if _client_registry is None:
+            _client_registry = ClientRegistry()
+        return _client_registry
@@ -213,6 +213,86 @@ class Constants:
     # Default directory for storing indices
     DEFAULT_INDEX_DIR = '.git_repo_research'
 
+    # Maximum number of loaded indices kept in the in-process index cache
+    INDEX_CACHE_MAX_ENTRIES = 8
+
+    # File name and maximum size of the persistent embedding cache in the index directory
+    EMBEDDING_CACHE_FILENAME = 'embedding_cache.sqlite3'
+    EMBEDDING_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+
+    # Embedding pipeline batch size, maximum in-flight batches and retries for throttled batches
+    EMBEDDING_BATCH_SIZE = 16
+    EMBEDDING_MAX_CONCURRENCY = 4
+    EMBEDDING_MAX_RETRIES = 5
+
+    # Minimum number of candidate files to read and chunk them in a process pool,
+    # and number of files sent to a worker process at a time
+    SCAN_PARALLEL_MIN_FILES = 256
+    SCAN_MAP_CHUNKSIZE = 64
+
+    # Number of chunks read from the file stream and embedded at a time when building an index
+    STREAM_BATCH_SIZE = 256
+
+    # Chunk counts from which an HNSW or IVF-PQ index is built instead of a flat index
+    ANN_HNSW_MIN_CHUNKS = 50000
+    ANN_IVF_PQ_MIN_CHUNKS = 1000000
+
+    # HNSW graph degree and search depth used while building and querying
+    ANN_HNSW_M = 32
+    ANN_HNSW_EF_CONSTRUCTION = 80
+    ANN_HNSW_EF_SEARCH = 64
+
+    # IVF-PQ training sample size, code size in bits per sub-quantizer and clusters probed
+    ANN_TRAINING_SAMPLE_SIZE = 100000
+    ANN_PQ_BITS = 8
+    ANN_IVF_NPROBE = 16
+
+    # Maximum number of repositories searched at the same time by a multi-repository search
+    MULTI_SEARCH_MAX_CONCURRENCY = 8
+
+    # Maximum number of query embeddings kept in the query embedding cache and their lifetime
+    QUERY_EMBEDDING_CACHE_MAX_ENTRIES = 1024
+    QUERY_EMBEDDING_CACHE_TTL_SECONDS = 3600
+
+    # Maximum number of pooled HTTP connections of each shared Bedrock client
+    BEDROCK_MAX_POOL_CONNECTIONS = 32
+
+    # File name of the lexical index and its BM25 parameters
+    LEXICAL_INDEX_FILENAME = 'lexical_index.npz'
+    LEXICAL_BM25_K1 = 1.2
+    LEXICAL_BM25_B = 0.75
+
+    # Reciprocal rank fusion offset, and candidates retrieved per result by each hybrid retriever
+    RRF_K = 60
+    HYBRID_CANDIDATE_MULTIPLIER = 4
+
+    # File name of the repository manifest, and default number of tree entries served per page
+    MANIFEST_FILENAME = 'manifest.json'
+    REPOSITORY_TREE_PAGE_SIZE = 1000
+
+    # Directory of the content-addressed blob store shared by the indices in an index directory;
+    # the leading dot keeps it apart from index directories, whose names are sanitized
+    BLOB_STORE_DIRNAME = '.blobs'
+
+    # Commits of history cloned for remote repositories, and maximum number of clones at a time
+    CLONE_DEPTH = 1
+    CLONE_MAX_CONCURRENCY = 4
+
+    # Background indexing jobs: jobs running at the same time, finished jobs kept, and the
+    # directory of job records and embedding checkpoints in the index directory
+    INDEXING_JOB_MAX_WORKERS = 2
+    INDEXING_JOB_HISTORY_MAX = 100
+    INDEXING_JOBS_DIRNAME = '.jobs'
+
+    # GitHub search: request timeout and pooled connections of the shared HTTP client, and the
+    # response cache in the index directory with the lifetime of fresh entries and the age after
+    # which entries kept for conditional requests and rate-limited searches are dropped
+    GITHUB_REQUEST_TIMEOUT_SECONDS = 10.0
+    GITHUB_MAX_CONNECTIONS = 10
+    GITHUB_SEARCH_CACHE_FILENAME = 'github_search_cache.db'
+    GITHUB_SEARCH_CACHE_TTL_SECONDS = 3600.0
+    GITHUB_SEARCH_CACHE_MAX_AGE_SECONDS = 7 * 24 * 3600.0
+
     # Default patterns for file inclusion
     DEFAULT_INCLUDE_PATTERNS = [
         '**/*.md',
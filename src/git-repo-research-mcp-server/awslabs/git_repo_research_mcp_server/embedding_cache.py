@@ -0,0 +1,311 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Persistent embedding cache for Git Repository Research MCP Server.
+
+This module provides an on-disk cache of chunk embeddings keyed by the content
+hash of the chunk and the embedding model, so identical chunks are only sent to
+Amazon Bedrock once across repositories and re-index runs.
+"""
+
+import hashlib
+import numpy as np
+import os
+import sqlite3
+import threading
+import time
+from awslabs.git_repo_research_mcp_server.defaults import Constants
+from awslabs.git_repo_research_mcp_server.models import EmbeddingCacheStats
+from langchain_core.embeddings.embeddings import Embeddings
+from loguru import logger
+from typing import Dict, List, Optional
+
+
+def get_embedding_cache_key(model_id: str, text: str) -> str:
+    """Compute the cache key for a chunk embedding.
+
+    Args:
+        model_id: ID of the embedding model
+        text: Text of the chunk
+
+    Returns:
+        Hex SHA-256 digest of the model ID and chunk text
+    """
+    digest = hashlib.sha256()
+    digest.update(model_id.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(text.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class EmbeddingCache:
+    """SQLite-backed cache of embedding vectors with size-based LRU eviction."""
+
+    def __init__(
+        self,
+        cache_path: str,
+        max_size_bytes: Optional[int] = Constants.EMBEDDING_CACHE_MAX_BYTES,
+    ):
+        """Initialize the embedding cache.
+
+        Args:
+            cache_path: Path to the SQLite database file
+            max_size_bytes: Maximum total size of cached vectors in bytes, or None for no limit
+        """
+        self.cache_path = cache_path
+        self.max_size_bytes = max_size_bytes
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+        self._connection = sqlite3.connect(cache_path, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS embeddings ('
+            'key TEXT PRIMARY KEY, vector BLOB NOT NULL, size INTEGER NOT NULL, '
+            'last_used REAL NOT NULL)'
+        )
+        self._connection.execute(
+            'CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)'
+        )
+        self._connection.commit()
+
+        # Running total of the vector sizes, so stores do not scan the whole table
+        row = self._connection.execute('SELECT COALESCE(SUM(size), 0) FROM embeddings').fetchone()
+        self._size = int(row[0])
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Look up cached embeddings.
+
+        Args:
+            keys: Cache keys to look up
+
+        Returns:
+            Dictionary mapping the keys found in the cache to their embeddings
+        """
+        found = {}
+        if not keys:
+            return found
+
+        with self._lock:
+            # Query in batches to stay below SQLite's variable limit
+            for start in range(0, len(keys), 500):
+                batch = keys[start : start + 500]
+                placeholders = ','.join('?' * len(batch))
+                rows = self._connection.execute(
+                    f'SELECT key, vector FROM embeddings WHERE key IN ({placeholders})',  # nosec B608
+                    batch,
+                ).fetchall()
+                for key, vector in rows:
+                    found[key] = np.frombuffer(vector, dtype=np.float32).tolist()
+
+            if found:
+                now = time.time()
+                self._connection.executemany(
+                    'UPDATE embeddings SET last_used = ? WHERE key = ?',
+                    [(now, key) for key in found],
+                )
+                self._connection.commit()
+
+        return found
+
+    def put_many(self, entries: Dict[str, List[float]]) -> None:
+        """Store embeddings in the cache and evict old entries if needed.
+
+        Args:
+            entries: Dictionary mapping cache keys to embeddings
+        """
+        if not entries:
+            return
+
+        now = time.time()
+        rows = []
+        for key, embedding in entries.items():
+            vector = np.asarray(embedding, dtype=np.float32).tobytes()
+            rows.append((key, vector, len(vector), now))
+
+        with self._lock:
+            # Subtract the size of the entries that are replaced
+            keys = list(entries)
+            for start in range(0, len(keys), 500):
+                batch = keys[start : start + 500]
+                placeholders = ','.join('?' * len(batch))
+                row = self._connection.execute(
+                    f'SELECT COALESCE(SUM(size), 0) FROM embeddings WHERE key IN ({placeholders})',  # nosec B608
+                    batch,
+                ).fetchone()
+                self._size -= int(row[0])
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO embeddings (key, vector, size, last_used) '
+                'VALUES (?, ?, ?, ?)',
+                rows,
+            )
+            self._size += sum(row[2] for row in rows)
+            self._evict()
+            self._connection.commit()
+
+    def _evict(self) -> None:
+        """Evict least recently used entries until the cache fits its size bound."""
+        if self.max_size_bytes is None or self._size <= self.max_size_bytes:
+            return
+
+        to_free = self._size - self.max_size_bytes
+        evicted_keys = []
+        for key, size in self._connection.execute(
+            'SELECT key, size FROM embeddings ORDER BY last_used ASC'
+        ):
+            evicted_keys.append((key,))
+            to_free -= size
+            self._size -= size
+            if to_free <= 0:
+                break
+
+        self._connection.executemany('DELETE FROM embeddings WHERE key = ?', evicted_keys)
+        self.evictions += len(evicted_keys)
+        logger.debug(f'Evicted {len(evicted_keys)} embeddings from cache')
+
+    def size_bytes(self) -> int:
+        """Get the total size of the cached vectors in bytes.
+
+        Returns:
+            Total size in bytes
+        """
+        with self._lock:
+            return self._size
+
+    def __len__(self) -> int:
+        """Get the number of cached embeddings."""
+        with self._lock:
+            row = self._connection.execute('SELECT COUNT(*) FROM embeddings').fetchone()
+            return int(row[0])
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._connection.close()
+
+
+class CachedEmbeddings(Embeddings):
+    """LangChain embeddings wrapper that consults an EmbeddingCache before the model.
+
+    Document embeddings are looked up by content hash; only texts missing from the
+    cache are sent to the wrapped model, in a single call. Query embeddings are
+    passed through unchanged.
+    """
+
+    def __init__(self, embeddings: Embeddings, cache: EmbeddingCache, model_id: str):
+        """Initialize the cached embeddings.
+
+        Args:
+            embeddings: Wrapped embedding model
+            cache: Embedding cache to consult
+            model_id: ID of the embedding model, used in the cache key
+        """
+        self.embeddings = embeddings
+        self.cache = cache
+        self.model_id = model_id
+        self.hits = 0
+        self.misses = 0
+        # Batches are embedded from several pipeline worker threads at once
+        self._stats_lock = threading.Lock()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents, reusing cached embeddings where available.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            List of embeddings, one per text
+        """
+        keys = [get_embedding_cache_key(self.model_id, text) for text in texts]
+        cached = self.cache.get_many(list(set(keys)))
+
+        # Embed each distinct missing text once
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+
+        if missing:
+            new_embeddings = self.embeddings.embed_documents(list(missing.values()))
+            computed = dict(zip(missing.keys(), new_embeddings))
+            self.cache.put_many(computed)
+            cached.update(computed)
+
+        with self._stats_lock:
+            self.misses += len(missing)
+            self.hits += len(texts) - len(missing)
+        return [cached[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query with the wrapped model.
+
+        Args:
+            text: Query text
+
+        Returns:
+            Query embedding
+        """
+        return self.embeddings.embed_query(text)
+
+    def stats(self) -> EmbeddingCacheStats:
+        """Get cache statistics for the texts embedded through this wrapper.
+
+        Returns:
+            EmbeddingCacheStats object
+        """
+        with self._stats_lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return EmbeddingCacheStats(
+            hits=hits,
+            misses=misses,
+            hit_rate=hits / lookups if lookups else 0.0,
+            evictions=self.cache.evictions,
+            cache_size_bytes=self.cache.size_bytes(),
+        )
+
+
+_embedding_caches: Dict[str, EmbeddingCache] = {}
+_embedding_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(index_dir: str) -> Optional[EmbeddingCache]:
+    """Get the embedding cache stored in an index directory.
+
+    The cache size can be overridden with the EMBEDDING_CACHE_MAX_BYTES environment
+    variable; a value of 0 disables the cache.
+
+    Args:
+        index_dir: Directory where indices are stored
+
+    Returns:
+        EmbeddingCache instance, or None if the cache is disabled or unavailable
+    """
+    max_size_bytes = Constants.EMBEDDING_CACHE_MAX_BYTES
+    try:
+        max_size_bytes = int(os.environ.get('EMBEDDING_CACHE_MAX_BYTES', max_size_bytes))
+    except ValueError:
+        logger.warning('Invalid EMBEDDING_CACHE_MAX_BYTES, using default')
+    if max_size_bytes <= 0:
+        return None
+
+    cache_path = os.path.abspath(os.path.join(index_dir, Constants.EMBEDDING_CACHE_FILENAME))
+    with _embedding_caches_lock:
+        cache = _embedding_caches.get(cache_path)
+        if cache is None:
+            try:
+                cache = EmbeddingCache(cache_path, max_size_bytes=max_size_bytes)
+            except Exception as e:
+                logger.warning(f'Embedding cache unavailable at {cache_path}: {e}')
+                return None
+            _embedding_caches[cache_path] = cache
+        return cache
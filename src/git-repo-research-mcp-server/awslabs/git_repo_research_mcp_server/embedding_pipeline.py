@@ -0,0 +1,259 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Concurrent embedding pipeline for Git Repository Research MCP Server.
+
+This module embeds document batches on worker threads with a bounded number of
+in-flight requests, adapts its concurrency when the embedding service throttles,
+and adds vectors to a FAISS vector store as each batch completes.
+"""
+
+import asyncio
+import random
+import time
+from awslabs.git_repo_research_mcp_server.defaults import Constants
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from loguru import logger
+from typing import Any, List, Optional
+
+
+THROTTLING_ERROR_CODES = (
+    'ThrottlingException',
+    'TooManyRequestsException',
+    'ServiceUnavailableException',
+    'ModelNotReadyException',
+)
+
+
+def is_throttling_error(error: Exception) -> bool:
+    """Check if an exception was caused by the embedding service throttling requests.
+
+    LangChain wraps Bedrock client errors in a ValueError, so the error message is
+    inspected in addition to the botocore error code.
+
+    Args:
+        error: Exception raised by the embedding model
+
+    Returns:
+        True if the request should be retried after backing off
+    """
+    response = getattr(error, 'response', None)
+    if isinstance(response, dict):
+        code = response.get('Error', {}).get('Code')
+        if code in THROTTLING_ERROR_CODES:
+            return True
+
+    message = str(error)
+    return any(code in message for code in THROTTLING_ERROR_CODES) or (
+        'Rate exceeded' in message or 'Too many requests' in message
+    )
+
+
+class EmbeddingPipeline:
+    """Bounded-concurrency embedding pipeline that streams vectors into FAISS.
+
+    Documents are split into batches that are embedded on worker threads so the
+    event loop stays responsive. At most max_concurrency batches are in flight;
+    the limit is halved whenever the service throttles and grows back by one
+    after each run of successful batches.
+    """
+
+    def __init__(
+        self,
+        embeddings: Any,
+        batch_size: int = Constants.EMBEDDING_BATCH_SIZE,
+        max_concurrency: int = Constants.EMBEDDING_MAX_CONCURRENCY,
+        max_retries: int = Constants.EMBEDDING_MAX_RETRIES,
+        initial_backoff_seconds: float = 1.0,
+        max_backoff_seconds: float = 30.0,
+    ):
+        """Initialize the embedding pipeline.
+
+        Args:
+            embeddings: LangChain embeddings used to embed documents
+            batch_size: Number of documents embedded per request batch
+            max_concurrency: Maximum number of batches in flight
+            max_retries: Maximum number of retries for a throttled batch
+            initial_backoff_seconds: Backoff before the first retry
+            max_backoff_seconds: Maximum backoff between retries
+        """
+        self.embeddings = embeddings
+        self.batch_size = max(1, batch_size)
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.initial_backoff_seconds = initial_backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+
+        self.concurrency_limit = self.max_concurrency
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.throttle_count = 0
+        self.retry_count = 0
+        self.embedded_count = 0
+        self.batch_count = 0
+        self.elapsed_seconds = 0.0
+        self._successes_since_throttle = 0
+        self._condition: Optional[asyncio.Condition] = None
+
+    async def _acquire(self) -> None:
+        """Wait for a free slot under the current concurrency limit."""
+        assert self._condition is not None
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.concurrency_limit)
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    async def _release(self, throttled: bool) -> None:
+        """Release a slot and adapt the concurrency limit.
+
+        Args:
+            throttled: Whether the request that held the slot was throttled
+        """
+        assert self._condition is not None
+        async with self._condition:
+            self.in_flight -= 1
+            if throttled:
+                self.concurrency_limit = max(1, self.concurrency_limit // 2)
+                self._successes_since_throttle = 0
+            else:
+                self._successes_since_throttle += 1
+                if (
+                    self.concurrency_limit < self.max_concurrency
+                    and self._successes_since_throttle >= self.concurrency_limit
+                ):
+                    self.concurrency_limit += 1
+                    self._successes_since_throttle = 0
+            self._condition.notify_all()
+
+    async def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed a batch of texts, backing off and retrying when throttled.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            List of embeddings, one per text
+        """
+        attempt = 0
+        while True:
+            await self._acquire()
+            throttled = False
+            try:
+                return await asyncio.to_thread(self.embeddings.embed_documents, texts)
+            except Exception as e:
+                if not is_throttling_error(e) or attempt >= self.max_retries:
+                    raise
+                throttled = True
+            finally:
+                await self._release(throttled)
+
+            self.throttle_count += 1
+            self.retry_count += 1
+            delay = min(self.max_backoff_seconds, self.initial_backoff_seconds * 2**attempt)
+            delay = delay / 2 + random.uniform(0, delay / 2)  # nosec B311 - jitter only
+            logger.warning(
+                f'Embedding request throttled, retrying in {delay:.1f}s '
+                f'(concurrency limit {self.concurrency_limit})'
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def embed_documents(
+        self,
+        documents: List[Document],
+        vector_store: Optional[FAISS] = None,
+        ctx: Optional[Any] = None,
+        progress_start: int = 75,
+        progress_end: int = 90,
+    ) -> Optional[FAISS]:
+        """Embed documents and add their vectors to a FAISS vector store.
+
+        Batches are added to the vector store in completion order, so only the
+        batches currently in flight are held in memory as raw embeddings. If every
+        document has an integer chunk_id in its metadata, it is used as the
+        document ID in the vector store.
+
+        Args:
+            documents: LangChain Document objects to embed
+            vector_store: Vector store to add to (optional, created from the first batch)
+            ctx: Context object for progress tracking (optional)
+            progress_start: Progress value reported before the first batch
+            progress_end: Progress value reported after the last batch
+
+        Returns:
+            The vector store, or None if no documents were given and no store was passed
+        """
+        if not documents:
+            return vector_store
+
+        self._condition = asyncio.Condition()
+        start_time = time.time()
+        batches = [
+            documents[start : start + self.batch_size]
+            for start in range(0, len(documents), self.batch_size)
+        ]
+        use_chunk_ids = all(isinstance(doc.metadata.get('chunk_id'), int) for doc in documents)
+
+        async def run(batch: List[Document]):
+            embeddings = await self._embed_batch([doc.page_content for doc in batch])
+            return batch, embeddings
+
+        tasks = [asyncio.create_task(run(batch)) for batch in batches]
+        embedded = 0
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                batch, embeddings = await next_result
+                text_embeddings = list(zip([doc.page_content for doc in batch], embeddings))
+                metadatas = [doc.metadata for doc in batch]
+                ids = [str(doc.metadata['chunk_id']) for doc in batch] if use_chunk_ids else None
+                if vector_store is None:
+                    vector_store = FAISS.from_embeddings(
+                        text_embeddings=text_embeddings,
+                        embedding=self.embeddings,
+                        metadatas=metadatas,
+                        ids=ids,
+                        normalize_L2=True,
+                    )
+                else:
+                    vector_store.add_embeddings(
+                        text_embeddings=text_embeddings, metadatas=metadatas, ids=ids
+                    )
+
+                embedded += len(batch)
+                if ctx:
+                    progress = progress_start + (progress_end - progress_start) * embedded // len(
+                        documents
+                    )
+                    await ctx.report_progress(progress, 100)
+        except BaseException:
+            # Also stop the batches in flight when the indexing job is cancelled
+            for task in tasks:
+                task.cancel()
+            raise
+
+        self.embedded_count += embedded
+        self.batch_count += len(batches)
+        self.elapsed_seconds += time.time() - start_time
+        logger.debug(self.summary())
+        return vector_store
+
+    def summary(self) -> str:
+        """Describe the work done by the pipeline so far.
+
+        Returns:
+            Human-readable summary of embedded chunks, throughput and throttling
+        """
+        rate = self.embedded_count / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+        return (
+            f'Embedded {self.embedded_count} chunks in {self.batch_count} batches in '
+            f'{self.elapsed_seconds:.1f}s ({rate:.1f} chunks/s, peak {self.peak_in_flight} '
+            f'in flight, {self.throttle_count} throttled requests)'
+        )
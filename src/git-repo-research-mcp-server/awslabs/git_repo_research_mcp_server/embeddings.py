@@ -11,15 +11,76 @@
 """Embeddings generation for Git Repository Research MCP Server.
 
 This module provides functionality for generating embeddings from text
-using Amazon Bedrock models via LangChain.
+using Amazon Bedrock models via LangChain, and a local stub backend for
+offline testing and benchmarking.
 """
 
+import hashlib
 import os
+import time
+from awslabs.git_repo_research_mcp_server.client_registry import get_client_registry
+from awslabs.git_repo_research_mcp_server.defaults import Constants
 from awslabs.git_repo_research_mcp_server.models import EmbeddingModel
+from botocore.config import Config
 from langchain_aws import BedrockEmbeddings
 from langchain_core.embeddings.embeddings import Embeddings
 from loguru import logger
-from typing import Optional
+from typing import List, Optional
+
+
+class StubEmbeddings(Embeddings):
+    """Deterministic local embedding backend that does not call Amazon Bedrock.
+
+    Each text is mapped to a pseudo-random unit vector derived from its SHA-256
+    hash. An optional per-text latency simulates the round trip to a remote model
+    so that indexing throughput can be benchmarked offline.
+    """
+
+    def __init__(self, dimensions: int = 1024, latency_seconds: float = 0.0):
+        """Initialize the stub embeddings.
+
+        Args:
+            dimensions: Number of dimensions of the generated vectors
+            latency_seconds: Simulated latency per embedded text in seconds
+        """
+        self.dimensions = dimensions
+        self.latency_seconds = latency_seconds
+
+    def _embed(self, text: str) -> List[float]:
+        """Generate the embedding for a single text."""
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        vector = []
+        counter = 0
+        while len(vector) < self.dimensions:
+            digest = hashlib.sha256(f'{counter}:{text}'.encode('utf-8')).digest()
+            vector.extend(byte / 127.5 - 1.0 for byte in digest)
+            counter += 1
+        vector = vector[: self.dimensions]
+        norm = sum(value * value for value in vector) ** 0.5 or 1.0
+        return [value / norm for value in vector]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            List of embeddings, one per text
+        """
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query.
+
+        Args:
+            text: Query text
+
+        Returns:
+            Query embedding
+        """
+        return self._embed(text)
 
 
 def create_bedrock_embeddings(
@@ -43,6 +104,10 @@ def create_bedrock_embeddings(
         model_id=model_id,
         region_name=aws_region,
         credentials_profile_name=aws_profile,
+        # Keep enough connections alive for the concurrent embedding and search requests
+        config=Config(
+            max_pool_connections=Constants.BEDROCK_MAX_POOL_CONNECTIONS, tcp_keepalive=True
+        ),
     )
     logger.info(f'Created BedrockEmbeddings with model: {model_id}')
     return bedrock_embeddings
@@ -62,5 +127,21 @@ def get_embedding_model(
 
     Returns:
         Embeddings instance
+
+    Setting the EMBEDDING_BACKEND environment variable to "stub" returns a local
+    StubEmbeddings instance instead of Amazon Bedrock embeddings. The simulated
+    latency per text can be set with STUB_EMBEDDING_LATENCY_MS.
+
+    Bedrock embedding clients are created once per region, profile and model and
+    shared through the process-wide client registry.
     """
-    return create_bedrock_embeddings(model_id, aws_region, aws_profile)
+    if os.environ.get('EMBEDDING_BACKEND', '').lower() == 'stub':
+        latency_ms = float(os.environ.get('STUB_EMBEDDING_LATENCY_MS', '0'))
+        logger.info(f'Using stub embeddings with {latency_ms}ms simulated latency')
+        return StubEmbeddings(latency_seconds=latency_ms / 1000)
+
+    aws_region = aws_region or os.environ.get('AWS_REGION', 'us-west-2')
+    return get_client_registry().get_or_create(
+        ('bedrock-embeddings', aws_region, aws_profile, getattr(model_id, 'value', model_id)),
+        lambda: create_bedrock_embeddings(model_id, aws_region, aws_profile),
+    )
@@ -10,15 +10,27 @@
 # and limitations under the License.
 """GitHub repository search functionality for Git Repository Research MCP Server.
 
-This module provides functionality for searching GitHub repositories using the GitHub GraphQL API.
+This module provides functionality for searching GitHub repositories using the GitHub GraphQL
+and REST APIs. Requests share one pooled async HTTP client, and the REST API is queried for all
+organizations at the same time. Search results and API responses are kept in an on-disk cache
+that serves repeated searches, revalidates responses with conditional requests, and answers
+searches while the rate limit of an API is spent instead of waiting for it to reset.
 """
 
+import asyncio
 import backoff
+import hashlib
+import httpx
+import json
 import os
-import requests
+import sqlite3
+import threading
 import time
+from awslabs.git_repo_research_mcp_server.client_registry import get_client_registry
+from awslabs.git_repo_research_mcp_server.defaults import Constants
+from awslabs.git_repo_research_mcp_server.models import GitHubSearchCacheEntry
 from loguru import logger
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Mapping, Optional
 
 
 # GitHub GraphQL API query for repository search
@@ -64,19 +76,326 @@ query SearchRepositories($query: String!, $numResults: Int!) {
 """
 
 
+class GitHubRateLimitExceeded(Exception):
+    """Raised instead of waiting when the rate limit of a GitHub API is spent."""
+
+    def __init__(self, resource: str, retry_after: float):
+        """Initialize the exception.
+
+        Args:
+            resource: GitHub API rate limit resource, such as graphql or search
+            retry_after: Seconds until the rate limit resets
+        """
+        super().__init__(
+            f'GitHub {resource} API rate limit exceeded, resets in {retry_after:.0f} seconds'
+        )
+        self.resource = resource
+        self.retry_after = retry_after
+
+
+class RateLimitBudget:
+    """Remaining GitHub API rate limit of each resource.
+
+    The budget is updated from the rate limit headers of every response. Once
+    the limit of a resource is spent, requests to it are shed until the limit
+    resets, so searches are answered from the cache or come back empty instead
+    of sleeping.
+    """
+
+    def __init__(self):
+        """Initialize the rate limit budget."""
+        self._limits: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        self.shed_requests = 0
+
+    def update(self, resource: str, headers: Mapping[str, str]) -> None:
+        """Update the budget of a resource from the rate limit headers of a response.
+
+        Args:
+            resource: GitHub API rate limit resource
+            headers: Response headers
+        """
+        try:
+            remaining = int(headers['X-RateLimit-Remaining'])
+            reset_at = float(headers['X-RateLimit-Reset'])
+        except (KeyError, TypeError, ValueError):
+            return
+        with self._lock:
+            self._limits[resource] = {'remaining': remaining, 'reset_at': reset_at}
+
+    def exhaust(self, resource: str, reset_at: float) -> None:
+        """Mark the budget of a resource as spent until it resets.
+
+        Args:
+            resource: GitHub API rate limit resource
+            reset_at: Time the rate limit resets, in seconds since the epoch
+        """
+        with self._lock:
+            self._limits[resource] = {'remaining': 0, 'reset_at': reset_at}
+
+    def seconds_until_reset(self, resource: str) -> float:
+        """Get how long the budget of a resource stays spent.
+
+        Args:
+            resource: GitHub API rate limit resource
+
+        Returns:
+            Seconds until the rate limit resets, or 0 if requests can be made
+        """
+        with self._lock:
+            limit = self._limits.get(resource)
+        if limit is None or limit['remaining'] > 0:
+            return 0.0
+        return max(limit['reset_at'] - time.time(), 0.0)
+
+    def check(self, resource: str) -> None:
+        """Check that a request to a resource can be made.
+
+        Args:
+            resource: GitHub API rate limit resource
+
+        Raises:
+            GitHubRateLimitExceeded: If the budget of the resource is spent
+        """
+        retry_after = self.seconds_until_reset(resource)
+        if retry_after > 0:
+            with self._lock:
+                self.shed_requests += 1
+            raise GitHubRateLimitExceeded(resource, retry_after)
+
+
+class GitHubSearchCache:
+    """SQLite-backed cache of GitHub search results and API responses.
+
+    Entries younger than the time to live are served without a request. Older
+    entries are kept until the maximum age, to revalidate them with their ETag
+    and to answer searches while the rate limit is spent.
+    """
+
+    def __init__(
+        self,
+        cache_path: str,
+        ttl_seconds: float = Constants.GITHUB_SEARCH_CACHE_TTL_SECONDS,
+        max_age_seconds: float = Constants.GITHUB_SEARCH_CACHE_MAX_AGE_SECONDS,
+    ):
+        """Initialize the GitHub search cache.
+
+        Args:
+            cache_path: Path to the SQLite database file
+            ttl_seconds: Time after which entries are revalidated, in seconds
+            max_age_seconds: Time after which entries are dropped, in seconds
+        """
+        self.cache_path = cache_path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(cache_path)), exist_ok=True)
+        self._connection = sqlite3.connect(cache_path, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS responses ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, etag TEXT, stored_at REAL NOT NULL)'
+        )
+        self._connection.execute(
+            'DELETE FROM responses WHERE stored_at < ?', (time.time() - max_age_seconds,)
+        )
+        self._connection.commit()
+
+    def get(self, key: str) -> Optional[GitHubSearchCacheEntry]:
+        """Look up a cache entry, fresh or not.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            GitHubSearchCacheEntry, or None if the key is not cached
+        """
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT value, etag, stored_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return GitHubSearchCacheEntry(value=json.loads(row[0]), etag=row[1], stored_at=row[2])
+
+    def put(self, key: str, value: Any, etag: Optional[str] = None) -> None:
+        """Store a cache entry.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable search results or response body
+            etag: ETag of the API response
+        """
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO responses (key, value, etag, stored_at) '
+                'VALUES (?, ?, ?, ?)',
+                (key, json.dumps(value), etag, time.time()),
+            )
+            self._connection.commit()
+
+    def is_fresh(self, entry: GitHubSearchCacheEntry) -> bool:
+        """Check whether an entry can be served without a request.
+
+        Args:
+            entry: Cache entry
+
+        Returns:
+            True if the entry is younger than the time to live
+        """
+        return time.time() - entry.stored_at < self.ttl_seconds
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._connection.close()
+
+
+def get_cache_key(kind: str, **fields: Any) -> str:
+    """Compute a cache key from the fields that identify a search or request.
+
+    Args:
+        kind: Kind of cached value, such as graphql, rest or a request path
+        **fields: JSON-serializable fields identifying the value
+
+    Returns:
+        Hex SHA-256 digest of the kind and fields
+    """
+    payload = json.dumps({'kind': kind, **fields}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def get_search_cache_key(
+    api: str,
+    keywords: List[str],
+    organizations: List[str],
+    license_filter: Optional[List[str]],
+    num_results: int,
+) -> str:
+    """Compute the cache key of a repository search.
+
+    Keywords, organizations and licenses are order- and case-insensitive, as
+    they are in the search.
+
+    Args:
+        api: GitHub API used for the search, graphql or rest
+        keywords: List of keywords to search for
+        organizations: List of GitHub organizations the search is scoped to
+        license_filter: Optional list of license names repositories are filtered by
+        num_results: Number of results to return
+
+    Returns:
+        Cache key of the search
+    """
+    return get_cache_key(
+        api,
+        keywords=sorted({keyword.lower() for keyword in keywords}),
+        organizations=sorted({org.lower() for org in organizations}),
+        license_filter=sorted(license_filter or []),
+        num_results=num_results,
+    )
+
+
+_github_search_cache: Optional[GitHubSearchCache] = None
+_rate_limit_budget: Optional[RateLimitBudget] = None
+_github_search_lock = threading.Lock()
+
+
+def get_github_search_cache() -> GitHubSearchCache:
+    """Get the process-wide GitHub search cache.
+
+    The cache is stored in the default index directory, and the time to live
+    of its entries can be overridden with the GITHUB_SEARCH_CACHE_TTL_SECONDS
+    environment variable.
+
+    Returns:
+        GitHubSearchCache instance shared by all searches
+    """
+    global _github_search_cache
+    with _github_search_lock:
+        if _github_search_cache is None:
+            ttl_seconds = Constants.GITHUB_SEARCH_CACHE_TTL_SECONDS
+            try:
+                ttl_seconds = float(os.environ.get('GITHUB_SEARCH_CACHE_TTL_SECONDS', ttl_seconds))
+            except (TypeError, ValueError):
+                logger.warning('Invalid GitHub search cache time to live, using the default')
+            _github_search_cache = GitHubSearchCache(
+                os.path.join(
+                    os.path.expanduser(f'~/{Constants.DEFAULT_INDEX_DIR}'),
+                    Constants.GITHUB_SEARCH_CACHE_FILENAME,
+                ),
+                ttl_seconds=ttl_seconds,
+            )
+        return _github_search_cache
+
+
+def get_rate_limit_budget() -> RateLimitBudget:
+    """Get the process-wide GitHub API rate limit budget.
+
+    Returns:
+        RateLimitBudget instance shared by all searches
+    """
+    global _rate_limit_budget
+    with _github_search_lock:
+        if _rate_limit_budget is None:
+            _rate_limit_budget = RateLimitBudget()
+        return _rate_limit_budget
+
+
+def get_github_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client for the GitHub API.
+
+    Returns:
+        httpx.AsyncClient with pooled connections to the GitHub API
+    """
+    return get_client_registry().get_or_create(
+        ('github-http-client',),
+        lambda: httpx.AsyncClient(
+            base_url='https://api.github.com',
+            timeout=Constants.GITHUB_REQUEST_TIMEOUT_SECONDS,
+            limits=httpx.Limits(max_connections=Constants.GITHUB_MAX_CONNECTIONS),
+        ),
+    )
+
+
+def _is_rate_limited(response: httpx.Response) -> bool:
+    """Check whether a response was rejected by the GitHub API rate limit."""
+    if response.status_code not in (403, 429):
+        return False
+    return (
+        'rate limit' in response.text.lower()
+        or response.headers.get('X-RateLimit-Remaining') == '0'
+    )
+
+
+def _get_reset_time(response: httpx.Response) -> float:
+    """Get the time a rate-limited request can be retried, in seconds since the epoch."""
+    try:
+        return float(response.headers['X-RateLimit-Reset'])
+    except (KeyError, TypeError, ValueError):
+        pass
+    try:
+        return time.time() + float(response.headers['Retry-After'])
+    except (KeyError, TypeError, ValueError):
+        return time.time() + 60
+
+
+def _is_auth_failure(e: Exception) -> bool:
+    """Check whether a request failed because of invalid credentials."""
+    response = getattr(e, 'response', None)
+    return response is not None and getattr(response, 'status_code', None) == 401
+
+
 @backoff.on_exception(
     backoff.expo,
-    (requests.exceptions.RequestException, requests.exceptions.HTTPError),
+    httpx.HTTPError,
     max_tries=5,
-    giveup=lambda e: bool(
-        (response := getattr(e, 'response', None))
-        and getattr(response, 'status_code', None) == 401
-    ),  # Don't retry on auth failures
+    giveup=_is_auth_failure,  # Don't retry on auth failures
 )
-def github_graphql_request(
+async def github_graphql_request(
     query: str, variables: Dict[str, Any], token: Optional[str] = None
 ) -> Dict[str, Any]:
-    """Make a request to the GitHub GraphQL API with exponential backoff for rate limiting.
+    """Make a request to the GitHub GraphQL API with exponential backoff for transient errors.
 
     Args:
         query: The GraphQL query
@@ -85,7 +404,13 @@ def github_graphql_request(
 
     Returns:
         The JSON response from the API
+
+    Raises:
+        GitHubRateLimitExceeded: If the GraphQL API rate limit is spent
     """
+    budget = get_rate_limit_budget()
+    budget.check('graphql')
+
     headers = {
         'Content-Type': 'application/json',
     }
@@ -95,44 +420,96 @@ def github_graphql_request(
         headers['Authorization'] = f'Bearer {token}'
 
     try:
-        response = requests.post(
-            'https://api.github.com/graphql',
+        response = await get_github_client().post(
+            '/graphql',
             headers=headers,
             json={'query': query, 'variables': variables},
-            timeout=10,  # Add 10 second timeout to prevent hanging requests
         )
+        budget.update('graphql', response.headers)
 
-        # Check for rate limiting
-        if response.status_code == 403 and 'rate limit' in response.text.lower():
-            # For unauthenticated requests, don't wait - just log and return empty response
+        # Shed the request instead of waiting for the rate limit to reset
+        if _is_rate_limited(response):
             if not token:
                 logger.warning(
                     'Rate limited by GitHub API and no token provided. Consider adding a GITHUB_TOKEN.'
                 )
-                return {'data': {'search': {'edges': []}}}
-
-            # For authenticated requests, check reset time but cap at reasonable value
-            reset_time = int(response.headers.get('X-RateLimit-Reset', 0))
-            current_time = int(time.time())
-            wait_time = min(max(reset_time - current_time, 0), 60)  # Cap at 60 seconds
-
-            if wait_time > 0:
-                logger.warning(f'Rate limited by GitHub API. Waiting {wait_time} seconds.')
-                time.sleep(wait_time)
-                # Retry the request
-                return github_graphql_request(query, variables, token)
+            budget.exhaust('graphql', _get_reset_time(response))
+            raise GitHubRateLimitExceeded('graphql', budget.seconds_until_reset('graphql'))
 
         # Raise exception for other HTTP errors
         response.raise_for_status()
 
         return response.json()
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f'GitHub API request error: {str(e)}')
         raise
 
 
-def github_repo_search_graphql(
+@backoff.on_exception(
+    backoff.expo,
+    httpx.HTTPError,
+    max_tries=3,
+    giveup=_is_auth_failure,
+)
+async def github_rest_request(path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Make a conditional request to the GitHub REST search API.
+
+    Responses are cached with their ETag. A cached response is revalidated with
+    If-None-Match, and served as is when the API answers 304 Not Modified or
+    when the search API rate limit is spent.
+
+    Args:
+        path: Path of the API endpoint
+        params: Query parameters
+
+    Returns:
+        The JSON response from the API
+
+    Raises:
+        GitHubRateLimitExceeded: If the search API rate limit is spent and the
+            response is not cached
+    """
+    cache = get_github_search_cache()
+    budget = get_rate_limit_budget()
+    key = get_cache_key(path, params=params)
+    # The cache runs SQLite queries and commits, so keep them off the event loop
+    entry = await asyncio.to_thread(cache.get, key)
+
+    try:
+        budget.check('search')
+    except GitHubRateLimitExceeded as e:
+        if entry is None:
+            raise
+        logger.info(f'{e}, serving the cached response of {path}')
+        return entry.value
+
+    headers = {'Accept': 'application/vnd.github.v3+json'}
+    if entry is not None and entry.etag:
+        headers['If-None-Match'] = entry.etag
+
+    response = await get_github_client().get(path, params=params, headers=headers)
+    budget.update('search', response.headers)
+
+    if response.status_code == 304 and entry is not None:
+        await asyncio.to_thread(cache.put, key, entry.value, entry.etag)
+        return entry.value
+
+    if _is_rate_limited(response):
+        budget.exhaust('search', _get_reset_time(response))
+        if entry is None:
+            raise GitHubRateLimitExceeded('search', budget.seconds_until_reset('search'))
+        logger.warning(f'Rate limited by GitHub API, serving the cached response of {path}')
+        return entry.value
+
+    response.raise_for_status()
+
+    data = response.json()
+    await asyncio.to_thread(cache.put, key, data, response.headers.get('ETag'))
+    return data
+
+
+async def github_repo_search_graphql(
     keywords: List[str],
     organizations: List[str],
     num_results: int = 5,
@@ -150,6 +527,9 @@ def github_repo_search_graphql(
 
     Returns:
         List of GitHub repositories matching the search criteria
+
+    Raises:
+        GitHubRateLimitExceeded: If the GraphQL API rate limit is spent
     """
     # Build the search query with organization filters
     org_filters = ' '.join([f'org:{org}' for org in organizations])
@@ -165,7 +545,7 @@ def github_repo_search_graphql(
             'numResults': num_results * 2,  # Request more than needed to filter
         }
 
-        response = github_graphql_request(GITHUB_GRAPHQL_QUERY, variables, token)
+        response = await github_graphql_request(GITHUB_GRAPHQL_QUERY, variables, token)
 
         if 'errors' in response:
             error_messages = [
@@ -244,6 +624,8 @@ def github_repo_search_graphql(
         logger.info(f'Found {len(repo_results)} GitHub repositories via GraphQL API')
         return repo_results
 
+    except GitHubRateLimitExceeded:
+        raise
     except Exception as e:
         logger.error(f'GitHub GraphQL search error: {str(e)}')
         return []
@@ -301,49 +683,71 @@ def extract_org_from_url(url: str) -> Optional[str]:
     return org
 
 
-def github_repo_search_rest(
+async def github_repo_search_rest(
     keywords: List[str],
     organizations: List[str],
     num_results: int = 5,
     license_filter: Optional[List[str]] = None,
+    errors: Optional[List[str]] = None,
 ) -> List[Dict[str, Any]]:
     """Search GitHub repositories using the REST API.
 
     This is a fallback for when GraphQL API is rate limited and no token is provided.
+    Each organization is searched separately, all at the same time.
 
     Args:
         keywords: List of keywords to search for
         organizations: List of GitHub organizations to scope the search to
         num_results: Number of results to return
         license_filter: Optional list of license names to filter repositories by
+        errors: Optional list the organizations that could not be searched are added to
 
     Returns:
         List of GitHub repositories matching the search criteria
-    """
-    repo_results = []
-    processed_urls = set()
 
-    # Process each organization separately
+    Raises:
+        GitHubRateLimitExceeded: If the search API rate limit is spent and no
+            organization could be searched
+    """
+    keyword_string = ' OR '.join(keywords)
     for org in organizations:
-        try:
-            # Build the search query for this organization
-            keyword_string = '+OR+'.join(keywords)
-            query_string = f'{keyword_string}+org:{org}'
-
-            logger.info(f'Searching GitHub REST API for org {org}')
+        logger.info(f'Searching GitHub REST API for org {org}')
 
-            # Make the REST API request
-            response = requests.get(
-                f'https://api.github.com/search/repositories?q={query_string}&sort=stars&order=desc&per_page={num_results}',
-                headers={'Accept': 'application/vnd.github.v3+json'},
-                timeout=10,  # Add 10 second timeout to prevent hanging requests
+    responses = await asyncio.gather(
+        *(
+            github_rest_request(
+                '/search/repositories',
+                {
+                    'q': f'{keyword_string} org:{org}',
+                    'sort': 'stars',
+                    'order': 'desc',
+                    'per_page': num_results,
+                },
             )
+            for org in organizations
+        ),
+        return_exceptions=True,
+    )
 
-            # Check for errors
-            response.raise_for_status()
+    repo_results = []
+    processed_urls = set()
+    rate_limit_error = None
+
+    # Process the organizations in order, so that results do not depend on response timing
+    for org, data in zip(organizations, responses):
+        if isinstance(data, GitHubRateLimitExceeded):
+            logger.warning(f'Skipped GitHub REST API search for org {org}: {data}')
+            rate_limit_error = data
+            if errors is not None:
+                errors.append(org)
+            continue
+        if isinstance(data, Exception):
+            logger.error(f'GitHub REST API error for org {org}: {str(data)}')
+            if errors is not None:
+                errors.append(org)
+            continue
 
-            # Parse the response
-            data = response.json()
+        try:
             items = data.get('items', [])
 
             # Process each repository
@@ -389,20 +793,26 @@ def github_repo_search_rest(
                 if len(repo_results) >= num_results:
                     break
 
-            # Add a small delay between requests to avoid rate limiting
-            time.sleep(1)
-
         except Exception as e:
             logger.error(f'GitHub REST API error for org {org}: {str(e)}')
+            if errors is not None:
+                errors.append(org)
             continue
 
+    if rate_limit_error is not None and not repo_results:
+        raise rate_limit_error
+
     logger.info(f'Found {len(repo_results)} GitHub repositories via REST API')
     return repo_results
 
 
-def github_repo_search_wrapper(**kwargs) -> List[Dict[str, Any]]:
+async def github_repo_search_wrapper(**kwargs) -> List[Dict[str, Any]]:
     """Wrapper for GitHub API search that returns GitHub repository results.
 
+    Results are served from the GitHub search cache while they are fresh. When
+    the rate limit of the API is spent, stale cached results are served, or no
+    results if the search is not cached.
+
     Args:
         **kwargs: Keyword arguments including:
             - keywords: List of keywords to search for
@@ -435,27 +845,58 @@ def github_repo_search_wrapper(**kwargs) -> List[Dict[str, Any]]:
 
     # Get GitHub token from environment variable
     token = os.environ.get('GITHUB_TOKEN')
+    api = 'graphql' if token else 'rest'
 
     try:
-        # GraphQL API requires authentication, so only use it if token is provided
-        if token:
-            logger.info('Using authenticated GitHub GraphQL API')
-            results = github_repo_search_graphql(
-                keywords=keywords,
-                organizations=organizations,
-                num_results=num_results,
-                token=token,
-                license_filter=license_filter,
-            )
-        # Always use REST API for unauthenticated requests
+        cache = get_github_search_cache()
+        cache_key = get_search_cache_key(api, keywords, organizations, license_filter, num_results)
+        cached = await asyncio.to_thread(cache.get, cache_key)
+        failed_organizations: List[str] = []
+
+        if cached is not None and cache.is_fresh(cached):
+            logger.info('Serving GitHub repository search results from cache')
+            results = cached.value
         else:
-            logger.info('Using unauthenticated GitHub REST API (GraphQL requires auth)')
-            results = github_repo_search_rest(
-                keywords=keywords,
-                organizations=organizations,
-                num_results=num_results,
-                license_filter=license_filter,
-            )
+            try:
+                # GraphQL API requires authentication, so only use it if token is provided
+                if token:
+                    logger.info('Using authenticated GitHub GraphQL API')
+                    results = await github_repo_search_graphql(
+                        keywords=keywords,
+                        organizations=organizations,
+                        num_results=num_results,
+                        token=token,
+                        license_filter=license_filter,
+                    )
+                # Always use REST API for unauthenticated requests
+                else:
+                    logger.info('Using unauthenticated GitHub REST API (GraphQL requires auth)')
+                    results = await github_repo_search_rest(
+                        keywords=keywords,
+                        organizations=organizations,
+                        num_results=num_results,
+                        license_filter=license_filter,
+                        errors=failed_organizations,
+                    )
+            except GitHubRateLimitExceeded as e:
+                if cached is None:
+                    logger.warning(f'{e}, no cached results to serve')
+                    return []
+                logger.warning(
+                    f'{e}, serving cached results from '
+                    f'{time.time() - cached.stored_at:.0f} seconds ago'
+                )
+                results = cached.value
+            else:
+                # Failed searches come back empty, and searches cut short by the rate limit
+                # or an error may miss organizations, so only complete results are cached
+                resource = 'graphql' if token else 'search'
+                if (
+                    results
+                    and not failed_organizations
+                    and get_rate_limit_budget().seconds_until_reset(resource) == 0
+                ):
+                    await asyncio.to_thread(cache.put, cache_key, results)
 
         # Sort results by stars (descending) and then by updated_at date
         results.sort(
@@ -0,0 +1,185 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""In-process cache of loaded FAISS indices for Git Repository Research MCP Server.
+
+This module keeps recently used indices in memory so that repeated searches
+against the same repository do not re-read the FAISS index and docstore from disk.
+"""
+
+import json
+import os
+import threading
+from awslabs.git_repo_research_mcp_server.defaults import Constants
+from awslabs.git_repo_research_mcp_server.models import IndexCacheStats
+from collections import OrderedDict
+from loguru import logger
+from typing import Any, Callable, Optional, Tuple
+
+
+def get_index_version(index_path: str) -> Optional[Tuple]:
+    """Compute a version token for an index directory.
+
+    The token changes whenever the index files are rewritten or the repository
+    is re-indexed at a different commit.
+
+    Args:
+        index_path: Path to the index directory
+
+    Returns:
+        Version token, or None if the index files do not exist
+    """
+    version = []
+    for filename in ('index.faiss', 'docstore.json', 'index_mapping.json'):
+        try:
+            stat = os.stat(os.path.join(index_path, filename))
+        except OSError:
+            return None
+        version.append((stat.st_mtime_ns, stat.st_size))
+
+    last_commit_id = None
+    metadata_path = os.path.join(index_path, 'metadata.json')
+    try:
+        with open(metadata_path, 'r') as f:
+            last_commit_id = json.load(f).get('last_commit_id')
+    except Exception:
+        # Metadata is optional for loading; the file mtimes still version the index
+        pass
+    version.append(last_commit_id)
+
+    return tuple(version)
+
+
+class IndexCache:
+    """Size-bounded LRU cache of loaded FAISS indices.
+
+    Entries are keyed by index path and validated against the index version on
+    every lookup, so an index rebuilt on disk is reloaded transparently.
+    """
+
+    def __init__(self, max_entries: int = Constants.INDEX_CACHE_MAX_ENTRIES):
+        """Initialize the index cache.
+
+        Args:
+            max_entries: Maximum number of indices to keep loaded
+        """
+        self.max_entries = max(1, max_entries)
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get_or_load(self, index_path: str, loader: Callable[[str], Any]) -> Any:
+        """Return the cached index for a path, loading it on a miss.
+
+        Args:
+            index_path: Path to the index directory
+            loader: Function that loads the index from disk given its path
+
+        Returns:
+            The loaded index components returned by the loader
+        """
+        key = os.path.abspath(index_path)
+        version = get_index_version(key)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if version is not None and entry[0] == version:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                # The index on disk changed (or disappeared) since it was loaded
+                del self._entries[key]
+                self.invalidations += 1
+            self.misses += 1
+
+        value = loader(index_path)
+
+        if version is not None:
+            with self._lock:
+                self._entries[key] = (version, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    evicted_key, _ = self._entries.popitem(last=False)
+                    self.evictions += 1
+                    logger.debug(f'Evicted index from cache: {evicted_key}')
+
+        return value
+
+    def invalidate(self, index_path: str) -> bool:
+        """Drop a cached index.
+
+        Args:
+            index_path: Path to the index directory
+
+        Returns:
+            True if an entry was removed, False otherwise
+        """
+        key = os.path.abspath(index_path)
+        with self._lock:
+            if self._entries.pop(key, None) is None:
+                return False
+            self.invalidations += 1
+            return True
+
+    def clear(self) -> None:
+        """Drop all cached indices and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.invalidations = 0
+
+    def stats(self) -> IndexCacheStats:
+        """Get cache statistics.
+
+        Returns:
+            IndexCacheStats object with counters and the cached index paths
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return IndexCacheStats(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                invalidations=self.invalidations,
+                hit_rate=self.hits / lookups if lookups else 0.0,
+                size=len(self._entries),
+                max_entries=self.max_entries,
+                cached_indices=list(self._entries.keys()),
+            )
+
+
+_index_cache: Optional[IndexCache] = None
+_index_cache_lock = threading.Lock()
+
+
+def get_index_cache() -> IndexCache:
+    """Get the process-wide index cache.
+
+    The cache size can be overridden with the INDEX_CACHE_MAX_ENTRIES environment variable.
+
+    Returns:
+        IndexCache instance shared by all searchers and indexers
+    """
+    global _index_cache
+    with _index_cache_lock:
+        if _index_cache is None:
+            max_entries = Constants.INDEX_CACHE_MAX_ENTRIES
+            try:
+                max_entries = int(os.environ.get('INDEX_CACHE_MAX_ENTRIES', max_entries))
+            except ValueError:
+                logger.warning('Invalid INDEX_CACHE_MAX_ENTRIES, using default')
+            _index_cache = IndexCache(max_entries=max_entries)
+        return _index_cache
@@ -14,26 +14,68 @@ This module provides functionality for creating and managing FAISS indices
 for Git repositories using LangChain's FAISS implementation.
 """
 
+import asyncio
 import faiss
 import json
 import os
+import re
 import shutil
+import sys
+import threading
 import time
+from awslabs.git_repo_research_mcp_server.ann_index import (
+    build_ann_index,
+    get_index_type,
+    select_index_type,
+)
+from awslabs.git_repo_research_mcp_server.client_registry import get_client_registry
 from awslabs.git_repo_research_mcp_server.defaults import Constants
+from awslabs.git_repo_research_mcp_server.embedding_cache import (
+    CachedEmbeddings,
+    EmbeddingCache,
+    get_embedding_cache,
+)
+from awslabs.git_repo_research_mcp_server.embedding_pipeline import EmbeddingPipeline
 from awslabs.git_repo_research_mcp_server.embeddings import get_embedding_model
+from awslabs.git_repo_research_mcp_server.index_cache import get_index_cache
+from awslabs.git_repo_research_mcp_server.lexical_index import build_lexical_index
+from awslabs.git_repo_research_mcp_server.manifest import build_and_save_manifest
 from awslabs.git_repo_research_mcp_server.models import (
+    CloneStats,
+    EmbeddingCacheStats,
     EmbeddingModel,
+    IndexingStage,
+    IndexingStageTimings,
+    IndexingStats,
     IndexMetadata,
     IndexRepositoryResponse,
+    IndexType,
+    RepositoryScanStats,
+    SnapshotStats,
+    StorageMode,
 )
+from awslabs.git_repo_research_mcp_server.query_cache import CachedQueryEmbeddings
 from awslabs.git_repo_research_mcp_server.repository import (
     cleanup_repository,
     clone_repository,
+    ensure_commit,
+    get_changed_files,
+    get_file_extension_stats,
     get_repository_name,
+    get_sparse_checkout_patterns,
     is_git_repo,
     is_git_url,
-    process_repository,
+    iter_repository_files,
+    matches_file_patterns,
+    read_and_chunk_file,
+)
+from awslabs.git_repo_research_mcp_server.snapshot_store import (
+    BlobStore,
+    get_blob_store,
+    snapshot_directory,
+    store_file,
 )
+from awslabs.git_repo_research_mcp_server.utils import load_metadata
 from datetime import datetime
 from git import Repo
 from langchain_community.docstore.in_memory import InMemoryDocstore
@@ -42,7 +84,7 @@ from langchain_core.documents import Document
 from loguru import logger
 from pydantic import BaseModel, field_validator
 from pydantic_core.core_schema import ValidationInfo
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 
 class RepositoryConfig(BaseModel):
@@ -58,6 +100,10 @@ class RepositoryConfig(BaseModel):
     exclude_patterns: Optional[List[str]] = None
     chunk_size: int = 1000
     chunk_overlap: int = 200
+    incremental: bool = False
+    clone_depth: Optional[int] = Constants.CLONE_DEPTH
+    clone_filter: Optional[str] = None
+    sparse_checkout: bool = False
 
     @field_validator('repository_path')
     @classmethod
@@ -71,6 +117,32 @@ class RepositoryConfig(BaseModel):
             raise ValueError('Repository path must be a valid Git URL or existing local path')
         return git_string_url
 
+    @field_validator('clone_depth')
+    @classmethod
+    def validate_clone_depth(cls, clone_depth):
+        """Validate the clone depth.
+
+        :param clone_depth: Number of commits to clone, or 0 or None for full history
+        :return: Validated clone depth.
+        """
+        if clone_depth is not None and clone_depth < 0:
+            raise ValueError('Clone depth must not be negative')
+        return clone_depth or None
+
+    @field_validator('clone_filter')
+    @classmethod
+    def validate_clone_filter(cls, clone_filter):
+        """Validate the partial clone filter.
+
+        :param clone_filter: Partial clone filter
+        :return: Validated clone filter.
+        """
+        if clone_filter and not re.fullmatch(
+            r'blob:none|blob:limit=\d+[kmg]?|tree:\d+', clone_filter
+        ):
+            raise ValueError('Clone filter must be blob:none, blob:limit=<size> or tree:<depth>')
+        return clone_filter or None
+
     @field_validator('chunk_size')
     @classmethod
     def validate_chunk_size(cls, chunk_size):
@@ -112,6 +184,14 @@ class IndexConfig(BaseModel):
     aws_region: Optional[str] = None
     aws_profile: Optional[str] = None
     index_dir: Optional[str] = None
+    embedding_batch_size: int = Constants.EMBEDDING_BATCH_SIZE
+    embedding_max_concurrency: int = Constants.EMBEDDING_MAX_CONCURRENCY
+    index_type: IndexType = IndexType.AUTO
+    hnsw_m: int = Constants.ANN_HNSW_M
+    ivf_nlist: Optional[int] = None
+    pq_m: Optional[int] = None
+    training_sample_size: int = Constants.ANN_TRAINING_SAMPLE_SIZE
+    storage_mode: StorageMode = StorageMode.BLOBS
 
     @field_validator('embedding_model')
     @classmethod
@@ -195,13 +275,17 @@ def save_index_without_pickle(vector_store, index_path):
         index_path: Path to save the index
 
     This function saves a FAISS index using FAISS's native methods and JSON
-    instead of pickle for serialization.
+    instead of pickle for serialization, together with a lexical index of the
+    chunk text.
     """
     os.makedirs(index_path, exist_ok=True)
 
-    # 1. Save FAISS index using faiss's native methods
+    # 1. Save FAISS index using faiss's native methods. The file is replaced
+    # atomically, since loaded indices may memory-map the previous version.
     faiss_path = os.path.join(index_path, 'index.faiss')
-    faiss.write_index(vector_store.index, faiss_path)
+    temp_faiss_path = f'{faiss_path}.tmp'
+    faiss.write_index(vector_store.index, temp_faiss_path)
+    os.replace(temp_faiss_path, faiss_path)
 
     # 2. Save docstore as JSON
     docstore_path = os.path.join(index_path, 'docstore.json')
@@ -219,24 +303,94 @@ def save_index_without_pickle(vector_store, index_path):
     with open(mapping_path, 'w') as f:
         json.dump(mapping, f)
 
+    # 4. Save the lexical index used by lexical and hybrid search
+    build_lexical_index(
+        (
+            (doc_id, doc.page_content)
+            for doc_id, doc in get_docstore_dict(vector_store.docstore).items()
+        ),
+        index_path,
+    )
+
+
+def get_embedding_cache_stats(embedding_generator) -> Optional[EmbeddingCacheStats]:
+    """Get embedding cache statistics from an embedding function.
+
+    Args:
+        embedding_generator: Embedding function used for indexing
+
+    Returns:
+        EmbeddingCacheStats if the embedding function is cached, None otherwise
+    """
+    if isinstance(embedding_generator, CachedEmbeddings):
+        return embedding_generator.stats()
+    return None
+
+
+def load_index_components(index_path, mmap=True):
+    """Load the components of a FAISS vector store without using pickle.
+
+    Args:
+        index_path: Path to the index
+        mmap: Whether to memory-map the FAISS index instead of reading it into memory.
+            Memory-mapped indices must not be modified.
+
+    Returns:
+        Tuple of (FAISS index, docstore, index_to_docstore_id mapping)
+
+    This function reads the files written by save_index_without_pickle.
+    """
+    # 1. Load FAISS index using faiss's native methods
+    faiss_path = os.path.join(index_path, 'index.faiss')
+    index = None
+    if mmap:
+        try:
+            index = faiss.read_index(faiss_path, faiss.IO_FLAG_MMAP)
+        except Exception as e:
+            logger.debug(f'Cannot memory-map {faiss_path}, reading it instead: {e}')
+    if index is None:
+        index = faiss.read_index(faiss_path)
+
+    # 2. Load docstore from JSON
+    docstore_path = os.path.join(index_path, 'docstore.json')
+    with open(docstore_path, 'r') as f:
+        docstore_data = json.load(f)
+
+    # Reconstruct the document store
+    docstore = InMemoryDocstore({})
+    dict_obj = ensure_docstore_dict(docstore)
+    for doc_id, doc_data in docstore_data.items():
+        dict_obj[doc_id] = Document(
+            page_content=doc_data['page_content'], metadata=doc_data['metadata']
+        )
+
+    # 3. Load index_to_docstore_id mapping from JSON
+    mapping_path = os.path.join(index_path, 'index_mapping.json')
+    with open(mapping_path, 'r') as f:
+        mapping_data = json.load(f)
+
+    # Convert string keys back to integers for the mapping
+    index_to_docstore_id = {int(k): v for k, v in mapping_data.items()}
+
+    return index, docstore, index_to_docstore_id
+
 
 def save_chunk_map_without_pickle(chunk_map, index_path):
     """Save chunk map without using pickle.
 
     Args:
-        chunk_map: Chunk map to save
+        chunk_map: Chunk map to save, with a 'chunk_to_file' dictionary mapping
+            integer chunk IDs to file paths
         index_path: Path to save the chunk map
 
     This function saves a chunk map using JSON instead of pickle for serialization.
+    The chunk text is not stored, since it is already kept in the docstore.
     """
-    # Convert the chunk map to a JSON-serializable format
-    serializable_chunk_map = {'chunks': chunk_map['chunks'], 'chunk_to_file': {}}
-
-    # Convert the chunk_to_file dictionary to a serializable format
-    # Since chunks are not hashable in JSON, we use indices
-    for i, chunk in enumerate(chunk_map['chunks']):
-        if chunk in chunk_map['chunk_to_file']:
-            serializable_chunk_map['chunk_to_file'][str(i)] = chunk_map['chunk_to_file'][chunk]
+    serializable_chunk_map = {
+        'chunk_to_file': {
+            str(chunk_id): file_path for chunk_id, file_path in chunk_map['chunk_to_file'].items()
+        }
+    }
 
     # Save as JSON
     chunk_map_path = os.path.join(index_path, 'chunk_map.json')
@@ -251,9 +405,12 @@ def load_chunk_map_without_pickle(index_path):
         index_path: Path to the chunk map
 
     Returns:
-        Chunk map dictionary if found, None otherwise
+        Chunk map dictionary with a 'chunk_to_file' dictionary mapping integer
+        chunk IDs to file paths if found, None otherwise
 
     This function loads a chunk map using JSON instead of pickle for serialization.
+    Chunk maps written by earlier versions, which also contain the chunk text, are
+    keyed by chunk position and load the same way.
     """
     chunk_map_path = os.path.join(index_path, 'chunk_map.json')
 
@@ -264,19 +421,73 @@ def load_chunk_map_without_pickle(index_path):
         with open(chunk_map_path, 'r') as f:
             serialized_map = json.load(f)
 
-        # Reconstruct the chunk-to-file mapping
-        chunks = serialized_map['chunks']
-        chunk_to_file = {}
-        for i, chunk in enumerate(chunks):
-            if str(i) in serialized_map['chunk_to_file']:
-                chunk_to_file[chunk] = serialized_map['chunk_to_file'][str(i)]
-
-        return {'chunks': chunks, 'chunk_to_file': chunk_to_file}
+        chunk_to_file = {
+            int(chunk_id): file_path
+            for chunk_id, file_path in serialized_map['chunk_to_file'].items()
+        }
+        return {'chunk_to_file': chunk_to_file}
     except Exception as e:
         logger.error(f'Error loading chunk map: {e}')
         return None
 
 
+def get_index_size_bytes(index_path: str) -> int:
+    """Get the disk space used by an index.
+
+    Snapshot files linked to the shared blob store are stored once for all
+    indices, so they are not counted.
+
+    Args:
+        index_path: Path to the index directory
+
+    Returns:
+        Size of the index in bytes
+    """
+    index_size = 0
+    for root, _, files in os.walk(index_path):
+        for file in files:
+            stat = os.lstat(os.path.join(root, file))
+            if stat.st_nlink <= 1:
+                index_size += stat.st_size
+    return index_size
+
+
+def get_peak_memory_bytes() -> Optional[int]:
+    """Get the peak resident memory of the current process.
+
+    Returns:
+        Peak resident set size in bytes, or None if it is not available on this platform
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def iter_chunk_documents(
+    file_chunks: Iterator[Tuple[str, List[str]]], chunk_to_file: Dict[int, str]
+) -> Iterator[Document]:
+    """Turn a stream of file chunks into Documents with sequential integer chunk IDs.
+
+    Args:
+        file_chunks: Iterator of file paths and their text chunks
+        chunk_to_file: Dictionary updated with the file path of each chunk ID
+
+    Yields:
+        LangChain Document objects
+    """
+    chunk_id = 0
+    for rel_path, chunks in file_chunks:
+        for chunk in chunks:
+            chunk_to_file[chunk_id] = rel_path
+            yield Document(page_content=chunk, metadata={'source': rel_path, 'chunk_id': chunk_id})
+            chunk_id += 1
+
+
 class RepositoryIndexer:
     """Indexer for Git repositories using LangChain's FAISS implementation.
 
@@ -294,6 +505,9 @@ class RepositoryIndexer:
         self.aws_region = config.aws_region
         self.aws_profile = config.aws_profile
         self.index_dir = config.index_dir or os.path.expanduser(f'~/{Constants.DEFAULT_INDEX_DIR}')
+        self.embedding_batch_size = config.embedding_batch_size
+        self.embedding_max_concurrency = config.embedding_max_concurrency
+        self.index_config = config
 
         # Create the index directory if it doesn't exist
         os.makedirs(self.index_dir, exist_ok=True)
@@ -331,6 +545,36 @@ class RepositoryIndexer:
         index_path = self._get_index_path(repository_name)
         return os.path.join(index_path, 'metadata.json')
 
+    def _get_indexing_embeddings(self, checkpoint: Optional[EmbeddingCache] = None):
+        """Get the embedding function used to embed repository chunks.
+
+        Args:
+            checkpoint: Embedding cache that stores the embeddings of this indexing run,
+                so that an interrupted run can resume without embedding them again (optional)
+
+        Returns:
+            CachedEmbeddings wrapping the embedding generator, or the embedding
+            generator itself if no embedding cache is used
+        """
+        embeddings = self.embedding_generator
+        if checkpoint is not None:
+            embeddings = CachedEmbeddings(embeddings, checkpoint, self.embedding_model)
+        embedding_cache = get_embedding_cache(self.index_dir)
+        if embedding_cache is None:
+            return embeddings
+        return CachedEmbeddings(embeddings, embedding_cache, self.embedding_model)
+
+    def _get_blob_store(self) -> Optional[BlobStore]:
+        """Get the blob store that repository snapshots are deduplicated into.
+
+        Returns:
+            BlobStore shared by the indices in the index directory, or None if
+            repository files are copied
+        """
+        if self.index_config.storage_mode == StorageMode.COPY:
+            return None
+        return get_blob_store(self.index_dir)
+
     def _get_chunk_map_path(self, repository_name: str) -> str:
         """Get the path to the chunk map file for a repository.
 
@@ -348,12 +592,16 @@ class RepositoryIndexer:
         self,
         config: RepositoryConfig,
         ctx: Optional[Any] = None,
+        checkpoint: Optional[EmbeddingCache] = None,
+        on_stage: Optional[Callable[[IndexingStage], None]] = None,
     ) -> IndexRepositoryResponse:
         """Index a Git repository.
 
         Args:
             config: RepositoryConfig object with indexing configuration
             ctx: Context object for progress tracking (optional)
+            checkpoint: Embedding cache to checkpoint chunk embeddings into (optional)
+            on_stage: Callback called with each indexing stage as it starts (optional)
 
         Returns:
             IndexRepositoryResponse object with information about the created index
@@ -363,27 +611,64 @@ class RepositoryIndexer:
         """
         start_time = time.time()
         temp_dir = None
+        report_stage = on_stage or (lambda stage: None)
 
         try:
             # Initialize helper classes
             repo_processor = RepositoryProcessor()
-            index_builder = IndexBuilder()
-            file_manager = FileManager()
+            index_builder = IndexBuilder(
+                batch_size=self.embedding_batch_size,
+                max_concurrency=self.embedding_max_concurrency,
+                index_config=self.index_config,
+            )
+            file_manager = FileManager(self._get_blob_store())
             metadata_manager = MetadataManager()
 
             # Step 1: Repository preparation and processing
+            report_stage(IndexingStage.PREPARING)
             repo_path, repository_name, temp_dir = await repo_processor.prepare_repository(
-                config.repository_path, ctx
+                config.repository_path, ctx, config
             )
+            stage_timings = IndexingStageTimings(prepare_seconds=time.time() - start_time)
 
             if ctx:
                 await ctx.report_progress(0, 100)
 
-            chunks, chunk_to_file, extension_stats = await repo_processor.process_content(
-                repo_path, config, ctx
-            )
+            embedding_generator = self._get_indexing_embeddings(checkpoint)
+
+            if config.incremental:
+                response = await self._update_index(
+                    repo_path,
+                    repository_name,
+                    config,
+                    embedding_generator,
+                    start_time,
+                    ctx,
+                    stage_timings=stage_timings,
+                    clone_stats=repo_processor.clone_stats,
+                    on_stage=report_stage,
+                )
+                if response is not None:
+                    return response
+
+            # Step 2: Stream files, chunks and embedding batches into the index
+            report_stage(IndexingStage.INDEXING)
+            stage_start = time.time()
+            scan_stats = RepositoryScanStats()
+            file_chunks = repo_processor.stream_content(repo_path, config, scan_stats, ctx)
+            chunk_to_file: Dict[int, str] = {}
+            try:
+                vector_store, indexing_stats = await index_builder.build_vector_store(
+                    iter_chunk_documents(file_chunks, chunk_to_file),
+                    embedding_generator,
+                    scan_stats,
+                    ctx,
+                )
+            finally:
+                file_chunks.close()
+            stage_timings.index_seconds = time.time() - stage_start
 
-            if not chunks:
+            if vector_store is None:
                 logger.warning('No text chunks found in repository')
                 if ctx:
                     await ctx.info('No text chunks found in repository')
@@ -401,24 +686,30 @@ class RepositoryIndexer:
                     message='No text chunks found in repository',
                 )
 
-            # Step 2: Index creation
-            documents = await index_builder.create_documents(chunks, chunk_to_file, ctx)
             index_path = self._get_index_path(config.output_path or repository_name)
             repo_files_path = os.path.join(index_path, 'repository')
             os.makedirs(repo_files_path, exist_ok=True)
 
             # Step 3: File management
+            report_stage(IndexingStage.SNAPSHOTTING)
+            stage_start = time.time()
             await file_manager.copy_repository_files(repo_path, repo_files_path, ctx)
-            vector_store = await index_builder.create_vector_store(
-                documents, self.embedding_generator, ctx
-            )
-            index_builder.save_index(vector_store, index_path)
+            stage_timings.snapshot_seconds = time.time() - stage_start
+
+            report_stage(IndexingStage.SAVING)
+            stage_start = time.time()
+            await asyncio.to_thread(index_builder.save_index, vector_store, index_path)
 
             # Save chunk map
-            chunk_map_data = {'chunks': chunks, 'chunk_to_file': chunk_to_file}
-            file_manager.save_chunk_map(chunk_map_data, index_path)
+            await asyncio.to_thread(
+                file_manager.save_chunk_map, {'chunk_to_file': chunk_to_file}, index_path
+            )
+            stage_timings.save_seconds = time.time() - stage_start
+            extension_stats = get_file_extension_stats(sorted(set(chunk_to_file.values())))
 
             # Step 4: Metadata management
+            report_stage(IndexingStage.FINALIZING)
+            metadata_start = time.time()
             last_commit_id = await repo_processor.get_commit_id(
                 repo_path, repository_name, config.repository_path
             )
@@ -429,15 +720,26 @@ class RepositoryIndexer:
                     'config': config,
                     'index_path': index_path,
                     'repo_files_path': repo_files_path,
-                    'chunks': chunks,
                     'chunk_to_file': chunk_to_file,
                     'extension_stats': extension_stats,
                     'last_commit_id': last_commit_id,
                     'embedding_model': self.embedding_model,
+                    'embedding_cache_stats': get_embedding_cache_stats(embedding_generator),
+                    'scan_stats': scan_stats,
+                    'indexing_stats': indexing_stats,
+                    'index_type': get_index_type(vector_store.index).value,
+                    'snapshot_stats': file_manager.snapshot_stats,
+                    'clone_stats': repo_processor.clone_stats,
+                    'stage_timings': stage_timings,
+                    'start_time': start_time,
+                    'metadata_start_time': metadata_start,
                 },
                 ctx,
             )
 
+            # Drop any previously loaded version of this index
+            get_index_cache().invalidate(index_path)
+
             # Return success response
             execution_time_ms = int((time.time() - start_time) * 1000)
             logger.info(f'Indexing completed in {execution_time_ms}ms')
@@ -484,47 +786,279 @@ class RepositoryIndexer:
             if temp_dir:
                 cleanup_repository(temp_dir)
 
+    async def _update_index(
+        self,
+        repo_path: str,
+        repository_name: str,
+        config: RepositoryConfig,
+        embedding_generator,
+        start_time: float,
+        ctx: Optional[Any] = None,
+        stage_timings: Optional[IndexingStageTimings] = None,
+        clone_stats: Optional[CloneStats] = None,
+        on_stage: Optional[Callable[[IndexingStage], None]] = None,
+    ) -> Optional[IndexRepositoryResponse]:
+        """Incrementally update an existing index from the commit diff.
+
+        Only files added or modified since the indexed commit are re-chunked and
+        re-embedded, and vectors for deleted or modified files are removed.
+
+        Args:
+            repo_path: Path to the repository
+            repository_name: Name of the repository
+            config: RepositoryConfig object with indexing configuration
+            embedding_generator: Embedding function used for new chunks
+            start_time: Time the indexing operation started
+            ctx: Context object for progress tracking (optional)
+            stage_timings: Timings of the stages completed so far (optional)
+            clone_stats: Statistics of the repository clone (optional)
+            on_stage: Callback called with each indexing stage as it starts (optional)
+
+        Returns:
+            IndexRepositoryResponse object, or None if a full re-index is required
+        """
+        index_path = self._get_index_path(config.output_path or repository_name)
+        repo_files_path = os.path.join(index_path, 'repository')
+        metadata = load_metadata(os.path.join(index_path, 'metadata.json'))
+
+        if metadata is None or not os.path.exists(os.path.join(index_path, 'index.faiss')):
+            logger.info(f'No existing index for {repository_name}, performing full index')
+            return None
+        if metadata.embedding_model != self.embedding_model:
+            logger.info('Embedding model changed since last index, performing full index')
+            return None
+        if not metadata.last_commit_id or metadata.last_commit_id == 'unknown':
+            logger.info('Existing index has no commit ID, performing full index')
+            return None
+        chunking_settings = get_chunking_settings(config)
+        if any(getattr(metadata, name) != value for name, value in chunking_settings.items()):
+            logger.info('Chunking settings changed since last index, performing full index')
+            return None
+
+        repo_processor = RepositoryProcessor()
+        head_commit_id = await repo_processor.get_commit_id(
+            repo_path, repository_name, config.repository_path
+        )
+        if head_commit_id == 'unknown':
+            return None
+
+        previous_commit_id = metadata.last_commit_id
+        if head_commit_id == previous_commit_id:
+            logger.info(f'Index for {repository_name} is already at commit {head_commit_id}')
+            if ctx:
+                await ctx.info('Index is already up to date')
+                await ctx.report_progress(100, 100)
+            return IndexRepositoryResponse(
+                status='success',
+                repository_name=metadata.repository_name,
+                repository_path=config.repository_path,
+                index_path=index_path,
+                repository_directory=repo_files_path,
+                file_count=metadata.file_count,
+                chunk_count=metadata.chunk_count,
+                embedding_model=self.embedding_model,
+                execution_time_ms=int((time.time() - start_time) * 1000),
+                message=f'Index is already up to date at commit {head_commit_id}',
+            )
+
+        report_stage = on_stage or (lambda stage: None)
+        report_stage(IndexingStage.INDEXING)
+        stage_timings = stage_timings or IndexingStageTimings()
+        stage_start = time.time()
+        try:
+            # Shallow clones only contain the head commit, so fetch the indexed one to diff against
+            ensure_commit(repo_path, previous_commit_id)
+            changed_files, deleted_files = get_changed_files(repo_path, previous_commit_id)
+        except Exception as e:
+            logger.info(f'Cannot diff against commit {previous_commit_id}: {e}')
+            return None
+
+        logger.info(
+            f'Incremental update from {previous_commit_id} to {head_commit_id}: '
+            f'{len(changed_files)} changed, {len(deleted_files)} deleted files'
+        )
+        if ctx:
+            await ctx.info(
+                f'Updating index: {len(changed_files)} changed and {len(deleted_files)} deleted files'
+            )
+            await ctx.report_progress(20, 100)
+
+        include_patterns = chunking_settings['include_patterns']
+        exclude_patterns = chunking_settings['exclude_patterns']
+
+        # Load a private copy of the index so cached readers are not affected
+        index, docstore, index_to_docstore_id = await asyncio.to_thread(
+            load_index_components, index_path, mmap=False
+        )
+        index_type = get_index_type(index)
+        if index_type != IndexType.FLAT:
+            # HNSW graphs do not support removing vectors, and removing vectors from an IVF-PQ
+            # index renumbers the remaining ones out of step with the docstore mapping
+            logger.info(
+                f'Existing {index_type.value} index cannot be updated in place, performing full index'
+            )
+            return None
+        vector_store = FAISS(
+            embedding_function=self.embedding_generator,
+            index=index,
+            docstore=docstore,
+            index_to_docstore_id=index_to_docstore_id,
+            normalize_L2=True,
+        )
+
+        # Remove vectors for every file that was modified or deleted
+        stale_sources = set(changed_files) | set(deleted_files)
+        docstore_dict = get_docstore_dict(vector_store.docstore)
+        stale_ids = [
+            doc_id
+            for doc_id, doc in docstore_dict.items()
+            if doc.metadata.get('source') in stale_sources
+        ]
+        next_chunk_id = (
+            max(
+                (int(doc.metadata.get('chunk_id', -1)) for doc in docstore_dict.values()),
+                default=-1,
+            )
+            + 1
+        )
+        if stale_ids:
+            vector_store.delete(stale_ids)
+
+        # Re-chunk the added and modified files
+        documents = []
+        for rel_path in changed_files:
+            file_path = os.path.join(repo_path, rel_path)
+            if not os.path.isfile(file_path):
+                continue
+            if not matches_file_patterns(rel_path, include_patterns, exclude_patterns):
+                continue
+            result = read_and_chunk_file(file_path, config.chunk_size, config.chunk_overlap)
+            if result is None:
+                continue
+            for chunk in result[0]:
+                documents.append(
+                    Document(
+                        page_content=chunk,
+                        metadata={'source': rel_path, 'chunk_id': next_chunk_id},
+                    )
+                )
+                next_chunk_id += 1
+
+        if ctx:
+            await ctx.info(f'Embedding {len(documents)} new chunks...')
+            await ctx.report_progress(50, 100)
+
+        pipeline = EmbeddingPipeline(
+            embedding_generator,
+            batch_size=self.embedding_batch_size,
+            max_concurrency=self.embedding_max_concurrency,
+        )
+        await pipeline.embed_documents(documents, vector_store, ctx, 50, 80)
+        if documents:
+            logger.info(pipeline.summary())
+            if ctx:
+                await ctx.info(pipeline.summary())
+        stage_timings.index_seconds = time.time() - stage_start
+
+        report_stage(IndexingStage.SNAPSHOTTING)
+        stage_start = time.time()
+        file_manager = FileManager(self._get_blob_store())
+        await file_manager.sync_repository_files(
+            repo_path, repo_files_path, changed_files, deleted_files, ctx
+        )
+        stage_timings.snapshot_seconds = time.time() - stage_start
+
+        report_stage(IndexingStage.SAVING)
+        stage_start = time.time()
+        await asyncio.to_thread(save_index_without_pickle, vector_store, index_path)
+
+        # Rebuild the chunk map from the updated docstore
+        docstore_dict = get_docstore_dict(vector_store.docstore)
+        chunk_to_file = {
+            int(doc.metadata.get('chunk_id', position)): doc.metadata.get('source', 'unknown')
+            for position, doc in enumerate(docstore_dict.values())
+        }
+        await asyncio.to_thread(
+            file_manager.save_chunk_map, {'chunk_to_file': chunk_to_file}, index_path
+        )
+        stage_timings.save_seconds = time.time() - stage_start
+
+        report_stage(IndexingStage.FINALIZING)
+        metadata_start = time.time()
+        sources = sorted({doc.metadata.get('source', 'unknown') for doc in docstore_dict.values()})
+        metadata = await MetadataManager().update_and_save(
+            metadata,
+            {
+                'index_path': index_path,
+                'file_count': len(sources),
+                'chunk_count': len(docstore_dict),
+                'extension_stats': get_file_extension_stats(sources),
+                'last_commit_id': head_commit_id,
+                'repo_files_path': repo_files_path,
+                'embedding_cache_stats': get_embedding_cache_stats(embedding_generator),
+                'snapshot_stats': file_manager.snapshot_stats,
+                'clone_stats': clone_stats,
+                'stage_timings': stage_timings,
+                'start_time': start_time,
+                'metadata_start_time': metadata_start,
+            },
+            ctx,
+        )
+
+        get_index_cache().invalidate(index_path)
+
+        execution_time_ms = int((time.time() - start_time) * 1000)
+        message = (
+            f'Incrementally updated index from commit {previous_commit_id} to {head_commit_id}: '
+            f'{len(changed_files)} changed files, {len(deleted_files)} deleted files, '
+            f'{len(documents)} chunks embedded, {len(stale_ids)} chunks removed'
+        )
+        logger.info(f'{message} in {execution_time_ms}ms')
+
+        if ctx:
+            await ctx.info(f'Incremental indexing completed in {execution_time_ms}ms')
+            await ctx.report_progress(100, 100)
+
+        return IndexRepositoryResponse(
+            status='success',
+            repository_name=metadata.repository_name,
+            repository_path=config.repository_path,
+            index_path=index_path,
+            repository_directory=repo_files_path,
+            file_count=metadata.file_count,
+            chunk_count=metadata.chunk_count,
+            embedding_model=self.embedding_model,
+            execution_time_ms=execution_time_ms,
+            message=message,
+        )
+
     def load_index_without_pickle(self, index_path):
         """Load FAISS index without using pickle.
 
         Args:
-            index_path: Path to the index
-            embedding_function: Embedding function to use
+            index_path: Path to the index or name of the repository
 
         Returns:
             FAISS vector store
 
         This function loads a FAISS index using FAISS's native methods and JSON
-        instead of pickle for serialization.
+        instead of pickle for serialization. Loaded indices are kept in the
+        process-wide index cache and reused until the index changes on disk,
+        and query embeddings are served from the process-wide query cache.
         """
-        # 1. Load FAISS index using faiss's native methods
-        faiss_path = os.path.join(index_path, 'index.faiss')
-        index = faiss.read_index(faiss_path)
-
-        # 2. Load docstore from JSON
-        docstore_path = os.path.join(index_path, 'docstore.json')
-        with open(docstore_path, 'r') as f:
-            docstore_data = json.load(f)
-
-        # Reconstruct the document store
-        docstore = InMemoryDocstore({})
-        for doc_id, doc_data in docstore_data.items():
-            dict_obj = ensure_docstore_dict(docstore)
-            dict_obj[doc_id] = Document(
-                page_content=doc_data['page_content'], metadata=doc_data['metadata']
-            )
+        if not os.path.isdir(index_path):
+            # It's a repository name
+            index_path = self._get_index_path(index_path)
 
-        # 3. Load index_to_docstore_id mapping from JSON
-        mapping_path = os.path.join(index_path, 'index_mapping.json')
-        with open(mapping_path, 'r') as f:
-            mapping_data = json.load(f)
-
-        # Convert string keys back to integers for the mapping
-        index_to_docstore_id = {int(k): v for k, v in mapping_data.items()}
+        index, docstore, index_to_docstore_id = get_index_cache().get_or_load(
+            index_path, load_index_components
+        )
 
-        # 4. Create and return the FAISS vector store
+        # Wrap the shared components with this indexer's embedding function
         return FAISS(
-            embedding_function=self.embedding_generator,
+            embedding_function=CachedQueryEmbeddings(
+                self.embedding_generator, self.embedding_model
+            ),
             index=index,
             docstore=docstore,
             index_to_docstore_id=index_to_docstore_id,
@@ -534,14 +1068,25 @@ class RepositoryIndexer:
 class RepositoryProcessor:
     """Handles repository-specific operations for indexing."""
 
+    def __init__(self):
+        """Initialize the repository processor."""
+        self.clone_stats: Optional[CloneStats] = None
+
     async def prepare_repository(
-        self, repository_path: str, ctx: Optional[Any] = None
+        self,
+        repository_path: str,
+        ctx: Optional[Any] = None,
+        config: Optional[RepositoryConfig] = None,
     ) -> Tuple[str, str, Optional[str]]:
         """Prepare the repository for indexing.
 
+        Remote repositories are cloned in a worker thread, shallow and with the
+        partial clone filter and sparse checkout of the configuration.
+
         Args:
             repository_path: Path or URL to the repository
             ctx: Context object for progress tracking (optional)
+            config: RepositoryConfig object with the clone options (optional)
 
         Returns:
             Tuple containing:
@@ -555,7 +1100,21 @@ class RepositoryProcessor:
             logger.info(f'Cloning repository from {repository_path}')
             if ctx:
                 await ctx.info(f'Cloning repository from {repository_path}')
-            temp_dir = clone_repository(repository_path)
+            self.clone_stats = CloneStats()
+            sparse_patterns = None
+            if config is not None and config.sparse_checkout:
+                sparse_patterns = get_sparse_checkout_patterns(
+                    config.include_patterns or Constants.TEXT_FILE_INCLUDE_PATTERNS,
+                    config.exclude_patterns or Constants.TEXT_FILE_EXCLUDE_PATTERNS,
+                )
+            temp_dir = await asyncio.to_thread(
+                clone_repository,
+                repository_path,
+                depth=config.clone_depth if config is not None else None,
+                filter_spec=config.clone_filter if config is not None else None,
+                sparse_patterns=sparse_patterns,
+                stats=self.clone_stats,
+            )
             repo_path = temp_dir
         else:
             repo_path = repository_path
@@ -568,39 +1127,34 @@ class RepositoryProcessor:
 
         return repo_path, repository_name, temp_dir
 
-    async def process_content(
-        self, repo_path: str, config: RepositoryConfig, ctx: Optional[Any] = None
-    ) -> Tuple[List[str], Dict[str, str], Dict[str, int]]:
-        """Process repository files to get text chunks.
+    def stream_content(
+        self,
+        repo_path: str,
+        config: RepositoryConfig,
+        scan_stats: RepositoryScanStats,
+        ctx: Optional[Any] = None,
+    ) -> Iterator[Tuple[str, List[str]]]:
+        """Stream the text chunks of the repository files.
 
         Args:
             repo_path: Path to the repository
             config: Repository configuration
+            scan_stats: Scan statistics to update while streaming
             ctx: Context object for progress tracking (optional)
 
         Returns:
-            Tuple containing:
-            - List of text chunks
-            - Mapping of chunks to file paths
-            - Statistics about file extensions
+            Iterator of file paths relative to the repository and their text chunks
         """
-        if ctx:
-            await ctx.info('Processing repository files...')
-            await ctx.report_progress(10, 100)
-
-        chunks, chunk_to_file, extension_stats = process_repository(
+        logger.info(f'Processing repository at {repo_path}')
+        return iter_repository_files(
             repo_path,
             include_patterns=config.include_patterns,
             exclude_patterns=config.exclude_patterns,
             chunk_size=config.chunk_size,
             chunk_overlap=config.chunk_overlap,
+            stats=scan_stats,
         )
 
-        if ctx:
-            await ctx.report_progress(30, 100)
-
-        return chunks, chunk_to_file, extension_stats
-
     async def get_commit_id(
         self, repo_path: str, repository_name: str, repository_path: str
     ) -> str:
@@ -641,89 +1195,164 @@ class RepositoryProcessor:
 class IndexBuilder:
     """Handles FAISS index creation and management."""
 
-    async def create_documents(
-        self, chunks: List[str], chunk_to_file: Dict[str, str], ctx: Optional[Any] = None
-    ) -> List[Document]:
-        """Convert chunks to LangChain Document objects.
+    def __init__(
+        self,
+        batch_size: int = Constants.EMBEDDING_BATCH_SIZE,
+        max_concurrency: int = Constants.EMBEDDING_MAX_CONCURRENCY,
+        stream_batch_size: int = Constants.STREAM_BATCH_SIZE,
+        index_config: Optional[IndexConfig] = None,
+    ):
+        """Initialize the index builder.
 
         Args:
-            chunks: List of text chunks
-            chunk_to_file: Mapping of chunks to file paths
-            ctx: Context object for progress tracking (optional)
-
-        Returns:
-            List of LangChain Document objects
+            batch_size: Number of documents embedded per request batch
+            max_concurrency: Maximum number of embedding batches in flight
+            stream_batch_size: Number of documents read from the stream at a time
+            index_config: Indexer configuration with the FAISS index type options (optional)
         """
-        if ctx:
-            await ctx.info(f'Converting {len(chunks)} chunks to Document objects...')
-            await ctx.report_progress(40, 100)
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.stream_batch_size = stream_batch_size
+        self.index_config = index_config
 
-        documents = []
-        for i, chunk in enumerate(chunks):
-            file_path = chunk_to_file.get(chunk, 'unknown')
-            documents.append(
-                Document(
-                    page_content=chunk,
-                    metadata={'source': file_path, 'chunk_id': i},
-                )
-            )
-
-        logger.debug(f'Number of documents to embed: {len(documents)}')
-        return documents
+    async def build_vector_store(
+        self,
+        documents: Iterator[Document],
+        embedding_generator,
+        scan_stats: Optional[RepositoryScanStats] = None,
+        ctx: Optional[Any] = None,
+    ) -> Tuple[Optional[FAISS], IndexingStats]:
+        """Build a FAISS vector store from a stream of documents.
 
-    async def create_vector_store(
-        self, documents: List[Document], embedding_generator, ctx: Optional[Any] = None
-    ) -> FAISS:
-        """Create a FAISS vector store from documents.
+        Documents are pulled from the stream in fixed-size batches on a worker
+        thread, and the next batch is read while the current one is embedded, so
+        at most two batches of chunk text are buffered outside the vector store.
 
         Args:
-            documents: List of LangChain Document objects
+            documents: Iterator of LangChain Document objects
             embedding_generator: Embedding function to use
+            scan_stats: Statistics of the file scan feeding the stream (optional)
             ctx: Context object for progress tracking (optional)
 
         Returns:
-            FAISS vector store
+            Tuple containing:
+            - FAISS vector store, or None if the stream was empty
+            - Index build statistics
         """
         logger.info('Creating FAISS index with LangChain')
         if ctx:
-            await ctx.info('Creating FAISS index...')
-            await ctx.report_progress(70, 100)
+            await ctx.info('Processing files and generating embeddings...')
+            await ctx.report_progress(10, 100)
+
+        start_time = time.time()
+        stats = IndexingStats()
+        pipeline = EmbeddingPipeline(
+            embedding_generator,
+            batch_size=self.batch_size,
+            max_concurrency=self.max_concurrency,
+        )
+        stream_batch_size = max(self.stream_batch_size, self.batch_size * self.max_concurrency)
 
-        logger.debug(f'Using embedding function: {embedding_generator}')
+        stop_reading = threading.Event()
 
-        # Test the embedding function
+        def next_batch() -> List[Document]:
+            batch = []
+            for document in documents:
+                batch.append(document)
+                if len(batch) >= stream_batch_size or stop_reading.is_set():
+                    break
+            return batch
+
+        vector_store = None
+        read_task = asyncio.ensure_future(asyncio.to_thread(next_batch))
         try:
-            logger.info('Testing embedding function on sample document...')
-            test_content = documents[0].page_content if documents else 'Test content'
-            test_result = embedding_generator.embed_documents([test_content])
-            logger.info(
-                f'Test embedding successful - shape: {len(test_result)}x{len(test_result[0])}'
-            )
-        except Exception as e:
-            logger.error(f'Embedding function test failed: {e}')
+            batch = await asyncio.shield(read_task)
+            while batch:
+                # Read the next batch while the current one is embedded
+                read_task = asyncio.ensure_future(asyncio.to_thread(next_batch))
+                try:
+                    vector_store = await pipeline.embed_documents(batch, vector_store)
+                except Exception as e:
+                    logger.error(f'Error creating vector store: {e}')
+                    logger.error(f'First document content: {batch[0].page_content[:100]}')
+                    raise
+                stats.batch_count += 1
+                stats.chunk_count += len(batch)
+                next_batch_documents = await asyncio.shield(read_task)
+                stats.max_buffered_chunks = max(
+                    stats.max_buffered_chunks, len(batch) + len(next_batch_documents)
+                )
+                batch = next_batch_documents
+
+                if ctx:
+                    await ctx.info(f'Embedded {stats.chunk_count} chunks...')
+                    if scan_stats is not None and scan_stats.files_selected:
+                        done = min(1.0, scan_stats.files_processed / scan_stats.files_selected)
+                        await ctx.report_progress(10 + int(75 * done), 100)
+        except BaseException:
+            # A thread cannot be interrupted, so stop the read after the current document and
+            # wait for it, as the caller closes the document stream once this returns
+            stop_reading.set()
+            await asyncio.wait([read_task])
+            if not read_task.cancelled():
+                read_task.exception()
             raise
 
-        if ctx:
-            await ctx.info('Generating embeddings and creating vector store...')
-            await ctx.report_progress(75, 100)
+        if vector_store is not None:
+            await self.convert_index(vector_store, ctx)
 
-        logger.debug(f'Number of documents: {len(documents)}')
+        stats.elapsed_seconds = time.time() - start_time
+        if stats.elapsed_seconds > 0:
+            stats.chunks_per_second = stats.chunk_count / stats.elapsed_seconds
+        stats.peak_memory_bytes = get_peak_memory_bytes()
 
-        try:
-            vector_store = FAISS.from_documents(
-                documents=documents, embedding=embedding_generator, normalize_L2=True
-            )
-            logger.debug(
-                f'Created vector store with {get_docstore_dict_size(vector_store.docstore)} documents'
-            )
-            return vector_store
-        except Exception as e:
-            logger.error(f'Error creating vector store: {e}')
-            logger.error(f'Document count: {len(documents)}')
-            logger.error(
-                f'First document content: {documents[0].page_content[:100] if documents else "None"}'
+        message = pipeline.summary()
+        if scan_stats is not None:
+            message += (
+                f'; processed {scan_stats.files_processed} of {scan_stats.files_selected} '
+                f'selected files ({scan_stats.bytes_read} bytes) with {scan_stats.workers} workers'
             )
-            raise
+        if stats.peak_memory_bytes is not None:
+            message += f'; peak memory {stats.peak_memory_bytes // (1024 * 1024)} MB'
+        logger.info(message)
+        if ctx:
+            await ctx.info(message)
+            await ctx.report_progress(85, 100)
+
+        return vector_store, stats
+
+    async def convert_index(self, vector_store: FAISS, ctx: Optional[Any] = None) -> IndexType:
+        """Replace the flat index of a vector store with the configured index type.
+
+        Args:
+            vector_store: FAISS vector store with a flat index
+            ctx: Context object for progress tracking (optional)
+
+        Returns:
+            Type of the vector store's index after conversion
+        """
+        config = self.index_config
+        index_type = select_index_type(
+            vector_store.index.ntotal, config.index_type if config else IndexType.AUTO
+        )
+        if index_type == IndexType.FLAT:
+            return index_type
+
+        options = {}
+        if config:
+            options = {
+                'hnsw_m': config.hnsw_m,
+                'ivf_nlist': config.ivf_nlist,
+                'pq_m': config.pq_m,
+                'training_sample_size': config.training_sample_size,
+            }
+
+        if ctx:
+            await ctx.info(f'Building {index_type.value} index...')
+        vector_store.index = await asyncio.to_thread(
+            build_ann_index, vector_store.index, index_type, **options
+        )
+        return get_index_type(vector_store.index)
 
     def save_index(self, vector_store: FAISS, index_path: str):
         """Save FAISS index without using pickle.
@@ -738,10 +1367,21 @@ class IndexBuilder:
 class FileManager:
     """Handles file operations for indexing."""
 
+    def __init__(self, blob_store: Optional[BlobStore] = None):
+        """Initialize the file manager.
+
+        Args:
+            blob_store: Blob store to deduplicate repository files into, or None to copy them
+        """
+        self.blob_store = blob_store
+        self.snapshot_stats: Optional[SnapshotStats] = None
+
     async def copy_repository_files(
         self, repo_path: str, repo_files_path: str, ctx: Optional[Any] = None
     ) -> int:
-        """Copy all files from the repository to the target directory.
+        """Store all files from the repository in the target directory.
+
+        Files are copied, or linked to the blob store when the file manager has one.
 
         Args:
             repo_path: Source repository path
@@ -749,41 +1389,97 @@ class FileManager:
             ctx: Context object for progress tracking (optional)
 
         Returns:
-            Number of copied files
+            Number of stored files
         """
         logger.info(f'Copying all files from {repo_path} to {repo_files_path}')
         if ctx:
             await ctx.info('Copying repository files...')
             await ctx.report_progress(60, 100)
 
-        # First, ensure the target directory is empty
-        if os.path.exists(repo_files_path):
-            shutil.rmtree(repo_files_path)
-        os.makedirs(repo_files_path, exist_ok=True)
+        def store_files() -> SnapshotStats:
+            # First, ensure the target directory is empty
+            if os.path.exists(repo_files_path):
+                shutil.rmtree(repo_files_path)
+            os.makedirs(repo_files_path, exist_ok=True)
+
+            stats = snapshot_directory(repo_path, repo_files_path, self.blob_store)
+            if self.blob_store is not None:
+                # Blobs only used by the replaced snapshot are not needed anymore
+                self.blob_store.prune()
+            return stats
 
-        copied_files = 0
-        for root, dirs, files in os.walk(repo_path):
-            if '.git' in root.split(os.sep):
-                continue
+        # Hashing and linking every file is slow, keep it off the event loop
+        stats = await asyncio.to_thread(store_files)
+        self.snapshot_stats = stats
+
+        logger.info(
+            f'Stored {stats.file_count} files in {repo_files_path} in '
+            f'{stats.elapsed_seconds:.2f}s: {stats.bytes_written} bytes written, '
+            f'{stats.bytes_deduplicated} bytes deduplicated'
+        )
+        return stats.file_count
+
+    async def sync_repository_files(
+        self,
+        repo_path: str,
+        repo_files_path: str,
+        changed_files: List[str],
+        deleted_files: List[str],
+        ctx: Optional[Any] = None,
+    ) -> int:
+        """Apply added, modified and deleted files to the copied repository files.
+
+        Args:
+            repo_path: Source repository path
+            repo_files_path: Target path for copied files
+            changed_files: Relative paths of files added or modified
+            deleted_files: Relative paths of files deleted
+            ctx: Context object for progress tracking (optional)
 
-            rel_path = os.path.relpath(root, repo_path)
-            if rel_path == '.':
-                rel_path = ''
+        Returns:
+            Number of copied files
+        """
+        logger.info(f'Updating repository files in {repo_files_path}')
+        if ctx:
+            await ctx.info('Updating repository files...')
+            await ctx.report_progress(60, 100)
 
-            target_dir = os.path.join(repo_files_path, rel_path)
-            os.makedirs(target_dir, exist_ok=True)
+        start_time = time.time()
+        stats = SnapshotStats(
+            storage_mode=(
+                StorageMode.COPY.value if self.blob_store is None else StorageMode.BLOBS.value
+            )
+        )
 
-            for file in files:
-                source_file = os.path.join(root, file)
-                target_file = os.path.join(target_dir, file)
+        def sync_files() -> None:
+            for rel_path in deleted_files:
+                target_file = os.path.join(repo_files_path, rel_path)
+                if os.path.isfile(target_file):
+                    try:
+                        os.remove(target_file)
+                    except Exception as e:
+                        logger.warning(f'Error removing file {target_file}: {e}')
+
+            for rel_path in changed_files:
+                source_file = os.path.join(repo_path, rel_path)
+                if not os.path.isfile(source_file):
+                    continue
+                target_file = os.path.join(repo_files_path, rel_path)
                 try:
-                    shutil.copy2(source_file, target_file)
-                    copied_files += 1
+                    os.makedirs(os.path.dirname(target_file), exist_ok=True)
+                    store_file(source_file, target_file, self.blob_store, stats)
                 except Exception as e:
                     logger.warning(f'Error copying file {source_file}: {e}')
 
-        logger.info(f'Copied {copied_files} files to {repo_files_path}')
-        return copied_files
+            if self.blob_store is not None and (changed_files or deleted_files):
+                self.blob_store.prune()
+
+        await asyncio.to_thread(sync_files)
+        stats.elapsed_seconds = time.time() - start_time
+        self.snapshot_stats = stats
+
+        logger.info(f'Copied {stats.file_count} changed files to {repo_files_path}')
+        return stats.file_count
 
     def save_chunk_map(self, chunk_map_data: Dict, index_path: str):
         """Save chunk map without using pickle.
@@ -795,6 +1491,38 @@ class FileManager:
         save_chunk_map_without_pickle(chunk_map_data, index_path)
 
 
+def _finish_stage_timings(params: Dict[str, Any]) -> Optional[IndexingStageTimings]:
+    """Complete the stage timings with the metadata stage and the total time."""
+    stage_timings = params.get('stage_timings')
+    if stage_timings is None:
+        return None
+    now = time.time()
+    if params.get('metadata_start_time'):
+        stage_timings.metadata_seconds = now - params['metadata_start_time']
+    if params.get('start_time'):
+        stage_timings.total_seconds = now - params['start_time']
+    return stage_timings
+
+
+def get_chunking_settings(config: RepositoryConfig) -> Dict[str, Any]:
+    """Get the settings that decide which chunks a repository is indexed as.
+
+    An index can only be updated incrementally with the settings it was built with.
+
+    Args:
+        config: RepositoryConfig object with indexing configuration
+
+    Returns:
+        Dictionary of the chunk size, chunk overlap and effective file patterns
+    """
+    return {
+        'chunk_size': config.chunk_size,
+        'chunk_overlap': config.chunk_overlap,
+        'include_patterns': list(config.include_patterns or Constants.TEXT_FILE_INCLUDE_PATTERNS),
+        'exclude_patterns': list(config.exclude_patterns or Constants.TEXT_FILE_EXCLUDE_PATTERNS),
+    }
+
+
 class MetadataManager:
     """Handles metadata operations for indexing."""
 
@@ -814,15 +1542,20 @@ class MetadataManager:
             await ctx.info('Finalizing index metadata...')
             await ctx.report_progress(90, 100)
 
-        # Get index size
-        index_size = 0
-        for root, _, files in os.walk(params['index_path']):
-            for file in files:
-                index_size += os.path.getsize(os.path.join(root, file))
-
         # Use output_path as repository_name if provided
         final_repo_name = params['config'].output_path or params['repository_name']
 
+        # List the copied repository files once, for directory trees and README lookup
+        await asyncio.to_thread(
+            build_and_save_manifest,
+            params['repo_files_path'],
+            final_repo_name,
+            params['index_path'],
+        )
+
+        # Get index size
+        index_size = get_index_size_bytes(params['index_path'])
+
         metadata = IndexMetadata(
             repository_name=final_repo_name,
             repository_path=params['config'].repository_path,
@@ -830,13 +1563,21 @@ class MetadataManager:
             created_at=datetime.now(),
             last_accessed=None,
             file_count=len(set(params['chunk_to_file'].values())),
-            chunk_count=len(params['chunks']),
+            chunk_count=len(params['chunk_to_file']),
             embedding_model=params['embedding_model'],
             file_types=params['extension_stats'],
             total_tokens=None,
             index_size_bytes=index_size,
             last_commit_id=params['last_commit_id'],
             repository_directory=params['repo_files_path'],
+            embedding_cache=params.get('embedding_cache_stats'),
+            scan_stats=params.get('scan_stats'),
+            indexing_stats=params.get('indexing_stats'),
+            index_type=params.get('index_type'),
+            snapshot_stats=params.get('snapshot_stats'),
+            clone_stats=params.get('clone_stats'),
+            stage_timings=_finish_stage_timings(params),
+            **get_chunking_settings(params['config']),
         )
 
         # Save metadata
@@ -847,14 +1588,69 @@ class MetadataManager:
 
         return metadata
 
+    async def update_and_save(
+        self, metadata: IndexMetadata, params: Dict[str, Any], ctx: Optional[Any] = None
+    ) -> IndexMetadata:
+        """Update and save the metadata of an incrementally updated repository.
+
+        Args:
+            metadata: Existing IndexMetadata object
+            params: Dictionary containing updated metadata parameters
+            ctx: Context object for progress tracking (optional)
+
+        Returns:
+            Updated IndexMetadata object
+        """
+        if ctx:
+            await ctx.info('Updating index metadata...')
+            await ctx.report_progress(90, 100)
+
+        # Refresh the listing of the repository files
+        await asyncio.to_thread(
+            build_and_save_manifest,
+            params['repo_files_path'],
+            metadata.repository_name,
+            params['index_path'],
+        )
+
+        # Get index size
+        index_size = get_index_size_bytes(params['index_path'])
+
+        metadata = metadata.model_copy(
+            update={
+                'file_count': params['file_count'],
+                'chunk_count': params['chunk_count'],
+                'file_types': params['extension_stats'],
+                'index_size_bytes': index_size,
+                'last_commit_id': params['last_commit_id'],
+                'repository_directory': params['repo_files_path'],
+                'embedding_cache': params.get('embedding_cache_stats'),
+                'snapshot_stats': params.get('snapshot_stats') or metadata.snapshot_stats,
+                'clone_stats': params.get('clone_stats') or metadata.clone_stats,
+                'stage_timings': _finish_stage_timings(params) or metadata.stage_timings,
+            }
+        )
+
+        # Save metadata
+        metadata_path = os.path.join(params['index_path'], 'metadata.json')
+        with open(metadata_path, 'w') as f:
+            f.write(metadata.model_dump_json(indent=2))
+
+        return metadata
+
 
 def get_repository_indexer(config: IndexConfig) -> RepositoryIndexer:
     """Factory method to return a repository indexer.
 
+    Indexers are created lazily on first use and shared through the process-wide
+    client registry, one per distinct configuration.
+
     Args:
         config: IndexConfig object with indexer configuration
 
     Returns:
         RepositoryIndexer instance
     """
-    return RepositoryIndexer(config)
+    return get_client_registry().get_or_create(
+        ('repository-indexer', config.model_dump_json()), lambda: RepositoryIndexer(config)
+    )
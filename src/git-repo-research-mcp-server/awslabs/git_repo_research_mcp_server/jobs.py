@@ -0,0 +1,381 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Background indexing jobs for Git Repository Research MCP Server.
+
+This module runs repository indexing as background jobs on the server's event
+loop, so the indexing tool returns a job ID at once. The slow synchronous
+steps of a job, such as reading files, snapshotting the repository and saving
+the index, run in worker threads so they do not block the event loop. A
+bounded number of jobs run at the same time and the others wait in submission
+order. Each job is recorded in a JSON file, and the chunk embeddings of a
+running job are checkpointed in a per-job embedding cache, so a job
+interrupted by a failure, a cancellation or a server restart can be resumed
+without embedding the chunks of its completed batches again.
+"""
+
+import asyncio
+import os
+import threading
+import uuid
+from awslabs.git_repo_research_mcp_server.defaults import Constants
+from awslabs.git_repo_research_mcp_server.embedding_cache import EmbeddingCache
+from awslabs.git_repo_research_mcp_server.indexer import (
+    IndexConfig,
+    RepositoryConfig,
+    get_repository_indexer,
+)
+from awslabs.git_repo_research_mcp_server.models import (
+    IndexingJob,
+    IndexingJobStatus,
+    IndexingStage,
+)
+from datetime import datetime
+from loguru import logger
+from typing import Dict, List, Optional
+
+
+FINISHED_STATUSES = (
+    IndexingJobStatus.SUCCEEDED,
+    IndexingJobStatus.FAILED,
+    IndexingJobStatus.CANCELLED,
+    IndexingJobStatus.INTERRUPTED,
+)
+
+
+class JobContext:
+    """Context passed to the indexer in place of the MCP context.
+
+    Progress reports and messages are recorded on the job instead of being sent
+    to a client, which may have disconnected long before the job finishes.
+    """
+
+    def __init__(self, job: IndexingJob):
+        """Initialize the job context.
+
+        Args:
+            job: Job to record progress on
+        """
+        self.job = job
+
+    async def info(self, message: str) -> None:
+        """Record a progress message."""
+        self.job.message = message
+
+    async def warning(self, message: str) -> None:
+        """Record a warning message."""
+        logger.warning(f'Indexing job {self.job.job_id}: {message}')
+        self.job.message = message
+
+    async def error(self, message: str) -> None:
+        """Record an error message."""
+        logger.error(f'Indexing job {self.job.job_id}: {message}')
+        self.job.message = message
+
+    async def report_progress(self, progress: float, total: Optional[float] = None) -> None:
+        """Record the progress of the job.
+
+        Progress never goes back, as stages report their own progress ranges.
+        """
+        percent = progress * 100 / total if total else progress
+        self.job.progress_percent = max(self.job.progress_percent, min(100.0, float(percent)))
+
+
+class IndexingJobManager:
+    """Queue of background indexing jobs with a bounded number of workers."""
+
+    def __init__(
+        self,
+        jobs_dir: str,
+        max_workers: int = Constants.INDEXING_JOB_MAX_WORKERS,
+        history_max: int = Constants.INDEXING_JOB_HISTORY_MAX,
+    ):
+        """Initialize the job manager and load the jobs recorded in the jobs directory.
+
+        Jobs that were queued or running when the server stopped are marked as
+        interrupted, so that they can be resumed.
+
+        Args:
+            jobs_dir: Directory of the job records and embedding checkpoints
+            max_workers: Maximum number of jobs running at the same time
+            history_max: Maximum number of finished jobs kept
+        """
+        self.jobs_dir = jobs_dir
+        self.max_workers = max(1, max_workers)
+        self.history_max = history_max
+        self._jobs: Dict[str, IndexingJob] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._slots: Optional[asyncio.Semaphore] = None
+
+        os.makedirs(jobs_dir, exist_ok=True)
+        self._load_jobs()
+
+    def _job_path(self, job_id: str) -> str:
+        """Get the path of the record of a job."""
+        return os.path.join(self.jobs_dir, f'{job_id}.json')
+
+    def checkpoint_path(self, job_id: str) -> str:
+        """Get the path of the embedding checkpoint of a job.
+
+        Args:
+            job_id: ID of the job
+
+        Returns:
+            Path to the SQLite database of the checkpoint
+        """
+        return os.path.join(self.jobs_dir, f'{job_id}.checkpoint.db')
+
+    def _save(self, job: IndexingJob) -> None:
+        """Write the record of a job."""
+        path = self._job_path(job.job_id)
+        temp_path = f'{path}.tmp'
+        with open(temp_path, 'w') as f:
+            f.write(job.model_dump_json(indent=2))
+        os.replace(temp_path, path)
+
+    def _remove_checkpoint(self, job_id: str) -> None:
+        """Remove the embedding checkpoint of a job, with its SQLite journal files."""
+        path = self.checkpoint_path(job_id)
+        for suffix in ('', '-wal', '-shm'):
+            try:
+                os.remove(f'{path}{suffix}')
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f'Cannot remove checkpoint file {path}{suffix}: {e}')
+
+    def _load_jobs(self) -> None:
+        """Load the recorded jobs and mark those that did not finish as interrupted."""
+        for name in os.listdir(self.jobs_dir):
+            if not name.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(self.jobs_dir, name)) as f:
+                    job = IndexingJob.model_validate_json(f.read())
+            except Exception as e:
+                logger.warning(f'Cannot load indexing job {name}: {e}')
+                continue
+            if job.status not in FINISHED_STATUSES:
+                job.status = IndexingJobStatus.INTERRUPTED
+                job.message = 'Interrupted by a server restart'
+                self._save(job)
+            self._jobs[job.job_id] = job
+        self._prune_history()
+
+    def _prune_history(self) -> None:
+        """Remove the oldest finished jobs beyond the history limit."""
+        finished = sorted(
+            (job for job in self._jobs.values() if job.status in FINISHED_STATUSES),
+            key=lambda job: job.finished_at or job.created_at,
+        )
+        for job in finished[: max(0, len(finished) - self.history_max)]:
+            del self._jobs[job.job_id]
+            try:
+                os.remove(self._job_path(job.job_id))
+            except OSError as e:
+                logger.warning(f'Cannot remove indexing job {job.job_id}: {e}')
+            self._remove_checkpoint(job.job_id)
+
+    def submit(
+        self, index_config: IndexConfig, repository_config: RepositoryConfig
+    ) -> IndexingJob:
+        """Submit a repository to index in the background.
+
+        Must be called from the event loop the jobs run on.
+
+        Args:
+            index_config: IndexConfig object with indexer configuration
+            repository_config: RepositoryConfig object with indexing configuration
+
+        Returns:
+            The queued IndexingJob
+        """
+        job = IndexingJob(
+            job_id=uuid.uuid4().hex,
+            repository_path=repository_config.repository_path,
+            created_at=datetime.now(),
+            index_config=index_config.model_dump(mode='json'),
+            repository_config=repository_config.model_dump(mode='json'),
+        )
+        self._jobs[job.job_id] = job
+        self._save(job)
+        self._start(job)
+        logger.info(f'Submitted indexing job {job.job_id} for {job.repository_path}')
+        return job
+
+    def get(self, job_id: str) -> Optional[IndexingJob]:
+        """Get a job.
+
+        Args:
+            job_id: ID of the job
+
+        Returns:
+            IndexingJob, or None if there is no such job
+        """
+        return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[IndexingJob]:
+        """List the jobs, newest first.
+
+        Returns:
+            List of IndexingJob objects
+        """
+        return sorted(self._jobs.values(), key=lambda job: job.created_at, reverse=True)
+
+    async def cancel(self, job_id: str, timeout: float = 5.0) -> Optional[IndexingJob]:
+        """Cancel a queued or running job.
+
+        The embedding checkpoint of the job is kept, so it can be resumed later.
+
+        Args:
+            job_id: ID of the job
+            timeout: Maximum time in seconds to wait for the job to stop
+
+        Returns:
+            The IndexingJob, or None if there is no such job
+        """
+        job = self._jobs.get(job_id)
+        task = self._tasks.get(job_id)
+        if job is None or task is None or task.done():
+            return job
+        task.cancel()
+        await asyncio.wait({task}, timeout=timeout)
+        return job
+
+    def resume(self, job_id: str) -> Optional[IndexingJob]:
+        """Resume a failed, cancelled or interrupted job from its embedding checkpoint.
+
+        Args:
+            job_id: ID of the job
+
+        Returns:
+            The IndexingJob, or None if there is no such job
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.status not in FINISHED_STATUSES:
+            return job
+        if job.status == IndexingJobStatus.SUCCEEDED:
+            return job
+
+        job.status = IndexingJobStatus.QUEUED
+        job.stage = IndexingStage.QUEUED
+        job.progress_percent = 0.0
+        job.message = 'Resuming from the embedding checkpoint'
+        job.finished_at = None
+        job.result = None
+        self._save(job)
+        self._start(job)
+        logger.info(f'Resuming indexing job {job_id}')
+        return job
+
+    def _start(self, job: IndexingJob) -> None:
+        """Schedule a job to run once a worker is free."""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+        task = asyncio.create_task(self._run(job))
+        task.add_done_callback(lambda task: self._on_done(job, task))
+        self._tasks[job.job_id] = task
+
+    def _on_done(self, job: IndexingJob, task: asyncio.Task) -> None:
+        """Forget the task of a finished job, and record cancellations.
+
+        A job cancelled while queued may be cancelled before its task starts, so
+        cancellations are recorded here rather than in the task.
+        """
+        self._tasks.pop(job.job_id, None)
+        if task.cancelled() and job.status not in FINISHED_STATUSES:
+            self._finish(job, IndexingJobStatus.CANCELLED, 'Cancelled')
+
+    def _set_stage(self, job: IndexingJob, stage: IndexingStage) -> None:
+        """Record the stage of a running job."""
+        job.stage = stage
+        self._save(job)
+
+    def _finish(self, job: IndexingJob, status: IndexingJobStatus, message: Optional[str]) -> None:
+        """Record the end of a job."""
+        job.status = status
+        job.message = message
+        job.finished_at = datetime.now()
+        self._save(job)
+        self._prune_history()
+        logger.info(f'Indexing job {job.job_id} {status.value}: {message}')
+
+    async def _run(self, job: IndexingJob) -> None:
+        """Run a job once a worker is free and record its outcome."""
+        try:
+            async with self._slots:
+                await self._execute(job)
+        except Exception as e:
+            self._finish(job, IndexingJobStatus.FAILED, f'Error indexing repository: {str(e)}')
+
+    async def _execute(self, job: IndexingJob) -> None:
+        """Index the repository of a job, checkpointing its chunk embeddings."""
+        job.status = IndexingJobStatus.RUNNING
+        job.started_at = datetime.now()
+        job.attempts += 1
+        self._save(job)
+
+        # The checkpoint must hold every embedding of the job, so it is never evicted
+        checkpoint = EmbeddingCache(self.checkpoint_path(job.job_id), max_size_bytes=None)
+        try:
+            job.checkpointed_chunks = len(checkpoint)
+            if job.checkpointed_chunks:
+                logger.info(
+                    f'Indexing job {job.job_id} resumes with '
+                    f'{job.checkpointed_chunks} checkpointed chunk embeddings'
+                )
+            indexer = get_repository_indexer(IndexConfig(**job.index_config))
+            response = await indexer.index_repository(
+                RepositoryConfig(**job.repository_config),
+                JobContext(job),
+                checkpoint=checkpoint,
+                on_stage=lambda stage: self._set_stage(job, stage),
+            )
+        finally:
+            checkpoint.close()
+
+        job.result = response
+        if response.status == 'success':
+            self._remove_checkpoint(job.job_id)
+            job.stage = IndexingStage.DONE
+            job.progress_percent = 100.0
+            self._finish(job, IndexingJobStatus.SUCCEEDED, response.message)
+        else:
+            self._finish(job, IndexingJobStatus.FAILED, response.message)
+
+
+_job_manager: Optional[IndexingJobManager] = None
+_job_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> IndexingJobManager:
+    """Get the process-wide indexing job manager.
+
+    Jobs are recorded in the jobs directory of the default index directory. The
+    number of jobs running at the same time can be overridden with the
+    INDEXING_JOB_MAX_WORKERS environment variable.
+
+    Returns:
+        IndexingJobManager instance shared by all tools
+    """
+    global _job_manager
+    with _job_manager_lock:
+        if _job_manager is None:
+            max_workers = Constants.INDEXING_JOB_MAX_WORKERS
+            try:
+                max_workers = int(os.environ.get('INDEXING_JOB_MAX_WORKERS', max_workers))
+            except ValueError:
+                logger.warning('Invalid INDEXING_JOB_MAX_WORKERS, using the default')
+            jobs_dir = os.path.join(
+                os.path.expanduser(f'~/{Constants.DEFAULT_INDEX_DIR}'),
+                Constants.INDEXING_JOBS_DIRNAME,
+            )
+            _job_manager = IndexingJobManager(jobs_dir, max_workers=max_workers)
+        return _job_manager
@@ -0,0 +1,285 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Lexical (BM25) index for Git Repository Research MCP Server.
+
+This module builds an inverted index over code tokens of the indexed chunks,
+stores it next to the FAISS index, and ranks chunks for a query with BM25.
+Lexical search needs no embedding call and finds exact identifiers, error
+strings and configuration keys that embeddings often miss.
+"""
+
+import math
+import numpy as np
+import os
+import re
+from awslabs.git_repo_research_mcp_server.defaults import Constants
+from collections import Counter
+from functools import lru_cache
+from loguru import logger
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+_WORD_PATTERN = re.compile(r'[A-Za-z0-9_]+')
+_SUBWORD_PATTERN = re.compile(r'[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase code tokens.
+
+    Each identifier is kept whole, so exact matches rank first, and is also
+    split into its snake_case and camelCase parts.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of tokens
+    """
+    tokens = []
+    for word in _WORD_PATTERN.findall(text):
+        tokens.extend(_word_tokens(word))
+    return tokens
+
+
+@lru_cache(maxsize=65536)
+def _word_tokens(word: str) -> Tuple[str, ...]:
+    """Get the tokens of one word; words repeat so much in code that caching pays off."""
+    parts = _SUBWORD_PATTERN.findall(word)
+    if len(parts) > 1:
+        return (word.lower(), *(part.lower() for part in parts))
+    return (word.lower(),)
+
+
+class LexicalIndex:
+    """BM25 inverted index stored as compact arrays.
+
+    Postings are grouped by term: the postings of term i are
+    doc_positions[offsets[i]:offsets[i + 1]] with matching term frequencies.
+    """
+
+    def __init__(
+        self,
+        terms: np.ndarray,
+        offsets: np.ndarray,
+        doc_positions: np.ndarray,
+        term_frequencies: np.ndarray,
+        doc_lengths: np.ndarray,
+        doc_ids: np.ndarray,
+    ):
+        """Initialize the lexical index.
+
+        Args:
+            terms: Vocabulary, ordered by term ID
+            offsets: Start of the postings of each term, plus the total number of postings
+            doc_positions: Document position of each posting
+            term_frequencies: Frequency of the term in the document of each posting
+            doc_lengths: Number of tokens in each document
+            doc_ids: Docstore ID of each document
+        """
+        self.terms = terms
+        self.offsets = offsets
+        self.doc_positions = doc_positions
+        self.term_frequencies = term_frequencies
+        self.doc_lengths = doc_lengths
+        self.doc_ids = doc_ids
+        self.term_ids: Dict[str, int] = {str(term): i for i, term in enumerate(terms)}
+        self.average_doc_length = float(doc_lengths.mean()) if len(doc_lengths) else 0.0
+        self._length_norms: Dict[Tuple[float, float], np.ndarray] = {}
+
+    @classmethod
+    def build(cls, documents: Iterable[Tuple[str, str]]) -> 'LexicalIndex':
+        """Build a lexical index.
+
+        Args:
+            documents: Pairs of docstore ID and text
+
+        Returns:
+            LexicalIndex over the documents
+        """
+        term_ids: Dict[str, int] = {}
+        posting_terms, posting_frequencies, doc_lengths, doc_ids = [], [], [], []
+        for doc_id, text in documents:
+            tokens = tokenize(text)
+            counts = Counter(tokens)
+            posting_terms.append(
+                np.array(
+                    [term_ids.setdefault(term, len(term_ids)) for term in counts], dtype=np.int32
+                )
+            )
+            posting_frequencies.append(np.array(list(counts.values()), dtype=np.int32))
+            doc_lengths.append(len(tokens))
+            doc_ids.append(doc_id)
+
+        lengths = np.array([len(terms) for terms in posting_terms], dtype=np.int64)
+        all_terms = np.concatenate(posting_terms) if posting_terms else np.zeros(0, np.int32)
+        all_frequencies = (
+            np.concatenate(posting_frequencies) if posting_frequencies else np.zeros(0, np.int32)
+        )
+        all_positions = np.repeat(np.arange(len(doc_ids), dtype=np.int32), lengths)
+
+        # Group the postings by term, keeping documents in order within each term
+        order = np.argsort(all_terms, kind='stable')
+        offsets = np.zeros(len(term_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(all_terms, minlength=len(term_ids)), out=offsets[1:])
+
+        return cls(
+            terms=np.array(list(term_ids), dtype=str),
+            offsets=offsets,
+            doc_positions=all_positions[order],
+            term_frequencies=all_frequencies[order],
+            doc_lengths=np.array(doc_lengths, dtype=np.int32),
+            doc_ids=np.array(doc_ids, dtype=str),
+        )
+
+    def __len__(self) -> int:
+        """Get the number of indexed documents."""
+        return len(self.doc_ids)
+
+    def search(
+        self,
+        query: str,
+        k: int = 10,
+        k1: float = Constants.LEXICAL_BM25_K1,
+        b: float = Constants.LEXICAL_BM25_B,
+    ) -> List[Tuple[str, float]]:
+        """Rank documents for a query with BM25.
+
+        Args:
+            query: Query text
+            k: Maximum number of documents to return
+            k1: BM25 term frequency saturation
+            b: BM25 document length normalization
+
+        Returns:
+            List of (docstore ID, BM25 score) pairs, best first
+        """
+        doc_count = len(self.doc_ids)
+        term_ids = [self.term_ids.get(term) for term in dict.fromkeys(tokenize(query))]
+        term_ids = [term_id for term_id in term_ids if term_id is not None]
+        if not term_ids or doc_count == 0 or k <= 0:
+            return []
+
+        scores = np.zeros(doc_count, dtype=np.float32)
+        length_norm = self._length_norms.get((k1, b))
+        if length_norm is None:
+            # Document length normalization only depends on k1 and b, so compute it once
+            length_norm = k1 * (1 - b + b * self.doc_lengths / max(self.average_doc_length, 1e-9))
+            self._length_norms[(k1, b)] = length_norm
+        for term_id in term_ids:
+            start, end = self.offsets[term_id], self.offsets[term_id + 1]
+            positions = self.doc_positions[start:end]
+            frequencies = self.term_frequencies[start:end]
+            idf = math.log(1 + (doc_count - len(positions) + 0.5) / (len(positions) + 0.5))
+            # Each document appears at most once in the postings of a term
+            scores[positions] += (
+                idf * frequencies * (k1 + 1) / (frequencies + length_norm[positions])
+            )
+
+        matched = np.flatnonzero(scores)
+        if len(matched) > k:
+            matched = matched[np.argpartition(scores[matched], -k)[-k:]]
+        matched = matched[np.argsort(-scores[matched], kind='stable')]
+        return [(str(self.doc_ids[i]), float(scores[i])) for i in matched]
+
+    def save(self, index_path: str) -> None:
+        """Save the lexical index next to a FAISS index.
+
+        Args:
+            index_path: Path to the index directory
+        """
+        path = os.path.join(index_path, Constants.LEXICAL_INDEX_FILENAME)
+        # np.savez appends .npz to names without it, so keep the suffix on the temporary file
+        temp_path = f'{path[: -len(".npz")]}.tmp.npz'
+        np.savez_compressed(
+            temp_path,
+            terms=self.terms,
+            offsets=self.offsets,
+            doc_positions=self.doc_positions,
+            term_frequencies=self.term_frequencies,
+            doc_lengths=self.doc_lengths,
+            doc_ids=self.doc_ids,
+        )
+        os.replace(temp_path, path)
+
+
+def build_lexical_index(documents: Iterable[Tuple[str, str]], index_path: str) -> LexicalIndex:
+    """Build a lexical index and save it next to a FAISS index.
+
+    Args:
+        documents: Pairs of docstore ID and text
+        index_path: Path to the index directory
+
+    Returns:
+        The saved LexicalIndex
+    """
+    lexical_index = LexicalIndex.build(documents)
+    lexical_index.save(index_path)
+    logger.info(
+        f'Built lexical index with {len(lexical_index.terms)} terms over '
+        f'{len(lexical_index)} chunks'
+    )
+    return lexical_index
+
+
+@lru_cache(maxsize=Constants.INDEX_CACHE_MAX_ENTRIES)
+def _load_lexical_index(path: str, mtime_ns: int, size: int) -> LexicalIndex:
+    """Load a lexical index file; the modification time and size version the cache entry."""
+    with np.load(path, allow_pickle=False) as data:
+        return LexicalIndex(
+            terms=data['terms'],
+            offsets=data['offsets'],
+            doc_positions=data['doc_positions'],
+            term_frequencies=data['term_frequencies'],
+            doc_lengths=data['doc_lengths'],
+            doc_ids=data['doc_ids'],
+        )
+
+
+def load_lexical_index(index_path: str) -> Optional[LexicalIndex]:
+    """Load the lexical index of a repository index.
+
+    Loaded indices are cached until the file changes on disk.
+
+    Args:
+        index_path: Path to the index directory
+
+    Returns:
+        LexicalIndex, or None if the index has no lexical index or it cannot be read
+    """
+    path = os.path.abspath(os.path.join(index_path, Constants.LEXICAL_INDEX_FILENAME))
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    try:
+        return _load_lexical_index(path, stat.st_mtime_ns, stat.st_size)
+    except Exception as e:
+        logger.warning(f'Error loading lexical index {path}: {e}')
+        return None
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[str]], k: int = Constants.RRF_K
+) -> List[Tuple[str, float]]:
+    """Fuse rankings with reciprocal rank fusion.
+
+    Args:
+        rankings: Rankings of item keys, best first
+        k: Rank offset that dampens the weight of the top ranks
+
+    Returns:
+        List of (key, fused score) pairs, best first
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, start=1):
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
@@ -0,0 +1,250 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Repository manifest for Git Repository Research MCP Server.
+
+This module lists the files of an indexed repository once at index time and
+stores the listing next to metadata.json, so directory trees and README files
+are served from the manifest instead of walking the repository on every read.
+"""
+
+import os
+from awslabs.git_repo_research_mcp_server.defaults import Constants
+from awslabs.git_repo_research_mcp_server.models import (
+    ManifestEntry,
+    RepositoryManifest,
+    RepositoryTreePage,
+)
+from functools import lru_cache
+from loguru import logger
+from typing import List, Optional
+
+
+def build_manifest(repo_files_path: str, repository_name: str) -> RepositoryManifest:
+    """List the files of a repository directory.
+
+    Hidden files and directories are skipped, as in the directory tree.
+
+    Args:
+        repo_files_path: Path to the repository files
+        repository_name: Name of the repository
+
+    Returns:
+        RepositoryManifest of the directory
+    """
+    paths: List[str] = []
+    is_directory: List[bool] = []
+    sizes: List[int] = []
+    total_bytes = _scan_directory(repo_files_path, '', paths, is_directory, sizes)
+
+    readme_files = [
+        path
+        for path, directory in zip(paths, is_directory)
+        if not directory and path.rsplit('/', 1)[-1].lower().startswith('readme')
+    ]
+    directory_count = sum(is_directory)
+    return RepositoryManifest(
+        repository_name=repository_name,
+        file_count=len(paths) - directory_count,
+        directory_count=directory_count,
+        total_bytes=total_bytes,
+        paths=paths,
+        is_directory=is_directory,
+        sizes=sizes,
+        readme_files=readme_files,
+    )
+
+
+def _scan_directory(
+    directory: str,
+    rel_dir: str,
+    paths: List[str],
+    is_directory: List[bool],
+    sizes: List[int],
+) -> int:
+    """Append the entries below a directory in tree order and return their total size."""
+    try:
+        with os.scandir(directory) as iterator:
+            entries = sorted(
+                (entry for entry in iterator if not entry.name.startswith('.')),
+                key=lambda entry: entry.name,
+            )
+    except OSError as e:
+        logger.warning(f'Error listing directory {directory}: {e}')
+        return 0
+
+    total_bytes = 0
+    for entry in entries:
+        path = f'{rel_dir}/{entry.name}' if rel_dir else entry.name
+        position = len(paths)
+        paths.append(path)
+        try:
+            directory_entry = entry.is_dir(follow_symlinks=False)
+            size = 0 if directory_entry else entry.stat(follow_symlinks=False).st_size
+        except OSError as e:
+            logger.warning(f'Error reading {entry.path}: {e}')
+            directory_entry, size = False, 0
+        is_directory.append(directory_entry)
+        sizes.append(size)
+        if directory_entry:
+            size = _scan_directory(entry.path, path, paths, is_directory, sizes)
+            sizes[position] = size
+        total_bytes += size
+    return total_bytes
+
+
+def save_manifest(manifest: RepositoryManifest, index_path: str) -> None:
+    """Save a repository manifest next to metadata.json.
+
+    Args:
+        manifest: Manifest to save
+        index_path: Path to the index directory
+    """
+    path = os.path.join(index_path, Constants.MANIFEST_FILENAME)
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'w') as f:
+        f.write(manifest.model_dump_json())
+    os.replace(temp_path, path)
+
+
+def build_and_save_manifest(
+    repo_files_path: str, repository_name: str, index_path: str
+) -> RepositoryManifest:
+    """Build the manifest of a repository directory and save it next to metadata.json.
+
+    Args:
+        repo_files_path: Path to the repository files
+        repository_name: Name of the repository
+        index_path: Path to the index directory
+
+    Returns:
+        The saved RepositoryManifest
+    """
+    manifest = build_manifest(repo_files_path, repository_name)
+    save_manifest(manifest, index_path)
+    logger.info(
+        f'Built manifest with {manifest.file_count} files and '
+        f'{manifest.directory_count} directories for {repository_name}'
+    )
+    return manifest
+
+
+@lru_cache(maxsize=Constants.INDEX_CACHE_MAX_ENTRIES)
+def _load_manifest(path: str, mtime_ns: int, size: int) -> RepositoryManifest:
+    """Load a manifest file; the modification time and size version the cache entry."""
+    with open(path) as f:
+        return RepositoryManifest.model_validate_json(f.read())
+
+
+def load_manifest(index_path: str) -> Optional[RepositoryManifest]:
+    """Load the manifest of a repository index.
+
+    Loaded manifests are cached until the file changes on disk.
+
+    Args:
+        index_path: Path to the index directory
+
+    Returns:
+        RepositoryManifest, or None if the index has no manifest or it cannot be read
+    """
+    path = os.path.abspath(os.path.join(index_path, Constants.MANIFEST_FILENAME))
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    try:
+        return _load_manifest(path, stat.st_mtime_ns, stat.st_size)
+    except Exception as e:
+        logger.warning(f'Error loading manifest {path}: {e}')
+        return None
+
+
+def get_tree_page(
+    manifest: RepositoryManifest,
+    path_prefix: str = '',
+    max_depth: Optional[int] = None,
+    offset: int = 0,
+    limit: int = Constants.REPOSITORY_TREE_PAGE_SIZE,
+) -> RepositoryTreePage:
+    """Get a page of the directory tree of a repository.
+
+    Args:
+        manifest: Manifest of the repository
+        path_prefix: Directory to root the tree at, relative to the repository root
+        max_depth: Maximum depth below the path prefix, or None for unlimited
+        offset: Index of the first entry to return
+        limit: Maximum number of entries to return
+
+    Returns:
+        RepositoryTreePage with the entries and their text rendering
+    """
+    path_prefix = path_prefix.strip('/')
+    offset = max(0, offset)
+    limit = max(1, limit)
+    start = len(path_prefix) + 1 if path_prefix else 0
+
+    # Positions of the matching entries, in tree order
+    positions = []
+    for position, path in enumerate(manifest.paths):
+        if path_prefix and not path.startswith(f'{path_prefix}/'):
+            continue
+        if max_depth is not None and path.count('/', start) >= max_depth:
+            continue
+        positions.append(position)
+
+    # An entry is drawn as the last child of its directory if no later entry shares its parent
+    is_last = {}
+    seen_parents = set()
+    for position in reversed(positions):
+        parent = manifest.paths[position].rpartition('/')[0]
+        is_last[position] = parent not in seen_parents
+        seen_parents.add(parent)
+    last_by_path = {manifest.paths[position]: last for position, last in is_last.items()}
+
+    page = positions[offset : offset + limit]
+    root_name = path_prefix.rsplit('/', 1)[-1] if path_prefix else 'repository'
+    lines = ['Directory structure:', f'└── {root_name}/']
+    entries = []
+    for position in page:
+        path = manifest.paths[position]
+        directory = manifest.is_directory[position]
+        parts = path[start:].split('/')
+        ancestor = path_prefix
+        prefix = []
+        for part in parts[:-1]:
+            ancestor = f'{ancestor}/{part}' if ancestor else part
+            prefix.append('    ' if last_by_path.get(ancestor, False) else '    │')
+        connector = '    └── ' if is_last[position] else '    ├── '
+        lines.append(f'{"".join(prefix)}{connector}{parts[-1]}{"/" if directory else ""}')
+        entries.append(
+            ManifestEntry(
+                path=path,
+                type='directory' if directory else 'file',
+                size=manifest.sizes[position],
+            )
+        )
+
+    next_offset = offset + limit if offset + limit < len(positions) else None
+    return RepositoryTreePage(
+        repository_name=manifest.repository_name,
+        path_prefix=path_prefix,
+        max_depth=max_depth,
+        offset=offset,
+        limit=limit,
+        total_entries=len(positions),
+        next_offset=next_offset,
+        entries=entries,
+        tree='\n'.join(lines) + '\n',
+        readme_files=[
+            path
+            for path in manifest.readme_files
+            if not path_prefix or path.startswith(f'{path_prefix}/')
+        ],
+    )
@@ -13,7 +13,7 @@
 from datetime import datetime
 from enum import Enum
 from pydantic import BaseModel, Field
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
 
 class GitHubConfig(BaseModel):
@@ -29,6 +29,130 @@ class GitHubConfig(BaseModel):
     )
 
 
+class EmbeddingCacheStats(BaseModel):
+    """Statistics for the persistent embedding cache.
+
+    This model records how many chunk embeddings were served from the cache
+    instead of being generated by the embedding model.
+    """
+
+    hits: int = Field(0, description='Number of chunk embeddings served from the cache')
+    misses: int = Field(0, description='Number of chunk embeddings generated by the model')
+    hit_rate: float = Field(0.0, description='Fraction of chunk embeddings served from the cache')
+    evictions: int = Field(
+        0, description='Number of cached embeddings evicted to respect the size bound'
+    )
+    cache_size_bytes: int = Field(0, description='Total size of the cached embeddings in bytes')
+
+
+class RepositoryScanStats(BaseModel):
+    """Statistics for the scan of a repository's files.
+
+    This model records how many files were found, read and chunked when
+    processing a repository for indexing, and how fast this was done.
+    """
+
+    files_scanned: int = Field(0, description='Number of files visited in the repository')
+    files_selected: int = Field(
+        0, description='Number of files matching the include and exclude patterns'
+    )
+    files_processed: int = Field(0, description='Number of text files read and chunked')
+    directories_pruned: int = Field(
+        0, description='Number of excluded directories skipped without being walked'
+    )
+    bytes_read: int = Field(0, description='Total size of the text files read in bytes')
+    workers: int = Field(1, description='Number of processes used to read and chunk files')
+    elapsed_seconds: float = Field(0.0, description='Duration of the scan in seconds')
+    files_per_second: float = Field(0.0, description='Text files processed per second')
+    bytes_per_second: float = Field(0.0, description='Bytes of text read per second')
+
+
+class IndexingStats(BaseModel):
+    """Statistics for the streaming construction of a repository index.
+
+    This model records how many chunks were embedded, how many were buffered
+    in memory at once, and the memory high-water mark of the process.
+    """
+
+    chunk_count: int = Field(0, description='Number of chunks embedded')
+    batch_count: int = Field(0, description='Number of chunk batches streamed into the index')
+    max_buffered_chunks: int = Field(
+        0, description='Maximum number of chunks buffered in memory at once'
+    )
+    peak_memory_bytes: Optional[int] = Field(
+        None, description='Peak resident memory of the server process in bytes'
+    )
+    elapsed_seconds: float = Field(0.0, description='Duration of the index build in seconds')
+    chunks_per_second: float = Field(0.0, description='Chunks embedded per second')
+
+
+class SnapshotStats(BaseModel):
+    """Statistics for storing the snapshot of a repository's files.
+
+    This model records how many files were linked to blobs already in the
+    shared blob store and how many bytes had to be written.
+    """
+
+    storage_mode: str = Field('copy', description='How the files were stored (copy or blobs)')
+    file_count: int = Field(0, description='Number of files in the snapshot')
+    total_bytes: int = Field(0, description='Total size of the files in the snapshot in bytes')
+    linked_files: int = Field(
+        0, description='Number of files linked to a blob that was already stored'
+    )
+    stored_files: int = Field(0, description='Number of files written as new blobs')
+    copied_files: int = Field(
+        0, description='Number of files copied because they could not be linked'
+    )
+    bytes_written: int = Field(0, description='Number of bytes written to disk')
+    bytes_deduplicated: int = Field(
+        0, description='Number of bytes not written because an identical blob was stored'
+    )
+    elapsed_seconds: float = Field(0.0, description='Duration of the snapshot in seconds')
+
+
+class CloneStats(BaseModel):
+    """Statistics for cloning a remote repository.
+
+    This model records how the repository was cloned and how long the clone
+    waited for a free clone slot and took to complete.
+    """
+
+    depth: Optional[int] = Field(
+        None, description='Number of commits of history cloned, or None for full history'
+    )
+    filter: Optional[str] = Field(None, description='Partial clone filter, such as blob:none')
+    sparse_checkout: bool = Field(
+        False, description='Whether only files matching the include patterns were checked out'
+    )
+    wait_seconds: float = Field(
+        0.0, description='Time spent waiting for other clones to finish in seconds'
+    )
+    clone_seconds: float = Field(0.0, description='Duration of the clone in seconds')
+
+
+class IndexingStageTimings(BaseModel):
+    """Duration of each stage of an indexing run.
+
+    This model records where the time of an indexing run was spent, so that
+    the slowest stage of indexing a repository can be identified.
+    """
+
+    prepare_seconds: float = Field(
+        0.0, description='Time to clone a remote repository or open a local one in seconds'
+    )
+    index_seconds: float = Field(
+        0.0, description='Time to scan, chunk and embed files into the vector index in seconds'
+    )
+    snapshot_seconds: float = Field(
+        0.0, description='Time to store the repository files in the index in seconds'
+    )
+    save_seconds: float = Field(0.0, description='Time to save the index files in seconds')
+    metadata_seconds: float = Field(
+        0.0, description='Time to read the commit ID and list the repository files in seconds'
+    )
+    total_seconds: float = Field(0.0, description='Total duration of the indexing run in seconds')
+
+
 class IndexMetadata(BaseModel):
     """Metadata for a repository index.
 
@@ -57,6 +181,35 @@ class IndexMetadata(BaseModel):
     repository_directory: Optional[str] = Field(
         None, description='Path to the cloned repository directory'
     )
+    embedding_cache: Optional[EmbeddingCacheStats] = Field(
+        None, description='Embedding cache statistics for the last indexing run'
+    )
+    scan_stats: Optional[RepositoryScanStats] = Field(
+        None, description='File scan statistics for the last full indexing run'
+    )
+    indexing_stats: Optional[IndexingStats] = Field(
+        None, description='Index build statistics for the last full indexing run'
+    )
+    index_type: Optional[str] = Field(
+        None, description='Type of the FAISS index (flat, hnsw or ivfpq)'
+    )
+    snapshot_stats: Optional[SnapshotStats] = Field(
+        None, description='Storage statistics for the last snapshot of the repository files'
+    )
+    clone_stats: Optional[CloneStats] = Field(
+        None, description='Clone statistics for the last indexing run of a remote repository'
+    )
+    stage_timings: Optional[IndexingStageTimings] = Field(
+        None, description='Duration of each stage of the last indexing run'
+    )
+    chunk_size: Optional[int] = Field(None, description='Maximum size of the indexed chunks')
+    chunk_overlap: Optional[int] = Field(None, description='Overlap between the indexed chunks')
+    include_patterns: Optional[List[str]] = Field(
+        None, description='Glob patterns of the files included in the index'
+    )
+    exclude_patterns: Optional[List[str]] = Field(
+        None, description='Glob patterns of the files excluded from the index'
+    )
 
 
 class SearchResult(BaseModel):
@@ -98,6 +251,59 @@ class SearchResponse(BaseModel):
     )
 
 
+class MultiRepositorySearchResult(SearchResult):
+    """Result from a search across several repositories.
+
+    This model extends a search result with the repository it was found in.
+    """
+
+    repository_name: str = Field(..., description='Name of the repository')
+    repository_directory: Optional[str] = Field(
+        None, description='Path to the cloned repository directory'
+    )
+
+
+class RepositorySearchTiming(BaseModel):
+    """Outcome of searching one repository in a multi-repository search.
+
+    This model records the status, result count and timing of the search in
+    each selected repository.
+    """
+
+    repository_name: str = Field(..., description='Name of the repository')
+    index_path: str = Field(..., description='Path to the index that was searched')
+    status: str = Field(..., description='Status of the search in this repository')
+    result_count: int = Field(0, description='Number of results found in this repository')
+    execution_time_ms: float = Field(
+        0.0, description='Time to load and search the index in milliseconds'
+    )
+    message: Optional[str] = Field(None, description='Reason the repository was not searched')
+
+
+class MultiRepositorySearchResponse(BaseModel):
+    """Response from a search across several repositories.
+
+    This model represents the merged results of one query against a set of
+    indexed repositories, with per-repository timing.
+    """
+
+    results: List[MultiRepositorySearchResult] = Field(
+        default_factory=list, description='Search results from all repositories, best first'
+    )
+    query: str = Field(..., description='Original search query')
+    repositories: List[RepositorySearchTiming] = Field(
+        default_factory=list, description='Outcome of the search in each repository'
+    )
+    timestamp: datetime = Field(
+        default_factory=datetime.now, description='When the search was performed'
+    )
+    total_results: int = Field(0, description='Total number of results returned')
+    embedding_time_ms: float = Field(0.0, description='Time to embed the query in milliseconds')
+    execution_time_ms: Optional[float] = Field(
+        None, description='Search execution time in milliseconds'
+    )
+
+
 class IndexedRepositoryInfo(BaseModel):
     """Information about an indexed repository.
 
@@ -166,6 +372,135 @@ class DetailedIndexedRepositoriesResponse(BaseModel):
     )
 
 
+class IndexCacheStats(BaseModel):
+    """Statistics for the in-process index cache.
+
+    This model reports how effective the cache of loaded FAISS indices is
+    at avoiding reloads from disk.
+    """
+
+    hits: int = Field(0, description='Number of lookups served from the cache')
+    misses: int = Field(0, description='Number of lookups that loaded the index from disk')
+    evictions: int = Field(0, description='Number of indices evicted to respect the size bound')
+    invalidations: int = Field(
+        0, description='Number of cached indices dropped because the index changed on disk'
+    )
+    hit_rate: float = Field(0.0, description='Fraction of lookups served from the cache')
+    size: int = Field(0, description='Number of indices currently cached')
+    max_entries: int = Field(..., description='Maximum number of indices kept in the cache')
+    cached_indices: List[str] = Field(
+        default_factory=list, description='Index paths currently cached, least recent first'
+    )
+
+
+class QueryEmbeddingCacheStats(BaseModel):
+    """Statistics for the in-process query embedding cache.
+
+    This model reports how often query embeddings were served from memory
+    instead of calling the embedding model.
+    """
+
+    hits: int = Field(0, description='Number of query embeddings served from the cache')
+    misses: int = Field(0, description='Number of query embeddings generated by the model')
+    evictions: int = Field(0, description='Number of entries evicted to respect the size bound')
+    expirations: int = Field(0, description='Number of entries dropped after their time to live')
+    hit_rate: float = Field(0.0, description='Fraction of lookups served from the cache')
+    size: int = Field(0, description='Number of query embeddings currently cached')
+    max_entries: int = Field(..., description='Maximum number of query embeddings kept')
+    ttl_seconds: float = Field(..., description='Time to live of a cached embedding in seconds')
+
+
+class ClientRegistryEntry(BaseModel):
+    """Statistics for one client in the client registry.
+
+    This model reports how long the client took to create and how often it was
+    reused instead of being created again.
+    """
+
+    key: str = Field(..., description='Key of the client, such as its kind, region and model')
+    creation_ms: float = Field(0.0, description='Time to create the client in milliseconds')
+    reuses: int = Field(0, description='Number of requests that reused the client')
+    saved_ms: float = Field(
+        0.0, description='Creation time saved by reusing the client, in milliseconds'
+    )
+
+
+class ClientRegistryStats(BaseModel):
+    """Statistics for the registry of long-lived clients.
+
+    This model reports the clients shared between request handlers and the
+    latency saved by not creating them on every request.
+    """
+
+    clients: int = Field(0, description='Number of clients in the registry')
+    reuses: int = Field(0, description='Number of requests that reused a client')
+    creation_ms: float = Field(
+        0.0, description='Total time spent creating clients in milliseconds'
+    )
+    saved_ms: float = Field(
+        0.0, description='Total creation time saved by reusing clients, in milliseconds'
+    )
+    entries: List[ClientRegistryEntry] = Field(
+        default_factory=list, description='Statistics for each client'
+    )
+
+
+class ManifestEntry(BaseModel):
+    """File or directory in a repository manifest."""
+
+    path: str = Field(..., description='Path relative to the repository root, using / separators')
+    type: str = Field(..., description='Entry type (file or directory)')
+    size: int = Field(0, description='Size in bytes; for directories, the size of all files below')
+
+
+class RepositoryManifest(BaseModel):
+    """Structured listing of the files of an indexed repository.
+
+    The manifest is computed once at index time and stored next to metadata.json.
+    Entries are stored as parallel lists in depth-first order, with the entries of
+    each directory sorted by name, so the file stays compact for large repositories.
+    """
+
+    repository_name: str = Field(..., description='Name of the repository')
+    created_at: datetime = Field(
+        default_factory=datetime.now, description='When the manifest was created'
+    )
+    file_count: int = Field(0, description='Number of files in the repository')
+    directory_count: int = Field(0, description='Number of directories in the repository')
+    total_bytes: int = Field(0, description='Total size of the files in bytes')
+    paths: List[str] = Field(default_factory=list, description='Relative path of each entry')
+    is_directory: List[bool] = Field(
+        default_factory=list, description='Whether each entry is a directory'
+    )
+    sizes: List[int] = Field(default_factory=list, description='Size of each entry in bytes')
+    readme_files: List[str] = Field(
+        default_factory=list, description='Relative paths of README files'
+    )
+
+
+class RepositoryTreePage(BaseModel):
+    """Page of the directory tree of an indexed repository."""
+
+    repository_name: str = Field(..., description='Name of the repository')
+    path_prefix: str = Field('', description='Directory the tree is rooted at')
+    max_depth: Optional[int] = Field(
+        None, description='Maximum depth below the path prefix, or None for unlimited'
+    )
+    offset: int = Field(0, description='Index of the first entry of the page')
+    limit: int = Field(..., description='Maximum number of entries in the page')
+    total_entries: int = Field(0, description='Number of entries matching the prefix and depth')
+    next_offset: Optional[int] = Field(
+        None, description='Offset of the next page, or None for the last page'
+    )
+    entries: List[ManifestEntry] = Field(
+        default_factory=list, description='Entries of the page in tree order'
+    )
+    tree: str = Field('', description='Text rendering of the entries of the page')
+    readme_files: List[str] = Field(
+        default_factory=list, description='Relative paths of README files below the path prefix'
+    )
+
+
 class EmbeddingModel(str, Enum):
     """Available embedding models.
 
@@ -179,6 +514,75 @@ class EmbeddingModel(str, Enum):
     COHERE_EMBED_MULTILINGUAL_V3 = 'cohere.embed-multilingual-v3'
 
 
+class IndexType(str, Enum):
+    """Available FAISS index types.
+
+    This enum defines the index types that can be built for a repository.
+    AUTO selects an index type from the number of chunks.
+    """
+
+    AUTO = 'auto'
+    FLAT = 'flat'
+    HNSW = 'hnsw'
+    IVF_PQ = 'ivfpq'
+
+
+class StorageMode(str, Enum):
+    """Storage modes for the snapshot of an indexed repository's files.
+
+    COPY copies every file into the index. BLOBS stores each distinct file
+    content once in a blob store shared by all indices and hard-links the
+    snapshot files to it.
+    """
+
+    COPY = 'copy'
+    BLOBS = 'blobs'
+
+
+class StorageBenchmarkResult(BaseModel):
+    """Result of benchmarking a snapshot storage mode.
+
+    This model reports the time and disk space taken to store the snapshot
+    of a repository twice, as a repository and a re-index of it would.
+    """
+
+    storage_mode: StorageMode = Field(..., description='Benchmarked storage mode')
+    file_count: int = Field(..., description='Number of files in the snapshot')
+    first_snapshot_seconds: float = Field(..., description='Time to store the first snapshot')
+    second_snapshot_seconds: float = Field(
+        ..., description='Time to store a second snapshot of the same files'
+    )
+    disk_bytes: int = Field(..., description='Disk space used by both snapshots in bytes')
+
+
+class SearchMode(str, Enum):
+    """Retrieval modes for repository search.
+
+    This enum defines how a repository search ranks chunks.
+    """
+
+    HYBRID = 'hybrid'
+    VECTOR = 'vector'
+    LEXICAL = 'lexical'
+
+
+class IndexBenchmarkResult(BaseModel):
+    """Result of benchmarking an index type against the flat baseline.
+
+    This model reports the recall and search latency of an index type
+    compared to exact search.
+    """
+
+    index_type: IndexType = Field(..., description='Type of the benchmarked index')
+    vector_count: int = Field(..., description='Number of indexed vectors')
+    k: int = Field(..., description='Number of neighbours retrieved per query')
+    recall_at_k: float = Field(
+        ..., description='Fraction of the exact k nearest neighbours that were retrieved'
+    )
+    build_seconds: float = Field(..., description='Time to build the index in seconds')
+    mean_query_ms: float = Field(..., description='Mean latency of a single query in milliseconds')
+
+
 class IndexRepositoryResponse(BaseModel):
     """Response from indexing a repository.
 
@@ -204,6 +608,58 @@ class IndexRepositoryResponse(BaseModel):
     )
 
 
+class IndexingJobStatus(str, Enum):
+    """Statuses of a background indexing job.
+
+    INTERRUPTED marks jobs that were queued or running when the server stopped.
+    """
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+    INTERRUPTED = 'interrupted'
+
+
+class IndexingStage(str, Enum):
+    """Stages of indexing a repository."""
+
+    QUEUED = 'queued'
+    PREPARING = 'preparing'
+    INDEXING = 'indexing'
+    SNAPSHOTTING = 'snapshotting'
+    SAVING = 'saving'
+    FINALIZING = 'finalizing'
+    DONE = 'done'
+
+
+class IndexingJob(BaseModel):
+    """Background job that indexes a repository.
+
+    The configurations are stored so that an interrupted job can be resumed.
+    """
+
+    job_id: str = Field(..., description='ID of the job')
+    repository_path: str = Field(..., description='Path or URL of the repository')
+    status: IndexingJobStatus = Field(IndexingJobStatus.QUEUED, description='Status of the job')
+    stage: IndexingStage = Field(IndexingStage.QUEUED, description='Current indexing stage')
+    progress_percent: float = Field(0.0, description='Progress of the job in percent')
+    message: Optional[str] = Field(None, description='Latest progress or error message')
+    created_at: datetime = Field(..., description='When the job was submitted')
+    started_at: Optional[datetime] = Field(None, description='When the job last started running')
+    finished_at: Optional[datetime] = Field(None, description='When the job finished')
+    attempts: int = Field(0, description='Number of times the job started running')
+    checkpointed_chunks: int = Field(
+        0, description='Number of chunk embeddings restored from the checkpoint when last started'
+    )
+    index_config: Dict = Field(..., description='Indexer configuration of the job')
+    repository_config: Dict = Field(..., description='Repository configuration of the job')
+    result: Optional[IndexRepositoryResponse] = Field(
+        None, description='Response of the indexing operation once finished'
+    )
+
+
 class GitHubRepoSearchInput(BaseModel):
     """Input for GitHub repository search.
 
@@ -265,6 +721,18 @@ class GitHubRepoSearchResponse(BaseModel):
     )
 
 
+class GitHubSearchCacheEntry(BaseModel):
+    """Entry of the GitHub search response cache.
+
+    This model holds a cached search result or API response body, with the
+    ETag used to revalidate it and the time it was stored or last revalidated.
+    """
+
+    value: Any = Field(..., description='Cached search results or response body')
+    etag: Optional[str] = Field(None, description='ETag of the cached API response')
+    stored_at: float = Field(..., description='Time the entry was stored or revalidated')
+
+
 class DeleteRepositoryResponse(BaseModel):
     """Response from deleting a repository.
 
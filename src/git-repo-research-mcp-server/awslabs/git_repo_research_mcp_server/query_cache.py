@@ -0,0 +1,257 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""In-process cache of query embeddings for Git Repository Research MCP Server.
+
+This module keeps recently used query embeddings in memory so that repeated
+searches do not call the embedding model again for the same query text.
+"""
+
+import os
+import threading
+import time
+import unicodedata
+from awslabs.git_repo_research_mcp_server.defaults import Constants
+from awslabs.git_repo_research_mcp_server.models import QueryEmbeddingCacheStats
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from langchain_core.embeddings.embeddings import Embeddings
+from loguru import logger
+from typing import Callable, List, Optional, Sequence
+
+
+def normalize_query(query: str) -> str:
+    """Normalize query text for use as a cache key.
+
+    Unicode compatibility forms, letter case and runs of whitespace are folded,
+    so queries that differ only in formatting share one cache entry.
+
+    Args:
+        query: Query text
+
+    Returns:
+        Normalized query text
+    """
+    return ' '.join(unicodedata.normalize('NFKC', query).casefold().split())
+
+
+class QueryEmbeddingCache:
+    """Size-bounded LRU cache of query embeddings with a time to live.
+
+    Entries are keyed by embedding model and normalized query text, and expire
+    after a fixed time so that model updates are eventually picked up.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = Constants.QUERY_EMBEDDING_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = Constants.QUERY_EMBEDDING_CACHE_TTL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the query embedding cache.
+
+        Args:
+            max_entries: Maximum number of query embeddings to keep
+            ttl_seconds: Time after which a cached embedding expires, in seconds
+            clock: Function returning the current time in seconds
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, model_id: str, query: str) -> Optional[List[float]]:
+        """Look up the cached embedding of a query.
+
+        Args:
+            model_id: ID of the embedding model
+            query: Query text
+
+        Returns:
+            The cached embedding, or None on a miss
+        """
+        key = (getattr(model_id, 'value', model_id), normalize_query(query))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._clock() - entry[0] < self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return None
+
+    def put(self, model_id: str, query: str, embedding: List[float]) -> None:
+        """Store the embedding of a query.
+
+        Args:
+            model_id: ID of the embedding model
+            query: Query text
+            embedding: Query embedding
+        """
+        key = (getattr(model_id, 'value', model_id), normalize_query(query))
+        with self._lock:
+            self._entries[key] = (self._clock(), embedding)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all cached embeddings and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.expirations = 0
+
+    def stats(self) -> QueryEmbeddingCacheStats:
+        """Get cache statistics.
+
+        Returns:
+            QueryEmbeddingCacheStats object with counters and the cache size
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return QueryEmbeddingCacheStats(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                expirations=self.expirations,
+                hit_rate=self.hits / lookups if lookups else 0.0,
+                size=len(self._entries),
+                max_entries=self.max_entries,
+                ttl_seconds=self.ttl_seconds,
+            )
+
+
+_query_cache: Optional[QueryEmbeddingCache] = None
+_query_cache_lock = threading.Lock()
+
+
+def get_query_cache() -> QueryEmbeddingCache:
+    """Get the process-wide query embedding cache.
+
+    The cache size and time to live can be overridden with the
+    QUERY_EMBEDDING_CACHE_MAX_ENTRIES and QUERY_EMBEDDING_CACHE_TTL_SECONDS
+    environment variables.
+
+    Returns:
+        QueryEmbeddingCache instance shared by all searchers
+    """
+    global _query_cache
+    with _query_cache_lock:
+        if _query_cache is None:
+            max_entries = Constants.QUERY_EMBEDDING_CACHE_MAX_ENTRIES
+            ttl_seconds = Constants.QUERY_EMBEDDING_CACHE_TTL_SECONDS
+            try:
+                max_entries = int(os.environ.get('QUERY_EMBEDDING_CACHE_MAX_ENTRIES', max_entries))
+                ttl_seconds = float(
+                    os.environ.get('QUERY_EMBEDDING_CACHE_TTL_SECONDS', ttl_seconds)
+                )
+            except ValueError:
+                logger.warning('Invalid query embedding cache settings, using defaults')
+            _query_cache = QueryEmbeddingCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+        return _query_cache
+
+
+def embed_queries(
+    embeddings: Embeddings,
+    model_id: str,
+    queries: Sequence[str],
+    max_concurrency: int = Constants.EMBEDDING_MAX_CONCURRENCY,
+) -> List[List[float]]:
+    """Embed queries, reusing cached embeddings.
+
+    Each distinct query missing from the cache is embedded once, and the misses
+    are sent to the model concurrently. Queries are embedded with embed_query
+    because some models embed search queries differently from documents.
+
+    Args:
+        embeddings: Embedding model
+        model_id: ID of the embedding model, used in the cache key
+        queries: Query texts
+        max_concurrency: Maximum number of queries embedded at the same time
+
+    Returns:
+        List of embeddings, one per query
+    """
+    cache = get_query_cache()
+    vectors = {}
+    misses = {}
+    for query in queries:
+        key = normalize_query(query)
+        if key in vectors or key in misses:
+            continue
+        embedding = cache.get(model_id, query)
+        if embedding is None:
+            misses[key] = query
+        else:
+            vectors[key] = embedding
+
+    if misses:
+        if len(misses) == 1:
+            embedded = [embeddings.embed_query(query) for query in misses.values()]
+        else:
+            workers = max(1, min(max_concurrency, len(misses)))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                embedded = list(pool.map(embeddings.embed_query, misses.values()))
+        for (key, query), embedding in zip(misses.items(), embedded):
+            cache.put(model_id, query, embedding)
+            vectors[key] = embedding
+
+    return [vectors[normalize_query(query)] for query in queries]
+
+
+class CachedQueryEmbeddings(Embeddings):
+    """Embedding model wrapper that serves query embeddings from the query cache.
+
+    Document embeddings are passed through to the wrapped model unchanged.
+    """
+
+    def __init__(self, embeddings: Embeddings, model_id: str):
+        """Initialize the cached query embeddings.
+
+        Args:
+            embeddings: Embedding model to wrap
+            model_id: ID of the embedding model, used in the cache key
+        """
+        self.embeddings = embeddings
+        self.model_id = model_id
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents with the wrapped model.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            List of embeddings, one per text
+        """
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query, reusing a cached embedding.
+
+        Args:
+            text: Query text
+
+        Returns:
+            Query embedding
+        """
+        return embed_queries(self.embeddings, self.model_id, [text])[0]
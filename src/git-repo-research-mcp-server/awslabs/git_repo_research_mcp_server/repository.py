@@ -15,13 +15,21 @@ Git repositories for indexing and searching.
 """
 
 import fnmatch
+import multiprocessing
 import os
+import re
 import shutil
 import tempfile
+import threading
+import time
 from awslabs.git_repo_research_mcp_server.defaults import Constants
+from awslabs.git_repo_research_mcp_server.models import CloneStats, RepositoryScanStats
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from git import Repo
 from loguru import logger
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from urllib.parse import urlparse
 
 
@@ -54,12 +62,83 @@ def is_git_repo(path: str) -> bool:
         return False
 
 
-def clone_repository(url: str, target_dir: Optional[str] = None) -> str:
+_clone_semaphore: Optional[threading.BoundedSemaphore] = None
+_clone_semaphore_lock = threading.Lock()
+
+
+def get_clone_semaphore() -> threading.BoundedSemaphore:
+    """Get the semaphore that limits the number of concurrent clones.
+
+    The limit can be overridden with the CLONE_MAX_CONCURRENCY environment variable.
+
+    Returns:
+        Semaphore shared by all clones of the process
+    """
+    global _clone_semaphore
+    with _clone_semaphore_lock:
+        if _clone_semaphore is None:
+            try:
+                limit = int(
+                    os.environ.get('CLONE_MAX_CONCURRENCY', Constants.CLONE_MAX_CONCURRENCY)
+                )
+            except ValueError:
+                logger.warning('Invalid CLONE_MAX_CONCURRENCY, using the default')
+                limit = Constants.CLONE_MAX_CONCURRENCY
+            _clone_semaphore = threading.BoundedSemaphore(max(1, limit))
+        return _clone_semaphore
+
+
+def get_sparse_checkout_patterns(
+    include_patterns: Iterable[str], exclude_patterns: Iterable[str]
+) -> List[str]:
+    """Convert include and exclude patterns into sparse checkout patterns.
+
+    Git matches sparse checkout patterns with gitignore rules, where '*' does not
+    match '/', while the include patterns are matched with fnmatch. Include patterns
+    are therefore reduced to their file name part, which Git matches at any depth,
+    so the checkout holds at least every file that will be indexed. Only exclude
+    patterns for whole directories are applied. In gitignore rules '**/' also
+    matches no directory at all, while fnmatch needs at least one, so '**/' is
+    anchored below the root: '**/build/**' becomes '/*/**/build/**' and leaves a
+    top-level 'build' directory, which the indexer does not exclude, checked out.
+
+    Args:
+        include_patterns: Glob patterns for files to include
+        exclude_patterns: Glob patterns for files to exclude
+
+    Returns:
+        Patterns for git sparse-checkout in non-cone mode
+    """
+    patterns = []
+    for pattern in include_patterns:
+        name = pattern.rsplit('/', 1)[-1]
+        patterns.append('*' if name in ('', '**') else name)
+    for pattern in exclude_patterns:
+        if pattern.endswith('/**'):
+            directory = re.sub(r'(^|/)\*\*/', r'\1*/**/', pattern[:-3])
+            patterns.append(f'!/{directory.lstrip("/")}/**')
+    return list(dict.fromkeys(patterns))
+
+
+def clone_repository(
+    url: str,
+    target_dir: Optional[str] = None,
+    depth: Optional[int] = None,
+    filter_spec: Optional[str] = None,
+    sparse_patterns: Optional[List[str]] = None,
+    stats: Optional[CloneStats] = None,
+) -> str:
     """Clone a Git repository from a URL.
 
+    At most CLONE_MAX_CONCURRENCY clones run at the same time; further clones wait.
+
     Args:
         url: URL of the repository to clone
         target_dir: Directory to clone into (optional, uses temp dir if not provided)
+        depth: Number of commits of history to clone (optional, clones full history if not provided)
+        filter_spec: Partial clone filter such as 'blob:none' or 'blob:limit=1m' (optional)
+        sparse_patterns: Sparse checkout patterns (optional, checks out all files if not provided)
+        stats: Clone statistics to update (optional)
 
     Returns:
         Path to the cloned repository
@@ -70,27 +149,76 @@ def clone_repository(url: str, target_dir: Optional[str] = None) -> str:
     if target_dir is None:
         target_dir = tempfile.mkdtemp(prefix='git_repo_research_')
 
-    logger.info(f'Cloning repository from {url} to {target_dir}')
-    try:
-        # Clone the repository with GitPython
-        Repo.clone_from(url, target_dir)
+    clone_options = {}
+    if depth:
+        clone_options['depth'] = depth
+    if filter_spec:
+        clone_options['filter'] = filter_spec
+    if sparse_patterns:
+        # Check out after the sparse checkout patterns are set, so that only matching
+        # files are written and, with a filter, only their blobs are fetched
+        clone_options['no_checkout'] = True
+
+    wait_start = time.time()
+    with get_clone_semaphore():
+        clone_start = time.time()
+        logger.info(f'Cloning repository from {url} to {target_dir}')
+        try:
+            # Clone the repository with GitPython
+            repo = Repo.clone_from(url, target_dir, **clone_options)
+            if sparse_patterns:
+                repo.git.sparse_checkout('set', '--no-cone', *sparse_patterns)
+                repo.git.checkout()
+
+            # Check if .git directory exists after cloning
+            git_dir = os.path.join(target_dir, '.git')
+            if os.path.exists(git_dir):
+                logger.info(f'.git directory exists at {git_dir}')
+            else:
+                logger.warning(f'.git directory not found after cloning at {git_dir}')
+                # List the contents of the directory to debug
+                logger.info(f'Contents of {target_dir}: {os.listdir(target_dir)}')
+        except Exception as e:
+            # Clean up the target directory if it was created
+            if os.path.exists(target_dir):
+                shutil.rmtree(target_dir, ignore_errors=True)
+            logger.error(f'Failed to clone repository: {e}')
+            raise
 
-        # Check if .git directory exists after cloning
-        git_dir = os.path.join(target_dir, '.git')
-        if os.path.exists(git_dir):
-            logger.info(f'.git directory exists at {git_dir}')
-        else:
-            logger.warning(f'.git directory not found after cloning at {git_dir}')
-            # List the contents of the directory to debug
-            logger.info(f'Contents of {target_dir}: {os.listdir(target_dir)}')
+    clone_seconds = time.time() - clone_start
+    logger.info(f'Cloned {url} in {clone_seconds:.2f}s')
+    if stats is not None:
+        stats.depth = depth or None
+        stats.filter = filter_spec
+        stats.sparse_checkout = bool(sparse_patterns)
+        stats.wait_seconds = clone_start - wait_start
+        stats.clone_seconds = clone_seconds
+    return target_dir
+
+
+def ensure_commit(repo_path: str, commit_id: str) -> None:
+    """Fetch a commit missing from a shallow clone.
+
+    Shallow clones only hold the latest commit, so the commit an index was built
+    from is fetched on its own before diffing against it.
 
-        return target_dir
+    Args:
+        repo_path: Path to the repository
+        commit_id: ID of the commit that must be present
+    """
+    repo = Repo(repo_path)
+    try:
+        repo.git.cat_file('-e', f'{commit_id}^{{commit}}')
+        return
+    except Exception:
+        pass
+    if repo.git.rev_parse('--is-shallow-repository') != 'true':
+        return
+    logger.info(f'Fetching commit {commit_id} into shallow clone {repo_path}')
+    try:
+        repo.git.fetch('--depth=1', 'origin', commit_id)
     except Exception as e:
-        # Clean up the target directory if it was created
-        if os.path.exists(target_dir):
-            shutil.rmtree(target_dir, ignore_errors=True)
-        logger.error(f'Failed to clone repository: {e}')
-        raise
+        logger.info(f'Cannot fetch commit {commit_id}: {e}')
 
 
 def get_repository_name(repo_path: str) -> str:
@@ -130,57 +258,189 @@ def get_repository_name(repo_path: str) -> str:
         return os.path.basename(os.path.abspath(repo_path))
 
 
-def get_text_files(
+@lru_cache(maxsize=32)
+def compile_patterns(patterns: Tuple[str, ...]) -> re.Pattern:
+    """Compile glob patterns into a single regular expression.
+
+    The expression matches exactly the paths that fnmatch would match against
+    any of the patterns, so each path is tested once instead of once per pattern.
+
+    Args:
+        patterns: Glob patterns to compile
+
+    Returns:
+        Compiled regular expression
+    """
+    if not patterns:
+        # Never matches
+        return re.compile(r'(?!)')
+    return re.compile(
+        '|'.join(f'(?:{fnmatch.translate(os.path.normcase(pattern))})' for pattern in patterns)
+    )
+
+
+@lru_cache(maxsize=32)
+def compile_prune_patterns(exclude_patterns: Tuple[str, ...]) -> re.Pattern:
+    """Compile the exclude patterns that exclude everything below a directory.
+
+    A pattern ending in '/**' excludes every file below a directory matching the
+    rest of the pattern, so such directories can be skipped without walking them.
+
+    Args:
+        exclude_patterns: Glob patterns for files to exclude
+
+    Returns:
+        Compiled regular expression matching relative paths of prunable directories
+    """
+    return compile_patterns(
+        tuple(pattern[:-3] for pattern in exclude_patterns if pattern.endswith('/**'))
+    )
+
+
+def matches_file_patterns(
+    rel_path: str, include_patterns: Iterable[str], exclude_patterns: Iterable[str]
+) -> bool:
+    """Check if a file is selected by the include and exclude patterns.
+
+    Args:
+        rel_path: Path of the file relative to the repository root
+        include_patterns: Glob patterns for files to include
+        exclude_patterns: Glob patterns for files to exclude
+
+    Returns:
+        True if the file matches an include pattern and no exclude pattern
+    """
+    rel_path = os.path.normcase(rel_path)
+    if not compile_patterns(tuple(include_patterns)).match(rel_path):
+        return False
+    return not compile_patterns(tuple(exclude_patterns)).match(rel_path)
+
+
+def is_text_file(file_path: str) -> bool:
+    """Check if a file is a non-empty UTF-8 text file.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        True if the file can be read as text, False otherwise
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            # Read a small sample to check if it's text
+            sample = f.read(1024)
+            # If we can decode it as UTF-8, it's probably text
+            return bool(sample)
+    except UnicodeDecodeError:
+        # Not a text file
+        return False
+    except Exception as e:
+        logger.warning(f'Error reading file {file_path}: {e}')
+        return False
+
+
+def walk_repository(
     repo_path: str,
     include_patterns: Optional[List[str]] = None,
     exclude_patterns: Optional[List[str]] = None,
+    stats: Optional[RepositoryScanStats] = None,
 ) -> List[str]:
-    """Get all text files in a repository.
+    """Find the files in a repository selected by the include and exclude patterns.
+
+    Directories excluded as a whole are pruned before they are walked. Files are
+    not opened.
 
     Args:
         repo_path: Path to the repository
         include_patterns: Glob patterns for files to include (optional)
         exclude_patterns: Glob patterns for files to exclude (optional)
+        stats: Scan statistics to update (optional)
 
     Returns:
-        List of paths to text files
+        List of paths to the selected files
     """
     if include_patterns is None:
         include_patterns = Constants.TEXT_FILE_INCLUDE_PATTERNS
     if exclude_patterns is None:
         exclude_patterns = Constants.TEXT_FILE_EXCLUDE_PATTERNS
 
-    text_files = []
-    for root, _, files in os.walk(repo_path):
+    include_regex = compile_patterns(tuple(include_patterns))
+    exclude_regex = compile_patterns(tuple(exclude_patterns))
+    prune_regex = compile_prune_patterns(tuple(exclude_patterns))
+
+    selected_files = []
+    for root, dirs, files in os.walk(repo_path):
+        rel_root = os.path.relpath(root, repo_path)
+        rel_root = '' if rel_root == os.curdir else os.path.normcase(rel_root) + os.sep
+
+        kept_dirs = [name for name in dirs if not prune_regex.match(rel_root + name)]
+        if stats is not None:
+            stats.directories_pruned += len(dirs) - len(kept_dirs)
+        dirs[:] = kept_dirs
+
         for file in files:
-            file_path = os.path.join(root, file)
-            rel_path = os.path.relpath(file_path, repo_path)
+            if stats is not None:
+                stats.files_scanned += 1
+            rel_path = rel_root + os.path.normcase(file)
+            if include_regex.match(rel_path) and not exclude_regex.match(rel_path):
+                selected_files.append(os.path.join(root, file))
 
-            # Check if the file matches any include pattern
-            included = any(fnmatch.fnmatch(rel_path, pattern) for pattern in include_patterns)
-            if not included:
-                continue
+    return selected_files
 
-            # Check if the file matches any exclude pattern
-            excluded = any(fnmatch.fnmatch(rel_path, pattern) for pattern in exclude_patterns)
-            if excluded:
-                continue
 
-            # Try to read the file as text
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    # Read a small sample to check if it's text
-                    sample = f.read(1024)
-                    # If we can decode it as UTF-8, it's probably text
-                    if sample:
-                        text_files.append(file_path)
-            except UnicodeDecodeError:
-                # Not a text file
-                pass
-            except Exception as e:
-                logger.warning(f'Error reading file {file_path}: {e}')
+def get_text_files(
+    repo_path: str,
+    include_patterns: Optional[List[str]] = None,
+    exclude_patterns: Optional[List[str]] = None,
+) -> List[str]:
+    """Get all text files in a repository.
+
+    Args:
+        repo_path: Path to the repository
+        include_patterns: Glob patterns for files to include (optional)
+        exclude_patterns: Glob patterns for files to exclude (optional)
 
-    return text_files
+    Returns:
+        List of paths to text files
+    """
+    return [
+        file_path
+        for file_path in walk_repository(repo_path, include_patterns, exclude_patterns)
+        if is_text_file(file_path)
+    ]
+
+
+def get_changed_files(repo_path: str, since_commit: str) -> Tuple[List[str], List[str]]:
+    """Get the files changed between a commit and HEAD.
+
+    Args:
+        repo_path: Path to the repository
+        since_commit: ID of the commit to diff against
+
+    Returns:
+        Tuple containing:
+        - Relative paths of files added or modified since the commit
+        - Relative paths of files deleted since the commit
+
+    Raises:
+        Exception: If the commit cannot be resolved in the repository
+    """
+    repo = Repo(repo_path)
+    old_commit = repo.commit(since_commit)
+
+    changed_files = set()
+    deleted_files = set()
+    for diff in old_commit.diff(repo.head.commit):
+        if diff.change_type == 'D':
+            deleted_files.add(diff.a_path)
+        elif diff.change_type == 'R':
+            # A rename removes the old path and adds the new one
+            deleted_files.add(diff.a_path)
+            changed_files.add(diff.b_path)
+        else:
+            changed_files.add(diff.b_path)
+
+    return sorted(changed_files), sorted(deleted_files)
 
 
 def get_file_extension_stats(file_paths: List[str]) -> Dict[str, int]:
@@ -259,14 +519,148 @@ def chunk_text(text: str, chunk_size: int = 1000, chunk_overlap: int = 200) -> L
     return chunks
 
 
-def process_repository(
+def read_and_chunk_file(
+    file_path: str, chunk_size: int = 1000, chunk_overlap: int = 200
+) -> Optional[Tuple[List[str], int]]:
+    """Read a file once and split it into chunks if it is a non-empty UTF-8 text file.
+
+    This function runs in the worker processes of scan_repository, so it must
+    stay importable at module level.
+
+    Args:
+        file_path: Path to the file
+        chunk_size: Maximum size of each chunk in characters
+        chunk_overlap: Overlap between chunks in characters
+
+    Returns:
+        Tuple of the text chunks and the number of bytes read, or None if the file
+        is empty, binary, or cannot be read
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        content = data.decode('utf-8')
+    except UnicodeDecodeError:
+        # Not a text file
+        return None
+    except Exception as e:
+        logger.warning(f'Error reading file {file_path}: {e}')
+        return None
+
+    if not content:
+        return None
+    return chunk_text(content, chunk_size, chunk_overlap), len(data)
+
+
+def _read_and_chunk_files(
+    tasks: List[Tuple[str, int, int]],
+) -> List[Optional[Tuple[List[str], int]]]:
+    """Read and chunk a group of files in a worker process."""
+    return [read_and_chunk_file(*task) for task in tasks]
+
+
+def iter_repository_files(
     repo_path: str,
     include_patterns: Optional[List[str]] = None,
     exclude_patterns: Optional[List[str]] = None,
     chunk_size: int = 1000,
     chunk_overlap: int = 200,
-) -> Tuple[List[str], Dict[str, str], Dict[str, int]]:
-    """Process a repository for indexing.
+    max_workers: Optional[int] = None,
+    parallel_min_files: int = Constants.SCAN_PARALLEL_MIN_FILES,
+    stats: Optional[RepositoryScanStats] = None,
+) -> Iterator[Tuple[str, List[str]]]:
+    """Read and chunk the text files of a repository, yielding one file at a time.
+
+    Files are read exactly once. When there are at least parallel_min_files
+    selected files, reading and chunking is spread across a process pool in
+    groups, with a bounded number of groups in flight so memory use does not
+    grow with the size of the repository.
+
+    Args:
+        repo_path: Path to the repository
+        include_patterns: Glob patterns for files to include (optional)
+        exclude_patterns: Glob patterns for files to exclude (optional)
+        chunk_size: Maximum size of each chunk in characters
+        chunk_overlap: Overlap between chunks in characters
+        max_workers: Maximum number of worker processes (optional, defaults to the CPU count)
+        parallel_min_files: Minimum number of selected files to use a process pool
+        stats: Scan statistics to update (optional)
+
+    Yields:
+        Tuples of the file path relative to the repository and the file's text chunks
+    """
+    start_time = time.time()
+    if stats is None:
+        stats = RepositoryScanStats()
+    selected_files = walk_repository(repo_path, include_patterns, exclude_patterns, stats)
+    stats.files_selected = len(selected_files)
+
+    worker_count = max_workers or os.cpu_count() or 1
+    group_size = max(1, min(Constants.SCAN_MAP_CHUNKSIZE, len(selected_files) // worker_count))
+    groups = [
+        [
+            (file_path, chunk_size, chunk_overlap)
+            for file_path in selected_files[i : i + group_size]
+        ]
+        for i in range(0, len(selected_files), group_size)
+    ]
+
+    executor = None
+    if worker_count > 1 and len(selected_files) >= max(parallel_min_files, 2):
+        try:
+            # Spawn workers so the pool is safe to start from a multithreaded server
+            executor = ProcessPoolExecutor(
+                max_workers=worker_count, mp_context=multiprocessing.get_context('spawn')
+            )
+        except Exception as e:
+            logger.warning(f'Parallel file processing unavailable, processing serially: {e}')
+    stats.workers = worker_count if executor else 1
+
+    try:
+        pending = deque()
+        next_group = 0
+        for group in groups:
+            if executor:
+                # Keep a bounded number of groups in flight
+                while next_group < len(groups) and len(pending) < worker_count * 2:
+                    pending.append(executor.submit(_read_and_chunk_files, groups[next_group]))
+                    next_group += 1
+                try:
+                    results = pending.popleft().result()
+                except Exception as e:
+                    logger.warning(f'Parallel file processing failed, processing serially: {e}')
+                    results = _read_and_chunk_files(group)
+            else:
+                results = _read_and_chunk_files(group)
+
+            for (file_path, _, _), result in zip(group, results):
+                if result is None:
+                    continue
+                file_chunks, bytes_read = result
+                stats.files_processed += 1
+                stats.bytes_read += bytes_read
+                yield os.path.relpath(file_path, repo_path), file_chunks
+    finally:
+        if executor:
+            executor.shutdown(wait=True, cancel_futures=True)
+        stats.elapsed_seconds = time.time() - start_time
+        if stats.elapsed_seconds > 0:
+            stats.files_per_second = stats.files_processed / stats.elapsed_seconds
+            stats.bytes_per_second = stats.bytes_read / stats.elapsed_seconds
+
+
+def scan_repository(
+    repo_path: str,
+    include_patterns: Optional[List[str]] = None,
+    exclude_patterns: Optional[List[str]] = None,
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200,
+    max_workers: Optional[int] = None,
+    parallel_min_files: int = Constants.SCAN_PARALLEL_MIN_FILES,
+) -> Tuple[List[str], Dict[str, str], Dict[str, int], RepositoryScanStats]:
+    """Find, read and chunk the text files of a repository in a single pass.
+
+    This collects the output of iter_repository_files in memory.
 
     Args:
         repo_path: Path to the repository
@@ -274,35 +668,71 @@ def process_repository(
         exclude_patterns: Glob patterns for files to exclude (optional)
         chunk_size: Maximum size of each chunk in characters
         chunk_overlap: Overlap between chunks in characters
+        max_workers: Maximum number of worker processes (optional, defaults to the CPU count)
+        parallel_min_files: Minimum number of selected files to use a process pool
 
     Returns:
         Tuple containing:
         - List of text chunks
         - Dictionary mapping chunks to file paths
         - Dictionary of file extension statistics
+        - Scan statistics
     """
-    logger.info(f'Processing repository at {repo_path}')
-    text_files = get_text_files(repo_path, include_patterns, exclude_patterns)
-    logger.info(f'Found {len(text_files)} text files')
+    stats = RepositoryScanStats()
+    chunks = []
+    chunk_to_file = {}
+    text_files = []
+    for rel_path, file_chunks in iter_repository_files(
+        repo_path,
+        include_patterns,
+        exclude_patterns,
+        chunk_size,
+        chunk_overlap,
+        max_workers,
+        parallel_min_files,
+        stats,
+    ):
+        text_files.append(rel_path)
+        for chunk in file_chunks:
+            chunks.append(chunk)
+            chunk_to_file[chunk] = rel_path
 
     extension_stats = get_file_extension_stats(text_files)
-    logger.info(f'File extension statistics: {extension_stats}')
+    return chunks, chunk_to_file, extension_stats, stats
 
-    chunks = []
-    chunk_to_file = {}
 
-    for file_path in text_files:
-        try:
-            content = read_file_content(file_path)
-            file_chunks = chunk_text(content, chunk_size, chunk_overlap)
+def process_repository(
+    repo_path: str,
+    include_patterns: Optional[List[str]] = None,
+    exclude_patterns: Optional[List[str]] = None,
+    chunk_size: int = 1000,
+    chunk_overlap: int = 200,
+) -> Tuple[List[str], Dict[str, str], Dict[str, int]]:
+    """Process a repository for indexing.
 
-            rel_path = os.path.relpath(file_path, repo_path)
-            for chunk in file_chunks:
-                chunks.append(chunk)
-                chunk_to_file[chunk] = rel_path
-        except Exception as e:
-            logger.warning(f'Error processing file {file_path}: {e}')
+    Args:
+        repo_path: Path to the repository
+        include_patterns: Glob patterns for files to include (optional)
+        exclude_patterns: Glob patterns for files to exclude (optional)
+        chunk_size: Maximum size of each chunk in characters
+        chunk_overlap: Overlap between chunks in characters
 
+    Returns:
+        Tuple containing:
+        - List of text chunks
+        - Dictionary mapping chunks to file paths
+        - Dictionary of file extension statistics
+    """
+    logger.info(f'Processing repository at {repo_path}')
+    chunks, chunk_to_file, extension_stats, stats = scan_repository(
+        repo_path, include_patterns, exclude_patterns, chunk_size, chunk_overlap
+    )
+    logger.info(
+        f'Processed {stats.files_processed} of {stats.files_scanned} files '
+        f'({stats.bytes_read} bytes) in {stats.elapsed_seconds:.2f}s with {stats.workers} '
+        f'workers: {stats.files_per_second:.1f} files/s, {stats.bytes_per_second:.0f} bytes/s'
+    )
+    logger.info(f'File extension statistics: {extension_stats}')
     logger.info(f'Created {len(chunks)} text chunks')
     return chunks, chunk_to_file, extension_stats
 
@@ -14,8 +14,10 @@ This module provides functionality for searching within indexed Git repositories
 using LangChain's FAISS implementation.
 """
 
+import numpy as np
 import os
 import time
+from awslabs.git_repo_research_mcp_server.client_registry import get_client_registry
 from awslabs.git_repo_research_mcp_server.defaults import Constants
 from awslabs.git_repo_research_mcp_server.embeddings import get_embedding_model
 from awslabs.git_repo_research_mcp_server.indexer import (
@@ -23,13 +25,32 @@ from awslabs.git_repo_research_mcp_server.indexer import (
     get_docstore_dict_size,
     get_repository_indexer,
 )
+from awslabs.git_repo_research_mcp_server.lexical_index import (
+    LexicalIndex,
+    load_lexical_index,
+    reciprocal_rank_fusion,
+)
+from awslabs.git_repo_research_mcp_server.manifest import (
+    build_and_save_manifest,
+    get_tree_page,
+    load_manifest,
+)
 from awslabs.git_repo_research_mcp_server.models import (
     EmbeddingModel,
+    MultiRepositorySearchResponse,
+    MultiRepositorySearchResult,
+    RepositoryManifest,
+    RepositorySearchTiming,
+    RepositoryTreePage,
+    SearchMode,
     SearchResponse,
     SearchResult,
 )
+from awslabs.git_repo_research_mcp_server.query_cache import embed_queries
+from awslabs.git_repo_research_mcp_server.utils import list_indexed_repositories, load_metadata
+from concurrent.futures import ThreadPoolExecutor
 from loguru import logger
-from typing import Optional
+from typing import List, Optional, Tuple
 
 
 class RepositorySearcher:
@@ -75,14 +96,17 @@ class RepositorySearcher:
         # Initialize the repository indexer
         self.repository_indexer = get_repository_indexer(self.config)
 
-    def list_repository_files(self, repository_name: str) -> Optional[str]:
-        """Generate a directory tree structure of the repository files.
+    def get_repository_manifest(self, repository_name: str) -> Optional[RepositoryManifest]:
+        """Get the manifest of the files of an indexed repository.
+
+        Indices created before manifests existed get their manifest built and
+        saved on first use.
 
         Args:
             repository_name: Name of the repository
 
         Returns:
-            String representation of the directory tree, or None if repository not found
+            RepositoryManifest, or None if repository not found
         """
         # Get the index path for the repository
         index_path = self.repository_indexer._get_index_path(repository_name)
@@ -95,84 +119,45 @@ class RepositorySearcher:
             logger.warning(f'Repository directory not found: {repo_files_path}')
             return None
 
-        try:
-            # Generate the directory tree
-            tree = self._generate_directory_tree(repo_files_path)
-            return tree
-        except Exception as e:
-            logger.error(f'Error generating directory tree for {repository_name}: {e}')
-            return None
-
-    def _generate_directory_tree(self, path: str) -> str:
-        """Generate a directory tree structure for a given path.
-
-        Args:
-            path: Path to the directory
+        manifest = load_manifest(index_path)
+        if manifest is None:
+            manifest = build_and_save_manifest(repo_files_path, repository_name, index_path)
+        return manifest
 
-        Returns:
-            String representation of the directory tree
-        """
-        # Get the base name of the path
-        base_name = os.path.basename(path)
-
-        # Initialize the tree string
-        tree = f'Directory structure:\n└── {base_name}/\n'
-
-        # Generate the tree recursively
-        tree += self._generate_tree(path, '', base_name)
-
-        return tree
-
-    def _generate_tree(self, path: str, prefix: str, base_path: str) -> str:
-        """Recursively generate a directory tree structure.
+    def list_repository_files(
+        self,
+        repository_name: str,
+        path_prefix: str = '',
+        max_depth: Optional[int] = None,
+        offset: int = 0,
+        limit: int = Constants.REPOSITORY_TREE_PAGE_SIZE,
+    ) -> Optional[RepositoryTreePage]:
+        """Get a page of the directory tree of the repository files.
 
         Args:
-            path: Path to the current directory
-            prefix: Prefix for the current line
-            base_path: Base path to remove from the full path
+            repository_name: Name of the repository
+            path_prefix: Directory to root the tree at, relative to the repository root
+            max_depth: Maximum depth below the path prefix, or None for unlimited
+            offset: Index of the first entry to return
+            limit: Maximum number of entries to return
 
         Returns:
-            String representation of the directory tree
+            RepositoryTreePage with the directory tree, or None if repository not found
         """
-        # Get all entries in the directory
-        entries = sorted(os.listdir(path))
-
-        # Filter out hidden files and directories
-        entries = [e for e in entries if not e.startswith('.')]
-
-        # Initialize the tree string
-        tree = ''
-
-        # Process each entry
-        for i, entry in enumerate(entries):
-            # Construct the full path
-            full_path = os.path.join(path, entry)
-
-            # Check if this is the last entry
-            is_last = i == len(entries) - 1
-
-            # Add the entry to the tree
-            if is_last:
-                tree += f'{prefix}    └── '
-                new_prefix = prefix + '    '
-            else:
-                tree += f'{prefix}    ├── '
-                new_prefix = prefix + '    │'
-
-            # Check if the entry is a directory
-            if os.path.isdir(full_path):
-                # Add the directory name
-                tree += f'{entry}/\n'
-
-                # Recursively process the directory
-                # Always include the directory in the tree, even if it's empty
-                subtree = self._generate_tree(full_path, new_prefix, base_path)
-                tree += subtree
-            else:
-                # Add the file name
-                tree += f'{entry}\n'
-
-        return tree
+        try:
+            manifest = self.get_repository_manifest(repository_name)
+            if manifest is None:
+                return None
+            return get_tree_page(
+                manifest,
+                path_prefix=path_prefix,
+                max_depth=max_depth,
+                offset=offset,
+                limit=limit,
+            )
+        except Exception as e:
+            logger.error(f'Error generating directory tree for {repository_name}: {e}')
+            return None
 
     def search(
         self,
@@ -180,14 +165,22 @@ class RepositorySearcher:
         query: str,
         limit: int = 10,
         threshold: float = 0.0,
+        mode: SearchMode = SearchMode.HYBRID,
     ) -> SearchResponse:
         """Search within an indexed repository using LangChain's FAISS implementation.
 
+        Hybrid search runs lexical (BM25) and vector retrieval concurrently and fuses
+        the rankings with reciprocal rank fusion. Lexical search makes no embedding
+        call. Indices without a lexical index are searched by vector only.
+
         Args:
             index_path: Path to the index file or repository name
             query: Search query text
             limit: Maximum number of results to return
-            threshold: Similarity threshold for results (0.0-1.0)
+            threshold: Similarity threshold for results (0.0-1.0). In hybrid mode it applies
+                to the vector candidates before fusion, in lexical mode to the BM25 score
+                relative to the best match
+            mode: Retrieval mode (hybrid, vector or lexical)
 
         Returns:
             SearchResponse object with search results
@@ -196,6 +189,7 @@ class RepositorySearcher:
             Exception: If search fails
         """
         start_time = time.time()
+        mode = SearchMode(mode)
         # Initialize repository_name with a default value outside the try block
         repository_name = 'unknown'
 
@@ -234,61 +228,17 @@ class RepositorySearcher:
                 f'Vector store docstore size: {get_docstore_dict_size(vector_store.docstore)}'
             )
 
-            # Use the same approach as in the test script
-            try:
-                # Use similarity_search directly
-                langchain_results = vector_store.similarity_search(query, k=limit)
-
-                # Process the results
-                results = []
-                if langchain_results:
-                    logger.info(f'Found {len(langchain_results)} results')
-                    for doc in langchain_results:
-                        # Get file path from document metadata
-                        file_path = doc.metadata.get('source', 'unknown')
-
-                        # Create a search result
-                        result = SearchResult(
-                            file_path=file_path,
-                            content=doc.page_content,
-                            score=1.0,  # Default score since we're not using similarity_search_with_score
-                            line_numbers=None,  # We don't track line numbers currently
-                            metadata={'chunk_id': str(doc.metadata.get('chunk_id', -1))},
-                        )
-                        results.append(result)
-                else:
-                    logger.info('No results found')
-            except Exception as e:
-                logger.error(f'Error with similarity_search: {e}')
-                # Try with similarity_search_with_score as a fallback
-                try:
-                    logger.info('Trying with similarity_search_with_score as fallback')
-                    langchain_results = vector_store.similarity_search_with_score(query, k=limit)
-
-                    # Process the results
-                    results = []
-                    for doc, score in langchain_results:
-                        # Get file path from document metadata
-                        file_path = doc.metadata.get('source', 'unknown')
-
-                        # Convert score to similarity (0-1 range)
-                        similarity = 1.0 - min(1.0, score / 2.0)
-
-                        # Create a search result
-                        result = SearchResult(
-                            file_path=file_path,
-                            content=doc.page_content,
-                            score=float(similarity),
-                            line_numbers=None,  # We don't track line numbers currently
-                            metadata={
-                                'distance': str(float(score)),
-                                'chunk_id': str(doc.metadata.get('chunk_id', -1)),
-                            },
-                        )
-                        results.append(result)
-                except Exception as e:
-                    logger.error(f'Error with similarity_search_with_score fallback: {e}')
-                    results = []
+            lexical_index = None if mode == SearchMode.VECTOR else load_lexical_index(index_path)
+            if lexical_index is not None:
+                results = self._ranked_search(
+                    vector_store, lexical_index, query, limit, threshold, mode
+                )
+            else:
+                if mode == SearchMode.LEXICAL:
+                    logger.warning(
+                        f'No lexical index for repository {repository_name}, using vector search'
+                    )
+                results = self._vector_search(vector_store, query, limit)
 
             execution_time_ms = int((time.time() - start_time) * 1000)
             logger.info(f'Search completed in {execution_time_ms}ms, found {len(results)} results')
@@ -324,6 +274,459 @@ class RepositorySearcher:
                 execution_time_ms=int((time.time() - start_time) * 1000),
             )
 
+    def _vector_search(self, vector_store, query: str, limit: int) -> List[SearchResult]:
+        """Search a vector store with LangChain's similarity search.
+
+        Args:
+            vector_store: FAISS vector store to search
+            query: Search query text
+            limit: Maximum number of results to return
+
+        Returns:
+            List of search results
+        """
+        # Use the same approach as in the test script
+        try:
+            # Use similarity_search directly
+            langchain_results = vector_store.similarity_search(query, k=limit)
+
+            # Process the results
+            results = []
+            if langchain_results:
+                logger.info(f'Found {len(langchain_results)} results')
+                for doc in langchain_results:
+                    # Get file path from document metadata
+                    file_path = doc.metadata.get('source', 'unknown')
+
+                    # Create a search result
+                    result = SearchResult(
+                        file_path=file_path,
+                        content=doc.page_content,
+                        score=1.0,  # Default score since we're not using similarity_search_with_score
+                        line_numbers=None,  # We don't track line numbers currently
+                        metadata={'chunk_id': str(doc.metadata.get('chunk_id', -1))},
+                    )
+                    results.append(result)
+            else:
+                logger.info('No results found')
+        except Exception as e:
+            logger.error(f'Error with similarity_search: {e}')
+            # Try with similarity_search_with_score as a fallback
+            try:
+                logger.info('Trying with similarity_search_with_score as fallback')
+                langchain_results = vector_store.similarity_search_with_score(query, k=limit)
+
+                # Process the results
+                results = []
+                for doc, score in langchain_results:
+                    # Get file path from document metadata
+                    file_path = doc.metadata.get('source', 'unknown')
+
+                    # Convert score to similarity (0-1 range)
+                    similarity = 1.0 - min(1.0, score / 2.0)
+
+                    # Create a search result
+                    result = SearchResult(
+                        file_path=file_path,
+                        content=doc.page_content,
+                        score=float(similarity),
+                        line_numbers=None,  # We don't track line numbers currently
+                        metadata={
+                            'distance': str(float(score)),
+                            'chunk_id': str(doc.metadata.get('chunk_id', -1)),
+                        },
+                    )
+                    results.append(result)
+            except Exception as e:
+                logger.error(f'Error with similarity_search_with_score fallback: {e}')
+                results = []
+        return results
+
+    def _ranked_search(
+        self,
+        vector_store,
+        lexical_index: LexicalIndex,
+        query: str,
+        limit: int,
+        threshold: float,
+        mode: SearchMode,
+    ) -> List[SearchResult]:
+        """Search with the lexical index, fused with vector retrieval in hybrid mode.
+
+        Args:
+            vector_store: FAISS vector store to search
+            lexical_index: Lexical index of the same chunks
+            query: Search query text
+            limit: Maximum number of results to return
+            threshold: Minimum vector similarity of hybrid candidates, or minimum BM25 score
+                relative to the best match in lexical mode (0.0-1.0)
+            mode: Retrieval mode (hybrid or lexical)
+
+        Returns:
+            List of search results, best first
+        """
+        if mode == SearchMode.LEXICAL:
+            lexical_hits = lexical_index.search(query, limit)
+            vector_hits = []
+        else:
+            candidates = limit * Constants.HYBRID_CANDIDATE_MULTIPLIER
+            # Rank lexically while the query is embedded and the vector index searched
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                lexical_future = pool.submit(lexical_index.search, query, candidates)
+                try:
+                    query_matrix = _to_unit_matrix(
+                        [vector_store.embedding_function.embed_query(query)]
+                    )
+                    vector_hits = [
+                        (doc_id, 1.0 - min(1.0, distance / 2.0))
+                        for doc_id, distance in _search_ids(
+                            vector_store, query_matrix, candidates
+                        )[0]
+                    ]
+                    # The threshold is a similarity, so it filters the vector candidates
+                    # before fusion rather than the fused rank scores
+                    vector_hits = [hit for hit in vector_hits if hit[1] >= threshold]
+                except Exception as e:
+                    logger.error(f'Error with vector search, using lexical results only: {e}')
+                    vector_hits = []
+                lexical_hits = lexical_future.result()
+
+        lexical_scores = dict(lexical_hits)
+        vector_scores = dict(vector_hits)
+        lexical_ranks = {doc_id: rank for rank, (doc_id, _) in enumerate(lexical_hits, start=1)}
+        vector_ranks = {doc_id: rank for rank, (doc_id, _) in enumerate(vector_hits, start=1)}
+
+        if mode == SearchMode.LEXICAL:
+            # Scale BM25 scores by the best match
+            top_score = lexical_hits[0][1] if lexical_hits else 1.0
+            ranked = [
+                (doc_id, score / top_score)
+                for doc_id, score in lexical_hits
+                if score / top_score >= threshold
+            ]
+        else:
+            rankings = [[doc_id for doc_id, _ in hits] for hits in (lexical_hits, vector_hits)]
+            # Scale fused scores so that a chunk ranked first by both retrievers scores 1.0
+            best_score = 2.0 / (Constants.RRF_K + 1)
+            ranked = [
+                (doc_id, score / best_score) for doc_id, score in reciprocal_rank_fusion(rankings)
+            ]
+
+        results = []
+        for doc_id, score in ranked:
+            doc = vector_store.docstore.search(doc_id)
+            if isinstance(doc, str):
+                # The docstore returns an error message if the document is missing
+                continue
+            metadata = {'chunk_id': str(doc.metadata.get('chunk_id', -1)), 'retrieval': mode.value}
+            if doc_id in lexical_ranks:
+                metadata['lexical_rank'] = str(lexical_ranks[doc_id])
+                metadata['bm25'] = str(lexical_scores[doc_id])
+            if doc_id in vector_ranks:
+                metadata['vector_rank'] = str(vector_ranks[doc_id])
+                metadata['similarity'] = str(vector_scores[doc_id])
+            results.append(
+                SearchResult(
+                    file_path=doc.metadata.get('source', 'unknown'),
+                    content=doc.page_content,
+                    score=min(1.0, score),
+                    line_numbers=None,
+                    metadata=metadata,
+                )
+            )
+            if len(results) == limit:
+                break
+
+        logger.info(f'Found {len(results)} {mode.value} results')
+        return results
+
+    def search_repositories(
+        self,
+        query: str,
+        repositories: Optional[List[str]] = None,
+        limit: int = 10,
+        threshold: float = 0.0,
+        max_concurrency: int = Constants.MULTI_SEARCH_MAX_CONCURRENCY,
+    ) -> MultiRepositorySearchResponse:
+        """Search several indexed repositories with a single query.
+
+        The query is embedded once and the embedding is searched in each index
+        concurrently. Scores are cosine similarities mapped to the 0-1 range, so
+        results from different repositories can be merged into one ranking.
+
+        Args:
+            query: Search query text
+            repositories: Names of the repositories or paths to the indices to search
+                (optional, searches all indexed repositories if not provided)
+            limit: Maximum number of results to return across all repositories
+            threshold: Similarity threshold for results (0.0-1.0)
+            max_concurrency: Maximum number of repositories searched at the same time
+
+        Returns:
+            MultiRepositorySearchResponse object with the merged results and per-repository timing
+        """
+        start_time = time.time()
+
+        if repositories is None:
+            repositories = [
+                repo.index_path
+                for repo in list_indexed_repositories(index_dir=self.index_dir).repositories
+            ]
+        index_paths = []
+        for repository in dict.fromkeys(repositories):
+            if os.path.isdir(repository):
+                index_paths.append(repository)
+            else:
+                index_paths.append(
+                    self.repository_indexer._get_index_path(repository.replace('/', '_'))
+                )
+
+        if not index_paths:
+            return MultiRepositorySearchResponse(
+                query=query, execution_time_ms=(time.time() - start_time) * 1000
+            )
+
+        # Embed the query once and share the unit vector between all indices
+        embedding_start = time.time()
+        query_vector = _to_unit_matrix(
+            embed_queries(self.embedding_generator, self.embedding_model, [query])
+        )[0]
+        embedding_time_ms = (time.time() - embedding_start) * 1000
+
+        logger.info(f"Searching for '{query}' in {len(index_paths)} repositories")
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(max_concurrency, len(index_paths)))
+        ) as pool:
+            outcomes = list(
+                pool.map(
+                    lambda path: self._search_index(path, query_vector, limit, threshold),
+                    index_paths,
+                )
+            )
+
+        results = [result for _, repo_results in outcomes for result in repo_results]
+        results.sort(key=lambda result: result.score, reverse=True)
+        results = results[:limit]
+
+        execution_time_ms = (time.time() - start_time) * 1000
+        logger.info(
+            f'Multi-repository search completed in {execution_time_ms:.0f}ms, '
+            f'found {len(results)} results'
+        )
+        return MultiRepositorySearchResponse(
+            results=results,
+            query=query,
+            repositories=[timing for timing, _ in outcomes],
+            total_results=len(results),
+            embedding_time_ms=embedding_time_ms,
+            execution_time_ms=execution_time_ms,
+        )
+
+    def _search_index(
+        self, index_path: str, query_vector: np.ndarray, limit: int, threshold: float
+    ) -> Tuple[RepositorySearchTiming, List[MultiRepositorySearchResult]]:
+        """Search one index with a query embedding.
+
+        Args:
+            index_path: Path to the index directory
+            query_vector: Unit-length query embedding
+            limit: Maximum number of results to return
+            threshold: Similarity threshold for results (0.0-1.0)
+
+        Returns:
+            Tuple of the search outcome for the repository and its results
+        """
+        start_time = time.time()
+        repository_name = os.path.basename(index_path)
+        repo_files_path = os.path.join(index_path, 'repository')
+
+        def timing(status: str, result_count: int = 0, message: Optional[str] = None):
+            return RepositorySearchTiming(
+                repository_name=repository_name,
+                index_path=index_path,
+                status=status,
+                result_count=result_count,
+                execution_time_ms=(time.time() - start_time) * 1000,
+                message=message,
+            )
+
+        metadata = load_metadata(os.path.join(index_path, 'metadata.json'))
+        if metadata is not None:
+            repository_name = metadata.repository_name
+            if metadata.embedding_model != self.embedding_model:
+                # Distances between embeddings of different models are meaningless
+                return timing(
+                    'skipped', message=f'Index uses embedding model {metadata.embedding_model}'
+                ), []
+
+        try:
+            vector_store = self.repository_indexer.load_index_without_pickle(index_path)
+            if vector_store.index.d != len(query_vector):
+                return timing(
+                    'skipped',
+                    message=f'Index has {vector_store.index.d} dimensions, '
+                    f'query has {len(query_vector)}',
+                ), []
+
+            results = [
+                MultiRepositorySearchResult(
+                    **result.model_dump(),
+                    repository_name=repository_name,
+                    repository_directory=repo_files_path,
+                )
+                for result in _search_vectors(
+                    vector_store, query_vector.reshape(1, -1), limit, threshold
+                )[0]
+            ]
+            return timing('success', len(results)), results
+        except Exception as e:
+            logger.error(f'Error searching repository {repository_name}: {e}')
+            return timing('error', message=str(e)), []
+
+    def search_batch(
+        self,
+        index_path: str,
+        queries: List[str],
+        limit: int = 10,
+        threshold: float = 0.0,
+    ) -> List[SearchResponse]:
+        """Run several queries against an indexed repository at once.
+
+        The queries are embedded together, reusing cached query embeddings, and
+        the index is searched once with the stacked query matrix.
+
+        Args:
+            index_path: Path to the index file or repository name
+            queries: Search query texts
+            limit: Maximum number of results to return per query
+            threshold: Similarity threshold for results (0.0-1.0)
+
+        Returns:
+            List of SearchResponse objects, one per query and in the same order
+        """
+        start_time = time.time()
+        if os.path.exists(index_path) and os.path.isdir(index_path):
+            repository_name = os.path.basename(index_path)
+        else:
+            repository_name = index_path
+            index_path = self.repository_indexer._get_index_path(repository_name)
+        repo_files_path = os.path.join(index_path, 'repository')
+
+        results: List[List[SearchResult]] = [[] for _ in queries]
+        try:
+            if queries:
+                vector_store = self.repository_indexer.load_index_without_pickle(index_path)
+                query_matrix = _to_unit_matrix(
+                    embed_queries(self.embedding_generator, self.embedding_model, queries)
+                )
+                logger.info(
+                    f'Searching for {len(queries)} queries in repository {repository_name}'
+                )
+                results = _search_vectors(vector_store, query_matrix, limit, threshold)
+        except Exception as e:
+            logger.error(f'Error searching repository: {e}')
+
+        execution_time_ms = int((time.time() - start_time) * 1000)
+        logger.info(f'Batch search of {len(queries)} queries completed in {execution_time_ms}ms')
+        return [
+            SearchResponse(
+                results=query_results,
+                query=query,
+                index_path=index_path,
+                repository_name=repository_name,
+                repository_directory=repo_files_path,
+                total_results=len(query_results),
+                execution_time_ms=execution_time_ms,
+            )
+            for query, query_results in zip(queries, results)
+        ]
+
+
+def _to_unit_matrix(vectors: List[List[float]]) -> np.ndarray:
+    """Stack embeddings into a float32 matrix of unit-length rows.
+
+    Args:
+        vectors: Embeddings, one per query
+
+    Returns:
+        Matrix with one normalized embedding per row
+    """
+    matrix = np.array(vectors, dtype='float32', ndmin=2)
+    matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+    return matrix
+
+
+def _search_ids(
+    vector_store, query_matrix: np.ndarray, limit: int
+) -> List[List[Tuple[str, float]]]:
+    """Search the FAISS index of a vector store for the nearest docstore IDs.
+
+    Args:
+        vector_store: FAISS vector store to search
+        query_matrix: Matrix with one normalized query embedding per row
+        limit: Maximum number of neighbours to return per query
+
+    Returns:
+        List of (docstore ID, squared L2 distance) pairs for each query, nearest first
+    """
+    if vector_store.index.d != query_matrix.shape[1]:
+        raise ValueError(
+            f'Index has {vector_store.index.d} dimensions, query has {query_matrix.shape[1]}'
+        )
+
+    distances, positions = vector_store.index.search(query_matrix, limit)
+    return [
+        [
+            (vector_store.index_to_docstore_id[int(position)], float(distance))
+            for distance, position in zip(row_distances, row_positions)
+            # FAISS pads the results with -1 when the index has fewer vectors than requested
+            if position != -1
+        ]
+        for row_distances, row_positions in zip(distances, positions)
+    ]
+
+
+def _search_vectors(
+    vector_store, query_matrix: np.ndarray, limit: int, threshold: float
+) -> List[List[SearchResult]]:
+    """Search a vector store with a matrix of unit-length query embeddings.
+
+    Args:
+        vector_store: FAISS vector store to search
+        query_matrix: Matrix with one normalized query embedding per row
+        limit: Maximum number of results to return per query
+        threshold: Similarity threshold for results (0.0-1.0)
+
+    Returns:
+        List of search results for each query, best first
+    """
+    results = []
+    for row in _search_ids(vector_store, query_matrix, limit):
+        row_results = []
+        for doc_id, distance in row:
+            # Squared L2 distance between unit vectors is 2 - 2 * cosine similarity
+            similarity = min(1.0, max(0.0, 1.0 - distance / 2.0))
+            if similarity < threshold:
+                continue
+            doc = vector_store.docstore.search(doc_id)
+            if isinstance(doc, str):
+                # The docstore returns an error message if the document is missing
+                continue
+            row_results.append(
+                SearchResult(
+                    file_path=doc.metadata.get('source', 'unknown'),
+                    content=doc.page_content,
+                    score=similarity,
+                    line_numbers=None,
+                    metadata={
+                        'distance': str(float(distance)),
+                        'chunk_id': str(doc.metadata.get('chunk_id', -1)),
+                    },
+                )
+            )
+        results.append(row_results)
+    return results
+
 
 def get_repository_searcher(
     embedding_model: str = EmbeddingModel.AMAZON_TITAN_EMBED_TEXT_V2,
@@ -333,6 +736,9 @@ def get_repository_searcher(
 ) -> RepositorySearcher:
     """Factory method to return a repository searcher.
 
+    Searchers are created lazily on first use and shared through the process-wide
+    client registry, one per embedding model, region, profile and index directory.
+
     Args:
         embedding_model: ID of the embedding model to use
         aws_region: AWS region to use (optional, uses default if not provided)
@@ -342,9 +748,18 @@ def get_repository_searcher(
     Returns:
         RepositorySearcher instance
     """
-    return RepositorySearcher(
-        embedding_model=embedding_model,
-        aws_region=aws_region,
-        aws_profile=aws_profile,
-        index_dir=index_dir,
+    return get_client_registry().get_or_create(
+        (
+            'repository-searcher',
+            getattr(embedding_model, 'value', embedding_model),
+            aws_region,
+            aws_profile,
+            index_dir,
+        ),
+        lambda: RepositorySearcher(
+            embedding_model=embedding_model,
+            aws_region=aws_region,
+            aws_profile=aws_profile,
+            index_dir=index_dir,
+        ),
     )
@@ -11,25 +11,33 @@
 """awslabs git-repo-research MCP Server implementation."""
 
 import argparse
+import asyncio
 import json
 import mimetypes
 import os
 import sys
+from awslabs.git_repo_research_mcp_server.client_registry import get_client_registry
 from awslabs.git_repo_research_mcp_server.defaults import Constants
 from awslabs.git_repo_research_mcp_server.github_search import (
     github_repo_search_wrapper,
 )
+from awslabs.git_repo_research_mcp_server.index_cache import get_index_cache
 from awslabs.git_repo_research_mcp_server.indexer import (
     IndexConfig,
     RepositoryConfig,
     get_repository_indexer,
 )
+from awslabs.git_repo_research_mcp_server.jobs import get_job_manager
 from awslabs.git_repo_research_mcp_server.models import (
     DeleteRepositoryResponse,
     EmbeddingModel,
     GitHubRepoSearchResponse,
     GitHubRepoSearchResult,
+    IndexType,
+    SearchMode,
+    StorageMode,
 )
+from awslabs.git_repo_research_mcp_server.query_cache import get_query_cache
 from awslabs.git_repo_research_mcp_server.search import get_repository_searcher
 from awslabs.git_repo_research_mcp_server.utils import (
     DateTimeEncoder,
@@ -41,7 +49,7 @@ from loguru import logger
 from mcp.server.fastmcp import Context, FastMCP, Image
 from mcp.types import ImageContent
 from pydantic import Field
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 
 # Configure logging
@@ -70,8 +78,26 @@ IMPORTANT: Always use underscores in URIs (e.g., `repositories://awslabs_mcp/sum
 ### create_research_repository
 Build a FAISS index for a Git repository.
 
+### create_research_repository_job
+Start indexing a Git repository in the background and return a job ID at once. Prefer this for large or remote repositories.
+
+### cancel_research_repository_job
+Cancel a queued or running indexing job.
+
+### resume_research_repository_job
+Resume a failed, cancelled or interrupted indexing job without re-embedding the chunks it already embedded.
+
 ### search_research_repository
-Perform semantic search within an indexed repository.
+Perform hybrid keyword and semantic search within an indexed repository. Use `mode="lexical"` for exact identifiers, error strings or configuration keys; it needs no embedding call.
+
+### search_research_repositories
+Perform semantic search across several (or all) indexed repositories at once.
+
+### search_research_repository_batch
+Run several semantic search queries against one indexed repository in a single call.
+
+### list_research_repository_files
+List the files of an indexed repository as a directory tree, with file sizes and types. Use `path_prefix`, `max_depth` and `offset` to page through large repositories.
 
 ### delete_research_repository
 Delete an indexed repository.
@@ -93,6 +119,21 @@ List all indexed repositories with detailed information including file counts, c
 ### repositories://{index_directory}
 List all indexed repositories from a specific index directory.
 
+### indexing-jobs://{job_id}
+Get the status, stage and progress percent of a background indexing job, and its result once finished.
+
+### indexing-jobs://
+List the background indexing jobs.
+
+### index-cache://stats
+Get hit, miss and eviction counters for the in-memory cache of loaded repository indices.
+
+### query-cache://stats
+Get hit, miss, eviction and expiration counters for the in-memory cache of query embeddings.
+
+### client-registry://stats
+Get the shared Bedrock clients, searchers and indexers, how often each was reused and the creation latency saved.
+
 ## Usage Examples
 
 ### Summarizing or describing purpose/objective/goals of the specific repository (e.g. 'What does this repo do?' or 'What are the main features?').
@@ -111,6 +152,18 @@ Then after identifying the main files of interest (e.g. README.md, diagrams, etc
 create_research_repository(repository_path="https://github.com/username/repo.git")
 ```
 
+### Refreshing an Indexed Repository
+```
+create_research_repository(repository_path="https://github.com/username/repo.git", incremental=True)
+```
+Only files changed since the indexed commit are re-embedded. If the index does not exist, was built with a different embedding model, or its commit cannot be found, the repository is fully re-indexed.
+
+### Cloning Large Repositories
+```
+create_research_repository(repository_path="https://github.com/username/repo.git", clone_filter="blob:limit=1m", sparse_checkout=True)
+```
+Remote repositories are cloned with a depth of 1 by default. A partial clone filter skips large blobs, and sparse checkout only writes files matching the include patterns.
+
 ### Describing the Structure of a Repository (Directory Tree Format)
 ```
 # Access the repository summary resource (with organization name)
@@ -119,12 +172,27 @@ repositories://awslabs_mcp/summary
 # Or without organization name
 repositories://my-repo-name/summary
 ```
+The summary includes the first 1000 entries of the tree. For larger repositories, list a directory at a time:
+```
+list_research_repository_files(repository_name="awslabs_mcp", path_prefix="src", max_depth=2)
+```
 
 ### Searching a Repository
 ```
 search_research_repository(index_path="repo_name", query="How does the authentication system work?")
 ```
 
+### Searching Several Repositories
+```
+search_research_repositories(query="How are retries configured?", repositories=["awslabs_mcp", "my-repo-name"])
+```
+Omit `repositories` to search every indexed repository. Results from all repositories are merged by similarity score.
+
+### Running Several Queries Against a Repository
+```
+search_research_repository_batch(index_path="repo_name", queries=["How is logging configured?", "Where are retries handled?"])
+```
+
 ### Listing Indexed Repositories
 ```
 # Default listing
@@ -166,6 +234,74 @@ Results are automatically filtered to AWS organizations (aws-samples, aws-soluti
 )
 
 
+def _get_index_configs(
+    repository_path: str,
+    output_path: Optional[str],
+    embedding_model: str,
+    include_patterns: Optional[List[str]],
+    exclude_patterns: Optional[List[str]],
+    chunk_size: int,
+    chunk_overlap: int,
+    incremental: bool,
+    clone_depth: Optional[int],
+    clone_filter: Optional[str],
+    sparse_checkout: bool,
+) -> Tuple[IndexConfig, RepositoryConfig]:
+    """Build the indexer and repository configurations of an indexing tool call.
+
+    Args:
+        repository_path: Path to local repository or URL to remote repository
+        output_path: Where to store the index (optional, uses default if not provided)
+        embedding_model: Which AWS embedding model to use
+        include_patterns: Glob patterns for files to include (optional)
+        exclude_patterns: Glob patterns for files to exclude (optional)
+        chunk_size: Maximum size of each chunk in characters
+        chunk_overlap: Overlap between chunks in characters
+        incremental: Update an existing index by re-embedding only changed files
+        clone_depth: Number of commits of history to clone for remote repositories
+        clone_filter: Partial clone filter for remote repositories (optional)
+        sparse_checkout: Only check out files matching the include patterns
+
+    Returns:
+        Tuple of the IndexConfig and RepositoryConfig objects
+    """
+    # If output_path is provided and contains slashes, normalize it for file path compatibility
+    if output_path and '/' in output_path:
+        output_path = output_path.replace('/', '_')
+        logger.info(f'Normalized output path: {output_path}')
+
+    # Get AWS credentials from environment variables
+    aws_region = os.environ.get('AWS_REGION')
+    aws_profile = os.environ.get('AWS_PROFILE')
+
+    index_config = IndexConfig(
+        embedding_model=embedding_model,
+        aws_region=aws_region,
+        aws_profile=aws_profile,
+        embedding_max_concurrency=int(
+            os.environ.get('EMBEDDING_MAX_CONCURRENCY', Constants.EMBEDDING_MAX_CONCURRENCY)
+        ),
+        index_type=os.environ.get('INDEX_TYPE', IndexType.AUTO.value),
+        storage_mode=os.environ.get('REPOSITORY_STORAGE_MODE', StorageMode.BLOBS.value),
+    )
+
+    repository_config = RepositoryConfig(
+        repository_path=repository_path,
+        output_path=output_path,
+        include_patterns=include_patterns,
+        exclude_patterns=exclude_patterns,
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        # Ensure incremental is a bool, not a Field
+        incremental=incremental if isinstance(incremental, bool) else False,
+        # Ensure the clone options are values, not Fields
+        clone_depth=clone_depth if isinstance(clone_depth, int) else Constants.CLONE_DEPTH,
+        clone_filter=clone_filter if isinstance(clone_filter, str) else None,
+        sparse_checkout=sparse_checkout if isinstance(sparse_checkout, bool) else False,
+    )
+    return index_config, repository_config
+
+
 @mcp.tool(name='create_research_repository')
 async def mcp_index_repository(
     ctx: Context,
@@ -196,6 +332,22 @@ async def mcp_index_repository(
         default=200,
         description='Overlap between chunks in characters',
     ),
+    incremental: bool = Field(
+        default=False,
+        description='Update an existing index by re-embedding only files changed since the indexed commit',
+    ),
+    clone_depth: Optional[int] = Field(
+        default=Constants.CLONE_DEPTH,
+        description='Number of commits of history to clone for remote repositories (0 for full history)',
+    ),
+    clone_filter: Optional[str] = Field(
+        default=None,
+        description='Partial clone filter for remote repositories, e.g. blob:none or blob:limit=1m (optional)',
+    ),
+    sparse_checkout: bool = Field(
+        default=False,
+        description='Only check out files matching the include patterns when cloning remote repositories',
+    ),
 ) -> Dict:
     """Build a FAISS index for a Git repository.
 
@@ -211,33 +363,29 @@ async def mcp_index_repository(
         exclude_patterns: Glob patterns for files to exclude (optional)
         chunk_size: Maximum size of each chunk in characters
         chunk_overlap: Overlap between chunks in characters
+        incremental: Update an existing index by re-embedding only files changed since the indexed commit
+        clone_depth: Number of commits of history to clone for remote repositories (0 for full history)
+        clone_filter: Partial clone filter for remote repositories (optional)
+        sparse_checkout: Only check out files matching the include patterns when cloning remote repositories
 
     Returns:
         Information about the created index
     """
     logger.info(f'Indexing repository: {repository_path}')
 
-    # If output_path is provided and contains slashes, normalize it for file path compatibility
-    if output_path and '/' in output_path:
-        output_path = output_path.replace('/', '_')
-        logger.info(f'Normalized output path: {output_path}')
-
     try:
-        # Get AWS credentials from environment variables
-        aws_region = os.environ.get('AWS_REGION')
-        aws_profile = os.environ.get('AWS_PROFILE')
-
-        index_config = IndexConfig(
-            embedding_model=embedding_model, aws_region=aws_region, aws_profile=aws_profile
-        )
-
-        repository_config = RepositoryConfig(
+        index_config, repository_config = _get_index_configs(
             repository_path=repository_path,
             output_path=output_path,
+            embedding_model=embedding_model,
             include_patterns=include_patterns,
             exclude_patterns=exclude_patterns,
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap,
+            incremental=incremental,
+            clone_depth=clone_depth,
+            clone_filter=clone_filter,
+            sparse_checkout=sparse_checkout,
         )
 
         # Get the repository indexer
@@ -263,6 +411,193 @@ async def mcp_index_repository(
         raise
 
 
+@mcp.tool(name='create_research_repository_job')
+async def mcp_submit_indexing_job(
+    ctx: Context,
+    repository_path: str = Field(
+        description='Path to local repository or URL to remote repository'
+    ),
+    output_path: Optional[str] = Field(
+        default=None,
+        description='Where to store the index (optional, uses default if not provided)',
+    ),
+    embedding_model: str = Field(
+        default=EmbeddingModel.AMAZON_TITAN_EMBED_TEXT_V2,
+        description='Which AWS embedding model to use',
+    ),
+    include_patterns: Optional[List[str]] = Field(
+        default=Constants.DEFAULT_INCLUDE_PATTERNS,
+        description='Glob patterns for files to include (optional). Defaults to common source code and documentation files.',
+    ),
+    exclude_patterns: Optional[List[str]] = Field(
+        default=Constants.DEFAULT_EXCLUDE_PATTERNS,
+        description='Glob patterns for files to exclude (optional). Defaults to common binary files, build artifacts, and VCS directories.',
+    ),
+    chunk_size: int = Field(
+        default=1000,
+        description='Maximum size of each chunk in characters',
+    ),
+    chunk_overlap: int = Field(
+        default=200,
+        description='Overlap between chunks in characters',
+    ),
+    incremental: bool = Field(
+        default=False,
+        description='Update an existing index by re-embedding only files changed since the indexed commit',
+    ),
+    clone_depth: Optional[int] = Field(
+        default=Constants.CLONE_DEPTH,
+        description='Number of commits of history to clone for remote repositories (0 for full history)',
+    ),
+    clone_filter: Optional[str] = Field(
+        default=None,
+        description='Partial clone filter for remote repositories, e.g. blob:none or blob:limit=1m (optional)',
+    ),
+    sparse_checkout: bool = Field(
+        default=False,
+        description='Only check out files matching the include patterns when cloning remote repositories',
+    ),
+) -> Dict:
+    """Start indexing a Git repository in the background.
+
+    This tool takes the same arguments as create_research_repository but returns
+    at once with a job ID. Follow the job with the indexing-jobs://{job_id}
+    resource, and stop it with cancel_research_repository_job.
+
+    Args:
+        ctx: MCP context object used for error reporting
+        repository_path: Path to local repository or URL to remote repository
+        output_path: Where to store the index (optional, uses default if not provided)
+        embedding_model: Which AWS embedding model to use
+        include_patterns: Glob patterns for files to include (optional)
+        exclude_patterns: Glob patterns for files to exclude (optional)
+        chunk_size: Maximum size of each chunk in characters
+        chunk_overlap: Overlap between chunks in characters
+        incremental: Update an existing index by re-embedding only files changed since the indexed commit
+        clone_depth: Number of commits of history to clone for remote repositories (0 for full history)
+        clone_filter: Partial clone filter for remote repositories (optional)
+        sparse_checkout: Only check out files matching the include patterns when cloning remote repositories
+
+
+    Returns:
+        The queued indexing job
+    """
+    logger.info(f'Submitting indexing job for repository: {repository_path}')
+
+    try:
+        index_config, repository_config = _get_index_configs(
+            repository_path=repository_path,
+            output_path=output_path,
+            embedding_model=embedding_model,
+            include_patterns=include_patterns,
+            exclude_patterns=exclude_patterns,
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            incremental=incremental,
+            clone_depth=clone_depth,
+            clone_filter=clone_filter,
+            sparse_checkout=sparse_checkout,
+        )
+        job = get_job_manager().submit(index_config, repository_config)
+        return job.model_dump(mode='json')
+    except Exception as e:
+        logger.error(f'Error submitting indexing job: {e}')
+        await ctx.error(f'Error submitting indexing job: {str(e)}')
+        raise
+
+
+@mcp.tool(name='cancel_research_repository_job')
+async def mcp_cancel_indexing_job(
+    ctx: Context,
+    job_id: str = Field(description='ID of the indexing job to cancel'),
+) -> Dict:
+    """Cancel a queued or running indexing job.
+
+    The embeddings computed so far are kept, so the job can be resumed later with
+    resume_research_repository_job.
+
+    Args:
+        ctx: MCP context object used for error reporting
+        job_id: ID of the indexing job to cancel
+
+    Returns:
+        The indexing job
+    """
+    logger.info(f'Cancelling indexing job: {job_id}')
+
+    job = await get_job_manager().cancel(job_id)
+    if job is None:
+        await ctx.error(f'Indexing job not found: {job_id}')
+        return {'status': 'error', 'message': f'Indexing job not found: {job_id}'}
+    return job.model_dump(mode='json')
+
+
+@mcp.tool(name='resume_research_repository_job')
+async def mcp_resume_indexing_job(
+    ctx: Context,
+    job_id: str = Field(description='ID of the failed, cancelled or interrupted job to resume'),
+) -> Dict:
+    """Resume a failed, cancelled or interrupted indexing job.
+
+    Jobs that were running when the server stopped are marked as interrupted. A
+    resumed job restores the embeddings of the batches it completed before and
+    only embeds the remaining chunks.
+
+    Args:
+        ctx: MCP context object used for error reporting
+        job_id: ID of the failed, cancelled or interrupted job to resume
+
+    Returns:
+        The indexing job
+    """
+    logger.info(f'Resuming indexing job: {job_id}')
+
+    job = get_job_manager().resume(job_id)
+    if job is None:
+        await ctx.error(f'Indexing job not found: {job_id}')
+        return {'status': 'error', 'message': f'Indexing job not found: {job_id}'}
+    return job.model_dump(mode='json')
+
+
+@mcp.resource(uri='indexing-jobs://', name='Indexing Jobs', mime_type='application/json')
+async def list_indexing_jobs() -> str:
+    """List the background indexing jobs, newest first.
+
+    Returns:
+        List of indexing jobs with their status, stage and progress
+    """
+    logger.info('Listing indexing jobs')
+
+    try:
+        jobs = get_job_manager().list_jobs()
+        return json.dumps({'jobs': [job.model_dump(mode='json') for job in jobs]})
+    except Exception as e:
+        logger.error(f'Error listing indexing jobs: {e}')
+        return json.dumps({'status': 'error', 'message': f'Error listing indexing jobs: {str(e)}'})
+
+
+@mcp.resource(
+    uri='indexing-jobs://{job_id}',
+    name='Indexing Job Status',
+    mime_type='application/json',
+)
+async def indexing_job_status(job_id: str) -> str:
+    """Get the status of a background indexing job.
+
+    Args:
+        job_id: ID of the indexing job
+
+    Returns:
+        Status, stage, progress percent and, once finished, result of the job
+    """
+    logger.info(f'Getting status of indexing job: {job_id}')
+
+    job = get_job_manager().get(job_id)
+    if job is None:
+        return json.dumps({'status': 'error', 'message': f'Indexing job not found: {job_id}'})
+    return job.model_dump_json()
+
+
 @mcp.resource(
     uri='repositories://{repository_name}/summary',
     name='Repository Summary',
@@ -272,9 +607,11 @@ async def repository_summary(repository_name: str) -> str:
     """Get a summary of an indexed repository including structure and helpful files.
 
     This resource provides a summary of the repository including:
-    - Directory tree structure of all files
+    - Directory tree structure of the files, up to the first page of entries
     - List of helpful files (READMEs, documentation, etc.)
 
+    Larger trees can be paged through with the list_research_repository_files tool.
+
     Args:
         repository_name: Name of the repository
 
@@ -300,12 +637,12 @@ async def repository_summary(repository_name: str) -> str:
             aws_profile=aws_profile,
         )
 
-        # List the repository files
-        tree = searcher.list_repository_files(
+        # Get the first page of the directory tree from the repository manifest
+        page = searcher.list_repository_files(
             repository_name=normalized_repo_name,
         )
 
-        if tree is None:
+        if page is None:
             return json.dumps(
                 {
                     'status': 'error',
@@ -317,86 +654,15 @@ async def repository_summary(repository_name: str) -> str:
         index_path = searcher.repository_indexer._get_index_path(normalized_repo_name)
         repo_files_path = os.path.join(index_path, 'repository')
 
-        # Find helpful files (READMEs, etc.)
-        helpful_files = []
-        if tree and isinstance(tree, dict):
-            # Extract all README files from the tree
-            def extract_readme_paths(tree_dict, current_path=''):
-                readme_paths = []
-                for name, content in tree_dict.items():
-                    path = f'{current_path}/{name}' if current_path else name
-                    if isinstance(content, dict):
-                        # It's a directory
-                        readme_paths.extend(extract_readme_paths(content, path))
-                    elif name.lower().startswith('readme'):
-                        # It's a README file
-                        # Format the path for use with access_file tool
-                        file_path = f'{repository_name}/{path}'
-                        readme_paths.append(file_path)
-                return readme_paths
-
-            helpful_files = extract_readme_paths(tree)
-        elif tree and isinstance(tree, str):
-            # If tree is a string, try to parse it as a directory structure
-            logger.info('Tree is a string, attempting to parse directory structure')
-
-            # Extract README files with their full paths from the string representation of the tree
-            import re
-
-            # Parse the tree structure to extract full paths
-            lines = tree.split('\n')
-            current_path = []
-            readme_files = []
-
-            # Process each line to build the directory structure
-            for line in lines:
-                # Skip empty lines
-                if not line.strip():
-                    continue
-
-                # Calculate the indentation level
-                indent = 0
-                for char in line:
-                    if char in ' │':
-                        indent += 1
-                    else:
-                        break
-
-                # Adjust the current path based on indentation
-                current_path = current_path[: indent // 4 + 1]
-
-                # Extract the file or directory name
-                match = re.search(r'[─└├]─+\s+(.+)$', line)
-                if match:
-                    name = match.group(1)
-
-                    # If it's a directory, add it to the current path
-                    if name.endswith('/'):
-                        name = name.rstrip('/')
-                        if len(current_path) <= indent // 4:
-                            current_path.append(name)
-                        else:
-                            current_path[indent // 4] = name
-                    # If it's a README file, add its full path to the list
-                    elif re.match(r'README.*', name, re.IGNORECASE):
-                        path = '/'.join(current_path + [name]) if current_path else name
-                        # Format the path for use with access_file tool
-                        file_path = f'{repository_name}/{path}'
-                        readme_files.append(file_path)
-
-            # Add all found README files to helpful_files
-            if readme_files:
-                helpful_files = readme_files
-                logger.info(
-                    f'Found {len(helpful_files)} README files with full paths in string tree'
-                )
-            else:
-                logger.warning('No README files found in string tree')
+        # README files are looked up in the manifest, formatted for use with the access_file tool
+        helpful_files = [f'{repository_name}/{path}' for path in page.readme_files]
 
         return json.dumps(
             {
                 'status': 'success',
-                'tree': tree,
+                'tree': page.tree,
+                'total_entries': page.total_entries,
+                'next_offset': page.next_offset,
                 'repository_name': repository_name,
                 'repository_directory': (
                     repo_files_path
@@ -452,6 +718,86 @@ async def list_repositories() -> str:
         )
 
 
+@mcp.resource(
+    uri='index-cache://stats', name='Index Cache Statistics', mime_type='application/json'
+)
+async def index_cache_stats() -> str:
+    """Get statistics for the in-process cache of loaded repository indices.
+
+    This resource reports hit, miss, eviction and invalidation counters for the
+    cache that keeps recently searched indices loaded in memory.
+
+    Returns:
+        Index cache statistics
+    """
+    logger.info('Getting index cache statistics')
+
+    try:
+        return json.dumps(get_index_cache().stats().model_dump())
+    except Exception as e:
+        logger.error(f'Error getting index cache statistics: {e}')
+        return json.dumps(
+            {
+                'status': 'error',
+                'message': f'Error getting index cache statistics: {str(e)}',
+            }
+        )
+
+
+@mcp.resource(
+    uri='query-cache://stats',
+    name='Query Embedding Cache Statistics',
+    mime_type='application/json',
+)
+async def query_cache_stats() -> str:
+    """Get statistics for the in-process cache of query embeddings.
+
+    This resource reports hit, miss, eviction and expiration counters for the
+    cache that reuses the embeddings of repeated search queries.
+
+    Returns:
+        Query embedding cache statistics
+    """
+    logger.info('Getting query embedding cache statistics')
+
+    try:
+        return json.dumps(get_query_cache().stats().model_dump())
+    except Exception as e:
+        logger.error(f'Error getting query embedding cache statistics: {e}')
+        return json.dumps(
+            {
+                'status': 'error',
+                'message': f'Error getting query embedding cache statistics: {str(e)}',
+            }
+        )
+
+
+@mcp.resource(
+    uri='client-registry://stats', name='Client Registry Statistics', mime_type='application/json'
+)
+async def client_registry_stats() -> str:
+    """Get statistics for the registry of shared clients.
+
+    This resource reports the Bedrock clients, searchers and indexers shared
+    between requests, and the creation latency saved by reusing them.
+
+    Returns:
+        Client registry statistics
+    """
+    logger.info('Getting client registry statistics')
+
+    try:
+        return json.dumps(get_client_registry().stats().model_dump())
+    except Exception as e:
+        logger.error(f'Error getting client registry statistics: {e}')
+        return json.dumps(
+            {
+                'status': 'error',
+                'message': f'Error getting client registry statistics: {str(e)}',
+            }
+        )
+
+
 async def access_file_or_directory(filepath: str) -> Union[str, List[str], Image]:
     """Access file or directory contents.
 
@@ -602,12 +948,18 @@ async def mcp_search_repository(
     query: str = Field(description='The search query to use for semantic search'),
     limit: int = Field(default=10, description='Maximum number of results to return'),
     threshold: float = Field(
-        default=0.0, description='Minimum similarity score threshold (0.0 to 1.0)'
+        default=0.0,
+        description='Minimum similarity score threshold (0.0 to 1.0). Hybrid search applies it to the semantic results before fusing them, lexical search to the keyword score relative to the best match',
+    ),
+    mode: str = Field(
+        default=SearchMode.HYBRID.value,
+        description='Retrieval mode: "hybrid" fuses keyword (BM25) and semantic results, "vector" uses semantic search only, and "lexical" uses keyword search only without an embedding call',
     ),
 ) -> Dict:
     """Perform semantic search within an indexed repository.
 
-    This tool searches an indexed repository using semantic search with Amazon Bedrock embeddings.
+    This tool searches an indexed repository using semantic search with Amazon Bedrock embeddings,
+    fused with keyword (BM25) search so that exact identifiers and error strings are found.
     It returns results ranked by relevance to the query.
 
     Args:
@@ -616,6 +968,7 @@ async def mcp_search_repository(
         query: The search query to use for semantic search
         limit: Maximum number of results to return
         threshold: Minimum similarity score threshold (0.0 to 1.0)
+        mode: Retrieval mode (hybrid, vector or lexical)
 
     Returns:
         Search results ranked by relevance to the query
@@ -647,6 +1000,8 @@ async def mcp_search_repository(
             query=query,
             limit=limit,
             threshold=threshold,
+            # Ensure mode is a string, not a Field
+            mode=mode if isinstance(mode, str) else SearchMode.HYBRID,
         )
 
         # Calculate execution time
@@ -664,6 +1019,204 @@ async def mcp_search_repository(
         raise
 
 
+@mcp.tool(name='search_research_repository_batch')
+async def mcp_search_repository_batch(
+    ctx: Context,
+    index_path: str = Field(description='Name of the repository or path to the index to search'),
+    queries: List[str] = Field(description='The search queries to use for semantic search'),
+    limit: int = Field(default=10, description='Maximum number of results to return per query'),
+    threshold: float = Field(
+        default=0.0, description='Minimum similarity score threshold (0.0 to 1.0)'
+    ),
+) -> Dict:
+    """Perform several semantic searches within an indexed repository.
+
+    This tool embeds all queries together and searches the index once with the
+    stacked query embeddings. It returns one response per query, in order.
+
+    Args:
+        ctx: MCP context object used for error reporting
+        index_path: Name of the repository or path to the index to search
+        queries: The search queries to use for semantic search
+        limit: Maximum number of results to return per query
+        threshold: Minimum similarity score threshold (0.0 to 1.0)
+
+    Returns:
+        Search results for each query ranked by relevance
+    """
+    logger.info(f'Searching repository: {index_path} for {len(queries)} queries')
+
+    # Convert repository name with slashes to underscores for file path compatibility
+    normalized_index_path = str(index_path).replace('/', '_')
+
+    try:
+        # Record start time
+        start_time = datetime.now()
+
+        # Get AWS credentials from environment variables
+        aws_region = os.environ.get('AWS_REGION')
+        aws_profile = os.environ.get('AWS_PROFILE')
+
+        # Get the repository searcher
+        searcher = get_repository_searcher(
+            aws_region=aws_region,
+            aws_profile=aws_profile,
+        )
+
+        # Search the repository without blocking the event loop
+        responses = await asyncio.to_thread(
+            searcher.search_batch,
+            index_path=normalized_index_path,
+            queries=queries,
+            limit=limit,
+            threshold=threshold,
+        )
+
+        return {
+            'responses': [response.model_dump() for response in responses],
+            'total_queries': len(responses),
+            'execution_time_ms': (datetime.now() - start_time).total_seconds() * 1000,
+        }
+    except Exception as e:
+        logger.error(f'Error searching repository: {e}')
+        await ctx.error(f'Error searching repository: {str(e)}')
+        raise
+
+
+@mcp.tool(name='search_research_repositories')
+async def mcp_search_repositories(
+    ctx: Context,
+    query: str = Field(description='The search query to use for semantic search'),
+    repositories: Optional[List[str]] = Field(
+        default=None,
+        description='Names of the repositories or paths to the indices to search (optional, searches all indexed repositories if not provided)',
+    ),
+    limit: int = Field(
+        default=10, description='Maximum number of results to return across all repositories'
+    ),
+    threshold: float = Field(
+        default=0.0, description='Minimum similarity score threshold (0.0 to 1.0)'
+    ),
+) -> Dict:
+    """Perform semantic search across several indexed repositories.
+
+    This tool embeds the query once and searches the selected repositories concurrently.
+    Results from all repositories are merged and ranked by similarity score.
+
+    Args:
+        ctx: MCP context object used for error reporting
+        query: The search query to use for semantic search
+        repositories: Names of the repositories or paths to the indices to search (optional)
+        limit: Maximum number of results to return across all repositories
+        threshold: Minimum similarity score threshold (0.0 to 1.0)
+
+    Returns:
+        Merged search results with the timing of the search in each repository
+    """
+    # Ensure repositories is a list or None, not a Field
+    repositories = repositories if isinstance(repositories, list) else None
+    logger.info(f'Searching repositories: {repositories or "all"} for query: {query}')
+
+    try:
+        # Get AWS credentials from environment variables
+        aws_region = os.environ.get('AWS_REGION')
+        aws_profile = os.environ.get('AWS_PROFILE')
+
+        # Get the repository searcher
+        searcher = get_repository_searcher(
+            aws_region=aws_region,
+            aws_profile=aws_profile,
+        )
+
+        # Search the repositories without blocking the event loop
+        response = await asyncio.to_thread(
+            searcher.search_repositories,
+            query=query,
+            repositories=repositories,
+            limit=limit,
+            threshold=threshold,
+        )
+
+        return response.model_dump()
+    except Exception as e:
+        logger.error(f'Error searching repositories: {e}')
+        await ctx.error(f'Error searching repositories: {str(e)}')
+        raise
+
+
+@mcp.tool(name='list_research_repository_files')
+async def mcp_list_repository_files(
+    ctx: Context,
+    repository_name: str = Field(description='Name of the indexed repository'),
+    path_prefix: str = Field(
+        default='',
+        description='Directory to list, relative to the repository root (optional, lists the whole repository if not provided)',
+    ),
+    max_depth: Optional[int] = Field(
+        default=None,
+        description='Maximum depth below the path prefix (optional, unlimited if not provided)',
+    ),
+    offset: int = Field(default=0, description='Index of the first entry to return'),
+    limit: int = Field(
+        default=Constants.REPOSITORY_TREE_PAGE_SIZE,
+        description='Maximum number of entries to return',
+    ),
+) -> Dict:
+    """List the files of an indexed repository as a paginated directory tree.
+
+    The tree is served from the manifest computed when the repository was indexed,
+    with the size and type of each entry.
+
+    Args:
+        ctx: MCP context object used for error reporting
+        repository_name: Name of the indexed repository
+        path_prefix: Directory to list, relative to the repository root
+        max_depth: Maximum depth below the path prefix
+        offset: Index of the first entry to return
+        limit: Maximum number of entries to return
+
+    Returns:
+        Page of the directory tree with the offset of the next page
+    """
+    # Ensure optional parameters are values, not Fields
+    path_prefix = path_prefix if isinstance(path_prefix, str) else ''
+    max_depth = max_depth if isinstance(max_depth, int) else None
+    offset = offset if isinstance(offset, int) else 0
+    limit = limit if isinstance(limit, int) else Constants.REPOSITORY_TREE_PAGE_SIZE
+    logger.info(f'Listing files for repository: {repository_name} under "{path_prefix}"')
+
+    # Convert repository name with slashes to underscores for file path compatibility
+    normalized_repo_name = repository_name.replace('/', '_')
+
+    try:
+        # Get AWS credentials from environment variables
+        aws_region = os.environ.get('AWS_REGION')
+        aws_profile = os.environ.get('AWS_PROFILE')
+
+        # Get the repository searcher
+        searcher = get_repository_searcher(
+            aws_region=aws_region,
+            aws_profile=aws_profile,
+        )
+
+        page = await asyncio.to_thread(
+            searcher.list_repository_files,
+            repository_name=normalized_repo_name,
+            path_prefix=path_prefix,
+            max_depth=max_depth,
+            offset=offset,
+            limit=limit,
+        )
+        if page is None:
+            raise ValueError(f'Repository not found or no files available: {repository_name}')
+
+        return page.model_dump()
+    except Exception as e:
+        logger.error(f'Error listing repository files: {e}')
+        await ctx.error(f'Error listing repository files: {str(e)}')
+        raise
+
+
 @mcp.tool(name='search_research_repository_suggestions')
 async def mcp_search_github_repos(
     ctx: Context,
@@ -711,7 +1264,7 @@ async def mcp_search_github_repos(
         license_filter = ['Apache License 2.0', 'MIT', 'MIT No Attribution']
 
         # Call the search function
-        results = github_repo_search_wrapper(
+        results = await github_repo_search_wrapper(
             keywords=keywords,
             organizations=organizations,
             num_results=num_results,
@@ -0,0 +1,306 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Deduplicated storage of repository snapshots for Git Repository Research MCP Server.
+
+This module stores each distinct file content once in a content-addressed blob
+store shared by all indices of an index directory, and hard-links the files of
+each repository snapshot to their blob. Re-indexing a repository, or indexing a
+fork, writes only the files whose content is not stored yet, and the snapshot
+files stay ordinary files that are read in place.
+"""
+
+import argparse
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+from awslabs.git_repo_research_mcp_server.defaults import Constants
+from awslabs.git_repo_research_mcp_server.models import (
+    SnapshotStats,
+    StorageBenchmarkResult,
+    StorageMode,
+)
+from loguru import logger
+from typing import List, Optional, Sequence
+
+
+def hash_file(path: str) -> str:
+    """Compute the content hash of a file.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        Hex SHA-256 digest of the file content
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class BlobStore:
+    """Content-addressed store of file contents.
+
+    Blobs are stored under their SHA-256 digest. Snapshot files are hard links
+    to the blobs, so the link count of a blob tells whether any snapshot still
+    uses it.
+    """
+
+    def __init__(self, root: str):
+        """Initialize the blob store.
+
+        Args:
+            root: Directory of the blob store
+        """
+        self.root = root
+
+    def blob_path(self, digest: str) -> str:
+        """Get the path of a blob.
+
+        Args:
+            digest: Hex SHA-256 digest of the content
+
+        Returns:
+            Path to the blob
+        """
+        return os.path.join(self.root, digest[:2], digest[2:])
+
+    def store_file(self, source: str, target: str, stats: SnapshotStats) -> None:
+        """Store a file in the blob store and link the snapshot file to it.
+
+        Falls back to copying the file when the file system cannot link it.
+
+        Args:
+            source: Path to the file to store
+            target: Path of the snapshot file, which must not exist
+            stats: Snapshot statistics to update
+        """
+        size = os.path.getsize(source)
+        blob_path = self.blob_path(hash_file(source))
+        try:
+            os.link(blob_path, target)
+            stats.linked_files += 1
+            stats.bytes_deduplicated += size
+            return
+        except FileNotFoundError:
+            # The content is not stored yet
+            pass
+        except OSError as e:
+            logger.debug(f'Cannot link {target} to {blob_path}, copying it: {e}')
+            shutil.copy2(source, target)
+            stats.copied_files += 1
+            stats.bytes_written += size
+            return
+
+        # Link the snapshot file before publishing the blob, so that a concurrent
+        # prune never sees the new blob without a snapshot using it
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        temp_path = f'{blob_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        shutil.copy2(source, temp_path)
+        try:
+            os.link(temp_path, target)
+        except OSError as e:
+            logger.debug(f'Cannot link {target} to {temp_path}, moving it: {e}')
+            os.replace(temp_path, target)
+            stats.copied_files += 1
+            stats.bytes_written += size
+            return
+        os.replace(temp_path, blob_path)
+        stats.stored_files += 1
+        stats.bytes_written += size
+
+    def prune(self) -> int:
+        """Remove blobs that no snapshot links to anymore.
+
+        Returns:
+            Number of bytes freed
+        """
+        freed_bytes = 0
+        now = time.time()
+        for root, _, files in os.walk(self.root):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                    # Temporary files of blobs being written are only removed once abandoned
+                    if name.endswith('.tmp') and now - stat.st_ctime < 3600:
+                        continue
+                    if stat.st_nlink <= 1:
+                        os.remove(path)
+                        freed_bytes += stat.st_size
+                except OSError as e:
+                    logger.debug(f'Cannot prune blob {path}: {e}')
+        if freed_bytes:
+            logger.info(f'Pruned {freed_bytes} bytes of unused blobs from {self.root}')
+        return freed_bytes
+
+
+def get_blob_store(index_dir: str) -> BlobStore:
+    """Get the blob store shared by the indices of an index directory.
+
+    Args:
+        index_dir: Directory where indices are stored
+
+    Returns:
+        BlobStore in the index directory
+    """
+    return BlobStore(os.path.join(index_dir, Constants.BLOB_STORE_DIRNAME))
+
+
+def store_file(
+    source: str, target: str, blob_store: Optional[BlobStore], stats: SnapshotStats
+) -> None:
+    """Store a file in a repository snapshot.
+
+    Args:
+        source: Path to the file to store
+        target: Path of the snapshot file
+        blob_store: Blob store to deduplicate the file into, or None to copy it
+        stats: Snapshot statistics to update
+    """
+    # Never write through an existing snapshot file, which may be a blob shared with other snapshots
+    if os.path.lexists(target):
+        os.remove(target)
+
+    if blob_store is None:
+        shutil.copy2(source, target)
+        stats.copied_files += 1
+        stats.bytes_written += os.path.getsize(target)
+    else:
+        blob_store.store_file(source, target, stats)
+    stats.file_count += 1
+    stats.total_bytes += os.path.getsize(target)
+
+
+def snapshot_directory(
+    source_dir: str, target_dir: str, blob_store: Optional[BlobStore] = None
+) -> SnapshotStats:
+    """Store the files of a repository in an empty snapshot directory.
+
+    Files inside .git directories are skipped.
+
+    Args:
+        source_dir: Repository directory
+        target_dir: Snapshot directory
+        blob_store: Blob store to deduplicate files into, or None to copy them
+
+    Returns:
+        SnapshotStats for the snapshot
+    """
+    start_time = time.time()
+    stats = SnapshotStats(
+        storage_mode=StorageMode.COPY.value if blob_store is None else StorageMode.BLOBS.value
+    )
+    for root, dirs, files in os.walk(source_dir):
+        if '.git' in dirs:
+            dirs.remove('.git')
+
+        rel_path = os.path.relpath(root, source_dir)
+        target_root = os.path.join(target_dir, rel_path) if rel_path != '.' else target_dir
+        os.makedirs(target_root, exist_ok=True)
+
+        for name in files:
+            source_file = os.path.join(root, name)
+            try:
+                store_file(source_file, os.path.join(target_root, name), blob_store, stats)
+            except Exception as e:
+                logger.warning(f'Error copying file {source_file}: {e}')
+
+    stats.elapsed_seconds = time.time() - start_time
+    return stats
+
+
+def get_disk_usage(path: str) -> int:
+    """Get the size of the files below a directory, counting hard-linked files once.
+
+    Args:
+        path: Directory to measure
+
+    Returns:
+        Size in bytes
+    """
+    seen = set()
+    size = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            stat = os.lstat(os.path.join(root, name))
+            if (stat.st_dev, stat.st_ino) not in seen:
+                seen.add((stat.st_dev, stat.st_ino))
+                size += stat.st_size
+    return size
+
+
+def benchmark_storage_modes(
+    repository_dir: str,
+    work_dir: str,
+    storage_modes: Sequence[StorageMode] = (StorageMode.COPY, StorageMode.BLOBS),
+) -> List[StorageBenchmarkResult]:
+    """Benchmark snapshot storage modes on a repository.
+
+    Each mode stores two snapshots of the repository, as indexing a repository
+    and then re-indexing it or indexing a fork would.
+
+    Args:
+        repository_dir: Repository directory to snapshot
+        work_dir: Empty directory to store the snapshots in
+        storage_modes: Storage modes to benchmark
+
+    Returns:
+        List of benchmark results, one per storage mode
+    """
+    results = []
+    for storage_mode in storage_modes:
+        mode_dir = os.path.join(work_dir, storage_mode.value)
+        blob_store = get_blob_store(mode_dir) if storage_mode == StorageMode.BLOBS else None
+        first = snapshot_directory(
+            repository_dir, os.path.join(mode_dir, 'first', 'repository'), blob_store
+        )
+        second = snapshot_directory(
+            repository_dir, os.path.join(mode_dir, 'second', 'repository'), blob_store
+        )
+        results.append(
+            StorageBenchmarkResult(
+                storage_mode=storage_mode,
+                file_count=first.file_count,
+                first_snapshot_seconds=first.elapsed_seconds,
+                second_snapshot_seconds=second.elapsed_seconds,
+                disk_bytes=get_disk_usage(mode_dir),
+            )
+        )
+    return results
+
+
+def main():
+    """Run the snapshot storage benchmark from the command line."""
+    parser = argparse.ArgumentParser(
+        description='Benchmark copied and deduplicated repository snapshots'
+    )
+    parser.add_argument('repository_dir', help='Repository directory to snapshot')
+    parser.add_argument(
+        '--work-dir', help='Directory to store the snapshots in (defaults to a temporary one)'
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.work_dir) as work_dir:
+        for result in benchmark_storage_modes(args.repository_dir, work_dir):
+            print(
+                f'{result.storage_mode.value:>5}: first={result.first_snapshot_seconds:.2f}s '
+                f'second={result.second_snapshot_seconds:.2f}s '
+                f'disk={result.disk_bytes / (1024 * 1024):.1f}MiB ({result.file_count} files)'
+            )
+
+
+if __name__ == '__main__':
+    main()
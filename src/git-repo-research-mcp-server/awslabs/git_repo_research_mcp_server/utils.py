@@ -17,6 +17,7 @@ import json
 import os
 import shutil
 from awslabs.git_repo_research_mcp_server.defaults import Constants
+from awslabs.git_repo_research_mcp_server.index_cache import get_index_cache
 from awslabs.git_repo_research_mcp_server.models import (
     DetailedIndexedRepositoriesResponse,
     DetailedIndexedRepositoryInfo,
@@ -24,6 +25,7 @@ from awslabs.git_repo_research_mcp_server.models import (
     IndexedRepositoryInfo,
     IndexMetadata,
 )
+from awslabs.git_repo_research_mcp_server.snapshot_store import get_blob_store
 from datetime import datetime
 from loguru import logger
 from typing import Dict, List, Optional, Union
@@ -270,6 +272,9 @@ async def delete_indexed_repository(
 
     repository_name = metadata.repository_name
 
+    # Stop serving the index from memory once it is being deleted
+    get_index_cache().invalidate(index_path)
+
     # Check permissions before attempting to delete
     files_to_check = [metadata_path]
     if os.path.exists(index_path):
@@ -365,6 +370,11 @@ async def delete_indexed_repository(
                 errors.append(f'Failed to delete index directory {index_path}: {str(e)}')
                 logger.error(f'Error deleting index directory {index_path}: {e}')
 
+    # Free the blobs that only the deleted snapshot used
+    blob_store = get_blob_store(index_dir)
+    if os.path.isdir(blob_store.root):
+        blob_store.prune()
+
     # Return appropriate response based on results
     if not errors:
         return {
@@ -11,6 +11,10 @@
 """Configuration for pytest."""
 
 import pytest
+from awslabs.git_repo_research_mcp_server import github_search
+from awslabs.git_repo_research_mcp_server.client_registry import get_client_registry
+from awslabs.git_repo_research_mcp_server.query_cache import get_query_cache
+from unittest.mock import AsyncMock, MagicMock, patch
 
 
 def pytest_addoption(parser):
@@ -48,3 +52,45 @@ def pytest_collection_modifyitems(config, items):
         for item in items:
             if 'github' in item.keywords:
                 item.add_marker(skip_github)
+
+
+@pytest.fixture(autouse=True)
+def clear_query_cache():
+    """Start every test with an empty query embedding cache."""
+    get_query_cache().clear()
+    yield
+    get_query_cache().clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_client_registry():
+    """Start every test without shared clients, so patched factories take effect."""
+    get_client_registry().clear()
+    yield
+    get_client_registry().clear()
+
+
+@pytest.fixture(autouse=True)
+def isolate_github_search(tmp_path_factory):
+    """Give every test an empty GitHub search cache and a fresh rate limit budget."""
+    github_search._github_search_cache = github_search.GitHubSearchCache(
+        str(tmp_path_factory.mktemp('github') / 'github_search_cache.db')
+    )
+    github_search._rate_limit_budget = github_search.RateLimitBudget()
+    yield
+    github_search._github_search_cache.close()
+    github_search._github_search_cache = None
+    github_search._rate_limit_budget = None
+
+
+@pytest.fixture
+def github_client():
+    """Patch in a mock shared GitHub HTTP client."""
+    client = MagicMock()
+    client.get = AsyncMock()
+    client.post = AsyncMock()
+    with patch(
+        'awslabs.git_repo_research_mcp_server.github_search.get_github_client',
+        return_value=client,
+    ):
+        yield client
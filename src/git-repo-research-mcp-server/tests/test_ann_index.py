@@ -0,0 +1,137 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Tests for approximate nearest neighbour indices in Git Repository Research MCP Server."""
+
+import faiss
+import numpy as np
+import os
+import pytest
+from awslabs.git_repo_research_mcp_server.ann_index import (
+    benchmark_index_types,
+    build_ann_index,
+    get_index_type,
+    select_index_type,
+)
+from awslabs.git_repo_research_mcp_server.defaults import Constants
+from awslabs.git_repo_research_mcp_server.embeddings import StubEmbeddings
+from awslabs.git_repo_research_mcp_server.indexer import (
+    IndexConfig,
+    RepositoryConfig,
+    RepositoryIndexer,
+    load_index_components,
+)
+from awslabs.git_repo_research_mcp_server.models import IndexType
+from awslabs.git_repo_research_mcp_server.utils import load_metadata
+from unittest.mock import patch
+
+
+@pytest.fixture
+def flat_index():
+    """Create a flat index over clustered random vectors."""
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((16, 32)).astype('float32')
+    vectors = centers[rng.integers(0, 16, 3000)]
+    vectors += 0.1 * rng.standard_normal(vectors.shape).astype('float32')
+    index = faiss.IndexFlatL2(32)
+    index.add(vectors)
+    return index
+
+
+def test_select_index_type():
+    """Test automatic selection of the index type by chunk count."""
+    assert select_index_type(10) == IndexType.FLAT
+    assert select_index_type(Constants.ANN_HNSW_MIN_CHUNKS) == IndexType.HNSW
+    assert select_index_type(Constants.ANN_IVF_PQ_MIN_CHUNKS) == IndexType.IVF_PQ
+    assert select_index_type(10, IndexType.HNSW) == IndexType.HNSW
+
+
+def test_build_hnsw_index_keeps_positions(flat_index):
+    """Test that an HNSW index keeps the position of each vector."""
+    index = build_ann_index(flat_index, IndexType.HNSW)
+
+    assert get_index_type(index) == IndexType.HNSW
+    assert index.ntotal == flat_index.ntotal
+    _, found = index.search(flat_index.reconstruct_n(100, 5), 1)
+    assert found[:, 0].tolist() == [100, 101, 102, 103, 104]
+
+
+def test_build_ivf_pq_index(flat_index):
+    """Test building an IVF-PQ index from a training sample."""
+    index = build_ann_index(flat_index, IndexType.IVF_PQ, ivf_nlist=16, training_sample_size=1000)
+
+    assert get_index_type(index) == IndexType.IVF_PQ
+    assert index.ntotal == flat_index.ntotal
+    assert index.pq.M == 32
+
+
+def test_build_ivf_pq_index_too_few_vectors():
+    """Test that too few vectors to train an IVF-PQ index keep the flat index."""
+    index = faiss.IndexFlatL2(8)
+    index.add(np.random.default_rng(0).standard_normal((100, 8)).astype('float32'))
+
+    assert build_ann_index(index, IndexType.IVF_PQ) is index
+
+
+def test_benchmark_index_types(flat_index):
+    """Test the recall and latency benchmark against the flat baseline."""
+    vectors = flat_index.reconstruct_n(0, flat_index.ntotal)
+
+    results = benchmark_index_types(
+        vectors, vectors[:20], k=5, ivf_nlist=16, training_sample_size=1000
+    )
+
+    assert [result.index_type for result in results] == [
+        IndexType.FLAT,
+        IndexType.HNSW,
+        IndexType.IVF_PQ,
+    ]
+    assert results[0].recall_at_k == 1.0
+    assert all(0.0 <= result.recall_at_k <= 1.0 for result in results)
+    assert all(result.mean_query_ms >= 0 for result in results)
+
+
+@pytest.mark.asyncio
+async def test_index_repository_with_hnsw_index(tmp_path):
+    """Test building, saving and memory-mapping an HNSW repository index."""
+    repo_dir = tmp_path / 'hnsw_repo'
+    repo_dir.mkdir()
+    for i in range(20):
+        (repo_dir / f'module_{i}.py').write_text(f'def function_{i}():\n    return {i}\n')
+
+    with patch(
+        'awslabs.git_repo_research_mcp_server.indexer.get_embedding_model',
+        return_value=StubEmbeddings(dimensions=16),
+    ):
+        indexer = RepositoryIndexer(
+            IndexConfig(
+                embedding_model='test-model',
+                index_dir=str(tmp_path / 'indices'),
+                index_type=IndexType.HNSW,
+            )
+        )
+        result = await indexer.index_repository(
+            RepositoryConfig(
+                repository_path=str(repo_dir), include_patterns=['*.py'], exclude_patterns=[]
+            )
+        )
+        assert result.status == 'success'
+
+        metadata = load_metadata(os.path.join(result.index_path, 'metadata.json'))
+        assert metadata is not None
+        assert metadata.index_type == 'hnsw'
+
+        index, _, _ = load_index_components(result.index_path)
+        assert get_index_type(index) == IndexType.HNSW
+        assert index.ntotal == 20
+
+        vector_store = indexer.load_index_without_pickle(result.index_path)
+        documents = vector_store.similarity_search('def function_3():\n    return 3\n', k=1)
+        assert documents[0].metadata['source'] == 'module_3.py'
@@ -0,0 +1,135 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Tests for the registry of shared clients in Git Repository Research MCP Server."""
+
+import json
+import pytest
+import threading
+import time
+from awslabs.git_repo_research_mcp_server.client_registry import (
+    ClientRegistry,
+    get_client_registry,
+)
+from awslabs.git_repo_research_mcp_server.defaults import Constants
+from awslabs.git_repo_research_mcp_server.embeddings import get_embedding_model
+from awslabs.git_repo_research_mcp_server.indexer import IndexConfig, get_repository_indexer
+from awslabs.git_repo_research_mcp_server.models import EmbeddingModel
+from awslabs.git_repo_research_mcp_server.search import get_repository_searcher
+from awslabs.git_repo_research_mcp_server.server import client_registry_stats
+from unittest.mock import MagicMock, patch
+
+
+def test_registry_creates_each_client_once():
+    """Test that clients are created lazily and reused."""
+    registry = ClientRegistry()
+    factory = MagicMock(side_effect=lambda: object())
+
+    first = registry.get_or_create(('kind', 'a'), factory)
+    second = registry.get_or_create(('kind', 'a'), factory)
+    other = registry.get_or_create(('kind', 'b'), factory)
+
+    assert first is second
+    assert first is not other
+    assert factory.call_count == 2
+
+    stats = registry.stats()
+    assert stats.clients == 2
+    assert stats.reuses == 1
+    assert [entry.key for entry in stats.entries] == ['kind:a', 'kind:b']
+
+
+def test_registry_concurrent_first_use():
+    """Test that concurrent first requests share one client."""
+    registry = ClientRegistry()
+    created = []
+
+    def factory():
+        time.sleep(0.05)
+        created.append(object())
+        return created[-1]
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(registry.get_or_create('key', factory)))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1
+    assert all(result is created[0] for result in results)
+
+    stats = registry.stats()
+    assert stats.reuses == 3
+    assert stats.saved_ms == pytest.approx(stats.creation_ms * 3)
+    assert stats.saved_ms >= 150
+
+
+def test_get_embedding_model_shares_bedrock_clients(monkeypatch):
+    """Test that Bedrock clients are shared per region, profile and model."""
+    monkeypatch.delenv('EMBEDDING_BACKEND', raising=False)
+    with patch(
+        'awslabs.git_repo_research_mcp_server.embeddings.BedrockEmbeddings',
+        side_effect=lambda **kwargs: MagicMock(**kwargs),
+    ) as mock_bedrock:
+        first = get_embedding_model(
+            EmbeddingModel.AMAZON_TITAN_EMBED_TEXT_V2, aws_region='us-east-1'
+        )
+        second = get_embedding_model(
+            EmbeddingModel.AMAZON_TITAN_EMBED_TEXT_V2.value, aws_region='us-east-1'
+        )
+        other = get_embedding_model(
+            EmbeddingModel.AMAZON_TITAN_EMBED_TEXT_V2, aws_region='eu-west-1'
+        )
+
+    assert first is second
+    assert first is not other
+    assert mock_bedrock.call_count == 2
+    config = mock_bedrock.call_args.kwargs['config']
+    assert config.max_pool_connections == Constants.BEDROCK_MAX_POOL_CONNECTIONS
+
+
+def test_searcher_and_indexer_are_shared(tmp_path):
+    """Test that request handlers reuse searchers and indexers."""
+    with patch('awslabs.git_repo_research_mcp_server.indexer.get_embedding_model'):
+        with patch('awslabs.git_repo_research_mcp_server.search.get_embedding_model'):
+            searcher = get_repository_searcher(aws_region='us-west-2', index_dir=str(tmp_path))
+            assert (
+                get_repository_searcher(aws_region='us-west-2', index_dir=str(tmp_path))
+                is searcher
+            )
+            assert (
+                get_repository_searcher(aws_region='us-east-1', index_dir=str(tmp_path))
+                is not searcher
+            )
+
+        config = IndexConfig(embedding_model='test-model', index_dir=str(tmp_path))
+        indexer = get_repository_indexer(config)
+        assert get_repository_indexer(config.model_copy()) is indexer
+        assert (
+            get_repository_indexer(config.model_copy(update={'embedding_batch_size': 4}))
+            is not indexer
+        )
+
+
+@pytest.mark.asyncio
+async def test_client_registry_stats_resource():
+    """Test the client registry statistics resource."""
+    get_client_registry().get_or_create(('kind', 'a'), object)
+    get_client_registry().get_or_create(('kind', 'a'), object)
+
+    stats = json.loads(await client_registry_stats())
+
+    assert stats['clients'] == 1
+    assert stats['reuses'] == 1
+    assert stats['entries'][0]['key'] == 'kind:a'
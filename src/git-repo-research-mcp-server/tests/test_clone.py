@@ -0,0 +1,226 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Tests for shallow, partial and sparse cloning in Git Repository Research MCP Server."""
+
+import os
+import pytest
+import threading
+import time
+from awslabs.git_repo_research_mcp_server import repository
+from awslabs.git_repo_research_mcp_server.embeddings import StubEmbeddings
+from awslabs.git_repo_research_mcp_server.indexer import (
+    IndexConfig,
+    RepositoryConfig,
+    RepositoryIndexer,
+)
+from awslabs.git_repo_research_mcp_server.models import CloneStats
+from awslabs.git_repo_research_mcp_server.repository import (
+    clone_repository,
+    ensure_commit,
+    get_changed_files,
+    get_sparse_checkout_patterns,
+    matches_file_patterns,
+)
+from awslabs.git_repo_research_mcp_server.utils import load_metadata
+from concurrent.futures import ThreadPoolExecutor
+from git import Actor, Repo
+from pydantic import ValidationError
+from unittest.mock import patch
+
+
+AUTHOR = Actor('Test', 'test@example.com')
+
+
+@pytest.fixture
+def origin(tmp_path):
+    """Create a repository with two commits."""
+    origin_dir = tmp_path / 'origin'
+    repo = Repo.init(origin_dir)
+    for path, content in {
+        'README.md': '# Origin\n',
+        'src/app.py': 'print("v1")\n',
+        'node_modules/lib/index.js': 'module.exports = 1\n',
+    }.items():
+        (origin_dir / path).parent.mkdir(parents=True, exist_ok=True)
+        (origin_dir / path).write_text(content)
+    repo.index.add(['README.md', 'src/app.py', 'node_modules/lib/index.js'])
+    repo.index.commit('first', author=AUTHOR, committer=AUTHOR)
+    (origin_dir / 'src' / 'app.py').write_text('print("v2")\n')
+    repo.index.add(['src/app.py'])
+    repo.index.commit('second', author=AUTHOR, committer=AUTHOR)
+    return origin_dir
+
+
+@pytest.fixture(autouse=True)
+def reset_clone_semaphore():
+    """Create the clone semaphore again for every test."""
+    repository._clone_semaphore = None
+    yield
+    repository._clone_semaphore = None
+
+
+def test_sparse_checkout_patterns():
+    """Test that include patterns are reduced to file names and directory excludes kept."""
+    patterns = get_sparse_checkout_patterns(
+        ['**/*.py', 'docs/**/*.md', '*.py', '**'],
+        ['**/node_modules/**', '**/*.min.js', 'dist/**', 'src/**/gen/**'],
+    )
+
+    assert patterns == [
+        '*.py',
+        '*.md',
+        '*',
+        '!/*/**/node_modules/**',
+        '!/dist/**',
+        '!/src/*/**/gen/**',
+    ]
+
+
+def test_shallow_sparse_clone(tmp_path, origin):
+    """Test that a shallow sparse clone holds one commit and only matching files."""
+    stats = CloneStats()
+    clone_dir = clone_repository(
+        f'file://{origin}',
+        str(tmp_path / 'clone'),
+        depth=1,
+        filter_spec='blob:none',
+        sparse_patterns=get_sparse_checkout_patterns(['**/*.py'], ['**/node_modules/**']),
+        stats=stats,
+    )
+
+    repo = Repo(clone_dir)
+    assert len(list(repo.iter_commits())) == 1
+    assert (tmp_path / 'clone' / 'src' / 'app.py').read_text() == 'print("v2")\n'
+    assert not (tmp_path / 'clone' / 'README.md').exists()
+    assert not (tmp_path / 'clone' / 'node_modules').exists()
+    assert (stats.depth, stats.filter, stats.sparse_checkout) == (1, 'blob:none', True)
+    assert stats.clone_seconds > 0
+
+
+def test_sparse_clone_keeps_top_level_excluded_directory(tmp_path):
+    """Test that a sparse clone checks out the same files the indexer selects."""
+    origin_dir = tmp_path / 'origin'
+    repo = Repo.init(origin_dir)
+    paths = ['build/top.py', 'src/build/nested.py', 'src/app.py']
+    for path in paths:
+        (origin_dir / path).parent.mkdir(parents=True, exist_ok=True)
+        (origin_dir / path).write_text('x = 1\n')
+    repo.index.add(paths)
+    repo.index.commit('first', author=AUTHOR, committer=AUTHOR)
+    include_patterns, exclude_patterns = ['*.py'], ['**/build/**']
+
+    clone_repository(
+        f'file://{origin_dir}',
+        str(tmp_path / 'clone'),
+        sparse_patterns=get_sparse_checkout_patterns(include_patterns, exclude_patterns),
+    )
+
+    assert [
+        path for path in paths if matches_file_patterns(path, include_patterns, exclude_patterns)
+    ] == ['build/top.py', 'src/app.py']
+    assert (tmp_path / 'clone' / 'build' / 'top.py').exists()
+    assert (tmp_path / 'clone' / 'src' / 'app.py').exists()
+    assert not (tmp_path / 'clone' / 'src' / 'build').exists()
+
+
+def test_ensure_commit_fetches_into_shallow_clone(tmp_path, origin):
+    """Test that the indexed commit is fetched before diffing a shallow clone."""
+    first_commit = Repo(origin).head.commit.parents[0].hexsha
+    clone_dir = clone_repository(f'file://{origin}', str(tmp_path / 'clone'), depth=1)
+
+    ensure_commit(clone_dir, first_commit)
+
+    assert get_changed_files(clone_dir, first_commit) == (['src/app.py'], [])
+
+
+def test_clone_concurrency_limit(tmp_path, monkeypatch):
+    """Test that no more clones than the limit run at the same time."""
+    monkeypatch.setenv('CLONE_MAX_CONCURRENCY', '2')
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fake_clone(url, target_dir, **kwargs):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        os.makedirs(os.path.join(target_dir, '.git'), exist_ok=True)
+
+    with patch.object(repository.Repo, 'clone_from', side_effect=fake_clone):
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            stats = [CloneStats() for _ in range(5)]
+            list(
+                executor.map(
+                    lambda i: clone_repository(
+                        'https://example.com/repo.git', str(tmp_path / str(i)), stats=stats[i]
+                    ),
+                    range(5),
+                )
+            )
+
+    assert peak == 2
+    assert max(s.wait_seconds for s in stats) > 0.04
+
+
+def test_clone_options_validation():
+    """Test that invalid clone depths and filters are rejected."""
+    assert RepositoryConfig(repository_path='.', clone_depth=0).clone_depth is None
+    assert RepositoryConfig(repository_path='.', clone_filter='blob:limit=1m').clone_filter
+    with pytest.raises(ValidationError):
+        RepositoryConfig(repository_path='.', clone_depth=-1)
+    with pytest.raises(ValidationError):
+        RepositoryConfig(repository_path='.', clone_filter='sparse:oid=main')
+
+
+@pytest.mark.asyncio
+async def test_remote_index_records_clone_stats_and_stage_timings(tmp_path, origin):
+    """Test that indexing a remote repository records clone options and stage timings."""
+    index_dir = tmp_path / 'indices'
+    with (
+        patch(
+            'awslabs.git_repo_research_mcp_server.indexer.get_embedding_model',
+            return_value=StubEmbeddings(dimensions=16),
+        ),
+        patch('awslabs.git_repo_research_mcp_server.indexer.is_git_url', return_value=True),
+    ):
+        indexer = RepositoryIndexer(
+            IndexConfig(embedding_model='test-model', index_dir=str(index_dir))
+        )
+        result = await indexer.index_repository(
+            RepositoryConfig(
+                repository_path=f'file://{origin}',
+                output_path='origin',
+                include_patterns=['**/*.py'],
+                exclude_patterns=['**/node_modules/**'],
+                sparse_checkout=True,
+            )
+        )
+
+    assert result.status == 'success', result.message
+    assert result.file_count == 1
+    metadata = load_metadata(str(index_dir / 'origin' / 'metadata.json'))
+    assert metadata.clone_stats.depth == 1
+    assert metadata.clone_stats.sparse_checkout
+    timings = metadata.stage_timings
+    assert timings.prepare_seconds >= metadata.clone_stats.clone_seconds
+    assert timings.index_seconds > 0
+    assert timings.total_seconds >= (
+        timings.prepare_seconds
+        + timings.index_seconds
+        + timings.snapshot_seconds
+        + timings.save_seconds
+        + timings.metadata_seconds
+    )
+    assert not (index_dir / 'origin' / 'repository' / 'README.md').exists()
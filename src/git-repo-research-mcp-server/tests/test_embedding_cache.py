@@ -0,0 +1,202 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Tests for the persistent embedding cache in Git Repository Research MCP Server."""
+
+import os
+import pytest
+from awslabs.git_repo_research_mcp_server.embedding_cache import (
+    CachedEmbeddings,
+    EmbeddingCache,
+    get_embedding_cache,
+    get_embedding_cache_key,
+)
+from awslabs.git_repo_research_mcp_server.indexer import (
+    IndexConfig,
+    RepositoryConfig,
+    RepositoryIndexer,
+)
+from awslabs.git_repo_research_mcp_server.utils import load_metadata
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+
+@pytest.fixture
+def embedding_cache(tmp_path):
+    """Create an embedding cache in a temporary directory."""
+    cache = EmbeddingCache(str(tmp_path / 'cache.sqlite3'))
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def mock_embeddings():
+    """Create a mock embedding model."""
+    embeddings = MagicMock()
+    embeddings.embed_query.return_value = [0.5, 0.5]
+    embeddings.embed_documents.side_effect = lambda texts: [
+        [float(len(text)), 1.0] for text in texts
+    ]
+    return embeddings
+
+
+def test_get_embedding_cache_key():
+    """Test that cache keys depend on the model and the text."""
+    key = get_embedding_cache_key('model-a', 'text')
+
+    assert key == get_embedding_cache_key('model-a', 'text')
+    assert key != get_embedding_cache_key('model-b', 'text')
+    assert key != get_embedding_cache_key('model-a', 'other text')
+    assert len(key) == 64
+
+
+def test_embedding_cache_round_trip(embedding_cache):
+    """Test storing and loading embeddings."""
+    embedding_cache.put_many({'a': [0.25, 0.5], 'b': [1.0, 2.0]})
+
+    found = embedding_cache.get_many(['a', 'b', 'missing'])
+
+    assert found == {'a': [0.25, 0.5], 'b': [1.0, 2.0]}
+    assert embedding_cache.size_bytes() == 16
+
+
+def test_embedding_cache_persists(tmp_path):
+    """Test that cached embeddings survive reopening the cache."""
+    cache_path = str(tmp_path / 'cache.sqlite3')
+    cache = EmbeddingCache(cache_path)
+    cache.put_many({'a': [0.25, 0.5]})
+    cache.close()
+
+    reopened = EmbeddingCache(cache_path)
+    assert reopened.get_many(['a']) == {'a': [0.25, 0.5]}
+    reopened.close()
+
+
+def test_embedding_cache_size_eviction(tmp_path):
+    """Test that least recently used embeddings are evicted past the size bound."""
+    cache = EmbeddingCache(str(tmp_path / 'cache.sqlite3'), max_size_bytes=16)
+    cache.put_many({'a': [1.0, 1.0]})
+    cache.put_many({'b': [2.0, 2.0]})
+    # Use 'a' so that 'b' becomes the least recently used entry
+    cache.get_many(['a'])
+    cache.put_many({'c': [3.0, 3.0]})
+
+    assert set(cache.get_many(['a', 'b', 'c'])) == {'a', 'c'}
+    assert cache.evictions == 1
+    assert cache.size_bytes() <= 16
+    cache.close()
+
+
+def test_embedding_cache_size_is_tracked(tmp_path):
+    """Test that the running size total follows replacements, evictions and reopening."""
+    cache_path = str(tmp_path / 'cache.sqlite3')
+    cache = EmbeddingCache(cache_path, max_size_bytes=24)
+    cache.put_many({'a': [1.0, 1.0], 'b': [2.0, 2.0]})
+    cache.put_many({'a': [1.0, 1.0, 1.0, 1.0]})
+    assert cache.size_bytes() == 24
+
+    cache.put_many({'c': [3.0, 3.0]})
+    assert cache.evictions == 1
+    assert cache.size_bytes() == 24
+    assert set(cache.get_many(['a', 'b', 'c'])) == {'a', 'c'}
+    cache.close()
+
+    reopened = EmbeddingCache(cache_path, max_size_bytes=24)
+    assert reopened.size_bytes() == 24
+    reopened.close()
+
+
+def test_cached_embeddings_counts_from_threads(embedding_cache, mock_embeddings):
+    """Test that hits and misses are counted exactly when batches are embedded concurrently."""
+    cached_embeddings = CachedEmbeddings(mock_embeddings, embedding_cache, 'test-model')
+    cached_embeddings.embed_documents(['cached'])
+    texts = [f'text {i}' for i in range(200)] + ['cached']
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda i: cached_embeddings.embed_documents(texts[i::8]), range(8)))
+
+    stats = cached_embeddings.stats()
+    assert stats.misses == 201
+    assert stats.hits == 1
+
+
+def test_cached_embeddings_only_embeds_misses(embedding_cache, mock_embeddings):
+    """Test that only uncached texts are sent to the embedding model."""
+    cached_embeddings = CachedEmbeddings(mock_embeddings, embedding_cache, 'test-model')
+
+    first = cached_embeddings.embed_documents(['one', 'three', 'one'])
+    second = cached_embeddings.embed_documents(['three', 'four'])
+
+    assert first == [[3.0, 1.0], [5.0, 1.0], [3.0, 1.0]]
+    assert second == [[5.0, 1.0], [4.0, 1.0]]
+    assert mock_embeddings.embed_documents.call_args_list[0][0][0] == ['one', 'three']
+    assert mock_embeddings.embed_documents.call_args_list[1][0][0] == ['four']
+
+    stats = cached_embeddings.stats()
+    assert stats.misses == 3
+    assert stats.hits == 2
+    assert stats.hit_rate == pytest.approx(0.4)
+    assert stats.cache_size_bytes == 24
+
+
+def test_cached_embeddings_query_passthrough(embedding_cache, mock_embeddings):
+    """Test that query embeddings are not cached."""
+    cached_embeddings = CachedEmbeddings(mock_embeddings, embedding_cache, 'test-model')
+
+    assert cached_embeddings.embed_query('query') == [0.5, 0.5]
+    mock_embeddings.embed_query.assert_called_once_with('query')
+
+
+def test_get_embedding_cache_disabled(tmp_path, monkeypatch):
+    """Test that a zero size disables the cache."""
+    monkeypatch.setenv('EMBEDDING_CACHE_MAX_BYTES', '0')
+
+    assert get_embedding_cache(str(tmp_path)) is None
+
+
+def test_get_embedding_cache_shared(tmp_path):
+    """Test that the cache for an index directory is shared."""
+    cache = get_embedding_cache(str(tmp_path))
+
+    assert cache is not None
+    assert cache is get_embedding_cache(str(tmp_path))
+
+
+@pytest.mark.asyncio
+async def test_index_repository_records_cache_stats(tmp_path, mock_embeddings):
+    """Test that re-indexing reuses cached embeddings and records statistics."""
+    repo_dir = tmp_path / 'cached_repo'
+    repo_dir.mkdir()
+    (repo_dir / 'README.md').write_text('# Cached\n\nSome documentation.\n')
+    (repo_dir / 'main.py').write_text('print("hello")\n')
+
+    with patch(
+        'awslabs.git_repo_research_mcp_server.indexer.get_embedding_model',
+        return_value=mock_embeddings,
+    ):
+        indexer = RepositoryIndexer(
+            IndexConfig(embedding_model='test-model', index_dir=str(tmp_path / 'indices'))
+        )
+        config = RepositoryConfig(
+            repository_path=str(repo_dir), include_patterns=['*.md', '*.py'], exclude_patterns=[]
+        )
+
+        await indexer.index_repository(config)
+        mock_embeddings.embed_documents.reset_mock()
+        result = await indexer.index_repository(config)
+
+        assert result.status == 'success'
+        mock_embeddings.embed_documents.assert_not_called()
+
+        metadata = load_metadata(os.path.join(result.index_path, 'metadata.json'))
+        assert metadata is not None
+        assert metadata.embedding_cache is not None
+        assert metadata.embedding_cache.misses == 0
+        assert metadata.embedding_cache.hit_rate == 1.0
@@ -0,0 +1,162 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Tests for the concurrent embedding pipeline in Git Repository Research MCP Server."""
+
+import pytest
+import threading
+import time
+from awslabs.git_repo_research_mcp_server.embedding_pipeline import (
+    EmbeddingPipeline,
+    is_throttling_error,
+)
+from awslabs.git_repo_research_mcp_server.embeddings import StubEmbeddings, get_embedding_model
+from botocore.exceptions import ClientError
+from langchain_core.documents import Document
+from unittest.mock import AsyncMock, MagicMock
+
+
+class SlowEmbeddings(StubEmbeddings):
+    """Stub embeddings that record how many batches run at the same time."""
+
+    def __init__(self, latency_seconds: float, throttle_first: int = 0):
+        """Initialize the slow embeddings."""
+        super().__init__(dimensions=8)
+        self.batch_latency = latency_seconds
+        self.throttle_first = throttle_first
+        self.calls = 0
+        self.active = 0
+        self.peak_active = 0
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts):
+        """Embed documents after a delay, throttling the first calls if requested."""
+        with self._lock:
+            self.calls += 1
+            if self.calls <= self.throttle_first:
+                raise ValueError('Error raised by inference endpoint: ThrottlingException')
+            self.active += 1
+            self.peak_active = max(self.peak_active, self.active)
+        time.sleep(self.batch_latency)
+        with self._lock:
+            self.active -= 1
+        return super().embed_documents(texts)
+
+
+def make_documents(count, start=0):
+    """Create test documents."""
+    return [
+        Document(page_content=f'chunk {i}', metadata={'source': f'file_{i % 3}.py', 'chunk_id': i})
+        for i in range(start, start + count)
+    ]
+
+
+def test_stub_embeddings_deterministic():
+    """Test that stub embeddings are deterministic unit vectors."""
+    embeddings = StubEmbeddings(dimensions=48)
+
+    first = embeddings.embed_query('hello')
+
+    assert first == embeddings.embed_documents(['hello'])[0]
+    assert first != embeddings.embed_query('world')
+    assert len(first) == 48
+    assert sum(value * value for value in first) == pytest.approx(1.0)
+
+
+def test_get_embedding_model_stub_backend(monkeypatch):
+    """Test that the stub backend can be selected with an environment variable."""
+    monkeypatch.setenv('EMBEDDING_BACKEND', 'stub')
+    monkeypatch.setenv('STUB_EMBEDDING_LATENCY_MS', '5')
+
+    embeddings = get_embedding_model('amazon.titan-embed-text-v2:0')
+
+    assert isinstance(embeddings, StubEmbeddings)
+    assert embeddings.latency_seconds == pytest.approx(0.005)
+
+
+def test_is_throttling_error():
+    """Test detection of throttling errors."""
+    client_error = ClientError(
+        {'Error': {'Code': 'ThrottlingException', 'Message': 'Rate exceeded'}}, 'InvokeModel'
+    )
+
+    assert is_throttling_error(client_error)
+    assert is_throttling_error(ValueError('Error raised: ThrottlingException'))
+    assert not is_throttling_error(ValueError('AccessDeniedException'))
+
+
+@pytest.mark.asyncio
+async def test_pipeline_runs_batches_concurrently():
+    """Test that batches are embedded concurrently and all vectors are stored."""
+    embeddings = SlowEmbeddings(latency_seconds=0.05)
+    pipeline = EmbeddingPipeline(embeddings, batch_size=2, max_concurrency=4)
+    ctx = MagicMock()
+    ctx.info = AsyncMock()
+    ctx.report_progress = AsyncMock()
+
+    vector_store = await pipeline.embed_documents(make_documents(16), ctx=ctx)
+
+    assert vector_store is not None
+    assert vector_store.index.ntotal == 16
+    assert embeddings.calls == 8
+    assert 1 < embeddings.peak_active <= 4
+    ctx.report_progress.assert_called_with(90, 100)
+
+
+@pytest.mark.asyncio
+async def test_pipeline_adds_to_existing_store():
+    """Test that vectors are added to an existing vector store."""
+    embeddings = StubEmbeddings(dimensions=8)
+    pipeline = EmbeddingPipeline(embeddings, batch_size=3)
+    vector_store = await pipeline.embed_documents(make_documents(4))
+
+    result = await pipeline.embed_documents(make_documents(5, start=4), vector_store)
+
+    assert result is vector_store
+    assert vector_store.index.ntotal == 9
+    assert vector_store.index_to_docstore_id[8] == '8'
+    assert pipeline.embedded_count == 9
+
+
+@pytest.mark.asyncio
+async def test_pipeline_retries_throttled_batches():
+    """Test that throttled batches are retried and the concurrency limit is reduced."""
+    embeddings = SlowEmbeddings(latency_seconds=0.01, throttle_first=2)
+    pipeline = EmbeddingPipeline(
+        embeddings, batch_size=1, max_concurrency=4, initial_backoff_seconds=0.01
+    )
+
+    vector_store = await pipeline.embed_documents(make_documents(4))
+
+    assert vector_store is not None
+    assert vector_store.index.ntotal == 4
+    assert pipeline.throttle_count == 2
+    assert pipeline.concurrency_limit < 4
+
+
+@pytest.mark.asyncio
+async def test_pipeline_raises_non_throttling_errors():
+    """Test that other errors are not retried."""
+    embeddings = MagicMock()
+    embeddings.embed_documents.side_effect = ValueError('AccessDeniedException')
+    pipeline = EmbeddingPipeline(embeddings, batch_size=2)
+
+    with pytest.raises(ValueError, match='AccessDeniedException'):
+        await pipeline.embed_documents(make_documents(4))
+
+    assert pipeline.throttle_count == 0
+
+
+@pytest.mark.asyncio
+async def test_pipeline_no_documents():
+    """Test that an empty document list returns the given vector store."""
+    pipeline = EmbeddingPipeline(StubEmbeddings(dimensions=8))
+
+    assert await pipeline.embed_documents([]) is None
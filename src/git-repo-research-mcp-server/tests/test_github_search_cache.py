@@ -0,0 +1,206 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Tests for the cached and concurrent GitHub search in Git Repository Research MCP Server."""
+
+import asyncio
+import pytest
+import threading
+import time
+from awslabs.git_repo_research_mcp_server.github_search import (
+    get_github_search_cache,
+    get_rate_limit_budget,
+    get_search_cache_key,
+    github_repo_search_wrapper,
+)
+from unittest.mock import MagicMock, patch
+
+
+ORGANIZATIONS = ['awslabs', 'aws-samples', 'aws-solutions-library-samples']
+
+
+def make_response(status_code=200, items=None, headers=None, text=''):
+    """Create a mock REST search API response."""
+    response = MagicMock(status_code=status_code, text=text, headers=headers or {})
+    response.json.return_value = {'items': items or []}
+    return response
+
+
+def make_item(org, name, stars=10):
+    """Create a repository item of a REST search API response."""
+    return {
+        'full_name': f'{org}/{name}',
+        'html_url': f'https://github.com/{org}/{name}',
+        'stargazers_count': stars,
+        'license': {'name': 'Apache License 2.0'},
+    }
+
+
+@pytest.fixture(autouse=True)
+def no_token(monkeypatch):
+    """Search with the unauthenticated REST API."""
+    monkeypatch.delenv('GITHUB_TOKEN', raising=False)
+
+
+def search():
+    """Search the test organizations."""
+    return github_repo_search_wrapper(keywords=['mcp'], organizations=ORGANIZATIONS)
+
+
+def test_search_cache_key_ignores_order_and_case():
+    """Test that equivalent searches share a cache key."""
+    key = get_search_cache_key('rest', ['MCP', 'aws'], ['awslabs', 'aws-samples'], None, 5)
+
+    assert key == get_search_cache_key('rest', ['aws', 'mcp'], ['aws-samples', 'AWSLabs'], [], 5)
+    assert key != get_search_cache_key('rest', ['aws', 'mcp'], ['awslabs'], None, 5)
+    assert key != get_search_cache_key(
+        'graphql', ['aws', 'mcp'], ['aws-samples', 'awslabs'], [], 5
+    )
+
+
+@pytest.mark.asyncio
+async def test_organizations_are_searched_concurrently(github_client):
+    """Test that the organizations are searched at the same time."""
+    running = 0
+    peak = 0
+
+    async def get(path, params, headers):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.1)
+        running -= 1
+        org = params['q'].split('org:')[1]
+        return make_response(items=[make_item(org, 'repo', stars=len(org))])
+
+    github_client.get.side_effect = get
+
+    start_time = time.perf_counter()
+    results = await search()
+
+    assert peak == len(ORGANIZATIONS)
+    assert time.perf_counter() - start_time < 0.25
+    assert [result['organization'] for result in results] == [
+        'aws-solutions-library-samples',
+        'aws-samples',
+        'awslabs',
+    ]
+
+
+@pytest.mark.asyncio
+async def test_fresh_results_are_served_from_cache(github_client):
+    """Test that a repeated search is answered without requests."""
+    github_client.get.return_value = make_response(items=[make_item('awslabs', 'mcp')])
+
+    first = await search()
+    second = await search()
+
+    assert second == first
+    assert github_client.get.call_count == len(ORGANIZATIONS)
+
+
+@pytest.mark.asyncio
+async def test_cache_is_accessed_off_event_loop(github_client):
+    """Test that the SQLite cache is read and written in worker threads."""
+    github_client.get.return_value = make_response(items=[make_item('awslabs', 'mcp')])
+    cache = get_github_search_cache()
+    threads = []
+
+    def record(method):
+        def call(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return method(*args, **kwargs)
+
+        return call
+
+    with (
+        patch.object(cache, 'get', side_effect=record(cache.get)),
+        patch.object(cache, 'put', side_effect=record(cache.put)),
+    ):
+        await search()
+
+    # One lookup and one store per organization, plus the lookup and store of the search
+    assert len(threads) == 2 * len(ORGANIZATIONS) + 2
+    assert threading.current_thread() not in threads
+
+
+@pytest.mark.asyncio
+async def test_partial_results_are_not_cached(github_client):
+    """Test that results missing an organization after an error are not served from cache."""
+    failing = make_response()
+    failing.json.side_effect = ValueError('invalid JSON')
+
+    async def get(path, params, headers):
+        org = params['q'].split('org:')[1]
+        if org == 'awslabs':
+            return failing
+        return make_response(items=[make_item(org, 'repo')])
+
+    github_client.get.side_effect = get
+    partial = await search()
+    assert {result['organization'] for result in partial} == {
+        'aws-samples',
+        'aws-solutions-library-samples',
+    }
+
+    github_client.get.side_effect = None
+    github_client.get.return_value = make_response(items=[make_item('awslabs', 'mcp')])
+    complete = await search()
+
+    assert github_client.get.call_count == 2 * len(ORGANIZATIONS)
+    assert [result['organization'] for result in complete] == ['awslabs']
+    assert await search() == complete
+    assert github_client.get.call_count == 2 * len(ORGANIZATIONS)
+
+
+@pytest.mark.asyncio
+async def test_stale_responses_are_revalidated_with_etags(github_client):
+    """Test that stale responses are revalidated and reused when not modified."""
+    get_github_search_cache().ttl_seconds = 0
+    github_client.get.return_value = make_response(
+        items=[make_item('awslabs', 'mcp')], headers={'ETag': '"abc"'}
+    )
+    first = await search()
+
+    github_client.get.reset_mock()
+    github_client.get.return_value = make_response(status_code=304)
+    second = await search()
+
+    assert second == first
+    assert github_client.get.call_count == len(ORGANIZATIONS)
+    for call in github_client.get.call_args_list:
+        assert call.kwargs['headers']['If-None-Match'] == '"abc"'
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_searches_are_shed(github_client):
+    """Test that a spent rate limit serves cached results or no results without waiting."""
+    get_github_search_cache().ttl_seconds = 0
+    github_client.get.return_value = make_response(items=[make_item('awslabs', 'mcp')])
+    first = await search()
+
+    github_client.get.reset_mock()
+    github_client.get.return_value = make_response(
+        status_code=403,
+        text='API rate limit exceeded',
+        headers={'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': str(time.time() + 600)},
+    )
+    start_time = time.perf_counter()
+    assert await search() == first
+    assert time.perf_counter() - start_time < 1
+
+    # Once the budget is known to be spent, searches are shed without requests
+    github_client.get.reset_mock()
+    shed_requests = get_rate_limit_budget().shed_requests
+    assert await search() == first
+    assert await github_repo_search_wrapper(keywords=['other'], organizations=ORGANIZATIONS) == []
+    github_client.get.assert_not_called()
+    assert get_rate_limit_budget().seconds_until_reset('search') > 500
+    assert get_rate_limit_budget().shed_requests - shed_requests == 2 * len(ORGANIZATIONS)
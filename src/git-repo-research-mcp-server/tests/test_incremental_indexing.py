@@ -0,0 +1,277 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Tests for incremental re-indexing in Git Repository Research MCP Server."""
+
+import os
+import pytest
+import subprocess
+from awslabs.git_repo_research_mcp_server.ann_index import get_index_type
+from awslabs.git_repo_research_mcp_server.embeddings import StubEmbeddings
+from awslabs.git_repo_research_mcp_server.indexer import (
+    IndexConfig,
+    RepositoryConfig,
+    RepositoryIndexer,
+    get_docstore_dict,
+    load_index_components,
+)
+from awslabs.git_repo_research_mcp_server.models import IndexType
+from awslabs.git_repo_research_mcp_server.repository import get_changed_files
+from awslabs.git_repo_research_mcp_server.utils import load_metadata
+from unittest.mock import MagicMock, patch
+
+
+def _git(repo_dir, *args):
+    """Run a git command in a repository."""
+    subprocess.run(['git', *args], cwd=repo_dir, check=True, capture_output=True)
+
+
+def _write(repo_dir, rel_path, content):
+    """Write a file in a repository."""
+    file_path = os.path.join(repo_dir, rel_path)
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, 'w') as f:
+        f.write(content)
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """Create a Git repository with a few committed files."""
+    repo_dir = str(tmp_path / 'incremental_repo')
+    os.makedirs(repo_dir)
+    _git(repo_dir, 'init')
+    _git(repo_dir, 'config', 'user.name', 'Test User')
+    _git(repo_dir, 'config', 'user.email', 'test@example.com')
+
+    _write(repo_dir, 'README.md', '# Incremental\n\nOriginal readme.\n')
+    _write(repo_dir, 'src/keep.py', 'def keep():\n    return 1\n')
+    _write(repo_dir, 'src/remove.py', 'def remove():\n    return 2\n')
+    _git(repo_dir, 'add', '.')
+    _git(repo_dir, 'commit', '-m', 'Initial commit')
+    return repo_dir
+
+
+@pytest.fixture
+def mock_embeddings():
+    """Create a mock embedding generator that records embedded texts."""
+    embeddings = MagicMock()
+    embeddings.embed_query.return_value = [0.1] * 8
+    embeddings.embed_documents.side_effect = lambda docs: [[0.1] * 8 for _ in docs]
+    return embeddings
+
+
+def _commit_changes(repo_dir):
+    """Modify, add and delete files and commit the changes."""
+    _write(repo_dir, 'README.md', '# Incremental\n\nUpdated readme.\n')
+    _write(repo_dir, 'docs/new.md', '# New\n\nA new document.\n')
+    os.remove(os.path.join(repo_dir, 'src', 'remove.py'))
+    _git(repo_dir, 'add', '-A')
+    _git(repo_dir, 'commit', '-m', 'Update files')
+
+
+def test_get_changed_files(git_repo):
+    """Test diffing a commit against HEAD."""
+    first_commit = subprocess.run(
+        ['git', 'rev-parse', 'HEAD'], cwd=git_repo, check=True, capture_output=True, text=True
+    ).stdout.strip()
+    _commit_changes(git_repo)
+
+    changed_files, deleted_files = get_changed_files(git_repo, first_commit)
+
+    assert changed_files == ['README.md', 'docs/new.md']
+    assert deleted_files == ['src/remove.py']
+
+
+@pytest.mark.asyncio
+async def test_incremental_index_repository(git_repo, tmp_path, mock_embeddings):
+    """Test that only changed files are re-embedded on an incremental update."""
+    with patch(
+        'awslabs.git_repo_research_mcp_server.indexer.get_embedding_model',
+        return_value=mock_embeddings,
+    ):
+        indexer = RepositoryIndexer(
+            IndexConfig(embedding_model='test-model', index_dir=str(tmp_path / 'indices'))
+        )
+        config = RepositoryConfig(
+            repository_path=git_repo,
+            include_patterns=['*.md', '*.py', '**/*.md', '**/*.py'],
+            exclude_patterns=['**/.git/**'],
+            incremental=True,
+        )
+
+        # Without an existing index the first run is a full index
+        result = await indexer.index_repository(config)
+        assert result.status == 'success'
+        assert result.file_count == 3
+
+        _commit_changes(git_repo)
+        mock_embeddings.embed_documents.reset_mock()
+
+        result = await indexer.index_repository(config)
+
+        assert result.status == 'success', result.message
+        assert 'Incrementally updated' in result.message
+        embedded_texts = [
+            text for call in mock_embeddings.embed_documents.call_args_list for text in call[0][0]
+        ]
+        assert sorted(embedded_texts) == [
+            '# Incremental\n\nUpdated readme.\n',
+            '# New\n\nA new document.\n',
+        ]
+
+        index_path = result.index_path
+        index, docstore, index_to_docstore_id = load_index_components(index_path)
+        sources = sorted(doc.metadata['source'] for doc in get_docstore_dict(docstore).values())
+        assert sources == ['README.md', 'docs/new.md', 'src/keep.py']
+        assert index.ntotal == 3
+        assert sorted(index_to_docstore_id) == [0, 1, 2]
+
+        metadata = load_metadata(os.path.join(index_path, 'metadata.json'))
+        assert metadata is not None
+        assert metadata.file_count == 3
+        assert metadata.chunk_count == 3
+        head_commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=git_repo, check=True, capture_output=True, text=True
+        ).stdout.strip()
+        assert metadata.last_commit_id == head_commit
+
+        repo_files_path = os.path.join(index_path, 'repository')
+        assert os.path.exists(os.path.join(repo_files_path, 'docs', 'new.md'))
+        assert not os.path.exists(os.path.join(repo_files_path, 'src', 'remove.py'))
+
+        # A second run at the same commit does not embed anything
+        mock_embeddings.embed_documents.reset_mock()
+        result = await indexer.index_repository(config)
+        assert result.status == 'success'
+        assert 'already up to date' in result.message
+        mock_embeddings.embed_documents.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_incremental_index_falls_back_on_model_change(git_repo, tmp_path, mock_embeddings):
+    """Test that a different embedding model triggers a full index."""
+    with patch(
+        'awslabs.git_repo_research_mcp_server.indexer.get_embedding_model',
+        return_value=mock_embeddings,
+    ):
+        index_dir = str(tmp_path / 'indices')
+        config = RepositoryConfig(
+            repository_path=git_repo,
+            include_patterns=['*.md', '**/*.py'],
+            exclude_patterns=['**/.git/**'],
+            incremental=True,
+        )
+        indexer = RepositoryIndexer(IndexConfig(embedding_model='test-model', index_dir=index_dir))
+        await indexer.index_repository(config)
+
+        other_indexer = RepositoryIndexer(
+            IndexConfig(embedding_model='amazon.titan-embed-text-v1', index_dir=index_dir)
+        )
+        result = await other_indexer.index_repository(config)
+
+        assert result.status == 'success'
+        assert result.message.startswith('Successfully indexed repository')
+        assert result.embedding_model == 'amazon.titan-embed-text-v1'
+
+
+@pytest.mark.asyncio
+async def test_incremental_index_falls_back_on_chunking_change(
+    git_repo, tmp_path, mock_embeddings
+):
+    """Test that different chunking settings or file patterns trigger a full index."""
+    with patch(
+        'awslabs.git_repo_research_mcp_server.indexer.get_embedding_model',
+        return_value=mock_embeddings,
+    ):
+        indexer = RepositoryIndexer(
+            IndexConfig(embedding_model='test-model', index_dir=str(tmp_path / 'indices'))
+        )
+        config = RepositoryConfig(
+            repository_path=git_repo,
+            include_patterns=['*.md', '**/*.py'],
+            exclude_patterns=['**/.git/**'],
+            incremental=True,
+        )
+        result = await indexer.index_repository(config)
+        metadata = load_metadata(os.path.join(result.index_path, 'metadata.json'))
+        assert metadata is not None
+        assert (metadata.chunk_size, metadata.chunk_overlap) == (1000, 200)
+        assert metadata.include_patterns == ['*.md', '**/*.py']
+
+        for changes in [
+            {'chunk_size': 500},
+            {'chunk_overlap': 50},
+            {'include_patterns': ['*.md']},
+            {'exclude_patterns': ['**/.git/**', 'src/**']},
+        ]:
+            config = config.model_copy(update=changes)
+            result = await indexer.index_repository(config)
+
+            assert result.status == 'success'
+            assert result.message.startswith('Successfully indexed repository'), changes
+
+        assert result.file_count == 1
+        result = await indexer.index_repository(config)
+        assert 'already up to date' in result.message
+
+
+@pytest.mark.asyncio
+async def test_incremental_index_falls_back_for_ivf_pq_index(tmp_path):
+    """Test that an IVF-PQ index is rebuilt instead of having vectors removed."""
+    repo_dir = str(tmp_path / 'ivf_pq_repo')
+    os.makedirs(repo_dir)
+    _git(repo_dir, 'init')
+    _git(repo_dir, 'config', 'user.name', 'Test User')
+    _git(repo_dir, 'config', 'user.email', 'test@example.com')
+    for i in range(300):
+        _write(repo_dir, f'module_{i}.py', f'def function_{i}():\n    return {i}\n')
+    _git(repo_dir, 'add', '.')
+    _git(repo_dir, 'commit', '-m', 'Initial commit')
+
+    with patch(
+        'awslabs.git_repo_research_mcp_server.indexer.get_embedding_model',
+        return_value=StubEmbeddings(dimensions=16),
+    ):
+        indexer = RepositoryIndexer(
+            IndexConfig(
+                embedding_model='test-model',
+                index_dir=str(tmp_path / 'indices'),
+                index_type=IndexType.IVF_PQ,
+                ivf_nlist=4,
+            )
+        )
+        config = RepositoryConfig(
+            repository_path=repo_dir,
+            include_patterns=['*.py'],
+            exclude_patterns=[],
+            incremental=True,
+        )
+        result = await indexer.index_repository(config)
+        assert result.status == 'success'
+
+        os.remove(os.path.join(repo_dir, 'module_0.py'))
+        _write(repo_dir, 'module_7.py', 'def renamed():\n    return 7\n')
+        _git(repo_dir, 'add', '-A')
+        _git(repo_dir, 'commit', '-m', 'Update files')
+
+        result = await indexer.index_repository(config)
+
+        assert result.status == 'success', result.message
+        assert result.message.startswith('Successfully indexed repository')
+        index, docstore, index_to_docstore_id = load_index_components(result.index_path)
+        assert get_index_type(index) == IndexType.IVF_PQ
+        assert index.ntotal == 299
+        docstore_dict = get_docstore_dict(docstore)
+        assert sorted(index_to_docstore_id) == list(range(299))
+        assert set(index_to_docstore_id.values()) == set(docstore_dict)
+
+        vector_store = indexer.load_index_without_pickle(result.index_path)
+        documents = vector_store.similarity_search('def renamed():\n    return 7\n', k=1)
+        assert documents[0].metadata['source'] == 'module_7.py'
@@ -0,0 +1,173 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Tests for the in-process index cache in Git Repository Research MCP Server."""
+
+import json
+import os
+import pytest
+from awslabs.git_repo_research_mcp_server.index_cache import (
+    IndexCache,
+    get_index_cache,
+    get_index_version,
+)
+from awslabs.git_repo_research_mcp_server.indexer import IndexConfig, RepositoryIndexer
+from awslabs.git_repo_research_mcp_server.server import index_cache_stats
+from unittest.mock import MagicMock, patch
+
+
+def _write_index(index_path, last_commit_id='abc123', content='index'):
+    """Write placeholder index files to a directory."""
+    os.makedirs(index_path, exist_ok=True)
+    for filename in ('index.faiss', 'docstore.json', 'index_mapping.json'):
+        with open(os.path.join(index_path, filename), 'w') as f:
+            f.write(content)
+    with open(os.path.join(index_path, 'metadata.json'), 'w') as f:
+        json.dump({'last_commit_id': last_commit_id}, f)
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    """Create a directory with placeholder index files."""
+    path = str(tmp_path / 'test_repo')
+    _write_index(path)
+    return path
+
+
+def test_get_index_version_missing_files(tmp_path):
+    """Test that an index without files has no version."""
+    assert get_index_version(str(tmp_path)) is None
+
+
+def test_get_index_version_changes_with_commit(index_path):
+    """Test that the version changes when the indexed commit changes."""
+    version = get_index_version(index_path)
+    assert version is not None
+    assert version[-1] == 'abc123'
+
+    with open(os.path.join(index_path, 'metadata.json'), 'w') as f:
+        json.dump({'last_commit_id': 'def456'}, f)
+
+    assert get_index_version(index_path) != version
+
+
+def test_index_cache_hit_and_miss(index_path):
+    """Test that the second lookup is served from the cache."""
+    cache = IndexCache(max_entries=2)
+    loader = MagicMock(return_value='loaded')
+
+    assert cache.get_or_load(index_path, loader) == 'loaded'
+    assert cache.get_or_load(index_path, loader) == 'loaded'
+
+    loader.assert_called_once_with(index_path)
+    stats = cache.stats()
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.hit_rate == 0.5
+    assert stats.size == 1
+
+
+def test_index_cache_invalidated_by_rewrite(index_path):
+    """Test that rewriting the index files reloads the index."""
+    cache = IndexCache()
+    loader = MagicMock(side_effect=['first', 'second'])
+
+    assert cache.get_or_load(index_path, loader) == 'first'
+    _write_index(index_path, content='rebuilt index')
+    assert cache.get_or_load(index_path, loader) == 'second'
+
+    stats = cache.stats()
+    assert stats.misses == 2
+    assert stats.invalidations == 1
+
+
+def test_index_cache_lru_eviction(tmp_path):
+    """Test that the least recently used index is evicted."""
+    cache = IndexCache(max_entries=2)
+    paths = []
+    for name in ('repo_a', 'repo_b', 'repo_c'):
+        path = str(tmp_path / name)
+        _write_index(path)
+        paths.append(path)
+
+    loader = MagicMock(side_effect=lambda path: os.path.basename(path))
+    cache.get_or_load(paths[0], loader)
+    cache.get_or_load(paths[1], loader)
+    # Touch repo_a so repo_b becomes the least recently used entry
+    cache.get_or_load(paths[0], loader)
+    cache.get_or_load(paths[2], loader)
+
+    stats = cache.stats()
+    assert stats.evictions == 1
+    assert stats.cached_indices == [paths[0], paths[2]]
+
+
+def test_index_cache_does_not_store_missing_index(tmp_path):
+    """Test that indices without files on disk are not cached."""
+    cache = IndexCache()
+    loader = MagicMock(return_value='loaded')
+
+    cache.get_or_load(str(tmp_path), loader)
+    cache.get_or_load(str(tmp_path), loader)
+
+    assert loader.call_count == 2
+    assert cache.stats().size == 0
+
+
+def test_index_cache_invalidate_and_clear(index_path):
+    """Test explicit invalidation and clearing."""
+    cache = IndexCache()
+    cache.get_or_load(index_path, MagicMock(return_value='loaded'))
+
+    assert cache.invalidate(index_path) is True
+    assert cache.invalidate(index_path) is False
+    assert cache.stats().invalidations == 1
+
+    cache.clear()
+    assert cache.stats().invalidations == 0
+
+
+def test_get_index_cache_is_shared():
+    """Test that the process-wide cache is a singleton."""
+    assert get_index_cache() is get_index_cache()
+
+
+def test_load_index_without_pickle_uses_cache(tmp_path, index_path):
+    """Test that the indexer resolves repository names and reuses loaded indices."""
+    with (
+        patch('awslabs.git_repo_research_mcp_server.indexer.get_embedding_model'),
+        patch(
+            'awslabs.git_repo_research_mcp_server.indexer.get_index_cache',
+            return_value=IndexCache(),
+        ),
+        patch('awslabs.git_repo_research_mcp_server.indexer.load_index_components') as mock_load,
+        patch('awslabs.git_repo_research_mcp_server.indexer.FAISS') as mock_faiss,
+    ):
+        mock_load.return_value = (MagicMock(), MagicMock(), {0: 'doc-0'})
+        indexer = RepositoryIndexer(
+            IndexConfig(embedding_model='test-model', index_dir=str(tmp_path))
+        )
+
+        indexer.load_index_without_pickle('test_repo')
+        indexer.load_index_without_pickle(index_path)
+
+        mock_load.assert_called_once_with(index_path)
+        assert mock_faiss.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_index_cache_stats_resource():
+    """Test the index cache statistics resource."""
+    result = json.loads(await index_cache_stats())
+
+    assert 'hits' in result
+    assert 'misses' in result
+    assert 'evictions' in result
+    assert result['max_entries'] >= 1
@@ -0,0 +1,226 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Tests for background indexing jobs in Git Repository Research MCP Server."""
+
+import asyncio
+import json
+import os
+import pytest
+from awslabs.git_repo_research_mcp_server.embeddings import StubEmbeddings
+from awslabs.git_repo_research_mcp_server.indexer import IndexConfig, RepositoryConfig
+from awslabs.git_repo_research_mcp_server.jobs import IndexingJobManager
+from awslabs.git_repo_research_mcp_server.models import (
+    IndexingJobStatus,
+    IndexingStage,
+)
+from awslabs.git_repo_research_mcp_server.server import (
+    indexing_job_status,
+    mcp_cancel_indexing_job,
+    mcp_resume_indexing_job,
+    mcp_submit_indexing_job,
+)
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+
+class CountingEmbeddings(StubEmbeddings):
+    """Stub embeddings that count the embedded texts."""
+
+    def __init__(self, **kwargs):
+        """Initialize the counting embeddings."""
+        super().__init__(**kwargs)
+        self.embedded_texts = 0
+
+    def embed_documents(self, texts):
+        """Embed documents and count them."""
+        self.embedded_texts += len(texts)
+        return super().embed_documents(texts)
+
+
+@pytest.fixture
+def repo_dir(tmp_path):
+    """Create a repository directory with many chunks."""
+    repo_dir = tmp_path / 'repo'
+    (repo_dir / 'src').mkdir(parents=True)
+    for i in range(12):
+        (repo_dir / 'src' / f'module_{i}.py').write_text(f'def function_{i}():\n    return {i}\n')
+    return repo_dir
+
+
+@pytest.fixture
+def embeddings(monkeypatch):
+    """Disable the shared embedding cache and patch in counting stub embeddings."""
+    monkeypatch.setenv('EMBEDDING_CACHE_MAX_BYTES', '0')
+    embeddings = CountingEmbeddings(dimensions=16, latency_seconds=0.02)
+    with patch(
+        'awslabs.git_repo_research_mcp_server.indexer.get_embedding_model',
+        return_value=embeddings,
+    ):
+        yield embeddings
+
+
+def make_configs(tmp_path, repo_dir, output_path='repo'):
+    """Create the configurations of an indexing job."""
+    index_config = IndexConfig(
+        embedding_model='test-model',
+        index_dir=str(tmp_path / 'indices'),
+        embedding_batch_size=2,
+        embedding_max_concurrency=1,
+    )
+    repository_config = RepositoryConfig(
+        repository_path=str(repo_dir),
+        output_path=output_path,
+        include_patterns=['**/*.py'],
+        exclude_patterns=[],
+    )
+    return index_config, repository_config
+
+
+async def wait_for(condition, timeout=10.0):
+    """Wait until a condition holds."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, 'timed out'
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_job_runs_in_background(tmp_path, repo_dir, embeddings):
+    """Test that a submitted job returns at once and records its stages and result."""
+    manager = IndexingJobManager(str(tmp_path / 'jobs'))
+    stages = []
+    original_set_stage = manager._set_stage
+    manager._set_stage = lambda job, stage: (stages.append(stage), original_set_stage(job, stage))
+
+    job = manager.submit(*make_configs(tmp_path, repo_dir))
+    assert job.status == IndexingJobStatus.QUEUED
+
+    await wait_for(lambda: job.status == IndexingJobStatus.SUCCEEDED)
+    assert job.stage == IndexingStage.DONE
+    assert job.progress_percent == 100.0
+    assert job.result.chunk_count == 12
+    assert stages == [
+        IndexingStage.PREPARING,
+        IndexingStage.INDEXING,
+        IndexingStage.SNAPSHOTTING,
+        IndexingStage.SAVING,
+        IndexingStage.FINALIZING,
+    ]
+    assert (tmp_path / 'indices' / 'repo' / 'index.faiss').exists()
+    assert not os.path.exists(manager.checkpoint_path(job.job_id))
+    with open(tmp_path / 'jobs' / f'{job.job_id}.json') as f:
+        assert json.load(f)['status'] == 'succeeded'
+
+
+@pytest.mark.asyncio
+async def test_worker_limit(tmp_path, repo_dir, embeddings):
+    """Test that jobs beyond the worker limit wait in the queue."""
+    manager = IndexingJobManager(str(tmp_path / 'jobs'), max_workers=1)
+
+    first = manager.submit(*make_configs(tmp_path, repo_dir, 'first'))
+    second = manager.submit(*make_configs(tmp_path, repo_dir, 'second'))
+    await wait_for(lambda: first.status == IndexingJobStatus.RUNNING)
+    assert second.status == IndexingJobStatus.QUEUED
+
+    await wait_for(lambda: second.status == IndexingJobStatus.SUCCEEDED)
+    assert first.status == IndexingJobStatus.SUCCEEDED
+    assert second.started_at >= first.finished_at
+
+
+@pytest.mark.asyncio
+async def test_cancel_and_resume_from_checkpoint(tmp_path, repo_dir, embeddings):
+    """Test that a cancelled job resumes without embedding its completed batches again."""
+    manager = IndexingJobManager(str(tmp_path / 'jobs'))
+    job = manager.submit(*make_configs(tmp_path, repo_dir))
+    # With one batch of two chunks in flight, at least two batches are checkpointed by then
+    await wait_for(lambda: embeddings.embedded_texts >= 6)
+
+    cancelled = await manager.cancel(job.job_id)
+    assert cancelled.status == IndexingJobStatus.CANCELLED
+    assert os.path.exists(manager.checkpoint_path(job.job_id))
+    embedded_before_cancel = embeddings.embedded_texts
+    assert embedded_before_cancel < 12
+
+    manager.resume(job.job_id)
+    await wait_for(lambda: job.status == IndexingJobStatus.SUCCEEDED)
+
+    assert job.attempts == 2
+    assert job.checkpointed_chunks >= 4
+    assert embeddings.embedded_texts - embedded_before_cancel == 12 - job.checkpointed_chunks
+    assert job.result.chunk_count == 12
+
+
+def test_restart_marks_unfinished_jobs_interrupted(tmp_path, repo_dir):
+    """Test that jobs running when the server stopped are marked as interrupted."""
+    jobs_dir = tmp_path / 'jobs'
+    jobs_dir.mkdir()
+    index_config, repository_config = make_configs(tmp_path, repo_dir)
+    (jobs_dir / 'abc.json').write_text(
+        json.dumps(
+            {
+                'job_id': 'abc',
+                'repository_path': str(repo_dir),
+                'status': 'running',
+                'stage': 'indexing',
+                'created_at': datetime.now().isoformat(),
+                'index_config': index_config.model_dump(mode='json'),
+                'repository_config': repository_config.model_dump(mode='json'),
+            }
+        )
+    )
+
+    manager = IndexingJobManager(str(jobs_dir), history_max=1)
+
+    assert manager.get('abc').status == IndexingJobStatus.INTERRUPTED
+    assert json.loads((jobs_dir / 'abc.json').read_text())['status'] == 'interrupted'
+
+
+@pytest.mark.asyncio
+async def test_job_tools(tmp_path, repo_dir, embeddings):
+    """Test submitting, following, cancelling and resuming a job through the server."""
+    manager = IndexingJobManager(str(tmp_path / 'jobs'))
+    ctx = MagicMock()
+    ctx.error = AsyncMock()
+    with patch(
+        'awslabs.git_repo_research_mcp_server.server.get_job_manager', return_value=manager
+    ):
+        submitted = await mcp_submit_indexing_job(
+            ctx,
+            repository_path=str(repo_dir),
+            output_path='tools',
+            embedding_model='test-model',
+            include_patterns=['**/*.py'],
+            exclude_patterns=[],
+            chunk_size=1000,
+            chunk_overlap=200,
+            incremental=False,
+            clone_depth=1,
+            clone_filter=None,
+            sparse_checkout=False,
+        )
+        assert submitted['status'] == 'queued'
+
+        cancelled = await mcp_cancel_indexing_job(ctx, job_id=submitted['job_id'])
+        assert cancelled['status'] == 'cancelled'
+
+        resumed = await mcp_resume_indexing_job(ctx, job_id=submitted['job_id'])
+        assert resumed['status'] == 'queued'
+        await wait_for(
+            lambda: manager.get(submitted['job_id']).status == IndexingJobStatus.SUCCEEDED
+        )
+
+        status = json.loads(await indexing_job_status(submitted['job_id']))
+        assert status['stage'] == 'done'
+        assert status['result']['repository_name'] == 'tools'
+
+        missing = json.loads(await indexing_job_status('missing'))
+        assert missing['status'] == 'error'
+        assert (await mcp_resume_indexing_job(ctx, job_id='missing'))['status'] == 'error'
@@ -0,0 +1,196 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Tests for lexical and hybrid search in Git Repository Research MCP Server."""
+
+import asyncio
+import os
+import pytest
+from awslabs.git_repo_research_mcp_server.defaults import Constants
+from awslabs.git_repo_research_mcp_server.embeddings import StubEmbeddings
+from awslabs.git_repo_research_mcp_server.indexer import (
+    IndexConfig,
+    RepositoryConfig,
+    RepositoryIndexer,
+)
+from awslabs.git_repo_research_mcp_server.lexical_index import (
+    LexicalIndex,
+    build_lexical_index,
+    load_lexical_index,
+    reciprocal_rank_fusion,
+    tokenize,
+)
+from awslabs.git_repo_research_mcp_server.models import SearchMode
+from awslabs.git_repo_research_mcp_server.search import RepositorySearcher
+from unittest.mock import MagicMock, patch
+
+
+DOCUMENTS = [
+    ('0', 'def get_repository_indexer(config):\n    return RepositoryIndexer(config)\n'),
+    ('1', 'The indexer builds a FAISS index for each repository.\n'),
+    ('2', "raise ValueError('Index or chunk map not found')\n"),
+    ('3', 'max_pool_connections = 32\n'),
+]
+
+
+@pytest.fixture
+def embeddings():
+    """Create stub embeddings that count query embeddings."""
+    stub = StubEmbeddings(dimensions=16)
+    stub.embed_query = MagicMock(side_effect=stub.embed_query)
+    return stub
+
+
+@pytest.fixture
+def searcher(tmp_path, embeddings):
+    """Index a small repository and create a searcher over it."""
+    repo_dir = tmp_path / 'lexical_repo'
+    repo_dir.mkdir()
+    for doc_id, text in DOCUMENTS:
+        (repo_dir / f'file_{doc_id}.py').write_text(text)
+
+    with (
+        patch(
+            'awslabs.git_repo_research_mcp_server.search.get_embedding_model',
+            return_value=embeddings,
+        ),
+        patch(
+            'awslabs.git_repo_research_mcp_server.indexer.get_embedding_model',
+            return_value=embeddings,
+        ),
+    ):
+        indexer = RepositoryIndexer(
+            IndexConfig(embedding_model='test-model', index_dir=str(tmp_path / 'indices'))
+        )
+        result = asyncio.run(
+            indexer.index_repository(
+                RepositoryConfig(
+                    repository_path=str(repo_dir), include_patterns=['*.py'], exclude_patterns=[]
+                )
+            )
+        )
+        assert result.status == 'success'
+        return RepositorySearcher(
+            embedding_model='test-model', index_dir=str(tmp_path / 'indices')
+        )
+
+
+def test_tokenize_splits_identifiers():
+    """Test that identifiers are kept whole and split into their parts."""
+    assert tokenize('getRepositoryIndexer(max_pool) HTTPServer') == [
+        'getrepositoryindexer',
+        'get',
+        'repository',
+        'indexer',
+        'max_pool',
+        'max',
+        'pool',
+        'httpserver',
+        'http',
+        'server',
+    ]
+
+
+def test_bm25_ranks_exact_identifier_first():
+    """Test that a chunk containing the exact identifier ranks first."""
+    index = LexicalIndex.build(DOCUMENTS)
+
+    hits = index.search('get_repository_indexer', k=10)
+
+    assert hits[0][0] == '0'
+    assert hits[0][1] > hits[1][1] > 0
+    assert index.search('max_pool_connections', k=1)[0][0] == '3'
+    assert index.search('no such term', k=10) == []
+
+
+def test_bm25_top_k():
+    """Test that only the best k documents are returned."""
+    index = LexicalIndex.build((str(i), 'common ' * (i + 1)) for i in range(20))
+
+    hits = index.search('common', k=3)
+
+    assert len(hits) == 3
+    assert [score for _, score in hits] == sorted((score for _, score in hits), reverse=True)
+
+
+def test_lexical_index_round_trip(tmp_path):
+    """Test saving and loading a lexical index without pickle."""
+    built = build_lexical_index(DOCUMENTS, str(tmp_path))
+
+    loaded = load_lexical_index(str(tmp_path))
+
+    assert os.path.exists(tmp_path / Constants.LEXICAL_INDEX_FILENAME)
+    assert loaded is not None
+    assert loaded is load_lexical_index(str(tmp_path))
+    assert loaded.search('ValueError', k=5) == built.search('ValueError', k=5)
+    assert load_lexical_index(str(tmp_path / 'missing')) is None
+
+
+def test_reciprocal_rank_fusion():
+    """Test that items ranked well by both rankings come first."""
+    fused = reciprocal_rank_fusion([['a', 'b', 'c'], ['b', 'a', 'd']], k=60)
+
+    assert [key for key, _ in fused][:2] in (['a', 'b'], ['b', 'a'])
+    assert [key for key, _ in fused][2:] == ['c', 'd']
+    assert fused[0][1] == pytest.approx(1 / 61 + 1 / 62)
+
+
+def test_lexical_search_makes_no_embedding_call(searcher, embeddings):
+    """Test that lexical search answers without embedding the query."""
+    response = searcher.search(
+        'lexical_repo', 'Index or chunk map not found', limit=2, mode=SearchMode.LEXICAL
+    )
+
+    embeddings.embed_query.assert_not_called()
+    assert response.results[0].file_path == 'file_2.py'
+    assert response.results[0].score == pytest.approx(1.0)
+    assert response.results[0].metadata['retrieval'] == 'lexical'
+
+
+def test_hybrid_search_fuses_rankings(searcher, embeddings):
+    """Test that hybrid search finds exact identifiers and records both ranks."""
+    response = searcher.search('lexical_repo', 'max_pool_connections', limit=4)
+
+    embeddings.embed_query.assert_called_once()
+    assert response.results[0].file_path == 'file_3.py'
+    metadata = response.results[0].metadata
+    assert metadata['retrieval'] == 'hybrid'
+    assert metadata['lexical_rank'] == '1'
+    assert 'vector_rank' in metadata
+    assert len(response.results) == 4
+
+
+def test_hybrid_threshold_keeps_vector_only_top_hit(searcher, embeddings):
+    """Test that the threshold filters vector similarity, not the fused rank score."""
+    # The query matches no token of the index, so only vector search finds the chunk
+    embeddings.embed_query = MagicMock(
+        return_value=StubEmbeddings(dimensions=16).embed_query(DOCUMENTS[1][1])
+    )
+
+    response = searcher.search('lexical_repo', 'zzz', limit=4, threshold=0.6)
+
+    top = response.results[0]
+    assert top.file_path == 'file_1.py'
+    assert top.metadata['vector_rank'] == '1'
+    assert 'lexical_rank' not in top.metadata
+    assert all(float(result.metadata['similarity']) >= 0.6 for result in response.results)
+
+
+def test_vector_search_without_lexical_index(searcher):
+    """Test that indices without a lexical index fall back to vector search."""
+    index_path = searcher.repository_indexer._get_index_path('lexical_repo')
+    os.remove(os.path.join(index_path, Constants.LEXICAL_INDEX_FILENAME))
+
+    response = searcher.search(
+        'lexical_repo', 'max_pool_connections = 32\n', limit=1, mode=SearchMode.LEXICAL
+    )
+
+    assert response.results[0].file_path == 'file_3.py'
+    assert 'retrieval' not in response.results[0].metadata
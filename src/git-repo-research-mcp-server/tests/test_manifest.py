@@ -0,0 +1,195 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Tests for the repository manifest in Git Repository Research MCP Server."""
+
+import asyncio
+import json
+import pytest
+from awslabs.git_repo_research_mcp_server.defaults import Constants
+from awslabs.git_repo_research_mcp_server.embeddings import StubEmbeddings
+from awslabs.git_repo_research_mcp_server.indexer import (
+    IndexConfig,
+    RepositoryConfig,
+    RepositoryIndexer,
+)
+from awslabs.git_repo_research_mcp_server.manifest import (
+    build_manifest,
+    get_tree_page,
+    load_manifest,
+    save_manifest,
+)
+from awslabs.git_repo_research_mcp_server.search import RepositorySearcher
+from awslabs.git_repo_research_mcp_server.server import (
+    mcp_list_repository_files,
+    repository_summary,
+)
+from unittest.mock import MagicMock, patch
+
+
+FILES = {
+    'README.md': '# Project\n',
+    'docs/guide.md': 'Guide\n',
+    'docs/api/readme.txt': 'API\n',
+    'src/app.py': 'print("app")\n',
+    'src/util.py': '',
+    '.hidden/secret.txt': 'hidden\n',
+}
+
+
+@pytest.fixture
+def repo_files(tmp_path):
+    """Create a repository directory with nested files."""
+    repo_files_path = tmp_path / 'repository'
+    for path, content in FILES.items():
+        (repo_files_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (repo_files_path / path).write_text(content)
+    return repo_files_path
+
+
+def test_build_manifest(repo_files):
+    """Test that entries are listed in tree order with sizes and types."""
+    manifest = build_manifest(str(repo_files), 'test_repo')
+
+    assert manifest.paths == [
+        'README.md',
+        'docs',
+        'docs/api',
+        'docs/api/readme.txt',
+        'docs/guide.md',
+        'src',
+        'src/app.py',
+        'src/util.py',
+    ]
+    assert manifest.is_directory == [False, True, True, False, False, True, False, False]
+    assert manifest.sizes[manifest.paths.index('docs')] == len('API\n') + len('Guide\n')
+    assert manifest.total_bytes == sum(
+        len(content) for path, content in FILES.items() if not path.startswith('.')
+    )
+    assert manifest.file_count == 5
+    assert manifest.directory_count == 3
+    assert manifest.readme_files == ['README.md', 'docs/api/readme.txt']
+
+
+def test_tree_page_rendering(repo_files):
+    """Test that the tree is drawn with the directory tree format."""
+    page = get_tree_page(build_manifest(str(repo_files), 'test_repo'))
+
+    assert page.tree == (
+        'Directory structure:\n'
+        '└── repository/\n'
+        '    ├── README.md\n'
+        '    ├── docs/\n'
+        '    │    ├── api/\n'
+        '    │    │    └── readme.txt\n'
+        '    │    └── guide.md\n'
+        '    └── src/\n'
+        '        ├── app.py\n'
+        '        └── util.py\n'
+    )
+    assert page.total_entries == 8
+    assert page.next_offset is None
+
+
+def test_tree_page_prefix_depth_and_pagination(repo_files):
+    """Test path prefix, depth and page limits."""
+    manifest = build_manifest(str(repo_files), 'test_repo')
+
+    top_level = get_tree_page(manifest, max_depth=1)
+    assert [entry.path for entry in top_level.entries] == ['README.md', 'docs', 'src']
+    assert top_level.entries[1].type == 'directory'
+
+    docs = get_tree_page(manifest, path_prefix='docs/')
+    assert docs.path_prefix == 'docs'
+    assert [entry.path for entry in docs.entries] == [
+        'docs/api',
+        'docs/api/readme.txt',
+        'docs/guide.md',
+    ]
+    assert docs.tree.startswith('Directory structure:\n└── docs/\n    ├── api/\n')
+    assert docs.readme_files == ['docs/api/readme.txt']
+
+    first = get_tree_page(manifest, limit=3)
+    second = get_tree_page(manifest, offset=first.next_offset, limit=3)
+    last = get_tree_page(manifest, offset=second.next_offset, limit=3)
+    assert first.next_offset == 3
+    assert second.next_offset == 6
+    assert last.next_offset is None
+    assert [entry.path for page in (first, second, last) for entry in page.entries] == (
+        manifest.paths
+    )
+
+
+def test_manifest_round_trip(tmp_path, repo_files):
+    """Test saving and loading a manifest."""
+    manifest = build_manifest(str(repo_files), 'test_repo')
+    save_manifest(manifest, str(tmp_path))
+
+    loaded = load_manifest(str(tmp_path))
+
+    assert loaded == manifest
+    assert load_manifest(str(tmp_path)) is loaded
+    assert load_manifest(str(tmp_path / 'missing')) is None
+
+
+def test_manifest_written_at_index_time(tmp_path, repo_files):
+    """Test that indexing saves the manifest and the summary serves it without walking files."""
+    stub = StubEmbeddings(dimensions=16)
+    with (
+        patch(
+            'awslabs.git_repo_research_mcp_server.indexer.get_embedding_model',
+            return_value=stub,
+        ),
+        patch(
+            'awslabs.git_repo_research_mcp_server.search.get_embedding_model',
+            return_value=stub,
+        ),
+    ):
+        index_dir = tmp_path / 'indices'
+        indexer = RepositoryIndexer(
+            IndexConfig(embedding_model='test-model', index_dir=str(index_dir))
+        )
+        result = asyncio.run(
+            indexer.index_repository(
+                RepositoryConfig(
+                    repository_path=str(repo_files),
+                    include_patterns=['**/*.md', '**/*.py'],
+                    exclude_patterns=[],
+                )
+            )
+        )
+        assert result.status == 'success'
+        assert (index_dir / 'repository' / Constants.MANIFEST_FILENAME).exists()
+
+        searcher = RepositorySearcher(embedding_model='test-model', index_dir=str(index_dir))
+        with (
+            patch(
+                'awslabs.git_repo_research_mcp_server.server.get_repository_searcher',
+                return_value=searcher,
+            ),
+            patch('os.scandir', side_effect=AssertionError('walked the repository')),
+        ):
+            summary = json.loads(asyncio.run(repository_summary(repository_name='repository')))
+            page = asyncio.run(
+                mcp_list_repository_files(
+                    MagicMock(),
+                    repository_name='repository',
+                    path_prefix='src',
+                    max_depth=None,
+                    offset=0,
+                    limit=1,
+                )
+            )
+
+    assert summary['status'] == 'success'
+    assert summary['total_entries'] == 8
+    assert summary['helpful_files'] == ['repository/README.md', 'repository/docs/api/readme.txt']
+    assert [entry['path'] for entry in page['entries']] == ['src/app.py']
+    assert page['next_offset'] == 1
@@ -0,0 +1,143 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Tests for searching several repositories in Git Repository Research MCP Server."""
+
+import asyncio
+import pytest
+from awslabs.git_repo_research_mcp_server.embeddings import StubEmbeddings
+from awslabs.git_repo_research_mcp_server.indexer import (
+    IndexConfig,
+    RepositoryConfig,
+    RepositoryIndexer,
+)
+from awslabs.git_repo_research_mcp_server.search import RepositorySearcher
+from awslabs.git_repo_research_mcp_server.server import mcp_search_repositories
+from unittest.mock import AsyncMock, MagicMock, patch
+
+
+@pytest.fixture
+def embeddings():
+    """Create stub embeddings that count query embeddings."""
+    stub = StubEmbeddings(dimensions=16)
+    stub.embed_query = MagicMock(side_effect=stub.embed_query)
+    return stub
+
+
+@pytest.fixture
+def index_dir(tmp_path, embeddings):
+    """Index two small repositories with stub embeddings."""
+    index_dir = tmp_path / 'indices'
+    with patch(
+        'awslabs.git_repo_research_mcp_server.indexer.get_embedding_model',
+        return_value=embeddings,
+    ):
+        indexer = RepositoryIndexer(
+            IndexConfig(embedding_model='test-model', index_dir=str(index_dir))
+        )
+        for name, files in {
+            'alpha': {'retry.py': 'MAX_RETRIES = 3\n', 'alpha.py': 'ALPHA = 1\n'},
+            'beta': {'beta.py': 'BETA = 2\n'},
+        }.items():
+            repo_dir = tmp_path / name
+            repo_dir.mkdir()
+            for filename, content in files.items():
+                (repo_dir / filename).write_text(content)
+            result = asyncio.run(
+                indexer.index_repository(
+                    RepositoryConfig(
+                        repository_path=str(repo_dir),
+                        include_patterns=['*.py'],
+                        exclude_patterns=[],
+                    )
+                )
+            )
+            assert result.status == 'success'
+    return index_dir
+
+
+@pytest.fixture
+def searcher(index_dir, embeddings):
+    """Create a searcher over the test indices."""
+    with (
+        patch(
+            'awslabs.git_repo_research_mcp_server.search.get_embedding_model',
+            return_value=embeddings,
+        ),
+        patch(
+            'awslabs.git_repo_research_mcp_server.indexer.get_embedding_model',
+            return_value=embeddings,
+        ),
+    ):
+        return RepositorySearcher(embedding_model='test-model', index_dir=str(index_dir))
+
+
+def test_search_all_repositories(searcher, embeddings):
+    """Test that all indexed repositories are searched with one query embedding."""
+    embeddings.embed_query.reset_mock()
+
+    response = searcher.search_repositories('MAX_RETRIES = 3\n', limit=2)
+
+    embeddings.embed_query.assert_called_once()
+    assert sorted(timing.repository_name for timing in response.repositories) == [
+        'alpha',
+        'beta',
+    ]
+    assert all(timing.status == 'success' for timing in response.repositories)
+    assert response.total_results == 2
+    assert response.results[0].repository_name == 'alpha'
+    assert response.results[0].file_path == 'retry.py'
+    assert response.results[0].score == pytest.approx(1.0)
+    assert response.results[0].score >= response.results[1].score
+
+
+def test_search_selected_repositories(searcher):
+    """Test searching a selected repository and applying the threshold."""
+    response = searcher.search_repositories('BETA = 2\n', repositories=['beta'], threshold=0.99)
+
+    assert [timing.repository_name for timing in response.repositories] == ['beta']
+    assert [result.file_path for result in response.results] == ['beta.py']
+
+
+def test_search_repositories_reports_failures(searcher, index_dir):
+    """Test that a missing index is reported without failing the other searches."""
+    response = searcher.search_repositories('ALPHA = 1\n', repositories=['alpha', 'missing'])
+
+    statuses = {timing.repository_name: timing.status for timing in response.repositories}
+    assert statuses == {'alpha': 'success', 'missing': 'error'}
+    assert response.results[0].file_path == 'alpha.py'
+
+
+def test_search_repositories_skips_other_embedding_models(searcher):
+    """Test that indices built with another embedding model are skipped."""
+    searcher.embedding_model = 'other-model'
+
+    response = searcher.search_repositories('ALPHA = 1\n')
+
+    assert {timing.status for timing in response.repositories} == {'skipped'}
+    assert response.results == []
+
+
+@pytest.mark.asyncio
+async def test_mcp_search_repositories(searcher):
+    """Test the multi-repository search tool."""
+    ctx = MagicMock()
+    ctx.error = AsyncMock()
+    with patch(
+        'awslabs.git_repo_research_mcp_server.server.get_repository_searcher',
+        return_value=searcher,
+    ):
+        response = await mcp_search_repositories(
+            ctx, query='BETA = 2\n', repositories=None, limit=1, threshold=0.0
+        )
+
+    assert response['total_results'] == 1
+    assert response['results'][0]['repository_name'] == 'beta'
+    assert len(response['repositories']) == 2
@@ -0,0 +1,192 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Tests for the query embedding cache and batched search in Git Repository Research MCP Server."""
+
+import asyncio
+import json
+import pytest
+from awslabs.git_repo_research_mcp_server.embeddings import StubEmbeddings
+from awslabs.git_repo_research_mcp_server.indexer import (
+    IndexConfig,
+    RepositoryConfig,
+    RepositoryIndexer,
+)
+from awslabs.git_repo_research_mcp_server.query_cache import (
+    CachedQueryEmbeddings,
+    QueryEmbeddingCache,
+    embed_queries,
+    get_query_cache,
+    normalize_query,
+)
+from awslabs.git_repo_research_mcp_server.search import RepositorySearcher
+from awslabs.git_repo_research_mcp_server.server import (
+    mcp_search_repository_batch,
+    query_cache_stats,
+)
+from unittest.mock import AsyncMock, MagicMock, patch
+
+
+@pytest.fixture
+def embeddings():
+    """Create stub embeddings that count query embeddings."""
+    stub = StubEmbeddings(dimensions=16)
+    stub.embed_query = MagicMock(side_effect=stub.embed_query)
+    return stub
+
+
+@pytest.fixture
+def searcher(tmp_path, embeddings):
+    """Index a small repository and create a searcher over it."""
+    repo_dir = tmp_path / 'batch_repo'
+    repo_dir.mkdir()
+    for i in range(5):
+        (repo_dir / f'module_{i}.py').write_text(f'VALUE_{i} = {i}\n')
+
+    with (
+        patch(
+            'awslabs.git_repo_research_mcp_server.search.get_embedding_model',
+            return_value=embeddings,
+        ),
+        patch(
+            'awslabs.git_repo_research_mcp_server.indexer.get_embedding_model',
+            return_value=embeddings,
+        ),
+    ):
+        indexer = RepositoryIndexer(
+            IndexConfig(embedding_model='test-model', index_dir=str(tmp_path / 'indices'))
+        )
+        result = asyncio.run(
+            indexer.index_repository(
+                RepositoryConfig(
+                    repository_path=str(repo_dir), include_patterns=['*.py'], exclude_patterns=[]
+                )
+            )
+        )
+        assert result.status == 'success'
+        return RepositorySearcher(
+            embedding_model='test-model', index_dir=str(tmp_path / 'indices')
+        )
+
+
+def test_normalize_query():
+    """Test that formatting differences share a cache key."""
+    assert normalize_query('  How does   AUTH\twork?\n') == 'how does auth work?'
+    assert normalize_query('ｆｕｌｌ width') == 'full width'
+
+
+def test_query_cache_lru_and_ttl():
+    """Test eviction of the least recently used entry and expiry after the time to live."""
+    now = [0.0]
+    cache = QueryEmbeddingCache(max_entries=2, ttl_seconds=10, clock=lambda: now[0])
+
+    cache.put('model', 'a', [1.0])
+    cache.put('model', 'b', [2.0])
+    assert cache.get('model', 'A ') == [1.0]
+    cache.put('model', 'c', [3.0])
+
+    assert cache.get('model', 'b') is None
+    assert cache.get('other-model', 'a') is None
+    now[0] = 11.0
+    assert cache.get('model', 'c') is None
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.expirations) == (1, 3, 1, 1)
+    assert stats.size == 1
+
+
+def test_embed_queries_embeds_each_distinct_query_once(embeddings):
+    """Test that duplicate and cached queries are not embedded again."""
+    first = embed_queries(embeddings, 'test-model', ['alpha', 'Alpha', 'beta'])
+    second = embed_queries(embeddings, 'test-model', ['beta', 'gamma'])
+
+    assert embeddings.embed_query.call_count == 3
+    assert first[0] == first[1] == embeddings.embed_documents(['alpha'])[0]
+    assert second[0] == first[2]
+    assert get_query_cache().stats().hits == 1
+
+
+def test_cached_query_embeddings(embeddings):
+    """Test that the wrapper caches queries and passes documents through."""
+    cached = CachedQueryEmbeddings(embeddings, 'test-model')
+
+    assert cached.embed_query('hello') == cached.embed_query('hello ')
+    assert cached.embed_documents(['hello']) == [embeddings.embed_query('hello')]
+    assert embeddings.embed_query.call_count == 2
+
+
+def test_search_uses_query_cache(searcher, embeddings):
+    """Test that repeating a search does not embed the query again."""
+    first = searcher.search('batch_repo', 'VALUE_1 = 1\n', limit=1)
+    second = searcher.search('batch_repo', 'VALUE_1 = 1\n', limit=1)
+
+    assert embeddings.embed_query.call_count == 1
+    assert first.results[0].file_path == second.results[0].file_path == 'module_1.py'
+
+
+def test_search_batch(searcher, embeddings):
+    """Test that batched queries return one ranked response per query."""
+    responses = searcher.search_batch(
+        'batch_repo', ['VALUE_3 = 3\n', 'VALUE_0 = 0\n', 'VALUE_3 = 3\n'], limit=2
+    )
+
+    assert [response.query for response in responses] == [
+        'VALUE_3 = 3\n',
+        'VALUE_0 = 0\n',
+        'VALUE_3 = 3\n',
+    ]
+    assert [response.results[0].file_path for response in responses] == [
+        'module_3.py',
+        'module_0.py',
+        'module_3.py',
+    ]
+    assert responses[0].results[0].score == pytest.approx(1.0)
+    assert responses[0].results[0].score >= responses[0].results[1].score
+    assert embeddings.embed_query.call_count == 2
+
+
+def test_search_batch_limit_exceeds_index_size(searcher):
+    """Test that padded FAISS results are dropped."""
+    responses = searcher.search_batch('batch_repo', ['VALUE_2 = 2\n'], limit=50)
+
+    assert responses[0].total_results == 5
+
+
+def test_search_batch_missing_index(searcher):
+    """Test that a missing index returns empty responses."""
+    responses = searcher.search_batch('missing', ['query'])
+
+    assert len(responses) == 1
+    assert responses[0].results == []
+
+
+@pytest.mark.asyncio
+async def test_mcp_search_repository_batch(searcher):
+    """Test the batched search tool and the query cache statistics resource."""
+    ctx = MagicMock()
+    ctx.error = AsyncMock()
+    with patch(
+        'awslabs.git_repo_research_mcp_server.server.get_repository_searcher',
+        return_value=searcher,
+    ):
+        response = await mcp_search_repository_batch(
+            ctx,
+            index_path='batch_repo',
+            queries=['VALUE_4 = 4\n', 'VALUE_4 = 4\n'],
+            limit=1,
+            threshold=0.0,
+        )
+
+    assert response['total_queries'] == 2
+    assert response['responses'][1]['results'][0]['file_path'] == 'module_4.py'
+
+    stats = json.loads(await query_cache_stats())
+    assert stats['misses'] == 1
+    assert stats['size'] == 1
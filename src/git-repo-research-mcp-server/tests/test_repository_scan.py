@@ -0,0 +1,139 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Tests for repository file scanning in Git Repository Research MCP Server."""
+
+import fnmatch
+import os
+import pytest
+from awslabs.git_repo_research_mcp_server.defaults import Constants
+from awslabs.git_repo_research_mcp_server.repository import (
+    compile_patterns,
+    get_text_files,
+    matches_file_patterns,
+    process_repository,
+    read_and_chunk_file,
+    scan_repository,
+    walk_repository,
+)
+
+
+@pytest.fixture
+def sample_repo(tmp_path):
+    """Create a sample repository tree."""
+    files = {
+        'README.md': '# Sample\n\nA sample repository.\n',
+        'src/main.py': 'def main():\n    return 1\n' * 50,
+        'src/util/helpers.py': 'HELPER = True\n',
+        'docs/guide.md': 'Guide ' * 400,
+        'node_modules/pkg/index.js': 'module.exports = {};\n',
+        'src/node_modules/pkg/index.js': 'module.exports = {};\n',
+        'build/output.py': 'print("built")\n',
+        'empty.py': '',
+    }
+    for rel_path, content in files.items():
+        path = tmp_path / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    (tmp_path / 'src' / 'binary.py').write_bytes(b'\xff\xfe\x00binary')
+    return tmp_path
+
+
+@pytest.mark.parametrize(
+    'rel_path',
+    [
+        'README.md',
+        'src/main.py',
+        'node_modules/pkg/index.js',
+        'a/node_modules/b.js',
+        'build/x.py',
+        'Dockerfile',
+        'image.png',
+        'deep/dir/file.min.js',
+    ],
+)
+def test_compiled_patterns_match_fnmatch(rel_path):
+    """Test that compiled patterns select the same paths as fnmatch."""
+    for include, exclude in [
+        (Constants.TEXT_FILE_INCLUDE_PATTERNS, Constants.TEXT_FILE_EXCLUDE_PATTERNS),
+        (Constants.DEFAULT_INCLUDE_PATTERNS, Constants.DEFAULT_EXCLUDE_PATTERNS),
+    ]:
+        expected = any(fnmatch.fnmatch(rel_path, p) for p in include) and not any(
+            fnmatch.fnmatch(rel_path, p) for p in exclude
+        )
+        assert matches_file_patterns(rel_path, include, exclude) == expected
+
+
+def test_compile_patterns_empty():
+    """Test that an empty pattern list matches nothing."""
+    assert compile_patterns(()).match('anything') is None
+
+
+def test_walk_repository_prunes_excluded_directories(sample_repo):
+    """Test that excluded directories are skipped without being walked."""
+    files = walk_repository(str(sample_repo), ['*.py', '*.md', '*.js'], ['node_modules/**'])
+    rel_paths = sorted(os.path.relpath(path, sample_repo) for path in files)
+
+    # Only the top-level node_modules directory is excluded by 'node_modules/**'
+    assert 'node_modules/pkg/index.js' not in rel_paths
+    assert 'src/node_modules/pkg/index.js' in rel_paths
+
+
+def test_read_and_chunk_file(sample_repo):
+    """Test reading and chunking a single file."""
+    chunks, bytes_read = read_and_chunk_file(str(sample_repo / 'docs' / 'guide.md'), 1000, 200)
+
+    assert len(chunks) > 1
+    assert bytes_read == len('Guide ' * 400)
+    assert read_and_chunk_file(str(sample_repo / 'empty.py')) is None
+    assert read_and_chunk_file(str(sample_repo / 'src' / 'binary.py')) is None
+    assert read_and_chunk_file(str(sample_repo / 'missing.py')) is None
+
+
+def test_scan_repository_stats(sample_repo):
+    """Test that scanning skips binary and empty files and records statistics."""
+    chunks, chunk_to_file, extension_stats, stats = scan_repository(
+        str(sample_repo),
+        ['*.md', '*.py', '*.js'],
+        ['node_modules/**', '*/node_modules/**', 'build/**'],
+    )
+
+    assert set(chunk_to_file.values()) == {
+        'README.md',
+        'src/main.py',
+        'src/util/helpers.py',
+        'docs/guide.md',
+    }
+    assert extension_stats == {'md': 2, 'py': 2}
+    assert stats.directories_pruned == 3
+    assert stats.files_processed == 4
+    assert stats.bytes_read > 0
+    assert stats.workers == 1
+    assert stats.files_per_second > 0
+    assert len(chunks) >= 4
+
+
+def test_scan_repository_parallel_matches_serial(sample_repo):
+    """Test that processing files in a process pool gives the same result."""
+    serial = scan_repository(str(sample_repo), max_workers=1)
+    parallel = scan_repository(str(sample_repo), max_workers=2, parallel_min_files=0)
+
+    assert parallel[:3] == serial[:3]
+    assert parallel[3].workers == 2
+
+
+def test_process_repository_matches_get_text_files(sample_repo):
+    """Test that process_repository chunks exactly the text files."""
+    text_files = get_text_files(str(sample_repo))
+    _, chunk_to_file, _ = process_repository(str(sample_repo))
+
+    assert set(chunk_to_file.values()) == {
+        os.path.relpath(path, sample_repo) for path in text_files
+    }
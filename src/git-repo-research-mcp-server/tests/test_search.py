@@ -130,44 +130,44 @@ def test_repository_searcher_init():
         mock_get_indexer.assert_called_once()
 
 
-def test_list_repository_files_success():
+def test_list_repository_files_success(tmp_path):
     """Test the list_repository_files method with a successful case."""
     with (
         patch('awslabs.git_repo_research_mcp_server.search.get_embedding_model'),
         patch('awslabs.git_repo_research_mcp_server.search.get_repository_indexer'),
-        patch('os.path.exists') as mock_exists,
-        patch('os.path.isdir') as mock_isdir,
-        patch('os.listdir') as mock_listdir,
     ):
-        # Configure the mocks
-        mock_indexer = MagicMock()
-        mock_indexer._get_index_path.return_value = '/tmp/index/test_repo'
+        # Create a repository directory in the index
+        index_path = tmp_path / 'test_repo'
+        (index_path / 'repository' / 'src').mkdir(parents=True)
+        (index_path / 'repository' / 'README.md').write_text('readme')
+        (index_path / 'repository' / 'src' / 'main.py').write_text('print(1)')
+        (index_path / 'repository' / 'src' / 'utils.py').write_text('')
 
-        mock_exists.return_value = True
-        mock_isdir.return_value = True
-
-        # Mock directory structure
-        mock_listdir.side_effect = lambda path: {
-            '/tmp/index/test_repo/repository': ['src', 'README.md'],
-            '/tmp/index/test_repo/repository/src': ['main.py', 'utils.py'],
-        }[path]
+        mock_indexer = MagicMock()
+        mock_indexer._get_index_path.return_value = str(index_path)
 
         # Create a RepositorySearcher instance with the mock indexer
         searcher = RepositorySearcher()
         searcher.repository_indexer = mock_indexer
 
-        # Mock the _generate_directory_tree method
-        searcher._generate_directory_tree = MagicMock(return_value='Directory tree')
-
         # Call the method
         result = searcher.list_repository_files('test_repo')
 
         # Verify the result
-        assert result == 'Directory tree'
-        mock_indexer._get_index_path.assert_called_once_with('test_repo')
-        searcher._generate_directory_tree.assert_called_once_with(
-            '/tmp/index/test_repo/repository'
+        assert result.tree == (
+            'Directory structure:\n'
+            '└── repository/\n'
+            '    ├── README.md\n'
+            '    └── src/\n'
+            '        ├── main.py\n'
+            '        └── utils.py\n'
         )
+        assert result.readme_files == ['README.md']
+        assert result.total_entries == 4
+        mock_indexer._get_index_path.assert_called_once_with('test_repo')
+
+        # The manifest of an older index is built on first use and saved
+        assert (index_path / 'manifest.json').exists()
 
 
 def test_list_repository_files_not_found():
@@ -202,58 +202,23 @@ def test_list_repository_files_exception():
     with (
         patch('awslabs.git_repo_research_mcp_server.search.get_embedding_model'),
         patch('awslabs.git_repo_research_mcp_server.search.get_repository_indexer'),
-        patch('os.path.exists') as mock_exists,
-        patch('os.path.isdir') as mock_isdir,
         patch('loguru.logger.error') as mock_logger_error,
     ):
-        # Configure the mocks
-        mock_indexer = MagicMock()
-        mock_indexer._get_index_path.return_value = '/tmp/index/test_repo'
-
-        mock_exists.return_value = True
-        mock_isdir.return_value = True
-
-        # Create a RepositorySearcher instance with the mock indexer
+        # Create a RepositorySearcher instance
         searcher = RepositorySearcher()
-        searcher.repository_indexer = mock_indexer
 
-        # Mock the _generate_directory_tree method to raise an exception
-        searcher._generate_directory_tree = MagicMock(side_effect=Exception('Test exception'))
+        # Mock the get_repository_manifest method to raise an exception
+        searcher.get_repository_manifest = MagicMock(side_effect=Exception('Test exception'))
 
         # Call the method
         result = searcher.list_repository_files('test_repo')
 
         # Verify the result
         assert result is None
-        mock_indexer._get_index_path.assert_called_once_with('test_repo')
+        searcher.get_repository_manifest.assert_called_once_with('test_repo')
         mock_logger_error.assert_called_once()
 
 
-def test_generate_directory_tree():
-    """Test the _generate_directory_tree method."""
-    with (
-        patch('awslabs.git_repo_research_mcp_server.search.get_embedding_model'),
-        patch('awslabs.git_repo_research_mcp_server.search.get_repository_indexer'),
-        patch('os.path.basename') as mock_basename,
-    ):
-        # Configure the mocks
-        mock_basename.return_value = 'test_repo'
-
-        # Create a RepositorySearcher instance
-        searcher = RepositorySearcher()
-
-        # Mock the _generate_tree method
-        searcher._generate_tree = MagicMock(return_value='    └── file.txt\n')
-
-        # Call the method
-        result = searcher._generate_directory_tree('/tmp/index/test_repo')
-
-        # Verify the result
-        assert result == 'Directory structure:\n└── test_repo/\n    └── file.txt\n'
-        mock_basename.assert_called_once_with('/tmp/index/test_repo')
-        searcher._generate_tree.assert_called_once_with('/tmp/index/test_repo', '', 'test_repo')
-
-
 def test_search_with_repository_name():
     """Test the search method with a repository name."""
     with (
@@ -0,0 +1,168 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Tests for deduplicated repository snapshots in Git Repository Research MCP Server."""
+
+import errno
+import os
+import pytest
+from awslabs.git_repo_research_mcp_server.embeddings import StubEmbeddings
+from awslabs.git_repo_research_mcp_server.indexer import (
+    IndexConfig,
+    RepositoryConfig,
+    RepositoryIndexer,
+)
+from awslabs.git_repo_research_mcp_server.models import StorageMode
+from awslabs.git_repo_research_mcp_server.snapshot_store import (
+    benchmark_storage_modes,
+    get_blob_store,
+    get_disk_usage,
+    snapshot_directory,
+    store_file,
+)
+from awslabs.git_repo_research_mcp_server.utils import (
+    delete_indexed_repository,
+    load_metadata,
+)
+from unittest.mock import patch
+
+
+FILES = {
+    'README.md': '# Snapshot\n',
+    'src/a.py': 'def a():\n    return 1\n' * 50,
+    'src/copy_of_a.py': 'def a():\n    return 1\n' * 50,
+    '.git/HEAD': 'ref: refs/heads/main\n',
+}
+
+
+@pytest.fixture
+def repo_dir(tmp_path):
+    """Create a repository directory with a duplicated file."""
+    repo_dir = tmp_path / 'repo'
+    for path, content in FILES.items():
+        (repo_dir / path).parent.mkdir(parents=True, exist_ok=True)
+        (repo_dir / path).write_text(content)
+    return repo_dir
+
+
+def test_snapshots_share_blobs(tmp_path, repo_dir):
+    """Test that identical contents are stored once across files and snapshots."""
+    blob_store = get_blob_store(str(tmp_path / 'indices'))
+
+    first = snapshot_directory(str(repo_dir), str(tmp_path / 'one'), blob_store)
+    second = snapshot_directory(str(repo_dir), str(tmp_path / 'two'), blob_store)
+
+    assert first.storage_mode == 'blobs'
+    assert first.file_count == 3
+    assert not (tmp_path / 'one' / '.git').exists()
+    assert (first.stored_files, first.linked_files) == (2, 1)
+    assert (second.stored_files, second.linked_files) == (0, 3)
+    assert second.bytes_written == 0
+    assert second.bytes_deduplicated == second.total_bytes
+    assert (tmp_path / 'two' / 'src' / 'a.py').read_text() == FILES['src/a.py']
+    assert os.path.samefile(tmp_path / 'one' / 'src' / 'a.py', tmp_path / 'two' / 'src' / 'a.py')
+
+    blob_bytes = get_disk_usage(blob_store.root)
+    assert blob_bytes == len(FILES['README.md']) + len(FILES['src/a.py'])
+    assert get_disk_usage(str(tmp_path)) == blob_bytes + sum(
+        len(content) for content in FILES.values()
+    )
+
+
+def test_updates_do_not_write_through_shared_blobs(tmp_path, repo_dir):
+    """Test that updating a snapshot file leaves other snapshots unchanged."""
+    blob_store = get_blob_store(str(tmp_path / 'indices'))
+    snapshot_directory(str(repo_dir), str(tmp_path / 'one'), blob_store)
+    stats = snapshot_directory(str(repo_dir), str(tmp_path / 'two'), blob_store)
+
+    (repo_dir / 'README.md').write_text('# Changed\n')
+    store_file(str(repo_dir / 'README.md'), str(tmp_path / 'two' / 'README.md'), blob_store, stats)
+
+    assert (tmp_path / 'one' / 'README.md').read_text() == '# Snapshot\n'
+    assert (tmp_path / 'two' / 'README.md').read_text() == '# Changed\n'
+
+
+def test_prune_removes_unused_blobs(tmp_path, repo_dir):
+    """Test that blobs are removed once no snapshot links to them."""
+    blob_store = get_blob_store(str(tmp_path / 'indices'))
+    snapshot_directory(str(repo_dir), str(tmp_path / 'one'), blob_store)
+    snapshot_directory(str(repo_dir), str(tmp_path / 'two'), blob_store)
+
+    os.remove(tmp_path / 'one' / 'README.md')
+    assert blob_store.prune() == 0
+
+    os.remove(tmp_path / 'two' / 'README.md')
+    assert blob_store.prune() == len(FILES['README.md'])
+    assert get_disk_usage(blob_store.root) == len(FILES['src/a.py'])
+
+
+def test_copy_fallback_when_links_are_not_supported(tmp_path, repo_dir):
+    """Test that files are copied when the file system cannot link them."""
+    blob_store = get_blob_store(str(tmp_path / 'indices'))
+    with patch(
+        'awslabs.git_repo_research_mcp_server.snapshot_store.os.link',
+        side_effect=OSError(errno.EXDEV, 'Invalid cross-device link'),
+    ):
+        stats = snapshot_directory(str(repo_dir), str(tmp_path / 'one'), blob_store)
+
+    assert stats.copied_files == 3
+    assert stats.bytes_written == stats.total_bytes
+    assert (tmp_path / 'one' / 'src' / 'copy_of_a.py').read_text() == FILES['src/copy_of_a.py']
+    assert get_disk_usage(blob_store.root) == 0
+
+
+def test_benchmark_storage_modes(tmp_path, repo_dir):
+    """Test that the benchmark reports the disk space of each storage mode."""
+    results = {
+        result.storage_mode: result
+        for result in benchmark_storage_modes(str(repo_dir), str(tmp_path / 'work'))
+    }
+
+    assert results[StorageMode.COPY].file_count == 3
+    assert results[StorageMode.COPY].disk_bytes == 2 * sum(
+        len(content) for path, content in FILES.items() if not path.startswith('.git')
+    )
+    assert results[StorageMode.BLOBS].disk_bytes < results[StorageMode.COPY].disk_bytes / 2
+
+
+@pytest.mark.asyncio
+async def test_indices_share_snapshot_blobs(tmp_path, repo_dir):
+    """Test that indexing a repository twice stores its files once."""
+    index_dir = tmp_path / 'indices'
+    with patch(
+        'awslabs.git_repo_research_mcp_server.indexer.get_embedding_model',
+        return_value=StubEmbeddings(dimensions=16),
+    ):
+        indexer = RepositoryIndexer(
+            IndexConfig(embedding_model='test-model', index_dir=str(index_dir))
+        )
+        for output_path in ('first', 'fork'):
+            result = await indexer.index_repository(
+                RepositoryConfig(
+                    repository_path=str(repo_dir),
+                    output_path=output_path,
+                    include_patterns=['**/*.md', '**/*.py'],
+                    exclude_patterns=[],
+                )
+            )
+            assert result.status == 'success', result.message
+
+    first = load_metadata(str(index_dir / 'first' / 'metadata.json'))
+    fork = load_metadata(str(index_dir / 'fork' / 'metadata.json'))
+    assert first.snapshot_stats.stored_files == 2
+    assert fork.snapshot_stats.linked_files == 3
+    assert fork.snapshot_stats.bytes_written == 0
+    # Snapshot files stored in the shared blob store are not counted in the index size
+    assert fork.index_size_bytes < first.index_size_bytes + fork.snapshot_stats.total_bytes
+
+    await delete_indexed_repository('first', str(index_dir))
+    assert (index_dir / 'fork' / 'repository' / 'src' / 'a.py').read_text() == FILES['src/a.py']
+    await delete_indexed_repository('fork', str(index_dir))
+    assert get_disk_usage(str(index_dir / '.blobs')) == 0
@@ -0,0 +1,174 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License"). You may not use this file except in compliance
+# with the License. A copy of the License is located at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the 'license' file accompanying this file. This file is distributed on an 'AS IS' BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND, express or implied. See the License for the specific language governing permissions
+# and limitations under the License.
+"""Tests for the streaming index build in Git Repository Research MCP Server."""
+
+import asyncio
+import json
+import os
+import pytest
+import threading
+import time
+from awslabs.git_repo_research_mcp_server.embeddings import StubEmbeddings
+from awslabs.git_repo_research_mcp_server.indexer import (
+    IndexBuilder,
+    IndexConfig,
+    RepositoryConfig,
+    RepositoryIndexer,
+    iter_chunk_documents,
+    load_chunk_map_without_pickle,
+    save_chunk_map_without_pickle,
+)
+from awslabs.git_repo_research_mcp_server.models import RepositoryScanStats
+from awslabs.git_repo_research_mcp_server.repository import iter_repository_files
+from awslabs.git_repo_research_mcp_server.utils import load_metadata
+from langchain_core.documents import Document
+from unittest.mock import patch
+
+
+def test_iter_chunk_documents_assigns_integer_ids():
+    """Test that identical chunks in different files keep their own source."""
+    chunk_to_file = {}
+    file_chunks = iter([('a.py', ['shared', 'only a']), ('b.py', ['shared'])])
+
+    documents = list(iter_chunk_documents(file_chunks, chunk_to_file))
+
+    assert [doc.metadata['chunk_id'] for doc in documents] == [0, 1, 2]
+    assert [doc.metadata['source'] for doc in documents] == ['a.py', 'a.py', 'b.py']
+    assert chunk_to_file == {0: 'a.py', 1: 'a.py', 2: 'b.py'}
+
+
+def test_chunk_map_round_trip(tmp_path):
+    """Test saving and loading a chunk map keyed by chunk ID."""
+    save_chunk_map_without_pickle({'chunk_to_file': {0: 'a.py', 1: 'b.py'}}, str(tmp_path))
+
+    with open(tmp_path / 'chunk_map.json') as f:
+        assert json.load(f) == {'chunk_to_file': {'0': 'a.py', '1': 'b.py'}}
+    assert load_chunk_map_without_pickle(str(tmp_path)) == {
+        'chunk_to_file': {0: 'a.py', 1: 'b.py'}
+    }
+
+
+def test_load_legacy_chunk_map(tmp_path):
+    """Test loading a chunk map that also stores the chunk text."""
+    with open(tmp_path / 'chunk_map.json', 'w') as f:
+        json.dump({'chunks': ['one', 'two'], 'chunk_to_file': {'0': 'a.py', '1': 'b.py'}}, f)
+
+    assert load_chunk_map_without_pickle(str(tmp_path)) == {
+        'chunk_to_file': {0: 'a.py', 1: 'b.py'}
+    }
+
+
+@pytest.mark.asyncio
+async def test_build_vector_store_bounds_buffered_chunks(tmp_path):
+    """Test that the stream is embedded in bounded batches."""
+    for i in range(40):
+        (tmp_path / f'file_{i}.py').write_text(f'value_{i} = {i}\n')
+    scan_stats = RepositoryScanStats()
+    chunk_to_file = {}
+    documents = iter_chunk_documents(
+        iter_repository_files(str(tmp_path), ['*.py'], [], stats=scan_stats), chunk_to_file
+    )
+    builder = IndexBuilder(batch_size=2, max_concurrency=2, stream_batch_size=4)
+
+    vector_store, stats = await builder.build_vector_store(
+        documents, StubEmbeddings(dimensions=8), scan_stats
+    )
+
+    assert vector_store is not None
+    assert vector_store.index.ntotal == 40
+    assert stats.chunk_count == 40
+    assert stats.batch_count == 10
+    assert stats.max_buffered_chunks <= 8
+    assert stats.peak_memory_bytes is None or stats.peak_memory_bytes > 0
+    assert scan_stats.files_selected == 40
+    assert scan_stats.files_processed == 40
+    assert sorted(vector_store.index_to_docstore_id.values(), key=int) == [
+        str(i) for i in range(40)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_build_vector_store_empty_stream():
+    """Test that an empty stream produces no vector store."""
+    vector_store, stats = await IndexBuilder().build_vector_store(
+        iter([]), StubEmbeddings(dimensions=8)
+    )
+
+    assert vector_store is None
+    assert stats.chunk_count == 0
+
+
+@pytest.mark.asyncio
+async def test_build_vector_store_cancelled_while_reading():
+    """Test that a cancelled build waits for the background read before the stream is closed."""
+    reading = threading.Event()
+
+    def slow_documents():
+        for i in range(100):
+            if i >= 2:
+                reading.set()
+                time.sleep(0.05)
+            yield Document(page_content=f'chunk {i}', metadata={'source': 'a.py', 'chunk_id': i})
+
+    documents = slow_documents()
+    builder = IndexBuilder(batch_size=1, max_concurrency=1, stream_batch_size=2)
+    task = asyncio.ensure_future(
+        builder.build_vector_store(documents, StubEmbeddings(dimensions=8))
+    )
+    assert await asyncio.to_thread(reading.wait, 5)
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    # The generator is not executing anymore, so it can be closed
+    documents.close()
+    assert documents.gi_frame is None
+
+
+@pytest.mark.asyncio
+async def test_index_repository_streaming(tmp_path):
+    """Test a full streaming index build with duplicate chunks across files."""
+    repo_dir = tmp_path / 'streaming_repo'
+    repo_dir.mkdir()
+    (repo_dir / 'a.py').write_text('SHARED = True\n')
+    (repo_dir / 'b.py').write_text('SHARED = True\n')
+    (repo_dir / 'README.md').write_text('# Streaming\n')
+
+    with patch(
+        'awslabs.git_repo_research_mcp_server.indexer.get_embedding_model',
+        return_value=StubEmbeddings(dimensions=8),
+    ):
+        indexer = RepositoryIndexer(
+            IndexConfig(embedding_model='test-model', index_dir=str(tmp_path / 'indices'))
+        )
+        result = await indexer.index_repository(
+            RepositoryConfig(
+                repository_path=str(repo_dir),
+                include_patterns=['*.py', '*.md'],
+                exclude_patterns=[],
+            )
+        )
+
+    assert result.status == 'success'
+    assert result.file_count == 3
+    assert result.chunk_count == 3
+
+    chunk_map = load_chunk_map_without_pickle(result.index_path)
+    assert sorted(chunk_map['chunk_to_file'].values()) == ['README.md', 'a.py', 'b.py']
+
+    metadata = load_metadata(os.path.join(result.index_path, 'metadata.json'))
+    assert metadata is not None
+    assert metadata.file_types == {'md': 1, 'py': 2}
+    assert metadata.indexing_stats is not None
+    assert metadata.indexing_stats.chunk_count == 3
+    assert metadata.scan_stats is not None
+    assert metadata.scan_stats.files_processed == 3